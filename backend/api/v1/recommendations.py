@@ -9,6 +9,8 @@ from backend.core.dependencies import get_domain_services
 from backend.schemas.recommendations import (
     BatchEmbeddingRequest,
     BatchEmbeddingResponse,
+    BatchRecommendationResponse,
+    BatchSimilarityRequest,
     EmbeddingStatus,
     IndexRebuildResponse,
     PromptRecommendationRequest,
@@ -25,6 +27,66 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+@router.post(
+    "/recommendations/similar/batch",
+    response_model=BatchRecommendationResponse,
+)
+async def get_similar_loras_batch(
+    request: BatchSimilarityRequest,
+    services: DomainServices = Depends(get_domain_services),
+):
+    """Get LoRAs similar to each of several target LoRAs in one call.
+
+    Args:
+        request: Target LoRA ids, shared weights, and whether to also return
+            a merged ranking that excludes the targets
+        services: Domain service container that provides recommendation logic
+
+    Returns:
+        Per-target similar LoRAs plus the optional merged ranking
+
+    """
+    try:
+        start_time = datetime.now()
+
+        recommendation_service = services.recommendations
+        results, merged = await recommendation_service.similar_loras_batch(
+            target_lora_ids=request.target_lora_ids,
+            limit=request.limit,
+            similarity_threshold=request.similarity_threshold,
+            diversify_results=request.diversify_results,
+            weights=request.weights,
+            include_merged=request.include_merged,
+        )
+
+        processing_time = (datetime.now() - start_time).total_seconds() * 1000
+
+        return BatchRecommendationResponse(
+            target_lora_ids=list(results),
+            results=results,
+            merged_recommendations=merged,
+            total_candidates=sum(len(items) for items in results.values()),
+            processing_time_ms=processing_time,
+            recommendation_config={
+                "device": recommendation_service.device,
+                "gpu_enabled": recommendation_service.gpu_enabled,
+                "similarity_threshold": request.similarity_threshold,
+                "include_merged": request.include_merged,
+                "weights": request.weights,
+            },
+            generated_at=datetime.now(timezone.utc),
+        )
+
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except Exception as exc:
+        logger.exception("similar_loras_batch failed")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch recommendation generation failed: {exc}",
+        ) from exc
+
+
 @router.get("/recommendations/similar/{lora_id}", response_model=RecommendationResponse)
 async def get_similar_loras(
     lora_id: str,
@@ -68,6 +68,35 @@ class Settings(BaseSettings):
     GENERATION_WEBSOCKET_RETRY_INTERVAL_MS: int = Field(default=3_000, gt=0)
     GENERATION_SYSTEM_STATUS_POLL_INTERVAL_MS: int = Field(default=10_000, gt=0)
 
+    # Recommendation similarity search backend: exact, ivf, faiss_ivf, faiss_hnsw
+    RECOMMENDATION_INDEX_BACKEND: str = "exact"
+    RECOMMENDATION_INDEX_NLIST: int = Field(default=0, ge=0)  # 0 = sqrt(N) lists
+    RECOMMENDATION_INDEX_NPROBE: int = Field(default=8, gt=0)
+    RECOMMENDATION_INDEX_HNSW_M: int = Field(default=32, gt=0)
+    # Storage precision of the index vectors: float32, float16 or int8
+    RECOMMENDATION_INDEX_PRECISION: str = "float32"
+    RECOMMENDATION_INDEX_RERANK_FACTOR: int = Field(default=4, gt=0)
+    # LRU size of the similar/trigger result cache (0 disables caching)
+    RECOMMENDATION_RESULT_CACHE_SIZE: int = Field(default=1024, ge=0)
+    # LRU size of the prompt embedding cache (0 disables caching); persisted
+    # under the embedding cache directory when enabled
+    RECOMMENDATION_PROMPT_CACHE_SIZE: int = Field(default=512, ge=0)
+    RECOMMENDATION_PROMPT_CACHE_PERSIST: bool = False
+    # Minimum seconds between trigger index change-stamp checks
+    RECOMMENDATION_TRIGGER_REFRESH_SECONDS: float = Field(default=5.0, ge=0)
+    # Memory-mapped index snapshot directory loaded at startup (warm start)
+    RECOMMENDATION_INDEX_SNAPSHOT_PATH: str = "cache/similarity_index"
+    # Hash every snapshot page on load instead of checking file sizes/mtimes
+    RECOMMENDATION_INDEX_SNAPSHOT_VERIFY: bool = False
+    # RAM budget (MiB) for resident recommendation models; least recently used
+    # models are unloaded beyond it (0 keeps every loaded model)
+    RECOMMENDATION_MODEL_MEMORY_BUDGET_MB: int = Field(default=0, ge=0)
+    # Precision of persisted embedding vectors: float32 or float16
+    RECOMMENDATION_EMBEDDING_STORAGE_DTYPE: str = "float32"
+    # Run the sentiment and zero-shot style pipelines during feature
+    # extraction (one extra forward pass per style label on every adapter)
+    RECOMMENDATION_SENTIMENT_STYLE_ENABLED: bool = False
+
     # CORS settings for backend API
     CORS_ORIGINS: List[str] = Field(
         default_factory=lambda: [
@@ -98,6 +127,54 @@ class Settings(BaseSettings):
             )
         return normalised
 
+    @field_validator("RECOMMENDATION_INDEX_BACKEND", mode="before")
+    @classmethod
+    def _normalise_index_backend(cls, value: str | None) -> str:
+        """Normalise the similarity index backend name."""
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return "exact"
+
+        normalised = str(value).strip().lower().replace("-", "_")
+        allowed = {"exact", "ivf", "faiss_ivf", "faiss_hnsw"}
+        if normalised not in allowed:
+            raise ValueError(
+                "RECOMMENDATION_INDEX_BACKEND must be one of: "
+                + ", ".join(sorted(allowed))
+            )
+        return normalised
+
+    @field_validator("RECOMMENDATION_INDEX_PRECISION", mode="before")
+    @classmethod
+    def _normalise_index_precision(cls, value: str | None) -> str:
+        """Normalise the similarity index storage precision."""
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return "float32"
+
+        normalised = str(value).strip().lower()
+        allowed = {"float32", "float16", "int8"}
+        if normalised not in allowed:
+            raise ValueError(
+                "RECOMMENDATION_INDEX_PRECISION must be one of: "
+                + ", ".join(sorted(allowed))
+            )
+        return normalised
+
+    @field_validator("RECOMMENDATION_EMBEDDING_STORAGE_DTYPE", mode="before")
+    @classmethod
+    def _normalise_embedding_storage_dtype(cls, value: str | None) -> str:
+        """Normalise the persisted embedding precision."""
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return "float32"
+
+        normalised = str(value).strip().lower()
+        allowed = {"float32", "float16"}
+        if normalised not in allowed:
+            raise ValueError(
+                "RECOMMENDATION_EMBEDDING_STORAGE_DTYPE must be one of: "
+                + ", ".join(sorted(allowed))
+            )
+        return normalised
+
     @model_validator(mode="after")
     def _require_production_settings(self) -> "Settings":
         """Enforce required settings when running in production."""
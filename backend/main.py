@@ -22,9 +22,10 @@ from backend.api.v1 import (
     websocket,
 )
 from backend.core.config import settings
-from backend.core.database import init_db
+from backend.core.database import get_session_context, init_db
 from backend.core.logging import setup_logging
 from backend.core.security import get_api_key
+from backend.services import create_service_container
 from backend.services.recommendations import RecommendationService
 
 
@@ -50,6 +51,25 @@ async def lifespan(app: FastAPI):
             recommendation_logger.info(
                 "Recommendation model preload completed successfully"
             )
+        await _warm_start_recommendation_index()
+
+    async def _warm_start_recommendation_index() -> None:
+        if not os.path.isdir(settings.RECOMMENDATION_INDEX_SNAPSHOT_PATH):
+            return
+        try:
+            with get_session_context() as session:
+                services = create_service_container(session)
+                loaded = await services.domain.recommendations.warm_start_index()
+        except Exception:  # pragma: no cover - defensive guard against startup failures
+            recommendation_logger.exception(
+                "Recommendation index warm start failed; the index will be "
+                "rebuilt on first use",
+            )
+        else:
+            if loaded:
+                recommendation_logger.info(
+                    "Recommendation index warm-started from snapshot"
+                )
 
     startup_tasks.append(asyncio.create_task(_preload_recommendations()))
 
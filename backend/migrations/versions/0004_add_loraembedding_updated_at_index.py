@@ -0,0 +1,38 @@
+"""Index loraembedding.updated_at for trigger index change stamps.
+
+Revision ID: 0004_add_loraembedding_updated_at_index
+Revises: 0003_add_loraembedding_trigger_columns
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from typing import Set
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004_add_loraembedding_updated_at_index"
+down_revision = "0003_add_loraembedding_trigger_columns"
+branch_labels = None
+depends_on = None
+
+TABLE_NAME = "loraembedding"
+INDEX_NAME = "idx_loraembedding_updated_at"
+
+
+def _existing_indexes() -> Set[str]:
+    """Get existing index names to avoid duplicate index errors."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    return {index["name"] for index in inspector.get_indexes(TABLE_NAME)}
+
+
+def upgrade() -> None:
+    """Add the index used by ``max(updated_at)`` change-stamp queries."""
+    if INDEX_NAME not in _existing_indexes():
+        op.create_index(INDEX_NAME, TABLE_NAME, ["updated_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the change-stamp index."""
+    if INDEX_NAME in _existing_indexes():
+        op.drop_index(INDEX_NAME, table_name=TABLE_NAME)
@@ -0,0 +1,43 @@
+"""Add loraembedding.content_hash for incremental recomputes.
+
+Revision ID: 0005_add_loraembedding_content_hash
+Revises: 0004_add_loraembedding_updated_at_index
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from typing import Set
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0005_add_loraembedding_content_hash"
+down_revision = "0004_add_loraembedding_updated_at_index"
+branch_labels = None
+depends_on = None
+
+TABLE_NAME = "loraembedding"
+
+
+def _existing_columns() -> Set[str]:
+    """Get existing columns in the table to avoid duplicate column errors."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    return {column["name"] for column in inspector.get_columns(TABLE_NAME)}
+
+
+def upgrade() -> None:
+    """Add the nullable hash column; existing rows recompute once."""
+    if "content_hash" in _existing_columns():
+        return
+    with op.batch_alter_table(TABLE_NAME, schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("content_hash", sa.String(length=64), nullable=True)
+        )
+
+
+def downgrade() -> None:
+    """Drop the hash column."""
+    if "content_hash" not in _existing_columns():
+        return
+    with op.batch_alter_table(TABLE_NAME, schema=None) as batch_op:
+        batch_op.drop_column("content_hash")
@@ -0,0 +1,165 @@
+"""Re-encode stored embeddings with the binary embedding codec.
+
+Modality embeddings were pickled ndarrays and trigger vectors JSON lists of
+floats. Both are rewritten as a small header (dtype, shape, model id)
+followed by raw little-endian float32 bytes, and ``trigger_embeddings``
+becomes a binary column holding one ``(triggers, dim)`` matrix.
+
+Revision ID: 0006_binary_embedding_encoding
+Revises: 0005_add_loraembedding_content_hash
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+import pickle
+import struct
+
+import numpy as np
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0006_binary_embedding_encoding"
+down_revision = "0005_add_loraembedding_content_hash"
+branch_labels = None
+depends_on = None
+
+TABLE_NAME = "loraembedding"
+MODALITY_COLUMNS = ("semantic_embedding", "artistic_embedding", "technical_embedding")
+PAGE_SIZE = 500
+
+# Frozen copy of the version 1 codec layout so the migration does not depend
+# on application code: magic, version, dtype (2 = float32), ndim, id length.
+_MAGIC = b"LEMB"
+_PREFIX = struct.Struct("<4sBBBB")
+_DTYPES = {1: "<f2", 2: "<f4"}
+
+
+def _encode(vector) -> bytes:
+    array = np.ascontiguousarray(vector, dtype="<f4")
+    header = _PREFIX.pack(_MAGIC, 1, 2, array.ndim, 0)
+    return header + struct.pack(f"<{array.ndim}I", *array.shape) + array.tobytes()
+
+
+def _decode(blob: bytes) -> np.ndarray:
+    _, _, dtype_code, ndim, model_length = _PREFIX.unpack_from(blob)
+    shape = struct.unpack_from(f"<{ndim}I", blob, _PREFIX.size)
+    offset = _PREFIX.size + 4 * ndim + model_length
+    array = np.frombuffer(blob, dtype=_DTYPES[dtype_code], offset=offset)
+    return array.reshape(shape).astype(np.float32)
+
+
+def _table(trigger_type, target: str, target_type) -> sa.Table:
+    return sa.table(
+        TABLE_NAME,
+        sa.column("adapter_id", sa.String),
+        *(sa.column(name, sa.LargeBinary) for name in MODALITY_COLUMNS),
+        sa.column("trigger_embeddings", trigger_type),
+        sa.column(target, target_type),
+    )
+
+
+def _rewrite(table: sa.Table, target: str, convert_row) -> None:
+    """Page through every row by key and write ``convert_row`` results back.
+
+    ``convert_row`` returns the new modality blobs and ``target`` value of a
+    row keyed by column name.
+    """
+    bind = op.get_bind()
+    written = (*MODALITY_COLUMNS, target)
+    update = (
+        table
+        .update()
+        .where(table.c.adapter_id == sa.bindparam("row_id"))
+        .values({name: sa.bindparam(f"new_{name}") for name in written})
+    )
+    last_id = None
+    while True:
+        stmt = (
+            sa
+            .select(
+                table.c.adapter_id,
+                *(table.c[name] for name in MODALITY_COLUMNS),
+                table.c.trigger_embeddings,
+            )
+            .order_by(table.c.adapter_id)
+            .limit(PAGE_SIZE)
+        )
+        if last_id is not None:
+            stmt = stmt.where(table.c.adapter_id > last_id)
+        rows = bind.execute(stmt).all()
+        if not rows:
+            return
+        params = []
+        for row in rows:
+            values = convert_row(row)
+            params.append(
+                {"row_id": row.adapter_id}
+                | {f"new_{name}": values[name] for name in written}
+            )
+        bind.execute(update, params)
+        last_id = rows[-1].adapter_id
+
+
+def upgrade() -> None:
+    """Convert pickled and JSON vectors to the binary encoding."""
+    with op.batch_alter_table(TABLE_NAME, schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("trigger_embeddings_blob", sa.LargeBinary(), nullable=True)
+        )
+
+    def convert(row):
+        values = {}
+        for name in MODALITY_COLUMNS:
+            blob = getattr(row, name)
+            if blob and bytes(blob[:4]) != _MAGIC:
+                blob = _encode(pickle.loads(blob))
+            values[name] = blob
+        triggers = row.trigger_embeddings or []
+        values["trigger_embeddings_blob"] = _encode(triggers) if triggers else None
+        return values
+
+    _rewrite(
+        _table(sa.JSON, "trigger_embeddings_blob", sa.LargeBinary),
+        "trigger_embeddings_blob",
+        convert,
+    )
+
+    with op.batch_alter_table(TABLE_NAME, schema=None) as batch_op:
+        batch_op.drop_column("trigger_embeddings")
+    with op.batch_alter_table(TABLE_NAME, schema=None) as batch_op:
+        batch_op.alter_column(
+            "trigger_embeddings_blob", new_column_name="trigger_embeddings"
+        )
+
+
+def downgrade() -> None:
+    """Restore pickled modality embeddings and JSON trigger vectors."""
+    with op.batch_alter_table(TABLE_NAME, schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("trigger_embeddings_json", sa.JSON(), nullable=True)
+        )
+
+    def convert(row):
+        values = {}
+        for name in MODALITY_COLUMNS:
+            blob = getattr(row, name)
+            if blob and bytes(blob[:4]) == _MAGIC:
+                blob = pickle.dumps(_decode(blob))
+            values[name] = blob
+        blob = row.trigger_embeddings
+        values["trigger_embeddings_json"] = (
+            _decode(blob).astype(float).tolist() if blob else []
+        )
+        return values
+
+    _rewrite(
+        _table(sa.LargeBinary, "trigger_embeddings_json", sa.JSON),
+        "trigger_embeddings_json",
+        convert,
+    )
+
+    with op.batch_alter_table(TABLE_NAME, schema=None) as batch_op:
+        batch_op.drop_column("trigger_embeddings")
+    with op.batch_alter_table(TABLE_NAME, schema=None) as batch_op:
+        batch_op.alter_column(
+            "trigger_embeddings_json", new_column_name="trigger_embeddings"
+        )
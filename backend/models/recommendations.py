@@ -50,6 +50,8 @@ class UserPreference(SQLModel, table=True):
 class LoRAEmbedding(SQLModel, table=True):
     """Store computed embeddings for LoRA adapters."""
 
+    __table_args__ = (Index("idx_loraembedding_updated_at", "updated_at"),)
+
     adapter_id: str = Field(primary_key=True, foreign_key="adapter.id")
     semantic_embedding: Optional[bytes] = Field(
         default=None, sa_column=Column(LargeBinary)
@@ -72,8 +74,13 @@ class LoRAEmbedding(SQLModel, table=True):
     compatibility_score: Optional[float] = None
     normalized_triggers: list = Field(default_factory=list, sa_column=Column(JSON))
     trigger_aliases: dict = Field(default_factory=dict, sa_column=Column(JSON))
-    trigger_embeddings: list = Field(default_factory=list, sa_column=Column(JSON))
+    # (triggers, dim) matrix encoded like the modality embeddings.
+    trigger_embeddings: Optional[bytes] = Field(
+        default=None, sa_column=Column(LargeBinary)
+    )
     trigger_metadata: dict = Field(default_factory=dict, sa_column=Column(JSON))
+    # SHA-256 of the text payloads and model ids the vectors were computed from.
+    content_hash: Optional[str] = Field(default=None, max_length=64)
     last_computed: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -60,6 +60,8 @@ from .import_export import (
 from .recommendations import (
     BatchEmbeddingRequest,
     BatchEmbeddingResponse,
+    BatchRecommendationResponse,
+    BatchSimilarityRequest,
     EmbeddingStatus,
     IndexRebuildResponse,
     PromptRecommendationRequest,
@@ -129,6 +131,8 @@ __all__ = [
     "RecommendationItem",
     "PromptRecommendationRequest",
     "SimilarityRequest",
+    "BatchSimilarityRequest",
+    "BatchRecommendationResponse",
     "UserFeedbackRequest",
     "UserPreferenceRequest",
     "RecommendationFeedbackRead",
@@ -72,6 +72,31 @@ class SimilarityRequest(BaseModel):
     diversify_results: bool = True
 
 
+class BatchSimilarityRequest(BaseModel):
+    """Request for similar LoRAs across several targets at once."""
+
+    target_lora_ids: List[str] = Field(min_length=1, max_length=50)
+    limit: int = Field(default=10, ge=1, le=50)
+    similarity_threshold: float = Field(default=0.1, ge=0.0, le=1.0)
+    diversify_results: bool = True
+    include_merged: bool = False
+    weights: Dict[str, float] = Field(
+        default_factory=lambda: {"semantic": 0.6, "artistic": 0.3, "technical": 0.1}
+    )
+
+
+class BatchRecommendationResponse(BaseModel):
+    """Per-target recommendations plus an optional merged ranking."""
+
+    target_lora_ids: List[str]
+    results: Dict[str, List[RecommendationItem]]
+    merged_recommendations: Optional[List[RecommendationItem]] = None
+    total_candidates: int
+    processing_time_ms: float
+    recommendation_config: Dict[str, Any]
+    generated_at: datetime
+
+
 class UserFeedbackRequest(BaseModel):
     """User feedback on recommendations."""
 
@@ -136,6 +161,16 @@ class RecommendationStats(BaseModel):
     feedback_count: int
     model_memory_usage_gb: float
     last_index_update: datetime
+    index_backend: Optional[str] = None
+    index_recall_at_k: Optional[float] = None
+    index_precision: Optional[str] = None
+    index_memory_bytes: Optional[int] = None
+    prompt_cache_hit_rate: Optional[float] = None
+    model_resident_bytes: Optional[int] = None
+    model_loads: Optional[int] = None
+    model_load_seconds: Optional[float] = None
+    model_evictions: Optional[int] = None
+    model_eviction_seconds: Optional[float] = None
 
 
 class EmbeddingStatus(BaseModel):
@@ -164,6 +199,7 @@ class BatchEmbeddingResponse(BaseModel):
 
     processed_count: int
     skipped_count: int
+    unchanged_count: int = 0
     error_count: int
     processing_time_seconds: float
     errors: List[Dict[str, str]] = Field(default_factory=list)
@@ -1,6 +1,7 @@
 """Adapter service package."""
 
+from .listeners import AdapterChangeListener
 from .search import AdapterSearchResult
 from .service import AdapterService
 
-__all__ = ["AdapterService", "AdapterSearchResult"]
+__all__ = ["AdapterChangeListener", "AdapterService", "AdapterSearchResult"]
@@ -0,0 +1,24 @@
+"""Hooks notified after adapter writes are committed."""
+
+from __future__ import annotations
+
+from typing import Protocol, Sequence, Set
+
+from backend.models import Adapter
+
+
+class AdapterChangeListener(Protocol):
+    """Receive committed adapter changes, e.g. to keep derived indexes fresh."""
+
+    def adapters_updated(
+        self,
+        adapters: Sequence[Adapter],
+        changed_fields: Set[str],
+    ) -> None:
+        """Handle adapters whose ``changed_fields`` were written."""
+
+    def adapters_removed(self, adapter_ids: Sequence[str]) -> None:
+        """Handle adapters that were deleted."""
+
+
+__all__ = ["AdapterChangeListener"]
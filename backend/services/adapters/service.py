@@ -1,5 +1,6 @@
 """Adapter service for managing LoRA adapters."""
 
+import logging
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Sequence, Set
 
@@ -9,6 +10,7 @@ from backend.models import Adapter
 from backend.schemas.adapters import AdapterCreate
 from backend.services.storage import get_storage_service
 
+from .listeners import AdapterChangeListener
 from .repository import (
     save_adapter as repository_save_adapter,
 )
@@ -36,6 +38,8 @@ from .statistics import (
     get_featured_adapters as statistics_get_featured_adapters,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class AdapterService:
     """Service for adapter-related operations."""
@@ -57,16 +61,25 @@ class AdapterService:
         "sd_version",
     }
 
-    def __init__(self, db_session: Session, storage_backend=None):
+    def __init__(
+        self,
+        db_session: Session,
+        storage_backend=None,
+        *,
+        change_listener: Optional[AdapterChangeListener] = None,
+    ):
         """Initialize AdapterService with a DB session and storage backend.
 
         Args:
             db_session: Database session
             storage_backend: Storage backend for file validation (optional)
+            change_listener: Notified after patch, (de)activate and delete
+                commits, e.g. to update the similarity index (optional)
 
         """
         self.db_session = db_session
         self.storage_backend = storage_backend
+        self.change_listener = change_listener
 
     def validate_file_path(self, path: str) -> bool:
         """Return True if the given path exists and is readable.
@@ -200,6 +213,7 @@ class AdapterService:
         self.db_session.delete(adapter)
         if commit:
             self.db_session.commit()
+            self._notify_removed([adapter_id])
         return True
 
     def activate_adapter(
@@ -213,14 +227,18 @@ class AdapterService:
         if ordinal is not None:
             updates["ordinal"] = ordinal
 
-        return self.update_adapter(adapter_id, updates)
+        adapter = self.update_adapter(adapter_id, updates)
+        if adapter is not None:
+            self._notify_updated([adapter], set(updates))
+        return adapter
 
     def deactivate_adapter(self, adapter_id: str) -> Optional[Adapter]:
         """Deactivate an adapter."""
-        return self.update_adapter(
-            adapter_id,
-            {"active": False, "updated_at": datetime.now(timezone.utc)},
-        )
+        updates = {"active": False, "updated_at": datetime.now(timezone.utc)}
+        adapter = self.update_adapter(adapter_id, updates)
+        if adapter is not None:
+            self._notify_updated([adapter], set(updates))
+        return adapter
 
     def get_all_tags(self) -> List[str]:
         """Return a sorted list of all unique adapter tags."""
@@ -280,6 +298,10 @@ class AdapterService:
             self.db_session.rollback()
             raise
 
+        if action == "delete":
+            self._notify_removed(processed)
+        else:
+            self._notify_updated(adapters, {"active", "updated_at"})
         return processed
 
     def patch_adapter(self, adapter_id: str, payload: Dict[str, Any]) -> Adapter:
@@ -320,4 +342,21 @@ class AdapterService:
         if updated is None:
             raise LookupError("adapter not found")
 
+        self._notify_updated([updated], set(updates))
         return updated
+
+    def _notify_updated(self, adapters: Sequence[Adapter], fields: Set[str]) -> None:
+        if self.change_listener is None or not adapters:
+            return
+        try:
+            self.change_listener.adapters_updated(adapters, fields)
+        except Exception as exc:  # pragma: no cover - listeners must not fail writes
+            logger.warning("Adapter change listener failed: %s", exc)
+
+    def _notify_removed(self, adapter_ids: Sequence[str]) -> None:
+        if self.change_listener is None or not adapter_ids:
+            return
+        try:
+            self.change_listener.adapters_removed(adapter_ids)
+        except Exception as exc:  # pragma: no cover - listeners must not fail writes
+            logger.warning("Adapter change listener failed: %s", exc)
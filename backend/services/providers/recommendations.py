@@ -114,7 +114,11 @@ def make_recommendation_service(
     persistence_service = persistence_components.service
     config = persistence_components.config
 
-    metrics_tracker = metrics_tracker or RecommendationMetricsTracker()
+    # Request-scoped services share process-wide counters so that query
+    # timings and cache hits accumulate in ``/recommendations/stats``.
+    metrics_tracker = metrics_tracker or RecommendationMetricsTracker(
+        model_registry.get_shared_metrics(),
+    )
 
     if use_case_bundle is None:
         use_case_bundle = build_use_cases(
@@ -139,6 +143,9 @@ def make_recommendation_service(
     stats_reporter = stats_reporter or StatsReporter(
         metrics_tracker=metrics_tracker,
         repository=repository,
+        engine_provider=model_registry.loaded_recommendation_engine,
+        prompt_cache_provider=model_registry.get_prompt_cache,
+        residency_provider=model_registry.get_model_residency,
     )
 
     builder = builder or RecommendationServiceBuilder()
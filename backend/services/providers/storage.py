@@ -7,7 +7,8 @@ from typing import Optional, Protocol
 
 from sqlmodel import Session
 
-from ..adapters import AdapterService
+from ..adapters import AdapterChangeListener, AdapterService
+from ..recommendations import LoRAEmbeddingRepository, SimilarityIndexSync
 from ..storage import StorageBackend, StorageService, get_storage_backend
 
 
@@ -28,6 +29,7 @@ class AdapterServiceFactory(Protocol):
         db_session: Session,
         storage_service: StorageService,
         storage_backend: Optional[StorageBackend] = None,
+        change_listener: Optional[AdapterChangeListener] = None,
     ) -> AdapterService:
         """Create an :class:`AdapterService` instance."""
         ...
@@ -44,10 +46,23 @@ def make_adapter_service(
     db_session: Session,
     storage_service: StorageService,
     storage_backend: Optional[StorageBackend] = None,
+    change_listener: Optional[AdapterChangeListener] = None,
 ) -> AdapterService:
-    """Create an :class:`AdapterService` with explicit collaborators."""
+    """Create an :class:`AdapterService` with explicit collaborators.
+
+    Adapter writes update the shared similarity index incrementally from the
+    stored embeddings unless a different ``change_listener`` is supplied.
+    """
     backend = storage_backend or storage_service.backend
-    return AdapterService(db_session, storage_backend=backend)
+    if change_listener is None:
+        change_listener = SimilarityIndexSync(
+            repository=LoRAEmbeddingRepository(db_session),
+        )
+    return AdapterService(
+        db_session,
+        storage_backend=backend,
+        change_listener=change_listener,
+    )
 
 
 @dataclass(frozen=True)
@@ -16,12 +16,21 @@ from .embedding_coordinator import EmbeddingCoordinator
 from .embedding_manager import EmbeddingManager
 from .embedding_repository import LoRAEmbeddingRepository
 from .feedback_manager import FeedbackManager
+from .index_snapshot import (
+    IndexSnapshot,
+    IndexSnapshotError,
+    read_index_snapshot,
+    write_index_snapshot,
+)
+from .index_sync import SimilarityIndexSync
 from .metrics import RecommendationMetrics, RecommendationMetricsTracker
 from .model_bootstrap import RecommendationModelBootstrap
 from .persistence_manager import RecommendationPersistenceManager
 from .persistence_service import RecommendationPersistenceService
 from .repository import RecommendationRepository
+from .result_cache import RecommendationResultCache
 from .service import RecommendationService
+from .sharded_embedding_runner import ShardedEmbeddingRunner
 from .similarity_index_builder import SimilarityIndexBuilder
 from .stats_reporter import StatsReporter
 from .trigger_engine import (
@@ -45,6 +54,8 @@ __all__ = [
     "EmbeddingManager",
     "LoRAEmbeddingRepository",
     "FeedbackManager",
+    "IndexSnapshot",
+    "IndexSnapshotError",
     "RecommendationMetrics",
     "RecommendationMetricsTracker",
     "RecommendationModelBootstrap",
@@ -52,8 +63,11 @@ __all__ = [
     "RecommendationPersistenceManager",
     "RecommendationPersistenceService",
     "RecommendationRepository",
+    "RecommendationResultCache",
     "RecommendationService",
+    "ShardedEmbeddingRunner",
     "SimilarityIndexBuilder",
+    "SimilarityIndexSync",
     "StatsReporter",
     "SimilarLoraUseCase",
     "PromptRecommendationUseCase",
@@ -65,4 +79,6 @@ __all__ = [
     "build_embedding_stack",
     "build_persistence_components",
     "build_use_cases",
+    "read_index_snapshot",
+    "write_index_snapshot",
 ]
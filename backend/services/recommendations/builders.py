@@ -7,6 +7,8 @@ from typing import Optional
 
 from sqlmodel import Session
 
+from backend.core.config import settings
+
 from .config import RecommendationConfig
 from .embedding_manager import EmbeddingManager
 from .embedding_repository import LoRAEmbeddingRepository
@@ -64,7 +66,10 @@ def build_embedding_stack(
             raise ValueError(
                 "db_session is required when embedding_repository is not provided",
             )
-        embedding_repository = LoRAEmbeddingRepository(db_session)
+        embedding_repository = LoRAEmbeddingRepository(
+            db_session,
+            embedding_dtype=settings.RECOMMENDATION_EMBEDDING_STORAGE_DTYPE,
+        )
 
     if embedding_manager is None:
         embedding_manager = EmbeddingManager(
@@ -100,6 +105,7 @@ def build_persistence_components(
             manager = RecommendationPersistenceManager(
                 embedding_manager,
                 model_registry.get_recommendation_engine,
+                prompt_cache=model_registry.get_prompt_cache(),
             )
 
     service = persistence_service or RecommendationPersistenceService(manager)
@@ -124,23 +130,27 @@ def build_use_cases(
     trigger_use_case: Optional[TriggerRecommendationUseCase] = None,
 ) -> UseCaseBundle:
     """Return high level use cases, defaulting to standard implementations."""
+    result_cache = model_registry.get_result_cache()
     similar = similar_use_case or SimilarLoraUseCase(
         repository=repository,
         embedding_workflow=embedding_workflow,
         engine_provider=model_registry.get_recommendation_engine,
         metrics=metrics_tracker,
+        result_cache=result_cache,
     )
     prompt = prompt_use_case or PromptRecommendationUseCase(
         repository=repository,
         embedder_provider=model_registry.get_semantic_embedder,
         metrics=metrics_tracker,
         device=device,
+        engine_provider=model_registry.loaded_recommendation_engine,
     )
 
     trigger = trigger_use_case or TriggerRecommendationUseCase(
         repository=repository,
         trigger_engine_provider=model_registry.get_trigger_engine,
         metrics=metrics_tracker,
+        result_cache=result_cache,
     )
 
     return UseCaseBundle(
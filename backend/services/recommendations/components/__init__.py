@@ -8,20 +8,28 @@ from .interfaces import (
     RecommendationEngineProtocol,
     SemanticEmbedderProtocol,
 )
+from .keyword_index import KeywordIndex
+from .model_residency import ModelResidencyManager
+from .prompt_cache import PromptEmbeddingCache
 from .sentence_transformer_provider import SentenceTransformerProvider
 from .text_payload_builder import MultiModalTextPayloadBuilder
 from .trigger_embedder import TriggerEmbedder
+from .trigger_ngram_index import TriggerNgramIndex
 from .trigger_processing import TriggerResolver
 
 __all__ = [
     "FeatureExtractorProtocol",
     "GPULoRAFeatureExtractor",
+    "KeywordIndex",
     "LoRARecommendationEngine",
     "RecommendationEngineProtocol",
     "SemanticEmbedderProtocol",
     "LoRASemanticEmbedder",
+    "ModelResidencyManager",
     "MultiModalTextPayloadBuilder",
+    "PromptEmbeddingCache",
     "SentenceTransformerProvider",
     "TriggerEmbedder",
+    "TriggerNgramIndex",
     "TriggerResolver",
 ]
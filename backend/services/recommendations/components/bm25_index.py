@@ -0,0 +1,103 @@
+"""Incrementally updatable in-memory BM25 index."""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Return the lower-cased alphanumeric tokens of ``text``."""
+    return _TOKEN.findall(text.lower())
+
+
+class BM25Index:
+    """Okapi BM25 over short documents keyed by id.
+
+    Postings map each term to ``{doc_id: term_frequency}``; document lengths
+    and the running total are kept alongside, so :meth:`add` and
+    :meth:`remove` touch only the terms of one document and IDF is derived
+    at query time from the live posting sizes.
+    """
+
+    def __init__(self, *, k1: float = 1.2, b: float = 0.75) -> None:
+        """Create an empty index with the usual ``k1``/``b`` parameters."""
+        self._k1 = k1
+        self._b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._terms: Dict[str, Counter[str]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        """Return the number of indexed documents."""
+        return len(self._lengths)
+
+    def __contains__(self, doc_id: object) -> bool:
+        """Return whether ``doc_id`` is indexed."""
+        return doc_id in self._lengths
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index ``text`` under ``doc_id``, replacing any previous version."""
+        self.remove(doc_id)
+        terms = Counter(tokenize(text))
+        length = sum(terms.values())
+        self._terms[doc_id] = terms
+        self._lengths[doc_id] = length
+        self._total_length += length
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+
+    def remove(self, doc_id: str) -> None:
+        """Drop ``doc_id`` from the index if present."""
+        terms = self._terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._lengths.pop(doc_id)
+        for term in terms:
+            posting = self._postings[term]
+            del posting[doc_id]
+            if not posting:
+                del self._postings[term]
+
+    def clear(self) -> None:
+        """Drop every document."""
+        self._postings.clear()
+        self._terms.clear()
+        self._lengths.clear()
+        self._total_length = 0
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Return up to ``limit`` ``(doc_id, score)`` pairs, best first."""
+        if limit <= 0 or not self._lengths:
+            return []
+        count = len(self._lengths)
+        average_length = self._total_length / count or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1.0 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc_id, frequency in posting.items():
+                norm = self._k1 * (
+                    1.0 - self._b + self._b * self._lengths[doc_id] / average_length
+                )
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * (
+                    frequency * (self._k1 + 1.0) / (frequency + norm)
+                )
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def rebuild(self, documents: Iterable[Tuple[str, str]]) -> None:
+        """Replace the index contents with ``(doc_id, text)`` pairs."""
+        self.clear()
+        for doc_id, text in documents:
+            self.add(doc_id, text)
+
+
+__all__ = ["BM25Index", "tokenize"]
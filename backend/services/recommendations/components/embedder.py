@@ -8,6 +8,8 @@ from typing import Any, Dict, Optional, Sequence
 import numpy as np
 
 from .interfaces import SemanticEmbedderProtocol
+from .model_residency import ModelResidencyManager
+from .prompt_cache import PromptEmbeddingCache
 from .sentence_transformer_provider import SentenceTransformerProvider
 from .text_payload_builder import MultiModalTextPayloadBuilder
 
@@ -44,9 +46,17 @@ class LoRASemanticEmbedder(SemanticEmbedderProtocol):
         force_fallback: bool = False,
         provider: SentenceTransformerProvider | None = None,
         payload_builder: MultiModalTextPayloadBuilder | None = None,
+        prompt_cache: PromptEmbeddingCache | None = None,
+        residency: ModelResidencyManager | None = None,
     ) -> None:
-        """Initialize semantic embedding orchestrator."""
+        """Initialize semantic embedding orchestrator.
+
+        ``prompt_cache`` lets repeated prompts skip inference in
+        :meth:`compute_prompt_embeddings`. ``residency`` is the shared
+        manager the default provider loads its models through.
+        """
         self.batch_size = batch_size
+        self.prompt_cache = prompt_cache
         self.mixed_precision = mixed_precision
         self._logger = logger or logging.getLogger(__name__)
         self._payload_builder = payload_builder or MultiModalTextPayloadBuilder()
@@ -57,6 +67,7 @@ class LoRASemanticEmbedder(SemanticEmbedderProtocol):
                 logger=self._logger,
                 force_fallback=force_fallback,
                 model_configs=self._MODEL_CONFIGS,
+                residency=residency,
             )
         self._provider = provider
         self.device = self._provider.device
@@ -79,6 +90,10 @@ class LoRASemanticEmbedder(SemanticEmbedderProtocol):
         """Get the technical embedding model, loading if necessary."""
         return self._provider.get_model("technical")
 
+    def model_versions(self) -> Dict[str, str]:
+        """Return the model identifier used for each embedding modality."""
+        return {key: self._provider.model_version(key) for key in self._MODEL_CONFIGS}
+
     # ------------------------------------------------------------------
     # Embedding helpers
     # ------------------------------------------------------------------
@@ -123,6 +138,10 @@ class LoRASemanticEmbedder(SemanticEmbedderProtocol):
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
+    def build_payload(self, lora: Any) -> Dict[str, str]:
+        """Return the per-modality texts that would be encoded for ``lora``."""
+        return self._payload_builder.build_payload(lora)
+
     def create_multi_modal_embedding(self, lora: Any) -> Dict[str, np.ndarray]:
         """Generate multiple specialized embeddings for different aspects."""
         content_texts = self._payload_builder.build_payload(lora)
@@ -186,12 +205,28 @@ class LoRASemanticEmbedder(SemanticEmbedderProtocol):
     def compute_prompt_embeddings(
         self, prompt: str, *, device: Optional[str] = None
     ) -> Dict[str, np.ndarray]:
-        """Compute semantic, artistic, and technical embeddings for ``prompt``."""
-        return {
+        """Compute semantic, artistic, and technical embeddings for ``prompt``.
+
+        With a prompt cache configured, prompts that normalise to the same
+        text under the same model versions are served without inference.
+        The returned arrays are then shared and read-only.
+        """
+        cache = self.prompt_cache
+        key = None
+        if cache is not None:
+            key = cache.make_key(prompt, self.model_versions())
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        embeddings = {
             "semantic": self._encode_single("semantic", prompt, device=device),
             "artistic": self._encode_single("artistic", prompt, device=device),
             "technical": self._encode_single("technical", prompt, device=device),
         }
+        if cache is not None:
+            cache.put(key, embeddings)
+        return embeddings
 
 
 __all__ = ["LoRASemanticEmbedder"]
@@ -2,13 +2,57 @@
 
 from __future__ import annotations
 
+import functools
 import logging
-import re
-from typing import Any, Dict, List, Optional, Sequence
+import threading
+import time
+from datetime import timezone
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
 import numpy as np
 
+from .bm25_index import BM25Index
 from .interfaces import RecommendationEngineProtocol
+from .keyword_index import KeywordIndex, document_text
+from .quantization import INDEX_PRECISIONS, QuantizedMatrix
+from .row_buffer import RowBuffer
+from .vector_index import (
+    INDEX_BACKENDS,
+    VectorIndexProtocol,
+    create_vector_index,
+    measure_recall_at_k,
+    top_k_indices,
+)
+
+MODALITIES: Tuple[str, ...] = ("semantic", "artistic", "technical")
+
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "semantic": 0.5,
+    "artistic": 0.35,
+    "technical": 0.15,
+}
+
+RECENCY_WINDOW_SECONDS = 30 * 86400
+
+# Rank offset of reciprocal rank fusion; 60 is the customary choice.
+RRF_K = 60
+
+# Engine defaults plus the ``/recommendations/similar`` query defaults.
+DEFAULT_WEIGHT_PROFILES: Tuple[Mapping[str, float], ...] = (
+    DEFAULT_WEIGHTS,
+    {"semantic": 0.6, "artistic": 0.3, "technical": 0.1},
+)
+
+
+def _synchronized(method):
+    """Run ``method`` under the engine lock so mutations never race queries."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class LoRARecommendationEngine(RecommendationEngineProtocol):
@@ -19,31 +63,104 @@ class LoRARecommendationEngine(RecommendationEngineProtocol):
         feature_extractor: Any,
         *,
         device: str = "cuda",
+        index_backend: str = "exact",
+        index_nlist: int = 0,
+        index_nprobe: int = 8,
+        index_hnsw_m: int = 32,
+        recall_k: int = 10,
+        recall_sample_size: int = 64,
+        weight_profiles: Optional[Sequence[Mapping[str, float]]] = None,
+        index_precision: str = "float32",
+        rerank_factor: int = 4,
+        compaction_ratio: float = 0.25,
+        keyword_index: Optional[KeywordIndex] = None,
         logger: Optional[logging.Logger] = None,
     ) -> None:
-        """Initialize recommendation engine."""
+        """Initialize recommendation engine.
+
+        Args:
+            feature_extractor: Extractor exposing the semantic embedder.
+            device: Preferred torch device for embedding work.
+            index_backend: One of ``exact``, ``ivf``, ``faiss_ivf`` or
+                ``faiss_hnsw``; non-exact backends retrieve candidates
+                approximately.
+            index_nlist: Inverted list count for IVF backends (``0`` = auto).
+            index_nprobe: Lists probed per query for IVF backends.
+            index_hnsw_m: Graph degree for the FAISS HNSW backend.
+            recall_k: ``k`` used when measuring approximate recall.
+            recall_sample_size: Number of sampled queries for recall checks.
+            weight_profiles: Weight mixes that get a pre-weighted fused matrix
+                so exact scoring is a single matrix-vector product.
+            index_precision: ``float32`` (default), ``float16`` or ``int8``.
+                Compact precisions keep one quantized fused matrix instead of
+                the float32 matrices and weight profiles.
+            rerank_factor: Oversampling applied to compact scores before the
+                candidates are re-ranked against memory-mapped float32
+                snapshot vectors; without a snapshot there is no re-rank.
+            compaction_ratio: Share of tombstoned rows (removed or replaced
+                LoRAs) that triggers an in-place compaction of the index.
+            keyword_index: Corpus keyword statistics for explanations, kept
+                in sync with the indexed LoRAs and rebuilt with the index, so
+                it must not be the feature extractor's catalog corpus.
+            logger: Optional logger for diagnostics.
+
+        """
+        if index_backend not in INDEX_BACKENDS:
+            raise ValueError(
+                f"Unknown index backend '{index_backend}'; expected one of "
+                f"{', '.join(INDEX_BACKENDS)}",
+            )
+        if index_precision not in INDEX_PRECISIONS:
+            raise ValueError(
+                f"Unknown index precision '{index_precision}'; expected one of "
+                f"{', '.join(INDEX_PRECISIONS)}",
+            )
+
         self.feature_extractor = feature_extractor
         self.device = device
         self._logger = logger or logging.getLogger(__name__)
 
-        self.semantic_embeddings: Optional[np.ndarray] = None
-        self.artistic_embeddings: Optional[np.ndarray] = None
-        self.technical_embeddings: Optional[np.ndarray] = None
+        self._lock = threading.RLock()
+        self._buffers: Optional[Tuple[RowBuffer, ...]] = None
+        # Rows stay allocated after removal until the next compaction.
+        self._alive = RowBuffer(np.zeros(0, dtype=bool))
+        self._tombstones = 0
+        self._compaction_ratio = compaction_ratio
+        self._generation = 0
+        # Per-row boosts and compatibility keys, kept aligned with the rows.
+        self._attributes: Dict[str, RowBuffer] = {}
+        self._sd_version_codes: Dict[str, int] = {}
+        # Predicted style labels; code 0 means "no style recorded".
+        self._style_labels: List[str] = [""]
+        self._style_codes: Dict[str, int] = {}
         self.lora_ids: List[str] = []
         self.loras_dict: Dict[str, Any] = {}
+        self._row_by_id: Dict[str, int] = {}
+        # Keyword indexes over names, descriptions, tags and trained words.
+        self._lexical = BM25Index()
+        self._keywords = keyword_index if keyword_index is not None else KeywordIndex()
 
-        self._faiss_available = False
-        try:
-            import faiss  # type: ignore
-
-            self._faiss = faiss
-            self._faiss_available = True
-            self._logger.info("FAISS available for fast similarity search")
-        except ImportError:
-            self._faiss = None
-            self._logger.debug(
-                "FAISS not available, falling back to numpy similarity computation",
-            )
+        self.index_backend = index_backend
+        self._index_options = {
+            "nlist": index_nlist,
+            "nprobe": index_nprobe,
+            "hnsw_m": index_hnsw_m,
+        }
+        self._recall_k = recall_k
+        self._recall_sample_size = recall_sample_size
+        self._vector_index: Optional[VectorIndexProtocol] = None
+        self._index_recall: Optional[float] = None
+
+        self.index_precision = index_precision
+        self._rerank_factor = max(1, rerank_factor)
+        self._compact: Optional[QuantizedMatrix] = None
+        # Float32 originals kept only when memory-mapped from a snapshot.
+        self._rerank_source: Optional[Tuple[np.ndarray, ...]] = None
+
+        self._weight_profiles: Dict[Tuple[float, ...], Optional[RowBuffer]] = {
+            self._weight_key(profile): None
+            for profile in (weight_profiles or DEFAULT_WEIGHT_PROFILES)
+        }
 
     def build_similarity_index(self, loras: Sequence[Any]) -> None:
         """Build similarity index for fast recommendations."""
@@ -52,25 +169,368 @@ class LoRARecommendationEngine(RecommendationEngineProtocol):
         embeddings = self.feature_extractor.semantic_embedder.batch_encode_collection(
             loras,
         )
+        self.build_from_embeddings(loras, embeddings)
 
-        self.semantic_embeddings = embeddings["semantic"].astype("float32")
-        self.artistic_embeddings = embeddings["artistic"].astype("float32")
-        self.technical_embeddings = embeddings["technical"].astype("float32")
-
-        self.semantic_embeddings = self._normalize_embeddings(self.semantic_embeddings)
-        self.artistic_embeddings = self._normalize_embeddings(self.artistic_embeddings)
-        self.technical_embeddings = self._normalize_embeddings(
-            self.technical_embeddings
+        self._logger.info(
+            "Similarity index built successfully for %s LoRAs",
+            len(loras),
         )
 
+    @_synchronized
+    def build_from_embeddings(
+        self,
+        loras: Sequence[Any],
+        embeddings: Mapping[str, np.ndarray],
+        *,
+        normalized: bool = False,
+        rerank: bool = True,
+    ) -> None:
+        """Build the index from precomputed vectors without running the models.
+
+        Args:
+            loras: LoRAs matching the embedding rows, in order.
+            embeddings: ``semantic``/``artistic``/``technical`` matrices.
+            normalized: Rows are already unit length; the arrays are then used
+                as-is, so read-only memory-mapped snapshots are not copied.
+            rerank: Memory-mapped rows may serve as the float32 re-rank source
+                of a compact index. Pass ``False`` when they were themselves
+                dequantized, since re-ranking against them changes nothing.
+
+        """
+        matrices = []
+        for key in MODALITIES:
+            matrix = np.asanyarray(embeddings[key], dtype=np.float32)
+            if not normalized:
+                matrix = self._normalize_embeddings(matrix)
+            matrices.append(matrix)
+        self._store_matrices(matrices, rerank=rerank)
+
         self.lora_ids = [lora.id for lora in loras]
         self.loras_dict = {lora.id: lora for lora in loras}
+        self._row_by_id = {lora_id: row for row, lora_id in enumerate(self.lora_ids)}
+        self._sd_version_codes = {}
+        self._attributes = {
+            key: RowBuffer(values)
+            for key, values in self._row_attributes(loras).items()
+        }
+        self._attributes["style"] = RowBuffer(np.zeros(len(loras), dtype=np.int32))
+        documents = [(lora.id, self._lexical_text(lora)) for lora in loras]
+        self._lexical.rebuild(documents)
+        self._keywords.rebuild(documents)
+
+        self._rebuild_vector_index()
+        self._rebuild_weight_profiles()
+        self._generation += 1
+
+    def _store_matrices(
+        self, matrices: Sequence[np.ndarray], *, rerank: bool = True
+    ) -> None:
+        """Keep normalised modality matrices at the configured precision."""
+        self._alive = RowBuffer(np.ones(len(matrices[0]), dtype=bool))
+        self._tombstones = 0
+        if self.index_precision == "float32":
+            self._compact = None
+            self._rerank_source = None
+            self._buffers = tuple(RowBuffer(matrix) for matrix in matrices)
+            return
+
+        self._compact = QuantizedMatrix.quantize(matrices, self.index_precision)
+        self._rerank_source = (
+            tuple(matrices)
+            if rerank and all(isinstance(matrix, np.memmap) for matrix in matrices)
+            else None
+        )
+        self._buffers = None
+
+    @property
+    def semantic_embeddings(self) -> Optional[np.ndarray]:
+        """Float32 semantic rows (``None`` when empty or stored compactly)."""
+        return self._buffers[0].view if self._buffers is not None else None
+
+    @property
+    def artistic_embeddings(self) -> Optional[np.ndarray]:
+        """Float32 artistic rows (``None`` when empty or stored compactly)."""
+        return self._buffers[1].view if self._buffers is not None else None
+
+    @property
+    def technical_embeddings(self) -> Optional[np.ndarray]:
+        """Float32 technical rows (``None`` when empty or stored compactly)."""
+        return self._buffers[2].view if self._buffers is not None else None
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped whenever indexed vectors or LoRA objects change."""
+        return self._generation
+
+    def _has_vectors(self) -> bool:
+        return self._compact is not None or self._buffers is not None
+
+    def _modality_rows(
+        self,
+        rows: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return float32 modality vectors for ``rows`` (all rows if ``None``).
+
+        Compact indexes read memory-mapped originals when they cover the
+        requested rows and dequantize otherwise.
+        """
+        if self._compact is None:
+            matrices = (
+                self.semantic_embeddings,
+                self.artistic_embeddings,
+                self.technical_embeddings,
+            )
+            if rows is None:
+                return matrices
+            return tuple(matrix[rows] for matrix in matrices)
+
+        if self._reranks(rows):
+            source = self._rerank_source
+            if rows is None:
+                return source
+            return tuple(np.asarray(matrix[rows]) for matrix in source)
+        return tuple(self._compact.dequantize(rows))
+
+    def _reranks(self, rows: Optional[np.ndarray] = None) -> bool:
+        """Return whether float32 originals cover ``rows`` (all if ``None``).
+
+        Only memory-mapped snapshot vectors are kept in float32 next to a
+        compact index; re-scoring dequantized rows would reproduce the
+        compact scores, so without them nothing is re-ranked.
+        """
+        source = self._rerank_source
+        if self._compact is None or source is None:
+            return False
+        covered = len(source[0])
+        if rows is None:
+            return covered == self._compact.rows
+        return rows.size == 0 or int(rows.max()) < covered
+
+    def embedding_matrices(self) -> Dict[str, np.ndarray]:
+        """Return the normalised float32 modality matrices of the index."""
+        return dict(zip(MODALITIES, self._modality_rows(), strict=True))
+
+    def weight_profile_matrices(self) -> Dict[Tuple[float, ...], np.ndarray]:
+        """Return the materialised pre-weighted fused matrices by weight key."""
+        return {
+            key: buffer.view
+            for key, buffer in self._weight_profiles.items()
+            if buffer is not None
+        }
+
+    def model_versions(self) -> Dict[str, str]:
+        """Return the embedding model identifiers the index was built with."""
+        getter = getattr(
+            self.feature_extractor.semantic_embedder, "model_versions", None
+        )
+        return dict(getter()) if callable(getter) else {}
+
+    def index_stats(self) -> Dict[str, Any]:
+        """Return backend details and measured recall for the active index."""
+        buffers = [
+            buffer for buffer in self._weight_profiles.values() if buffer is not None
+        ]
+        if self._compact is not None:
+            memory_bytes = self._compact.nbytes
+        else:
+            buffers.extend(self._buffers or ())
+            memory_bytes = 0
+        memory_bytes += sum(
+            buffer.nbytes
+            for buffer in buffers
+            if not isinstance(buffer.view, np.memmap)
+        )
+        return {
+            "backend": self.index_backend,
+            "precision": self.index_precision,
+            "memory_bytes": memory_bytes,
+            "indexed_items": len(self._row_by_id),
+            "tombstoned_items": self._tombstones,
+            "recall_k": self._recall_k,
+            "recall_at_k": self._index_recall,
+        }
+
+    def _fused_vectors(
+        self,
+        semantic: np.ndarray,
+        artistic: np.ndarray,
+        technical: np.ndarray,
+    ) -> np.ndarray:
+        return np.hstack([semantic, artistic, technical]).astype(np.float32)
+
+    def _rebuild_vector_index(self) -> None:
+        """Build the approximate index and measure its recall@k.
+
+        The three normalised modalities are concatenated so that a single
+        inner product against a weight-scaled query yields the combined score.
+        Compact indexes hand their quantized matrix to the ANN backend, which
+        keeps it in the compact dtype rather than a float32 copy.
+        """
+        if self.index_backend == "exact" or not self.lora_ids:
+            self._vector_index = None
+            self._index_recall = 1.0 if self.lora_ids else None
+            return
 
+        vectors = (
+            self._compact
+            if self._compact is not None
+            else self._fused_vectors(*self._modality_rows())
+        )
+        index = create_vector_index(
+            self.index_backend,
+            logger=self._logger,
+            **self._index_options,
+        )
+        index.build(vectors)
+        self._vector_index = index
+        self._index_recall = measure_recall_at_k(
+            index,
+            vectors,
+            k=self._recall_k,
+            sample_size=self._recall_sample_size,
+        )
         self._logger.info(
-            "Similarity index built successfully for %s LoRAs",
-            len(loras),
+            "Built %s vector index over %s LoRAs (recall@%s=%.3f)",
+            index.name,
+            index.size,
+            self._recall_k,
+            self._index_recall,
         )
 
+    @staticmethod
+    def _weight_key(weights: Mapping[str, float]) -> Tuple[float, ...]:
+        return tuple(round(float(weights[key]), 6) for key in MODALITIES)
+
+    def register_weight_profile(self, weights: Mapping[str, float]) -> None:
+        """Keep a fused matrix for ``weights`` so queries use one GEMV."""
+        key = self._weight_key(weights)
+        if key in self._weight_profiles:
+            return
+        self._weight_profiles[key] = None
+        if self._uses_weight_profiles():
+            self._weight_profiles[key] = RowBuffer(self._weighted_fused_matrix(key))
+
+    def _uses_weight_profiles(self) -> bool:
+        return (
+            self._vector_index is None and self._compact is None and bool(self.lora_ids)
+        )
+
+    def _weighted_fused_matrix(
+        self,
+        key: Tuple[float, ...],
+        matrices: Optional[Sequence[np.ndarray]] = None,
+    ) -> np.ndarray:
+        if matrices is None:
+            matrices = (
+                self.semantic_embeddings,
+                self.artistic_embeddings,
+                self.technical_embeddings,
+            )
+        return np.hstack([
+            weight * matrix for weight, matrix in zip(key, matrices, strict=True)
+        ]).astype(np.float32)
+
+    def _rebuild_weight_profiles(self) -> None:
+        """Precompute pre-weighted fused matrices for exact scoring.
+
+        Approximate backends already search a fused space and compact
+        precisions exist to save memory, so the profile matrices are only
+        materialised for the exact float32 index.
+        """
+        build = self._uses_weight_profiles()
+        for key in self._weight_profiles:
+            self._weight_profiles[key] = (
+                RowBuffer(self._weighted_fused_matrix(key)) if build else None
+            )
+
+    def _exact_scores(
+        self,
+        queries: Sequence[np.ndarray],
+        weights: Mapping[str, float],
+        *,
+        rows: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Return combined scores for every indexed LoRA (or only ``rows``).
+
+        Queries may be single vectors (GEMV, shape ``(N,)``) or stacked
+        ``(T, d)`` matrices (GEMM, shape ``(N, T)``). Known weight profiles
+        use their fused matrix; compact indexes score blockwise in their
+        storage precision; custom weights fall back to three per-modality
+        products.
+        """
+        profile = self._weight_profiles.get(self._weight_key(weights))
+        if profile is not None:
+            fused = profile.view
+            if rows is not None:
+                fused = fused[rows]
+            return fused @ np.concatenate(queries, axis=-1).T
+
+        if self._compact is not None and rows is None:
+            return self._compact.scores([
+                weights[key] * query
+                for key, query in zip(MODALITIES, queries, strict=True)
+            ])
+
+        return sum(
+            weights[key] * (matrix @ query.T)
+            for key, matrix, query in zip(
+                MODALITIES, self._modality_rows(rows), queries, strict=True
+            )
+        )
+
+    def _top_rows(
+        self,
+        scores: np.ndarray,
+        queries: Sequence[np.ndarray],
+        weights: Mapping[str, float],
+        k: int,
+    ) -> np.ndarray:
+        """Return the ``k`` best rows of ``scores``.
+
+        Compact scores are approximate, so when float32 snapshot vectors are
+        mapped an oversampled pool is re-ranked against them before
+        truncating to ``k``.
+        """
+        if self._rerank_source is None:
+            return top_k_indices(scores, k)
+        pool = top_k_indices(scores, k * self._rerank_factor)
+        if not self._reranks(pool):
+            return pool[:k]
+        exact = self._exact_scores(queries, weights, rows=pool)
+        return pool[top_k_indices(exact, k)]
+
+    def contains(self, lora_id: str) -> bool:
+        """Return whether ``lora_id`` is present in the similarity index."""
+        return lora_id in self._row_by_id
+
+    def _query_vectors(
+        self,
+        target_lora: Any,
+        query_embeddings: Optional[Mapping[str, np.ndarray]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return normalised query vectors, avoiding inference when possible."""
+        row = self._row_by_id.get(getattr(target_lora, "id", None))
+        if row is not None:
+            semantic, artistic, technical = self._modality_rows(
+                np.asarray([row], dtype=np.int64),
+            )
+            return semantic[0], artistic[0], technical[0]
+
+        if query_embeddings is None:
+            query_embeddings = (
+                self.feature_extractor.semantic_embedder.create_multi_modal_embedding(
+                    target_lora,
+                )
+            )
+
+        semantic_query, artistic_query, technical_query = (
+            self._normalize_embeddings(
+                np.asarray(query_embeddings[key], dtype=np.float32).reshape(1, -1),
+            )[0]
+            for key in MODALITIES
+        )
+        return semantic_query, artistic_query, technical_query
+
     def _normalize_embeddings(self, embeddings: np.ndarray) -> np.ndarray:
         if embeddings.size == 0:
             return embeddings
@@ -86,118 +546,509 @@ class LoRARecommendationEngine(RecommendationEngineProtocol):
         norms[norms == 0] = 1
         return embeddings / norms
 
+    @_synchronized
     def get_recommendations(
         self,
         target_lora: Any,
         n_recommendations: int = 20,
         weights: Optional[Dict[str, float]] = None,
         diversify_results: bool = True,
+        *,
+        query_embeddings: Optional[Mapping[str, np.ndarray]] = None,
     ) -> List[Dict[str, Any]]:
-        """Generate recommendations using multi-modal similarity."""
-        if self.semantic_embeddings is None or self.artistic_embeddings is None:
+        """Generate recommendations using multi-modal similarity.
+
+        The target's vectors are read from the index when it is indexed,
+        otherwise from ``query_embeddings`` (typically the persisted
+        ``LoRAEmbedding`` row); the models only run for unknown LoRAs.
+        """
+        if not self._has_vectors():
             return []
 
         if weights is None:
-            weights = {
-                "semantic": 0.5,
-                "artistic": 0.35,
-                "technical": 0.15,
-            }
-
-        target_embeddings = (
-            self.feature_extractor.semantic_embedder.create_multi_modal_embedding(
-                target_lora,
+            weights = DEFAULT_WEIGHTS
+
+        semantic_query, artistic_query, technical_query = self._query_vectors(
+            target_lora,
+            query_embeddings,
+        )
+
+        n_candidates = n_recommendations * 2
+        queries = (semantic_query, artistic_query, technical_query)
+        if self._vector_index is not None:
+            _, indices = self._vector_index.search(
+                self._weighted_query(queries, weights).reshape(1, -1),
+                n_candidates + 1 + self._tombstones,
+            )
+            ranked = indices[0]
+        else:
+            ranked = self._top_rows(
+                self._exact_scores(queries, weights),
+                queries,
+                weights,
+                n_candidates + 1 + self._tombstones,
             )
+
+        return self._rank_candidates(
+            [target_lora],
+            self._candidate_rows(ranked, {target_lora.id}, n_candidates),
+            queries,
+            weights,
+            diversify_results,
+            n_recommendations,
         )
 
-        semantic_query = self._normalize_embeddings(
-            target_embeddings["semantic"].reshape(1, -1),
-        )[0]
-        artistic_query = self._normalize_embeddings(
-            target_embeddings["artistic"].reshape(1, -1),
-        )[0]
-        technical_query = self._normalize_embeddings(
-            target_embeddings["technical"].reshape(1, -1),
-        )[0]
+    @_synchronized
+    def get_batch_recommendations(
+        self,
+        target_loras: Sequence[Any],
+        n_recommendations: int = 20,
+        weights: Optional[Dict[str, float]] = None,
+        diversify_results: bool = True,
+        *,
+        query_embeddings: Optional[Mapping[str, Mapping[str, np.ndarray]]] = None,
+        include_merged: bool = False,
+    ) -> Dict[str, Any]:
+        """Generate recommendations for several targets in one pass.
+
+        All query vectors are stacked so candidate retrieval is a single
+        matrix-matrix product (or one batched ANN search). The merged ranking
+        scores candidates against the mean of the targets' queries, which
+        equals their average combined similarity, and excludes the targets.
+
+        Args:
+            target_loras: LoRAs to find neighbours for; duplicates are ignored.
+            n_recommendations: Results to return per target and when merged.
+            weights: Modality weights shared by every target.
+            diversify_results: Whether quality/popularity/recency boosts apply.
+            query_embeddings: Stored vectors keyed by LoRA id for targets that
+                are not indexed.
+            include_merged: Also return a single ranking across all targets.
+
+        Returns:
+            ``{"results": {lora_id: [...]}, "merged": [...] | None}`` where each
+            list has the same shape as :meth:`get_recommendations` output.
 
-        semantic_similarities = np.dot(self.semantic_embeddings, semantic_query)
-        artistic_similarities = np.dot(self.artistic_embeddings, artistic_query)
-        technical_similarities = np.dot(self.technical_embeddings, technical_query)
+        """
+        unique_targets = list({lora.id: lora for lora in target_loras}.values())
+        results: Dict[str, List[Dict[str, Any]]] = {
+            lora.id: [] for lora in unique_targets
+        }
+        if not self._has_vectors() or not unique_targets:
+            return {"results": results, "merged": [] if include_merged else None}
+
+        if weights is None:
+            weights = DEFAULT_WEIGHTS
+
+        stored = query_embeddings or {}
+        per_target = [
+            self._query_vectors(lora, stored.get(lora.id)) for lora in unique_targets
+        ]
+        queries = tuple(
+            np.vstack([vectors[position] for vectors in per_target])
+            for position in range(len(MODALITIES))
+        )
+        centroid = tuple(matrix.mean(axis=0) for matrix in queries)
 
+        n_candidates = n_recommendations * 2
+        target_ids = set(results)
+        merged_ranked: Optional[np.ndarray] = None
+        if self._vector_index is not None:
+            search_queries = self._weighted_query(queries, weights)
+            if include_merged:
+                search_queries = np.vstack([
+                    search_queries,
+                    self._weighted_query(centroid, weights),
+                ])
+            _, indices = self._vector_index.search(
+                search_queries,
+                n_candidates + len(target_ids) + self._tombstones,
+            )
+            ranked_per_target = list(indices[: len(unique_targets)])
+            if include_merged:
+                merged_ranked = indices[-1]
+        else:
+            # (N, T) score matrix from one GEMM over the stacked queries.
+            scores = self._exact_scores(queries, weights)
+            ranked_per_target = [
+                self._top_rows(
+                    scores[:, column],
+                    tuple(matrix[column] for matrix in queries),
+                    weights,
+                    n_candidates + 1 + self._tombstones,
+                )
+                for column in range(len(unique_targets))
+            ]
+            if include_merged:
+                merged_ranked = self._top_rows(
+                    scores.mean(axis=1),
+                    centroid,
+                    weights,
+                    n_candidates + len(target_ids) + self._tombstones,
+                )
+
+        for column, lora in enumerate(unique_targets):
+            results[lora.id] = self._rank_candidates(
+                [lora],
+                self._candidate_rows(
+                    ranked_per_target[column], {lora.id}, n_candidates
+                ),
+                tuple(matrix[column] for matrix in queries),
+                weights,
+                diversify_results,
+                n_recommendations,
+            )
+
+        merged: Optional[List[Dict[str, Any]]] = None
+        if merged_ranked is not None:
+            merged = self._rank_candidates(
+                unique_targets,
+                self._candidate_rows(merged_ranked, target_ids, n_candidates),
+                centroid,
+                weights,
+                diversify_results,
+                n_recommendations,
+                target_queries=queries,
+            )
+
+        return {"results": results, "merged": merged}
+
+    @_synchronized
+    def get_prompt_recommendations(
+        self,
+        prompt_embeddings: Mapping[str, np.ndarray],
+        n_recommendations: int = 10,
+        weights: Optional[Mapping[str, float]] = None,
+        *,
+        exclude_ids: Sequence[str] = (),
+        style_preference: Optional[str] = None,
+        style_boost: float = 0.2,
+        query_text: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Score a prompt against every indexed LoRA in one vectorized pass.
+
+        The score is the weighted sum of per-modality cosine similarities
+        plus ``style_boost`` for rows whose predicted style contains
+        ``style_preference``. Exclusions and removed rows are masked out
+        before the top-k selection.
+
+        With ``query_text`` the dense ranking is fused with a BM25 ranking
+        of the same text by reciprocal rank fusion, so exact name or tag
+        hits surface even when their embeddings score poorly. The blend is
+        rank-only: each candidate's ``fusion_score`` is
+        ``1 / (RRF_K + 1 + dense_rank) + 1 / (RRF_K + 1 + bm25_rank)``, the
+        second term only for keyword hits, and results are returned in
+        descending ``fusion_score`` order. ``final_score`` stays the dense
+        score and is not re-sorted on, so a keyword hit may precede rows
+        with a higher ``final_score``. Without keyword hits ``fusion_score``
+        is ``0.0`` and results follow ``final_score``.
+
+        Args:
+            prompt_embeddings: ``semantic``/``artistic``/``technical`` vectors
+                of the prompt.
+            n_recommendations: Number of results to return.
+            weights: Modality weights; missing modalities weigh ``1.0``.
+            exclude_ids: LoRAs that must not be returned (e.g. already active).
+            style_preference: Case-insensitive predicted style to favour.
+            style_boost: Score added on a style match.
+            query_text: Raw prompt text for keyword retrieval.
+
+        """
+        if not self._has_vectors() or not self._row_by_id or n_recommendations <= 0:
+            return []
+
+        weights = {key: float((weights or {}).get(key, 1.0)) for key in MODALITIES}
+        queries = tuple(
+            self._normalize_embeddings(
+                np.asarray(prompt_embeddings[key], dtype=np.float32).reshape(1, -1),
+            )[0]
+            for key in MODALITIES
+        )
+
+        boosts = self._style_boosts(style_preference, style_boost)
+        scores = np.asarray(self._exact_scores(queries, weights), dtype=np.float64)
+        if boosts is not None:
+            scores += boosts
+        excluded = [self._row_by_id[i] for i in exclude_ids if i in self._row_by_id]
+        if excluded:
+            scores[excluded] = -np.inf
+        if self._tombstones:
+            scores[~self._alive.view] = -np.inf
+
+        # Compact scores are approximate: oversample, then re-rank against
+        # the mapped float32 vectors when there are any.
+        oversample = self._rerank_factor if self._reranks() else 1
+        rows = top_k_indices(scores, n_recommendations * oversample)
+        rows = rows[np.isfinite(scores[rows])]
+
+        lexical: Dict[int, Tuple[int, float]] = {}
+        if query_text:
+            skip = set(exclude_ids)
+            hits = self._lexical.search(
+                query_text,
+                limit=n_recommendations * oversample + len(skip),
+            )
+            for lora_id, bm25 in hits:
+                row = self._row_by_id.get(lora_id)
+                if row is not None and lora_id not in skip:
+                    lexical[row] = (len(lexical), bm25)
+            extra = np.setdiff1d(
+                np.fromiter(lexical, dtype=np.int64, count=len(lexical)),
+                rows,
+            )
+            rows = np.concatenate([rows, extra])
+
+        similarities = [
+            matrix @ query
+            for matrix, query in zip(self._modality_rows(rows), queries, strict=True)
+        ]
+        row_boosts = boosts[rows] if boosts is not None else np.zeros(len(rows))
+        final = row_boosts + sum(
+            weights[key] * similarity.astype(np.float64)
+            for key, similarity in zip(MODALITIES, similarities, strict=True)
+        )
+
+        order = np.argsort(-final, kind="stable")
+        fused = np.zeros(len(rows))
+        if lexical:
+            fused[order] = 1.0 / (RRF_K + 1 + np.arange(len(rows)))
+            for position, row in enumerate(rows.tolist()):
+                if row in lexical:
+                    fused[position] += 1.0 / (RRF_K + 1 + lexical[row][0])
+            order = np.argsort(-fused, kind="stable")
+
+        styles = self._attributes["style"].view
+        recommendations: List[Dict[str, Any]] = []
+        for position in order[:n_recommendations]:
+            row = rows[position]
+            recommendations.append(
+                {
+                    "lora_id": self.lora_ids[row],
+                    "final_score": float(final[position]),
+                    "semantic_similarity": float(similarities[0][position]),
+                    "artistic_similarity": float(similarities[1][position]),
+                    "technical_similarity": float(similarities[2][position]),
+                    "style_boost": float(row_boosts[position]),
+                    "predicted_style": self._style_labels[styles[row]] or None,
+                    "lexical_score": lexical.get(int(row), (0, 0.0))[1],
+                    "fusion_score": float(fused[position]),
+                },
+            )
+        return recommendations
+
+    @_synchronized
+    def lexical_search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Return ``(lora_id, bm25_score)`` pairs for ``query``, best first."""
+        return self._lexical.search(query, limit)
+
+    def _style_boosts(
+        self,
+        style_preference: Optional[str],
+        style_boost: float,
+    ) -> Optional[np.ndarray]:
+        """Return per-row style boosts, matching each label only once."""
+        if not style_preference or not style_boost:
+            return None
+        preference = style_preference.lower()
+        matches = np.asarray(
+            [
+                bool(label) and preference in label.lower()
+                for label in self._style_labels
+            ],
+        )
+        if not matches.any():
+            return None
+        return np.where(matches, style_boost, 0.0)[self._attributes["style"].view]
+
+    @staticmethod
+    def _weighted_query(
+        queries: Sequence[np.ndarray],
+        weights: Mapping[str, float],
+    ) -> np.ndarray:
+        """Return the weight-scaled fused query (row-wise for 2D inputs)."""
+        return np.concatenate(
+            [
+                weights[key] * query
+                for key, query in zip(MODALITIES, queries, strict=True)
+            ],
+            axis=-1,
+        ).astype(np.float32)
+
+    def _candidate_rows(
+        self,
+        ranked: Sequence[int],
+        excluded_ids: set,
+        limit: int,
+    ) -> List[int]:
+        """Drop padding slots, tombstones and excluded LoRAs from ``ranked``."""
+        alive = self._alive.view if self._tombstones else None
+        return [
+            int(idx)
+            for idx in ranked
+            if idx >= 0
+            and (alive is None or alive[idx])
+            and self.lora_ids[idx] not in excluded_ids
+        ][:limit]
+
+    def _rank_candidates(
+        self,
+        target_loras: Sequence[Any],
+        candidate_indices: Sequence[int],
+        queries: Sequence[np.ndarray],
+        weights: Mapping[str, float],
+        diversify_results: bool,
+        n_recommendations: int,
+        *,
+        target_queries: Optional[Sequence[np.ndarray]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Score, filter and explain retrieved candidates.
+
+        Candidates must be compatible with every target. With several targets
+        the explanation is written against the closest one, picked from
+        ``target_queries`` (stacked per-target query vectors).
+        """
+        semantic_query, artistic_query, technical_query = queries
+
+        # Per-modality scores are only needed for the retrieved candidates.
+        rows = np.asarray(candidate_indices, dtype=np.int64)
+        semantic_rows, artistic_rows, technical_rows = self._modality_rows(rows)
+        semantic_similarities = semantic_rows @ semantic_query
+        artistic_similarities = artistic_rows @ artistic_query
+        technical_similarities = technical_rows @ technical_query
         combined_similarities = (
             weights["semantic"] * semantic_similarities
             + weights["artistic"] * artistic_similarities
             + weights["technical"] * technical_similarities
         )
 
-        candidate_indices: List[int] = []
-        for idx in np.argsort(combined_similarities)[::-1]:
-            if self.lora_ids[idx] != target_lora.id:
-                candidate_indices.append(idx)
-                if len(candidate_indices) >= n_recommendations * 2:
-                    break
+        closest_target = np.zeros(len(candidate_indices), dtype=np.int64)
+        if target_queries is not None and len(target_loras) > 1 and rows.size:
+            closest_target = np.argmax(
+                self._exact_scores(target_queries, weights, rows=rows),
+                axis=1,
+            )
+
+        # Compatibility and boosts come from precomputed per-row arrays; only
+        # the returned top-k get Python-level explanation work.
+        compatible = self._compatible_mask(target_loras, rows)
+        selected = np.flatnonzero(compatible)[:n_recommendations]
+        selected_rows = rows[selected]
+        combined = combined_similarities[selected].astype(np.float64)
+        if diversify_results:
+            quality = self._attributes["quality"].view[selected_rows]
+            popularity = self._attributes["popularity"].view[selected_rows]
+            recency = self._recency_boosts(selected_rows)
+            final = combined * (1 + quality + popularity + recency)
+        else:
+            quality = popularity = recency = np.zeros(len(selected))
+            final = combined
 
         final_recommendations: List[Dict[str, Any]] = []
+        for order in np.argsort(-final, kind="stable"):
+            position = selected[order]
+            lora_id = self.lora_ids[rows[position]]
+            final_recommendations.append(
+                {
+                    "lora_id": lora_id,
+                    "similarity_score": float(combined[order]),
+                    "final_score": float(final[order]),
+                    "explanation": self._generate_explanation(
+                        target_loras[int(closest_target[position])],
+                        self.loras_dict[lora_id],
+                    ),
+                    "semantic_similarity": float(semantic_similarities[position]),
+                    "artistic_similarity": float(artistic_similarities[position]),
+                    "technical_similarity": float(technical_similarities[position]),
+                    "quality_boost": float(quality[order]),
+                    "popularity_boost": float(popularity[order]),
+                    "recency_boost": float(recency[order]),
+                },
+            )
+        return final_recommendations
 
-        for idx in candidate_indices:
-            candidate_lora = self.loras_dict[self.lora_ids[idx]]
+    def _index_text(self, lora: Any) -> None:
+        """Add or replace ``lora`` in the keyword indexes."""
+        text = self._lexical_text(lora)
+        self._lexical.add(lora.id, text)
+        self._keywords.add(lora.id, text)
 
-            if self._is_compatible(target_lora, candidate_lora):
-                explanation = self._generate_explanation(target_lora, candidate_lora)
+    @staticmethod
+    def _lexical_text(lora: Any) -> str:
+        """Return the text indexed for keyword retrieval of ``lora``."""
+        return document_text(lora)
 
-                quality_boost = (
-                    self._calculate_quality_boost(candidate_lora)
-                    if diversify_results
-                    else 0.0
-                )
-                popularity_boost = (
-                    self._calculate_popularity_boost(candidate_lora)
-                    if diversify_results
-                    else 0.0
-                )
-                recency_boost = (
-                    self._calculate_recency_boost(candidate_lora)
-                    if diversify_results
-                    else 0.0
-                )
+    def _row_attributes(self, loras: Sequence[Any]) -> Dict[str, np.ndarray]:
+        """Precompute boosts and compatibility keys for ``loras``."""
+        return {
+            "quality": np.asarray(
+                [self._calculate_quality_boost(lora) for lora in loras],
+                dtype=np.float64,
+            ),
+            "popularity": np.asarray(
+                [self._calculate_popularity_boost(lora) for lora in loras],
+                dtype=np.float64,
+            ),
+            "published_at": np.asarray(
+                [self._published_timestamp(lora) for lora in loras],
+                dtype=np.float64,
+            ),
+            "sd_version": np.asarray(
+                [self._sd_version_code(lora, register=True) for lora in loras],
+                dtype=np.int32,
+            ),
+        }
 
-                combined_score = combined_similarities[idx]
-                if diversify_results:
-                    final_score = combined_score * (
-                        1 + quality_boost + popularity_boost + recency_boost
-                    )
-                else:
-                    final_score = combined_score
-
-                final_recommendations.append(
-                    {
-                        "lora_id": self.lora_ids[idx],
-                        "similarity_score": float(combined_score),
-                        "final_score": float(final_score),
-                        "explanation": explanation,
-                        "semantic_similarity": float(semantic_similarities[idx]),
-                        "artistic_similarity": float(artistic_similarities[idx]),
-                        "technical_similarity": float(technical_similarities[idx]),
-                        "quality_boost": float(quality_boost),
-                        "popularity_boost": float(popularity_boost),
-                        "recency_boost": float(recency_boost),
-                    },
-                )
+    def _assign_attributes(self, rows: np.ndarray, loras: Sequence[Any]) -> None:
+        for key, values in self._row_attributes(loras).items():
+            self._attributes[key].assign(rows, values)
 
-                if len(final_recommendations) >= n_recommendations:
-                    break
+    def _sd_version_code(self, lora: Any, *, register: bool = False) -> int:
+        """Return the integer key of ``lora.sd_version``.
 
-        final_recommendations.sort(key=lambda x: x["final_score"], reverse=True)
-        return final_recommendations[:n_recommendations]
+        ``0`` means "unknown" and is compatible with everything; versions not
+        seen at build time map to ``-1`` so they only match unknown rows.
+        """
+        version = getattr(lora, "sd_version", None)
+        if not version:
+            return 0
+        code = self._sd_version_codes.get(version)
+        if code is None:
+            if not register:
+                return -1
+            code = len(self._sd_version_codes) + 1
+            self._sd_version_codes[version] = code
+        return code
 
-    def _is_compatible(self, target_lora: Any, candidate_lora: Any) -> bool:
-        if getattr(target_lora, "sd_version", None) and getattr(
-            candidate_lora,
-            "sd_version",
-            None,
-        ):
-            return target_lora.sd_version == candidate_lora.sd_version
-        return True
+    def _compatible_mask(
+        self,
+        target_loras: Sequence[Any],
+        rows: np.ndarray,
+    ) -> np.ndarray:
+        """Return which ``rows`` share an SD version with every target."""
+        candidate_codes = self._attributes["sd_version"].view[rows]
+        mask = np.ones(len(rows), dtype=bool)
+        for target in target_loras:
+            code = self._sd_version_code(target)
+            if code:
+                mask &= (candidate_codes == 0) | (candidate_codes == code)
+        return mask
+
+    def _recency_boosts(self, rows: np.ndarray) -> np.ndarray:
+        age = time.time() - self._attributes["published_at"].view[rows]
+        # NaN (unknown or unparsable dates) compares False.
+        return np.where(age < RECENCY_WINDOW_SECONDS, 0.05, 0.0)
+
+    @staticmethod
+    def _published_timestamp(lora: Any) -> float:
+        published_at = getattr(lora, "published_at", None)
+        if not published_at:
+            return float("nan")
+        try:
+            if getattr(published_at, "tzinfo", None) is None:
+                published_at = published_at.replace(tzinfo=timezone.utc)
+            return float(published_at.timestamp())
+        except Exception:
+            return float("nan")
 
     def _generate_explanation(self, target_lora: Any, candidate_lora: Any) -> str:
         explanations: List[str] = []
@@ -239,29 +1090,7 @@ class LoRARecommendationEngine(RecommendationEngineProtocol):
     def _find_common_keywords(self, text1: str, text2: str) -> List[str]:
         if not text1 or not text2:
             return []
-
-        words1 = set(re.findall(r"\b\w+\b", text1.lower()))
-        words2 = set(re.findall(r"\b\w+\b", text2.lower()))
-
-        stop_words = {
-            "the",
-            "a",
-            "an",
-            "and",
-            "or",
-            "but",
-            "in",
-            "on",
-            "at",
-            "to",
-            "for",
-            "of",
-            "with",
-            "by",
-        }
-        common_words = (words1 & words2) - stop_words
-
-        return [word for word in common_words if len(word) > 3][:5]
+        return self._keywords.common_keywords(text1, text2, limit=5)
 
     def _calculate_quality_boost(self, lora: Any) -> float:
         stats = getattr(lora, "stats", None)
@@ -287,66 +1116,291 @@ class LoRARecommendationEngine(RecommendationEngineProtocol):
             return 0.05
         return 0.0
 
-    def _calculate_recency_boost(self, lora: Any) -> float:
-        published_at = getattr(lora, "published_at", None)
-        if not published_at:
-            return 0.0
-        try:
-            from datetime import datetime, timezone
-
-            now = datetime.now(timezone.utc)
-            if getattr(published_at, "tzinfo", None) is None:
-                published_at = published_at.replace(tzinfo=timezone.utc)
-            days_old = (now - published_at).days
-            if days_old < 30:
-                return 0.05
-            return 0.0
-        except Exception:
-            return 0.0
-
     def update_index_incremental(self, new_loras: Sequence[Any]) -> None:
-        """Append ``new_loras`` to the in-memory similarity index."""
+        """Add ``new_loras`` to the in-memory similarity index."""
         if not new_loras:
             return
-
         self._logger.info("Adding %s new LoRAs to index", len(new_loras))
+        self.upsert(new_loras)
+
+    def upsert(
+        self,
+        loras: Sequence[Any],
+        embeddings: Optional[Mapping[str, np.ndarray]] = None,
+    ) -> None:
+        """Insert new LoRAs and replace the vectors of already indexed ones.
 
-        new_embeddings = (
-            self.feature_extractor.semantic_embedder.batch_encode_collection(
-                new_loras,
+        Rows live in capacity-doubling buffers, so inserts are amortised
+        O(1) per LoRA. The exact backend overwrites existing rows in place;
+        ANN backends cannot, so the old row is tombstoned and a new one
+        appended.
+
+        Args:
+            loras: LoRAs to index; later duplicates win.
+            embeddings: Optional raw ``semantic``/``artistic``/``technical``
+                rows matching ``loras``. Encoded with the embedder if omitted.
+
+        """
+        loras = list({lora.id: lora for lora in loras}.values())
+        if not loras:
+            return
+        if embeddings is None:
+            embeddings = (
+                self.feature_extractor.semantic_embedder.batch_encode_collection(
+                    loras,
+                )
             )
+        matrices = tuple(
+            self._normalize_embeddings(np.asarray(embeddings[key], dtype=np.float32))
+            for key in MODALITIES
         )
 
-        new_semantic = self._normalize_embeddings(
-            new_embeddings["semantic"].astype("float32"),
-        )
-        new_artistic = self._normalize_embeddings(
-            new_embeddings["artistic"].astype("float32"),
-        )
-        new_technical = self._normalize_embeddings(
-            new_embeddings["technical"].astype("float32"),
-        )
+        with self._lock:
+            if not self._has_vectors():
+                self.build_from_embeddings(
+                    loras,
+                    dict(zip(MODALITIES, matrices, strict=True)),
+                    normalized=True,
+                )
+                return
 
-        if self.semantic_embeddings is not None:
-            self.semantic_embeddings = np.vstack([
-                self.semantic_embeddings,
-                new_semantic,
-            ])
-            self.artistic_embeddings = np.vstack([
-                self.artistic_embeddings,
-                new_artistic,
-            ])
-            self.technical_embeddings = np.vstack([
-                self.technical_embeddings,
-                new_technical,
-            ])
+            existing = [
+                position
+                for position, lora in enumerate(loras)
+                if lora.id in self._row_by_id
+            ]
+            fresh = [
+                position
+                for position, lora in enumerate(loras)
+                if lora.id not in self._row_by_id
+            ]
+            if existing and self._vector_index is None:
+                picked = np.asarray(existing, dtype=np.int64)
+                self._assign_rows(
+                    np.asarray(
+                        [self._row_by_id[loras[position].id] for position in existing],
+                        dtype=np.int64,
+                    ),
+                    tuple(matrix[picked] for matrix in matrices),
+                )
+                for position in existing:
+                    lora = loras[position]
+                    self.loras_dict[lora.id] = lora
+                    self._index_text(lora)
+                self._assign_attributes(
+                    np.asarray(
+                        [self._row_by_id[loras[position].id] for position in existing],
+                        dtype=np.int64,
+                    ),
+                    [loras[position] for position in existing],
+                )
+            kept_styles: Dict[str, int] = {}
+            if existing and self._vector_index is not None:
+                # ANN rows cannot be overwritten; the replacement row keeps
+                # the style code of the row it tombstones.
+                replaced = [loras[position].id for position in existing]
+                codes = self._attributes["style"].view[
+                    np.asarray([self._row_by_id[lora_id] for lora_id in replaced])
+                ]
+                kept_styles = dict(zip(replaced, codes.tolist(), strict=True))
+                self._tombstone(replaced)
+                fresh = list(range(len(loras)))
+
+            if fresh:
+                picked = np.asarray(fresh, dtype=np.int64)
+                self._append_rows(
+                    [loras[position] for position in fresh],
+                    tuple(matrix[picked] for matrix in matrices),
+                )
+            if kept_styles:
+                self._attributes["style"].assign(
+                    np.asarray(
+                        [self._row_by_id[lora_id] for lora_id in kept_styles],
+                        dtype=np.int64,
+                    ),
+                    np.asarray(list(kept_styles.values()), dtype=np.int32),
+                )
+            self._generation += 1
+            self._maybe_compact()
+
+    @_synchronized
+    def refresh_metadata(self, loras: Sequence[Any]) -> int:
+        """Swap in updated LoRA objects whose vectors did not change.
+
+        Only already indexed LoRAs are touched; returns how many were.
+        """
+        indexed = [lora for lora in loras if lora.id in self._row_by_id]
+        for lora in indexed:
+            self.loras_dict[lora.id] = lora
+            self._index_text(lora)
+        if indexed:
+            self._assign_attributes(
+                np.asarray([self._row_by_id[lora.id] for lora in indexed]),
+                indexed,
+            )
+            self._generation += 1
+        return len(indexed)
+
+    @_synchronized
+    def set_predicted_styles(self, styles: Mapping[str, Optional[str]]) -> int:
+        """Record the predicted style of indexed LoRAs for prompt scoring.
+
+        Styles are stored as integer codes per row, so a style preference
+        becomes a single vectorized boost. Returns how many rows were set.
+        """
+        rows: List[int] = []
+        codes: List[int] = []
+        for lora_id, style in styles.items():
+            row = self._row_by_id.get(lora_id)
+            if row is None:
+                continue
+            code = 0
+            if style:
+                code = self._style_codes.get(style, 0)
+                if not code:
+                    code = len(self._style_labels)
+                    self._style_labels.append(style)
+                    self._style_codes[style] = code
+            rows.append(row)
+            codes.append(code)
+        if rows:
+            self._attributes["style"].assign(
+                np.asarray(rows, dtype=np.int64),
+                np.asarray(codes, dtype=np.int32),
+            )
+        return len(rows)
+
+    @_synchronized
+    def remove(self, lora_ids: Sequence[str]) -> int:
+        """Tombstone ``lora_ids`` so they are no longer recommended.
+
+        The rows are reclaimed by :meth:`compact`, which runs automatically
+        once tombstones exceed the compaction ratio. Returns how many LoRAs
+        were removed.
+        """
+        removed = self._tombstone(lora_ids)
+        if removed:
+            self._generation += 1
+        self._maybe_compact()
+        return removed
+
+    @_synchronized
+    def compact(self) -> int:
+        """Drop tombstoned rows and return how many were reclaimed."""
+        if not self._tombstones:
+            return 0
+
+        keep = np.flatnonzero(self._alive.view)
+        if self._compact is not None:
+            self._compact.take(keep)
+            self._rerank_source = None
+        else:
+            for buffer in self._buffers:
+                buffer.take(keep)
+        for buffer in self._weight_profiles.values():
+            if buffer is not None:
+                buffer.take(keep)
+        for buffer in self._attributes.values():
+            buffer.take(keep)
+
+        self.lora_ids = [self.lora_ids[row] for row in keep]
+        self._row_by_id = {lora_id: row for row, lora_id in enumerate(self.lora_ids)}
+        self._alive = RowBuffer(np.ones(len(keep), dtype=bool))
+        reclaimed = self._tombstones
+        self._tombstones = 0
+        # ANN row ids shift after compaction; remap them in place if possible.
+        take = getattr(self._vector_index, "take", None)
+        if callable(take):
+            take(keep)
+            self._maybe_retrain()
         else:
-            self.semantic_embeddings = new_semantic
-            self.artistic_embeddings = new_artistic
-            self.technical_embeddings = new_technical
+            self._rebuild_vector_index()
+        self._logger.info("Compacted similarity index, reclaimed %s rows", reclaimed)
+        return reclaimed
 
-        for lora in new_loras:
+    def _tombstone(self, lora_ids: Sequence[str]) -> int:
+        rows = []
+        for lora_id in lora_ids:
+            row = self._row_by_id.pop(lora_id, None)
+            if row is None:
+                continue
+            self.loras_dict.pop(lora_id, None)
+            self._lexical.remove(lora_id)
+            self._keywords.remove(lora_id)
+            rows.append(row)
+        if rows:
+            self._alive.assign(np.asarray(rows, dtype=np.int64), False)
+            self._tombstones += len(rows)
+        return len(rows)
+
+    def _maybe_retrain(self) -> None:
+        """Retrain the ANN index once its drift threshold is crossed."""
+        if getattr(self._vector_index, "needs_retrain", False):
+            self._logger.info("Vector index drifted; retraining")
+            self._rebuild_vector_index()
+
+    def _maybe_compact(self) -> None:
+        if self._tombstones and (
+            self._tombstones >= self._compaction_ratio * len(self.lora_ids)
+        ):
+            self.compact()
+
+    def _assign_rows(
+        self,
+        rows: np.ndarray,
+        matrices: Sequence[np.ndarray],
+    ) -> None:
+        """Overwrite indexed rows (exact backend only) with new vectors."""
+        if self._compact is not None:
+            self._compact.assign(
+                rows,
+                QuantizedMatrix.quantize(matrices, self.index_precision),
+            )
+            # The memory-mapped originals no longer match these rows.
+            self._rerank_source = None
+        else:
+            for buffer, matrix in zip(self._buffers, matrices, strict=True):
+                buffer.assign(rows, matrix)
+        for key, buffer in self._weight_profiles.items():
+            if buffer is not None:
+                buffer.assign(rows, self._weighted_fused_matrix(key, matrices))
+
+    def _append_rows(
+        self,
+        loras: Sequence[Any],
+        matrices: Sequence[np.ndarray],
+    ) -> None:
+        """Append vectors for LoRAs that are not indexed yet."""
+        quantized = None
+        if self._compact is not None:
+            quantized = QuantizedMatrix.quantize(matrices, self.index_precision)
+            self._compact.append(quantized)
+        else:
+            for buffer, matrix in zip(self._buffers, matrices, strict=True):
+                buffer.append(matrix)
+        self._alive.append(np.ones(len(loras), dtype=bool))
+        for key, values in self._row_attributes(loras).items():
+            self._attributes[key].append(values)
+        self._attributes["style"].append(np.zeros(len(loras), dtype=np.int32))
+
+        for lora in loras:
+            self._row_by_id[lora.id] = len(self.lora_ids)
             self.lora_ids.append(lora.id)
             self.loras_dict[lora.id] = lora
+            self._index_text(lora)
 
-        self._logger.info("Added %s new LoRAs to index", len(new_loras))
+        if self._vector_index is not None:
+            self._vector_index.add(
+                quantized if quantized is not None else self._fused_vectors(*matrices)
+            )
+            self._maybe_retrain()
+        elif self.index_backend != "exact":
+            self._rebuild_vector_index()
+        elif self._uses_weight_profiles():
+            for key, buffer in self._weight_profiles.items():
+                if buffer is None:
+                    self._weight_profiles[key] = RowBuffer(
+                        self._weighted_fused_matrix(key),
+                    )
+                else:
+                    buffer.append(self._weighted_fused_matrix(key, matrices))
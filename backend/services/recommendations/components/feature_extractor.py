@@ -2,14 +2,32 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
 
 from .embedder import LoRASemanticEmbedder
 from .interfaces import FeatureExtractorProtocol, SemanticEmbedderProtocol
-from .scoring import ScoreCalculator, ScoreCalculatorProtocol
+from .scoring import ScoreCalculator, ScoreCalculatorProtocol, score_rows
+from .sentiment_style import SentimentStyleAnalyzerProtocol
+from .text_features import KeywordExtractorProtocol
 from .trigger_embedder import TriggerEmbedder
-from .trigger_processing import TriggerResolver
+from .trigger_processing import TriggerResolution, TriggerResolver
+
+
+def embedding_content_hash(
+    payload: Mapping[str, str], model_versions: Mapping[str, str]
+) -> str:
+    """Return a stable SHA-256 of embedding inputs and the models used."""
+    document = json.dumps(
+        {"payload": dict(payload), "models": dict(model_versions)},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()
 
 
 class GPULoRAFeatureExtractor(FeatureExtractorProtocol):
@@ -23,9 +41,16 @@ class GPULoRAFeatureExtractor(FeatureExtractorProtocol):
         score_calculator: ScoreCalculatorProtocol | None = None,
         trigger_resolver: TriggerResolver | None = None,
         trigger_embedder: TriggerEmbedder | None = None,
+        sentiment_style_analyzer: SentimentStyleAnalyzerProtocol | None = None,
+        keyword_extractor: KeywordExtractorProtocol | None = None,
         logger: Optional[logging.Logger] = None,
     ) -> None:
-        """Initialize feature extractor."""
+        """Initialize feature extractor.
+
+        Sentiment and style features are only extracted when a
+        ``sentiment_style_analyzer`` is supplied, and keywords only with a
+        ``keyword_extractor`` such as a corpus :class:`KeywordIndex`.
+        """
         self.device = device
         self._logger = logger or logging.getLogger(__name__)
         self.semantic_embedder = semantic_embedder or LoRASemanticEmbedder(
@@ -39,6 +64,8 @@ class GPULoRAFeatureExtractor(FeatureExtractorProtocol):
         self.trigger_embedder = trigger_embedder or TriggerEmbedder(
             device="cpu", logger=self._logger
         )
+        self.sentiment_style_analyzer = sentiment_style_analyzer
+        self.keyword_extractor = keyword_extractor
 
     def extract_advanced_features(self, lora: Any) -> Dict[str, Any]:
         """Extract comprehensive features using available models."""
@@ -54,25 +81,188 @@ class GPULoRAFeatureExtractor(FeatureExtractorProtocol):
         )
 
         features.update(self.score_calculator.compute(lora))
+        features["content_hash"] = self.content_hash(lora)
+        features["model_versions"] = self.model_versions()
+
+        analyzer = self.sentiment_style_analyzer
+        if analyzer is not None:
+            text = self._analysis_text(lora)
+            features.update(analyzer.analyze_sentiment(text))
+            features.update(analyzer.classify_style(text))
+        if self.keyword_extractor is not None:
+            features.update(self.keyword_extractor.extract(self._keyword_text(lora)))
+
+        trigger_resolution = self._resolve_triggers(lora)
+        if trigger_resolution.canonical:
+            trigger_vectors = self.trigger_embedder.encode(trigger_resolution.canonical)
+            features.update(self._trigger_features(trigger_resolution, trigger_vectors))
+
+        return features
+
+    def extract_advanced_features_batch(
+        self, loras: Sequence[Any]
+    ) -> List[Dict[str, Any]]:
+        """Extract features for ``loras`` with one encode call per model.
+
+        The three modality payloads of every LoRA are encoded together, the
+        canonical triggers of the whole batch go through the trigger
+        embedder in a single call, sentiment and style analysis receive the
+        whole batch as lists, and scores are computed column-wise. Returns
+        one feature dict per LoRA, in order, shaped like
+        :meth:`extract_advanced_features`.
+        """
+        if not loras:
+            return []
+
+        embeddings = self.semantic_embedder.batch_encode_collection(loras)
+        resolutions = [self._resolve_triggers(lora) for lora in loras]
+        phrases = [
+            phrase for resolution in resolutions for phrase in resolution.canonical
+        ]
+        trigger_vectors = self.trigger_embedder.encode(phrases) if phrases else []
+        model_versions = self.model_versions()
+        analyses = self._analyze_batch(loras)
+        scores = self._score_batch(loras)
+
+        batch: List[Dict[str, Any]] = []
+        offset = 0
+        for position, (lora, resolution) in enumerate(
+            zip(loras, resolutions, strict=True)
+        ):
+            features: Dict[str, Any] = {
+                "semantic_embedding": embeddings["semantic"][position],
+                "artistic_embedding": embeddings["artistic"][position],
+                "technical_embedding": embeddings["technical"][position],
+            }
+            features.update(scores[position])
+            features["content_hash"] = self.content_hash(lora)
+            features["model_versions"] = dict(model_versions)
+            features.update(analyses[position])
+            if self.keyword_extractor is not None:
+                features.update(
+                    self.keyword_extractor.extract(self._keyword_text(lora))
+                )
+            if resolution.canonical:
+                count = len(resolution.canonical)
+                features.update(
+                    self._trigger_features(
+                        resolution, trigger_vectors[offset : offset + count]
+                    )
+                )
+                offset += count
+            batch.append(features)
+        return batch
+
+    def content_hash(self, lora: Any) -> Optional[str]:
+        """Return the hash of the inputs the embeddings of ``lora`` depend on.
+
+        It covers the three modality payload texts and the ids of the
+        embedding models (modalities and triggers) only. Optional keyword
+        and sentiment components do not contribute, so every extractor
+        using the same embedders agrees on the hash. Returns ``None`` when
+        the embedders cannot describe their inputs.
+        """
+        build_payload = getattr(self.semantic_embedder, "build_payload", None)
+        models = self._embedding_model_versions()
+        if not callable(build_payload) or not models:
+            return None
+        return embedding_content_hash(build_payload(lora), models)
 
-        trigger_candidates = self.trigger_resolver.build_candidates_from_adapter(
+    def model_versions(self) -> Dict[str, str]:
+        """Return the model id behind each modality and the trigger vectors.
+
+        Sentiment and style models are included when an analyzer is set.
+        Empty when the semantic embedder does not report its models.
+        """
+        models = self._embedding_model_versions()
+        if not models:
+            return {}
+        analyzer_versions = getattr(
+            self.sentiment_style_analyzer, "model_versions", None
+        )
+        if callable(analyzer_versions):
+            models.update(analyzer_versions())
+        return models
+
+    def _embedding_model_versions(self) -> Dict[str, str]:
+        """Return the semantic and trigger embedding model ids."""
+        model_versions = getattr(self.semantic_embedder, "model_versions", None)
+        if not callable(model_versions):
+            return {}
+        models = dict(model_versions())
+        trigger_version = getattr(self.trigger_embedder, "model_version", None)
+        if callable(trigger_version):
+            models["trigger"] = trigger_version()
+        return models
+
+    def _score_batch(self, loras: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Return the numeric scores of each of ``loras``, columnar if possible."""
+        compute_many = getattr(self.score_calculator, "compute_many", None)
+        if not callable(compute_many):
+            return [self.score_calculator.compute(lora) for lora in loras]
+        return score_rows(compute_many(loras))
+
+    def _analysis_text(self, lora: Any) -> str:
+        """Return the text sentiment and style analysis look at.
+
+        It is built from the semantic and artistic payloads, which the
+        content hash already covers.
+        """
+        build_payload = getattr(self.semantic_embedder, "build_payload", None)
+        if not callable(build_payload):
+            return ""
+        payload = build_payload(lora)
+        return " | ".join(
+            part for part in (payload["semantic"], payload["artistic"]) if part
+        )
+
+    @staticmethod
+    def _keyword_text(lora: Any) -> str:
+        """Return the metadata text keywords are extracted from.
+
+        Trained words, triggers, activation text, tags and archetype;
+        descriptions stay out of stored features.
+        """
+        parts: List[str] = []
+        for key in ("trained_words", "triggers", "tags"):
+            parts.extend(str(value) for value in getattr(lora, key, None) or [])
+        for key in ("activation_text", "archetype"):
+            parts.append(getattr(lora, key, None) or "")
+        return " ".join(part for part in parts if part)
+
+    def _analyze_batch(self, loras: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Return the sentiment and style features of each of ``loras``."""
+        analyzer = self.sentiment_style_analyzer
+        if analyzer is None:
+            return [{} for _ in loras]
+        texts = [self._analysis_text(lora) for lora in loras]
+        return [
+            {**sentiment, **style}
+            for sentiment, style in zip(
+                analyzer.analyze_sentiment_batch(texts),
+                analyzer.classify_style_batch(texts),
+                strict=True,
+            )
+        ]
+
+    def _resolve_triggers(self, lora: Any) -> TriggerResolution:
+        candidates = self.trigger_resolver.build_candidates_from_adapter(
             getattr(lora, "triggers", []) or [],
             getattr(lora, "trained_words", []) or [],
             getattr(lora, "activation_text", None),
         )
-        trigger_resolution = self.trigger_resolver.resolve(trigger_candidates)
-        if trigger_resolution.canonical:
-            trigger_vectors = self.trigger_embedder.encode(trigger_resolution.canonical)
-            features.update({
-                "normalized_triggers": trigger_resolution.canonical,
-                "trigger_aliases": trigger_resolution.alias_map,
-                "trigger_metadata": {
-                    "confidence": trigger_resolution.confidence,
-                    "sources": trigger_resolution.sources,
-                },
-                "trigger_embeddings": [
-                    vector.astype(float).tolist() for vector in trigger_vectors
-                ],
-            })
+        return self.trigger_resolver.resolve(candidates)
 
-        return features
+    @staticmethod
+    def _trigger_features(
+        resolution: TriggerResolution, vectors: Sequence[Any]
+    ) -> Dict[str, Any]:
+        return {
+            "normalized_triggers": resolution.canonical,
+            "trigger_aliases": resolution.alias_map,
+            "trigger_metadata": {
+                "confidence": resolution.confidence,
+                "sources": resolution.sources,
+            },
+            "trigger_embeddings": np.asarray(vectors, dtype=np.float32),
+        }
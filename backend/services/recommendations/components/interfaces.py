@@ -2,7 +2,17 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Protocol, Sequence, runtime_checkable
+from typing import (
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    runtime_checkable,
+)
 
 import numpy as np
 
@@ -26,6 +36,9 @@ class SemanticEmbedderProtocol(Protocol):
     ) -> Dict[str, np.ndarray]:
         """Compute embeddings for a free-form prompt."""
 
+    def model_versions(self) -> Dict[str, str]:
+        """Return the model identifier used for each modality."""
+
 
 @runtime_checkable
 class FeatureExtractorProtocol(Protocol):
@@ -36,6 +49,11 @@ class FeatureExtractorProtocol(Protocol):
     def extract_advanced_features(self, lora: Any) -> Dict[str, Any]:
         """Extract embedding vectors and metadata for a LoRA."""
 
+    def extract_advanced_features_batch(
+        self, loras: Sequence[Any]
+    ) -> List[Dict[str, Any]]:
+        """Extract features for several LoRAs with batched model calls."""
+
 
 @runtime_checkable
 class RecommendationEngineProtocol(Protocol):
@@ -44,14 +62,86 @@ class RecommendationEngineProtocol(Protocol):
     def build_similarity_index(self, loras: Sequence[Any]) -> None:
         """Build an index from the provided LoRAs."""
 
+    def build_from_embeddings(
+        self,
+        loras: Sequence[Any],
+        embeddings: Mapping[str, np.ndarray],
+        *,
+        normalized: bool = False,
+        rerank: bool = True,
+    ) -> None:
+        """Build an index from precomputed embedding matrices."""
+
+    def embedding_matrices(self) -> Dict[str, np.ndarray]:
+        """Return the normalised float32 modality matrices of the index."""
+
+    def weight_profile_matrices(self) -> Dict[Tuple[float, ...], np.ndarray]:
+        """Return pre-weighted fused matrices keyed by weight tuple."""
+
+    def model_versions(self) -> Dict[str, str]:
+        """Return the embedding model identifiers backing the index."""
+
     def get_recommendations(
         self,
         target_lora: Any,
         n_recommendations: int = 20,
         weights: Optional[Dict[str, float]] = None,
         diversify_results: bool = True,
+        *,
+        query_embeddings: Optional[Mapping[str, np.ndarray]] = None,
     ) -> List[Dict[str, Any]]:
         """Return ranked recommendations for the target LoRA."""
 
+    def get_batch_recommendations(
+        self,
+        target_loras: Sequence[Any],
+        n_recommendations: int = 20,
+        weights: Optional[Dict[str, float]] = None,
+        diversify_results: bool = True,
+        *,
+        query_embeddings: Optional[Mapping[str, Mapping[str, np.ndarray]]] = None,
+        include_merged: bool = False,
+    ) -> Dict[str, Any]:
+        """Return per-target rankings and an optional merged ranking."""
+
+    def get_prompt_recommendations(
+        self,
+        prompt_embeddings: Mapping[str, np.ndarray],
+        n_recommendations: int = 10,
+        weights: Optional[Mapping[str, float]] = None,
+        *,
+        exclude_ids: Sequence[str] = (),
+        style_preference: Optional[str] = None,
+        style_boost: float = 0.2,
+        query_text: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return indexed LoRAs ranked against prompt embeddings."""
+
+    @property
+    def generation(self) -> int:
+        """Return a counter that changes whenever the index changes."""
+
+    def contains(self, lora_id: str) -> bool:
+        """Return whether ``lora_id`` is already indexed."""
+
     def update_index_incremental(self, new_loras: Sequence[Any]) -> None:
         """Incrementally update the index with new LoRAs."""
+
+    def upsert(
+        self,
+        loras: Sequence[Any],
+        embeddings: Optional[Mapping[str, np.ndarray]] = None,
+    ) -> None:
+        """Insert new LoRAs and replace the vectors of indexed ones."""
+
+    def refresh_metadata(self, loras: Sequence[Any]) -> int:
+        """Swap in updated LoRA objects whose vectors did not change."""
+
+    def set_predicted_styles(self, styles: Mapping[str, Optional[str]]) -> int:
+        """Record predicted styles of indexed LoRAs for prompt scoring."""
+
+    def remove(self, lora_ids: Sequence[str]) -> int:
+        """Tombstone ``lora_ids`` so they are no longer recommended."""
+
+    def compact(self) -> int:
+        """Reclaim tombstoned rows."""
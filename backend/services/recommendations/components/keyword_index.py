@@ -0,0 +1,226 @@
+"""Corpus-aware TF-IDF keyword extraction."""
+
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+from .bm25_index import tokenize
+
+_STOP_WORDS = frozenset({
+    "about",
+    "also",
+    "been",
+    "does",
+    "each",
+    "from",
+    "have",
+    "into",
+    "just",
+    "like",
+    "more",
+    "most",
+    "only",
+    "over",
+    "some",
+    "such",
+    "than",
+    "that",
+    "their",
+    "them",
+    "then",
+    "there",
+    "these",
+    "they",
+    "this",
+    "very",
+    "were",
+    "what",
+    "when",
+    "which",
+    "will",
+    "with",
+    "your",
+})
+
+
+def document_text(lora: Any) -> str:
+    """Return the text a LoRA contributes to the keyword corpora.
+
+    Name, description, tags and trained words; shared by the engine's
+    indexes and by recomputes that fill a corpus up front.
+    """
+    parts = [
+        getattr(lora, "name", None) or "",
+        getattr(lora, "description", None) or "",
+    ]
+    for key in ("tags", "trained_words"):
+        parts.extend(str(value) for value in getattr(lora, key, None) or [])
+    return " ".join(parts)
+
+
+class KeywordIndex:
+    """Document-frequency tables for ranking the keywords of any text.
+
+    Each indexed document contributes its distinct terms to the corpus
+    document frequencies; :meth:`add` and :meth:`remove` touch only the
+    terms of one document. A text's keywords are its terms ranked by term
+    frequency times smoothed inverse document frequency, so words common
+    across the catalog rank below the ones that set a document apart.
+    With an empty corpus the ranking falls back to plain term frequency.
+
+    Updates and rankings hold an internal lock, so extractor threads can
+    rank keywords while the corpus changes.
+    """
+
+    def __init__(self, *, min_length: int = 4) -> None:
+        """Create an empty index ignoring terms shorter than ``min_length``."""
+        self._min_length = min_length
+        self._document_frequency: Dict[str, int] = {}
+        self._documents: Dict[str, Counter[str]] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Return picklable state for shipping the corpus to workers."""
+        with self._lock:
+            state = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore pickled state with a fresh lock."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of indexed documents."""
+        return len(self._documents)
+
+    def __contains__(self, doc_id: object) -> bool:
+        """Return whether ``doc_id`` is indexed."""
+        return doc_id in self._documents
+
+    def terms(self, text: str) -> Counter[str]:
+        """Return the keyword candidates of ``text`` with their counts."""
+        return Counter(
+            token
+            for token in tokenize(text)
+            if len(token) >= self._min_length
+            and token not in _STOP_WORDS
+            and not token.isdigit()
+        )
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index ``text`` under ``doc_id``, replacing any previous version."""
+        terms = self.terms(text)
+        with self._lock:
+            self._remove_locked(doc_id)
+            self._add_locked(doc_id, terms)
+
+    def remove(self, doc_id: str) -> None:
+        """Drop ``doc_id`` from the index if present."""
+        with self._lock:
+            self._remove_locked(doc_id)
+
+    def clear(self) -> None:
+        """Drop every document."""
+        with self._lock:
+            self._document_frequency = {}
+            self._documents = {}
+
+    def rebuild(self, documents: Iterable[Tuple[str, str]]) -> None:
+        """Replace the index contents with ``(doc_id, text)`` pairs.
+
+        The new tables are built aside and swapped in at once.
+        """
+        staged = KeywordIndex(min_length=self._min_length)
+        for doc_id, text in documents:
+            staged.add(doc_id, text)
+        with self._lock:
+            self._document_frequency = staged._document_frequency
+            self._documents = staged._documents
+
+    def document_terms(self) -> Dict[str, Dict[str, int]]:
+        """Return each document's term counts, e.g. to save the corpus."""
+        with self._lock:
+            return {doc_id: dict(terms) for doc_id, terms in self._documents.items()}
+
+    def load_document_terms(self, documents: Mapping[str, Mapping[str, int]]) -> None:
+        """Replace the index contents with saved :meth:`document_terms`.
+
+        No text is tokenized again, so restoring a catalog corpus is cheap.
+        """
+        staged = KeywordIndex(min_length=self._min_length)
+        for doc_id, terms in documents.items():
+            staged._add_locked(doc_id, Counter(terms))
+        with self._lock:
+            self._document_frequency = staged._document_frequency
+            self._documents = staged._documents
+
+    def idf(self, term: str) -> float:
+        """Return the smoothed inverse document frequency of ``term``."""
+        with self._lock:
+            return self._idf_locked(term)
+
+    def extract(self, text: str, limit: int = 10) -> Dict[str, List[Any]]:
+        """Return the top ``limit`` keywords of ``text`` and their TF-IDF scores."""
+        return self._rank(self.terms(text), limit)
+
+    def keywords_for(self, doc_id: str, limit: int = 10) -> Dict[str, List[Any]]:
+        """Return the top keywords of an indexed document, empty if unknown."""
+        with self._lock:
+            terms = self._documents.get(doc_id) or Counter()
+        return self._rank(terms, limit)
+
+    def common_keywords(self, text1: str, text2: str, limit: int = 5) -> List[str]:
+        """Return terms shared by both texts, most distinctive first."""
+        shared = self.terms(text1).keys() & self.terms(text2).keys()
+        with self._lock:
+            return heapq.nsmallest(
+                limit, shared, key=lambda term: (-self._idf_locked(term), term)
+            )
+
+    def _add_locked(self, doc_id: str, terms: Counter[str]) -> None:
+        self._documents[doc_id] = terms
+        frequencies = self._document_frequency
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+
+    def _remove_locked(self, doc_id: str) -> None:
+        terms = self._documents.pop(doc_id, None)
+        if terms is None:
+            return
+        frequencies = self._document_frequency
+        for term in terms:
+            remaining = frequencies[term] - 1
+            if remaining:
+                frequencies[term] = remaining
+            else:
+                del frequencies[term]
+
+    def _idf_locked(self, term: str) -> float:
+        count = len(self._documents)
+        return math.log((1 + count) / (1 + self._document_frequency.get(term, 0))) + 1
+
+    def _rank(self, terms: Counter[str], limit: int) -> Dict[str, List[Any]]:
+        total = sum(terms.values())
+        if not total or limit <= 0:
+            return {"extracted_keywords": [], "keyword_scores": []}
+        with self._lock:
+            ranked = heapq.nsmallest(
+                limit,
+                (
+                    (-count / total * self._idf_locked(term), term)
+                    for term, count in terms.items()
+                ),
+            )
+        return {
+            "extracted_keywords": [term for _, term in ranked],
+            "keyword_scores": [-score for score, _ in ranked],
+        }
+
+
+__all__ = ["KeywordIndex", "document_text"]
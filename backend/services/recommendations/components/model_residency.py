@@ -0,0 +1,217 @@
+"""Memory-budgeted residency of lazily loaded inference models."""
+
+from __future__ import annotations
+
+import gc
+import logging
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+
+
+def estimate_model_bytes(model: Any) -> int:
+    """Return the approximate resident size of ``model`` in bytes.
+
+    Torch modules are measured from their parameters and buffers; pipelines
+    and wrappers such as KeyBERT are unwrapped through their ``model`` or
+    ``embedding_model`` attribute. Anything else counts as its shallow size.
+    """
+    seen: set[int] = set()
+    while id(model) not in seen:
+        seen.add(id(model))
+        parameters = getattr(model, "parameters", None)
+        if callable(parameters):
+            try:
+                tensors = list(parameters())
+                buffers = getattr(model, "buffers", None)
+                if callable(buffers):
+                    tensors.extend(buffers())
+                return int(
+                    sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+                )
+            except Exception:
+                break
+        inner = getattr(model, "model", None) or getattr(model, "embedding_model", None)
+        if inner is None:
+            break
+        model = inner
+    return sys.getsizeof(model)
+
+
+@dataclass
+class _Resident:
+    model: Any
+    size_bytes: int
+
+
+class ModelResidencyManager:
+    """Keep loaded models in memory within a byte budget.
+
+    Models are registered lazily through :meth:`acquire`, which calls the
+    loader on first use and marks the model most recently used on every
+    call. When the resident total exceeds ``budget_bytes`` the least
+    recently used models are dropped until it fits again; the model just
+    acquired is never evicted, so a single model larger than the budget
+    still loads. A budget of ``None`` keeps every model, as before.
+
+    One manager is meant to be shared by every model owner in a process so
+    the budget covers embedders, trigger encoders and analysis pipelines
+    together.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: Optional[int] = None,
+        *,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Create an empty manager.
+
+        Args:
+            budget_bytes: Resident size limit; ``None`` or ``0`` is unlimited.
+            logger: Optional logger for load and eviction events.
+
+        """
+        self._budget_bytes = budget_bytes or None
+        self._logger = logger or logging.getLogger(__name__)
+        self._entries: OrderedDict[str, _Resident] = OrderedDict()
+        self._lock = Lock()
+        self._key_locks: Dict[str, Lock] = {}
+        self._loads = 0
+        self._evictions = 0
+        self._load_seconds = 0.0
+        self._eviction_seconds = 0.0
+
+    @property
+    def budget_bytes(self) -> Optional[int]:
+        """Return the configured budget (``None`` when unlimited)."""
+        return self._budget_bytes
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether the model registered as ``key`` is resident."""
+        with self._lock:
+            return key in self._entries
+
+    def acquire(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        *,
+        size_bytes: Optional[int] = None,
+    ) -> Any:
+        """Return the model for ``key``, loading it with ``loader`` if needed.
+
+        Args:
+            key: Identifier unique to the model within the process.
+            loader: Zero-argument callable building the model.
+            size_bytes: Known model size; estimated after loading if omitted.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry.model
+            key_lock = self._key_locks.setdefault(key, Lock())
+
+        # Loads of different models run concurrently; a second caller for
+        # the same key waits for the first load instead of repeating it.
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    return entry.model
+
+            start = time.perf_counter()
+            model = loader()
+            elapsed = time.perf_counter() - start
+            if size_bytes is None:
+                size_bytes = estimate_model_bytes(model)
+
+            with self._lock:
+                self._entries[key] = _Resident(model, size_bytes)
+                self._loads += 1
+                self._load_seconds += elapsed
+                evicted = self._evict_over_budget(keep=key)
+        self._logger.info(
+            "Loaded model %s (%.1f MiB) in %.2fs",
+            key,
+            size_bytes / 2**20,
+            elapsed,
+        )
+        if evicted:
+            self._release(evicted)
+        return model
+
+    def evict(self, key: str) -> bool:
+        """Drop the model registered as ``key``; return whether it was resident."""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            evicted = {key: self._entries.pop(key)}
+            self._evictions += 1
+        self._release(evicted)
+        return True
+
+    def clear(self) -> None:
+        """Drop every resident model."""
+        with self._lock:
+            evicted = dict(self._entries)
+            self._entries.clear()
+            self._evictions += len(evicted)
+        if evicted:
+            self._release(evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return residency, load and eviction counters."""
+        with self._lock:
+            return {
+                "budget_bytes": self._budget_bytes,
+                "resident_bytes": sum(e.size_bytes for e in self._entries.values()),
+                "resident_models": list(self._entries),
+                "loads": self._loads,
+                "load_seconds": self._load_seconds,
+                "evictions": self._evictions,
+                "eviction_seconds": self._eviction_seconds,
+            }
+
+    def _evict_over_budget(self, *, keep: str) -> Dict[str, _Resident]:
+        evicted: Dict[str, _Resident] = {}
+        if self._budget_bytes is None:
+            return evicted
+        resident = sum(entry.size_bytes for entry in self._entries.values())
+        for key in list(self._entries):
+            if resident <= self._budget_bytes:
+                break
+            if key == keep:
+                continue
+            entry = self._entries.pop(key)
+            resident -= entry.size_bytes
+            evicted[key] = entry
+        self._evictions += len(evicted)
+        return evicted
+
+    def _release(self, evicted: Dict[str, _Resident]) -> None:
+        # Pop the entries so the manager holds no reference while collecting.
+        start = time.perf_counter()
+        for key in list(evicted):
+            size_bytes = evicted.pop(key).size_bytes
+            self._logger.info("Evicted model %s (%.1f MiB)", key, size_bytes / 2**20)
+        gc.collect()
+        try:  # pragma: no cover - optional dependency
+            import torch
+
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:  # pragma: no cover - optional dependency
+            pass
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._eviction_seconds += elapsed
+
+
+__all__ = ["ModelResidencyManager", "estimate_model_bytes"]
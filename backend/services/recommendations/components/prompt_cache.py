@@ -0,0 +1,170 @@
+"""Bounded LRU cache for prompt embeddings with optional disk persistence."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+_WHITESPACE = re.compile(r"\s+")
+
+PromptKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Return ``prompt`` with Unicode NFKC applied and whitespace collapsed."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", prompt)).strip()
+
+
+class PromptEmbeddingCache:
+    """Thread-safe LRU of per-modality prompt embeddings.
+
+    Entries are keyed by the normalised prompt and the model versions that
+    produced them, so a model upgrade never serves stale vectors. Cached
+    arrays are read-only and shared between callers. When :attr:`directory`
+    is set, every computed entry is also written there as an ``.npz`` file
+    and memory misses fall back to it, so repeated prompts survive restarts.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        *,
+        directory: str | Path | None = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Create an empty cache holding at most ``max_entries`` prompts."""
+        self._max_entries = max(1, max_entries)
+        self._entries: OrderedDict[PromptKey, Dict[str, np.ndarray]] = OrderedDict()
+        self._lock = Lock()
+        self._logger = logger or logging.getLogger(__name__)
+        self._directory: Optional[Path] = None
+        self.directory = directory
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    @property
+    def directory(self) -> Optional[Path]:
+        """Return the persistence directory (``None`` keeps entries in memory)."""
+        return self._directory
+
+    @directory.setter
+    def directory(self, value: str | Path | None) -> None:
+        if value is not None:
+            value = Path(value)
+            value.mkdir(parents=True, exist_ok=True)
+        self._directory = value
+
+    @property
+    def max_entries(self) -> int:
+        """Return the configured capacity."""
+        return self._max_entries
+
+    def __len__(self) -> int:
+        """Return the number of prompts held in memory."""
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(prompt: str, model_versions: Mapping[str, str]) -> PromptKey:
+        """Return the cache key for ``prompt`` under ``model_versions``."""
+        return normalize_prompt(prompt), tuple(sorted(model_versions.items()))
+
+    def get(self, key: PromptKey) -> Optional[Dict[str, np.ndarray]]:
+        """Return the cached embeddings for ``key`` or ``None`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return dict(entry)
+
+        entry = self._read(key)
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+            self._store(key, entry)
+            return dict(entry)
+
+    def put(self, key: PromptKey, embeddings: Mapping[str, np.ndarray]) -> None:
+        """Store ``embeddings`` for ``key`` and persist them when enabled."""
+        entry = {}
+        for modality, vector in embeddings.items():
+            array = np.array(vector, dtype=np.float32)
+            array.flags.writeable = False
+            entry[modality] = array
+        with self._lock:
+            self._store(key, entry)
+        self._write(key, entry)
+
+    def clear(self) -> None:
+        """Drop the in-memory entries; persisted files are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Return size, hit counters and the overall hit rate."""
+        with self._lock:
+            lookups = self._hits + self._disk_hits + self._misses
+            hits = self._hits + self._disk_hits
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+    def _store(self, key: PromptKey, entry: Dict[str, np.ndarray]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: PromptKey) -> Optional[Path]:
+        if self._directory is None:
+            return None
+        digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=20)
+        return self._directory / f"{digest.hexdigest()}.npz"
+
+    def _read(self, key: PromptKey) -> Optional[Dict[str, np.ndarray]]:
+        path = self._path(key)
+        if path is None or not path.is_file():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as archive:
+                entry = {name: archive[name] for name in archive.files}
+        except (OSError, ValueError) as exc:
+            self._logger.warning(
+                "Ignoring unreadable prompt cache file %s: %s", path, exc
+            )
+            return None
+        for array in entry.values():
+            array.flags.writeable = False
+        return entry
+
+    def _write(self, key: PromptKey, entry: Mapping[str, np.ndarray]) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        staging = path.with_name(f".{path.stem}.tmp-{os.getpid()}.npz")
+        try:
+            np.savez(staging, **entry)
+            os.replace(staging, path)
+        except OSError as exc:
+            self._logger.warning("Could not persist prompt embeddings: %s", exc)
+            staging.unlink(missing_ok=True)
+
+
+__all__ = ["PromptEmbeddingCache", "normalize_prompt"]
@@ -0,0 +1,156 @@
+"""Compact float16 / int8 storage for the fused embedding matrix."""
+
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .row_buffer import RowBuffer
+
+INDEX_PRECISIONS: Tuple[str, ...] = ("float32", "float16", "int8")
+
+
+class QuantizedMatrix:
+    """Horizontally fused modality matrices stored in a compact dtype.
+
+    ``float16`` halves the footprint of float32 vectors. ``int8`` keeps one
+    float32 scale per row and modality segment (``max(|x|) / 127``), which
+    cuts it to roughly a quarter. Scores are computed block by block, so only
+    one float32 block is ever materialised.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        scales: Optional[np.ndarray],
+        segments: Sequence[Tuple[int, int]],
+        *,
+        block_rows: int = 4096,
+    ) -> None:
+        """Wrap already-quantized ``values`` and their per-segment ``scales``."""
+        self._values = RowBuffer(values)
+        self._scales = RowBuffer(scales) if scales is not None else None
+        self.segments = tuple(segments)
+        self.block_rows = block_rows
+
+    @classmethod
+    def quantize(
+        cls,
+        matrices: Sequence[np.ndarray],
+        precision: str,
+        *,
+        block_rows: int = 4096,
+    ) -> "QuantizedMatrix":
+        """Fuse ``matrices`` column-wise and store them at ``precision``."""
+        if precision not in INDEX_PRECISIONS or precision == "float32":
+            raise ValueError(f"Unsupported compact precision '{precision}'")
+
+        segments: List[Tuple[int, int]] = []
+        start = 0
+        for matrix in matrices:
+            segments.append((start, start + matrix.shape[1]))
+            start += matrix.shape[1]
+
+        if precision == "float16":
+            values = np.hstack([np.asarray(m, dtype=np.float16) for m in matrices])
+            return cls(values, None, segments, block_rows=block_rows)
+
+        rows = matrices[0].shape[0] if matrices else 0
+        values = np.empty((rows, start), dtype=np.int8)
+        scales = np.empty((rows, len(matrices)), dtype=np.float32)
+        for position, (matrix, (lo, hi)) in enumerate(
+            zip(matrices, segments, strict=True)
+        ):
+            matrix = np.asarray(matrix, dtype=np.float32)
+            scale = np.abs(matrix).max(axis=1) / 127.0
+            scale[scale == 0] = 1.0
+            values[:, lo:hi] = np.rint(matrix / scale[:, None]).astype(np.int8)
+            scales[:, position] = scale
+        return cls(values, scales, segments, block_rows=block_rows)
+
+    @property
+    def values(self) -> np.ndarray:
+        """Return the stored rows in the compact dtype."""
+        return self._values.view
+
+    @property
+    def scales(self) -> Optional[np.ndarray]:
+        """Return the int8 per-segment scales (``None`` for float16)."""
+        return self._scales.view if self._scales is not None else None
+
+    @property
+    def precision(self) -> str:
+        """Return the storage dtype name."""
+        return "int8" if self.scales is not None else "float16"
+
+    @property
+    def rows(self) -> int:
+        """Return the number of stored vectors."""
+        return int(self.values.shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        """Return the allocated size of values and scales."""
+        scales = self._scales.nbytes if self._scales is not None else 0
+        return self._values.nbytes + scales
+
+    def dequantize(self, rows: Optional[np.ndarray] = None) -> List[np.ndarray]:
+        """Return float32 copies of each modality segment for ``rows``."""
+        values = self.values if rows is None else self.values[rows]
+        segments = []
+        for position, (lo, hi) in enumerate(self.segments):
+            segment = values[:, lo:hi].astype(np.float32)
+            if self.scales is not None:
+                scales = self.scales if rows is None else self.scales[rows]
+                segment *= scales[:, position : position + 1]
+            segments.append(segment)
+        return segments
+
+    def scores(self, queries: Sequence[np.ndarray]) -> np.ndarray:
+        """Return inner products with the per-segment ``queries``.
+
+        Queries are single vectors (result ``(N,)``) or stacked ``(T, d)``
+        matrices (result ``(N, T)``); modality weights should already be
+        folded into them.
+        """
+        stacked = queries[0].ndim == 2
+        width = queries[0].shape[0] if stacked else None
+        out_shape = (self.rows, width) if stacked else (self.rows,)
+        out = np.empty(out_shape, dtype=np.float32)
+
+        for start in range(0, self.rows, self.block_rows):
+            stop = min(start + self.block_rows, self.rows)
+            block = self.values[start:stop].astype(np.float32)
+            total = np.zeros((stop - start,) + out_shape[1:], dtype=np.float32)
+            for position, ((lo, hi), query) in enumerate(
+                zip(self.segments, queries, strict=True)
+            ):
+                partial = block[:, lo:hi] @ query.T
+                if self.scales is not None:
+                    scale = self.scales[start:stop, position]
+                    partial *= scale[:, None] if stacked else scale
+                total += partial
+            out[start:stop] = total
+        return out
+
+    def append(self, other: "QuantizedMatrix") -> None:
+        """Append the rows of ``other`` in place."""
+        self._values.append(other.values)
+        if self._scales is not None and other.scales is not None:
+            self._scales.append(other.scales)
+
+    def assign(self, indices: np.ndarray, other: "QuantizedMatrix") -> None:
+        """Overwrite the rows at ``indices`` with the rows of ``other``."""
+        self._values.assign(indices, other.values)
+        if self._scales is not None and other.scales is not None:
+            self._scales.assign(indices, other.scales)
+
+    def take(self, indices: np.ndarray) -> None:
+        """Keep only the rows at ``indices``, in that order."""
+        self._values.take(indices)
+        if self._scales is not None:
+            self._scales.take(indices)
+
+
+__all__ = ["INDEX_PRECISIONS", "QuantizedMatrix"]
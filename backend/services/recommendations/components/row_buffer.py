@@ -0,0 +1,74 @@
+"""Capacity-doubling row storage for mutable embedding matrices."""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+class RowBuffer:
+    """Rows of a 1-D or 2-D array with amortised O(1) appends.
+
+    The backing array over-allocates by doubling, so appending ``k`` rows
+    copies only those rows most of the time. :attr:`view` exposes the filled
+    prefix without copying. Read-only inputs (e.g. memory-mapped snapshots)
+    are adopted as-is and only copied on the first mutation.
+    """
+
+    def __init__(self, initial: np.ndarray, *, min_capacity: int = 64) -> None:
+        """Adopt ``initial`` as the filled rows of the buffer."""
+        self._data = initial
+        self._size = int(initial.shape[0])
+        self._min_capacity = min_capacity
+
+    @property
+    def view(self) -> np.ndarray:
+        """Return the filled rows (a view, not a copy)."""
+        if self._size == self._data.shape[0]:
+            return self._data
+        return self._data[: self._size]
+
+    @property
+    def size(self) -> int:
+        """Return the number of filled rows."""
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Return the number of allocated rows."""
+        return int(self._data.shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        """Return the allocated size in bytes."""
+        return int(self._data.nbytes)
+
+    def _reserve(self, rows: int) -> None:
+        writable = self._data.flags.writeable and not isinstance(self._data, np.memmap)
+        if writable and rows <= self.capacity:
+            return
+        capacity = max(self._min_capacity, self.capacity)
+        while capacity < rows:
+            capacity *= 2
+        data = np.empty((capacity,) + self._data.shape[1:], dtype=self._data.dtype)
+        data[: self._size] = self._data[: self._size]
+        self._data = data
+
+    def append(self, rows: np.ndarray) -> None:
+        """Append ``rows`` after the filled prefix."""
+        count = int(rows.shape[0])
+        self._reserve(self._size + count)
+        self._data[self._size : self._size + count] = rows
+        self._size += count
+
+    def assign(self, indices: np.ndarray, rows: np.ndarray) -> None:
+        """Overwrite the rows at ``indices`` in place."""
+        self._reserve(self._size)
+        self._data[indices] = rows
+
+    def take(self, indices: np.ndarray) -> None:
+        """Keep only the rows at ``indices``, in that order."""
+        self._data = np.ascontiguousarray(self._data[indices])
+        self._size = int(self._data.shape[0])
+
+
+__all__ = ["RowBuffer"]
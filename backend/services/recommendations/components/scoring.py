@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, Optional, Protocol, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Mapping, Optional, Protocol, Sequence, Tuple
 
 import numpy as np
 
+_DAY_US = 86_400_000_000
+
 
 class ScoreCalculatorProtocol(Protocol):
     """Minimal protocol for numeric feature calculation helpers."""
@@ -31,9 +34,19 @@ class ScoreCalculator(ScoreCalculatorProtocol):
         "concept",
     ]
 
+    _STATS_FIELDS = ("rating", "downloadCount", "favoriteCount", "commentCount")
+    _MAX_CACHED_TAGS = 1 << 16
+    _CONSTANT_SCORES = {
+        "user_activation_frequency": 0.0,
+        "user_success_rate": 0.5,
+        "recent_usage_trend": 0.0,
+    }
+
     def __init__(self, *, logger: logging.Logger | None = None) -> None:
         """Initialise the score calculator with an optional logger."""
         self._logger = logger or logging.getLogger(__name__)
+        self._tag_categories: Dict[str, Tuple[bool, ...]] = {}
+        self._sd_versions: Dict[Optional[str], Tuple[list[float], float]] = {}
 
     def compute(self, lora: Any) -> Dict[str, Any]:
         """Calculate heuristic scoring data for ``lora``."""
@@ -68,6 +81,199 @@ class ScoreCalculator(ScoreCalculatorProtocol):
             "recent_usage_trend": 0.0,
         }
 
+    def compute_many(
+        self, loras: Sequence[Any], *, now: datetime | None = None
+    ) -> Dict[str, np.ndarray]:
+        """Calculate the scores of :meth:`compute` for ``loras`` as columns.
+
+        Every key of :meth:`compute` maps to a ``float64`` array with one
+        row per LoRA; ``tags_vector`` and ``sd_version_vector`` are 2-D.
+        Fields are gathered in a single pass and the scores derived with
+        vector operations, so values match :meth:`compute` exactly.
+
+        Args:
+            loras: Adapters or adapter-like objects to score.
+            now: Reference time for recency and maturity, defaulting to
+                the current UTC time. Naive values are taken as UTC.
+
+        """
+        count = len(loras)
+        no_stats = [0] * len(self._STATS_FIELDS)
+        stat_values: List[float] = []
+        has_stats: List[bool] = []
+        tag_counts: List[int] = []
+        all_tags: List[str] = []
+        authors: List[int] = []
+        file_sizes: List[float] = []
+        nsfw_levels: List[float] = []
+        supports: List[bool] = []
+        published: List[Any] = []
+        created: List[Any] = []
+        sd_versions: List[Optional[str]] = []
+
+        for lora in loras:
+            lora_stats = getattr(lora, "stats", None)
+            has_stats.append(bool(lora_stats))
+            stat_values.extend(
+                [lora_stats.get(key) or 0 for key in self._STATS_FIELDS]
+                if lora_stats
+                else no_stats
+            )
+            tags = getattr(lora, "tags", None) or ()
+            tag_counts.append(len(tags))
+            all_tags.extend(tags)
+            authors.append(len(getattr(lora, "author_username", None) or ""))
+            file_sizes.append(getattr(lora, "primary_file_size_kb", None) or 0)
+            nsfw_levels.append(getattr(lora, "nsfw_level", None) or 0)
+            supports.append(bool(getattr(lora, "supports_generation", False)))
+            published.append(getattr(lora, "published_at", None))
+            created.append(getattr(lora, "created_at", None))
+            sd_versions.append(getattr(lora, "sd_version", None))
+
+        stats = np.array(stat_values, dtype=np.float64).reshape(
+            count, len(self._STATS_FIELDS)
+        )
+        has_stats_mask = np.array(has_stats, dtype=bool)
+        tags_vector = self._tags_matrix(all_tags, tag_counts)
+        sd_encoded = [self._sd_version_scores(version) for version in sd_versions]
+        sd_version_vector = np.array(
+            [vector for vector, _ in sd_encoded], dtype=np.float64
+        ).reshape(count, 3)
+        sd_compatibility = np.array(
+            [score for _, score in sd_encoded], dtype=np.float64
+        )
+        author_lengths = np.array(authors, dtype=np.float64)
+        file_size_array = np.array(file_sizes, dtype=np.float64)
+
+        rating, downloads, favorites, comments = stats.T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            quality = (
+                np.where(rating > 0, (rating / 5.0) * 0.6, 0.0)
+                + np.where(
+                    downloads > 0,
+                    np.minimum(np.log10(downloads + 1) / 5.0, 1.0) * 0.3,
+                    0.0,
+                )
+                + np.where(
+                    favorites > 0,
+                    np.minimum(np.log10(favorites + 1) / 3.0, 1.0) * 0.1,
+                    0.0,
+                )
+            )
+            popularity = np.minimum(np.log10(downloads + 1) / 6.0, 1.0)
+            engagement = np.minimum(
+                np.log10(comments * 0.6 + favorites * 0.4 + 1) / 3.0, 1.0
+            )
+        reference = now or datetime.now(timezone.utc)
+        published_days = self._days_since(published, reference)
+        created_days = self._days_since(created, reference)
+
+        columns: Dict[str, np.ndarray] = {
+            "tags_vector": tags_vector,
+            "sd_version_vector": sd_version_vector,
+            "author_vector": np.minimum(author_lengths / 20.0, 1.0),
+            "quality_score": np.where(has_stats_mask, np.minimum(quality, 1.0), 0.5),
+            "popularity_score": np.where(has_stats_mask, popularity, 0.0),
+            "community_engagement": np.where(has_stats_mask, engagement, 0.0),
+            "file_size_normalized": np.where(
+                file_size_array != 0,
+                np.minimum(file_size_array / (500 * 1024), 1.0),
+                0.5,
+            ),
+            "recency_score": np.where(
+                np.isnan(published_days),
+                0.0,
+                np.maximum(0.0, 1.0 - (published_days / 365.0)),
+            ),
+            "maturity_score": np.where(
+                np.isnan(created_days), 0.0, np.minimum(created_days / 180.0, 1.0)
+            ),
+            "nsfw_level_normalized": np.array(nsfw_levels, dtype=np.float64) / 10.0,
+            "supports_generation": np.array(supports, dtype=np.float64),
+            "sd_compatibility_score": sd_compatibility,
+        }
+        for key, value in self._CONSTANT_SCORES.items():
+            columns[key] = np.full(count, value)
+        return columns
+
+    def _tags_matrix(self, tags: List[str], counts: List[int]) -> np.ndarray:
+        """Return the ``tags_vector`` rows for tags flattened across LoRAs.
+
+        ``counts`` holds how many consecutive entries of ``tags`` belong to
+        each LoRA. Category matches are computed once per distinct tag.
+        """
+        matrix = np.zeros((len(counts), len(self._COMMON_TAG_CATEGORIES)))
+        if not tags:
+            return matrix
+        distinct = dict.fromkeys(tags)
+        for position, tag in enumerate(distinct):
+            distinct[tag] = position
+        categories = np.array(
+            [self._tag_categories_of(tag) for tag in distinct], dtype=np.float64
+        )
+        matches = categories[
+            np.fromiter(map(distinct.__getitem__, tags), dtype=np.intp, count=len(tags))
+        ]
+        sizes = np.array(counts, dtype=np.intp)
+        tagged = sizes > 0
+        starts = np.cumsum(sizes) - sizes
+        matrix[tagged] = np.minimum(
+            np.add.reduceat(matches, starts[tagged]) / sizes[tagged, None], 1.0
+        )
+        return matrix
+
+    def _tag_categories_of(self, tag: str) -> Tuple[bool, ...]:
+        """Return which common categories ``tag`` mentions, memoised per tag."""
+        categories = self._tag_categories.get(tag)
+        if categories is None:
+            if len(self._tag_categories) >= self._MAX_CACHED_TAGS:
+                self._tag_categories.clear()
+            lowered = tag.lower()
+            categories = tuple(
+                category in lowered for category in self._COMMON_TAG_CATEGORIES
+            )
+            self._tag_categories[tag] = categories
+        return categories
+
+    def _sd_version_scores(
+        self, sd_version: Optional[str]
+    ) -> Tuple[list[float], float]:
+        """Return the one-hot version and compatibility of ``sd_version``."""
+        scores = self._sd_versions.get(sd_version)
+        if scores is None:
+            scores = (
+                self._encode_sd_version(sd_version),
+                self._sd_compatibility(sd_version),
+            )
+            self._sd_versions[sd_version] = scores
+        return scores
+
+    @staticmethod
+    def _days_since(timestamps: Sequence[Any], reference: datetime) -> np.ndarray:
+        """Return whole days from each timestamp to ``reference``, NaN if unset.
+
+        Naive timestamps are taken as UTC, as in :meth:`compute`.
+        """
+        epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        naive_epoch = epoch.replace(tzinfo=None)
+        microsecond = timedelta(microseconds=1)
+        is_set = np.fromiter(map(bool, timestamps), dtype=bool, count=len(timestamps))
+        offsets = np.fromiter(
+            (
+                (value - (naive_epoch if value.tzinfo is None else epoch))
+                // microsecond
+                for value in timestamps
+                if value
+            ),
+            dtype=np.int64,
+            count=int(is_set.sum()),
+        )
+        if reference.tzinfo is None:
+            reference = reference.replace(tzinfo=timezone.utc)
+        days = np.full(len(timestamps), np.nan)
+        days[is_set] = ((reference - epoch) // microsecond - offsets) // _DAY_US
+        return days
+
     def _encode_tags(self, tags: Optional[Sequence[str]]) -> list[float]:
         if not tags:
             return [0.0] * len(self._COMMON_TAG_CATEGORIES)
@@ -182,4 +388,15 @@ class ScoreCalculator(ScoreCalculatorProtocol):
         return 0.8
 
 
-__all__ = ["ScoreCalculator", "ScoreCalculatorProtocol"]
+def score_rows(columns: Mapping[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """Split :meth:`ScoreCalculator.compute_many` columns into per-LoRA dicts.
+
+    Vector columns become lists and scalar columns floats, as returned by
+    :meth:`ScoreCalculator.compute`.
+    """
+    keys = list(columns)
+    values = [columns[key].tolist() for key in keys]
+    return [dict(zip(keys, row, strict=True)) for row in zip(*values, strict=True)]
+
+
+__all__ = ["ScoreCalculator", "ScoreCalculatorProtocol", "score_rows"]
@@ -5,16 +5,38 @@ from __future__ import annotations
 import hashlib
 import logging
 import re
-from typing import Any, Dict, List, Mapping, MutableMapping, Optional
+from threading import Lock
+from typing import Any, Dict, List, Mapping, Optional, Sequence
 
 import numpy as np
 
+from .model_residency import ModelResidencyManager
+
 
 class _FallbackSentenceEncoder:
-    """Lightweight hashed-feature encoder used when transformers are unavailable."""
+    """Signed feature-hashing encoder used when transformers are unavailable.
+
+    Every token and adjacent-token bigram of a batch is hashed into one of
+    ``embedding_dim`` buckets with a ±1 sign taken from the hash, summed
+    with a single scatter-add and L2-normalised per row. Token hashes come
+    from BLAKE2b rather than ``hash()``, so vectors are identical across
+    processes and interpreter runs.
+    """
+
+    # Texts are joined with NUL so one regex pass tokenizes the whole batch;
+    # the separator comes back as its own token and marks row boundaries.
+    _SEPARATOR = "\x00"
+    _TOKEN = re.compile(r"\w+|\x00")
+    _ASCII_TOKEN = re.compile(r"\w+|\x00", re.ASCII)
+    _BOUNDARY = np.uint64(0)
+    _MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+    _MIX = np.uint64(0xBF58476D1CE4E5B9)
+    _MAX_CACHED_TOKENS = 1 << 16
 
     def __init__(self, embedding_dim: int):
         self.embedding_dim = embedding_dim
+        self._token_hashes: Dict[str, int] = {self._SEPARATOR: int(self._BOUNDARY)}
+        self._token_lock = Lock()
 
     def encode(
         self,
@@ -26,38 +48,96 @@ class _FallbackSentenceEncoder:
     ) -> np.ndarray | List[float]:
         """Encode text or batch of texts into deterministic hashed vectors."""
         if isinstance(inputs, str):
-            vector = self._encode_single(inputs)
+            vector = self._encode_batch([inputs])[0]
             return vector if convert_to_numpy else vector.tolist()
 
-        vectors = [self._encode_single(text) for text in inputs or []]
-        if not vectors:
-            array = np.zeros((0, self.embedding_dim), dtype=np.float32)
-        else:
-            array = np.vstack(vectors)
+        array = self._encode_batch(list(inputs or []))
         return array if convert_to_numpy else array.tolist()
 
-    def _encode_single(self, text: Optional[str]) -> np.ndarray:
-        if not text:
-            return np.zeros(self.embedding_dim, dtype=np.float32)
-
-        tokens = re.findall(r"\b\w+\b", text.lower())
-        if not tokens:
-            return np.zeros(self.embedding_dim, dtype=np.float32)
+    def _encode_batch(self, texts: Sequence[Optional[str]]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.embedding_dim), dtype=np.float32)
+        if not texts:
+            return matrix
 
-        vector = np.zeros(self.embedding_dim, dtype=np.float32)
-        for token in tokens:
-            digest = hashlib.md5(token.encode("utf-8")).hexdigest()
-            index = int(digest, 16) % self.embedding_dim
-            vector[index] += 1.0
+        joined = self._SEPARATOR.join(
+            (text or "").replace(self._SEPARATOR, " ") for text in texts
+        )
+        joined = joined.lower()
+        # ASCII matching is faster and identical when the batch is ASCII.
+        pattern = self._ASCII_TOKEN if joined.isascii() else self._TOKEN
+        tokens = pattern.findall(joined)
+        token_hashes = self._cache_hashes(tokens)
+        hashes = np.fromiter(
+            map(token_hashes.__getitem__, tokens),
+            dtype=np.uint64,
+            count=len(tokens),
+        )
 
-        norm = np.linalg.norm(vector)
-        if norm:
-            vector /= norm
-        return vector
+        boundary = hashes == self._BOUNDARY
+        rows = np.cumsum(boundary)[~boundary]
+        hashes = hashes[~boundary]
+        if not len(hashes):
+            return matrix
+
+        adjacent = rows[:-1] == rows[1:]
+        features = np.concatenate((
+            hashes,
+            self._combine(hashes[:-1][adjacent], hashes[1:][adjacent]),
+        ))
+        feature_rows = np.concatenate((rows, rows[:-1][adjacent]))
+        buckets = (features % np.uint64(self.embedding_dim)).astype(np.intp)
+        signs = np.where(features >> np.uint64(63), -1.0, 1.0).astype(np.float32)
+        cells = feature_rows * self.embedding_dim + buckets
+        values = matrix.reshape(-1)
+        np.add.at(values, cells, signs)
+
+        # Normalise through the touched cells only; the rest stay zero.
+        cells = np.unique(cells)
+        cell_rows = cells // self.embedding_dim
+        norms = np.sqrt(
+            np.bincount(cell_rows, weights=values[cells] ** 2, minlength=len(texts))
+        )
+        norms[norms == 0] = 1.0
+        values[cells] /= norms[cell_rows]
+        return matrix
+
+    def _cache_hashes(self, tokens: Sequence[str]) -> Dict[str, int]:
+        """Return a token-hash memo that holds every token in ``tokens``.
+
+        Updates are serialised by a lock. A full memo is replaced rather than
+        cleared, so the returned dict keeps this batch's hashes even when a
+        concurrent batch starts a new memo.
+        """
+        with self._token_lock:
+            memo = self._token_hashes
+            missing = set(tokens).difference(memo)
+            if missing and len(memo) + len(missing) > self._MAX_CACHED_TOKENS:
+                memo = {self._SEPARATOR: int(self._BOUNDARY)}
+                self._token_hashes = memo
+                missing = set(tokens).difference(memo)
+            for token in missing:
+                digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+                memo[token] = int.from_bytes(digest, "little")
+            return memo
+
+    @classmethod
+    def _combine(cls, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Return order-sensitive bigram hashes of paired token hashes."""
+        mixed = left * cls._MULTIPLIER ^ right
+        mixed ^= mixed >> np.uint64(31)
+        mixed *= cls._MIX
+        mixed ^= mixed >> np.uint64(29)
+        return mixed
 
 
 class SentenceTransformerProvider:
-    """Load and serve SentenceTransformer models with transparent fallbacks."""
+    """Load and serve SentenceTransformer models with transparent fallbacks.
+
+    Models are held by a :class:`ModelResidencyManager`, keyed by model
+    name and device, so providers sharing a manager share loaded weights
+    and a process-wide memory budget. Each modality loads on first use and
+    may be evicted and reloaded later under memory pressure.
+    """
 
     def __init__(
         self,
@@ -66,17 +146,20 @@ class SentenceTransformerProvider:
         logger: Optional[logging.Logger] = None,
         force_fallback: bool = False,
         model_configs: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        residency: Optional[ModelResidencyManager] = None,
     ) -> None:
-        """Initialise model configuration and optional fallbacks."""
+        """Initialise model configuration and optional fallbacks.
+
+        ``residency`` defaults to a private manager without a budget, which
+        keeps every loaded model for the provider's lifetime.
+        """
         self._logger = logger or logging.getLogger(__name__)
         self._preferred_device = device
+        self._residency = residency or ModelResidencyManager(logger=self._logger)
 
         self._model_configs: Dict[str, Mapping[str, Any]] = (
             dict(model_configs) if model_configs is not None else {}
         )
-        self._models: MutableMapping[str, Any] = {
-            key: None for key in self._model_configs
-        }
         self._dimensions: Dict[str, int] = {}
 
         self._transformers_available = not force_fallback
@@ -94,6 +177,9 @@ class SentenceTransformerProvider:
             self.device = "cpu"
         else:
             self._configure_torch_device()
+        # ``device`` may be overridden per call; models stay keyed by the
+        # device they were loaded onto.
+        self._load_device = self.device
 
     # ------------------------------------------------------------------
     # Public API
@@ -103,12 +189,43 @@ class SentenceTransformerProvider:
         """Return whether optional transformer dependencies are present."""
         return self._transformers_available
 
+    @property
+    def residency(self) -> ModelResidencyManager:
+        """Return the manager holding this provider's models."""
+        return self._residency
+
+    def model_version(self, model_key: str) -> str:
+        """Return an identifier for the vectors ``model_key`` produces.
+
+        The value is derived from configuration only, so it never loads a
+        model; the hashed fallback is versioned separately because its
+        vectors are not interchangeable with transformer output. Stored
+        vectors carry this id, so a bump makes index builds and lookups
+        treat older vectors as missing until they are recomputed.
+        """
+        self._ensure_model_config(model_key)
+        config = self._model_configs[model_key]
+        if not self._transformers_available:
+            return f"hashed-fallback-v2:{int(config['default_dim'])}"
+        return str(config.get("model_name") or model_key)
+
     def get_model(self, model_key: str) -> Any:
         """Return the model for the provided key, loading it lazily."""
         self._ensure_model_config(model_key)
-        if self._models[model_key] is None:
-            self._models[model_key] = self._load_model(model_key)
-        return self._models[model_key]
+        return self._residency.acquire(
+            self._residency_key(model_key),
+            lambda: self._load_model(model_key),
+        )
+
+    def is_loaded(self, model_key: str) -> bool:
+        """Return whether the model for ``model_key`` is currently resident."""
+        self._ensure_model_config(model_key)
+        return self._residency_key(model_key) in self._residency
+
+    def unload(self, model_key: str) -> bool:
+        """Release the model for ``model_key``; it reloads on next use."""
+        self._ensure_model_config(model_key)
+        return self._residency.evict(self._residency_key(model_key))
 
     def get_dimension(self, model_key: str) -> int:
         """Return the embedding dimension for the specified model."""
@@ -148,6 +265,9 @@ class SentenceTransformerProvider:
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
+    def _residency_key(self, model_key: str) -> str:
+        return f"{self.model_version(model_key)}@{self._load_device}"
+
     def _ensure_model_config(self, model_key: str) -> None:
         if model_key not in self._model_configs:
             raise KeyError(f"Unknown model key: {model_key}")
@@ -212,8 +332,8 @@ class SentenceTransformerProvider:
 
         self._logger.info("Loading SentenceTransformer model %s", model_name)
         model = self._SentenceTransformer(model_name)
-        if self.device in {"cuda", "mps"}:
-            model = model.to(self.device)
+        if self._load_device in {"cuda", "mps"}:
+            model = model.to(self._load_device)
 
         self._dimensions[model_key] = self._resolve_dimension(model, default_dim)
         return model
@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import logging
-import warnings
-from typing import Any, Dict, Protocol
+from typing import Any, Callable, Dict, List, Protocol, Sequence
+
+from .model_residency import ModelResidencyManager
 
 
 class SentimentStyleAnalyzerProtocol(Protocol):
@@ -20,6 +21,16 @@ class SentimentStyleAnalyzerProtocol(Protocol):
     ) -> Dict[str, Any]:  # pragma: no cover - interface
         """Return artistic style predictions for the supplied text."""
 
+    def analyze_sentiment_batch(
+        self, texts: Sequence[str]
+    ) -> List[Dict[str, Any]]:  # pragma: no cover - interface
+        """Return sentiment metadata for each of ``texts``, in order."""
+
+    def classify_style_batch(
+        self, texts: Sequence[str]
+    ) -> List[Dict[str, Any]]:  # pragma: no cover - interface
+        """Return artistic style predictions for each of ``texts``, in order."""
+
 
 class SentimentStyleAnalyzer(SentimentStyleAnalyzerProtocol):
     """Analyzer that tries to use transformers pipelines with robust fallbacks."""
@@ -37,144 +48,171 @@ class SentimentStyleAnalyzer(SentimentStyleAnalyzerProtocol):
         "pixel art",
     ]
 
+    _SENTIMENT_MODEL = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+    _STYLE_MODEL = "facebook/bart-large-mnli"
+    _MAX_CHARS = 512
+
+    _POSITIVE_WORDS = ("good", "great", "excellent", "amazing", "beautiful", "perfect")
+    _NEGATIVE_WORDS = ("bad", "terrible", "awful", "horrible", "ugly", "poor")
+    _STYLE_KEYWORDS = {
+        "anime": ("anime", "manga", "japanese", "kawaii"),
+        "realistic": ("realistic", "photorealistic", "photo", "real"),
+        "cartoon": ("cartoon", "comic", "toon"),
+        "digital art": ("digital", "cg", "computer"),
+        "painting": ("painting", "paint", "oil", "watercolor"),
+    }
+    _NEUTRAL_SENTIMENT = {"sentiment_label": "NEUTRAL", "sentiment_score": 0.5}
+    _UNKNOWN_STYLE = {"predicted_style": "unknown", "style_confidence": 0.0}
+
     def __init__(
-        self, *, device: str = "cuda", logger: logging.Logger | None = None
+        self,
+        *,
+        device: str = "cuda",
+        logger: logging.Logger | None = None,
+        residency: ModelResidencyManager | None = None,
+        batch_size: int = 32,
     ) -> None:
-        """Initialise the analyser with device preference and logging."""
-        warnings.warn(
-            (
-                "SentimentStyleAnalyzer is deprecated and will be removed in a "
-                "future release."
-            ),
-            DeprecationWarning,
-            stacklevel=2,
-        )
+        """Initialise the analyser with device preference and logging.
+
+        Pipelines are loaded lazily through ``residency`` so they count
+        against the same memory budget as the embedding models. The batch
+        methods send at most ``batch_size`` texts per pipeline call.
+        """
         self._device = device
         self._logger = logger or logging.getLogger(__name__)
-        self._sentiment_pipeline: Any | None = None
-        self._style_pipeline: Any | None = None
+        self._residency = residency or ModelResidencyManager(logger=self._logger)
+        self._transformers_available: bool | None = None
+        self._batch_size = max(1, batch_size)
+
+    def model_versions(self) -> Dict[str, str]:
+        """Return the pipeline models behind sentiment and style features."""
+        return {"sentiment": self._SENTIMENT_MODEL, "style": self._STYLE_MODEL}
 
     def analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """Analyse ``text`` and return sentiment metadata."""
-        if not text:
-            return {"sentiment_label": "NEUTRAL", "sentiment_score": 0.5}
-
-        self._ensure_sentiment_pipeline()
-        if self._sentiment_pipeline == "fallback":
-            return self._fallback_sentiment(text)
-
-        try:
-            sentiment = self._sentiment_pipeline(text[:512])
-            return {
-                "sentiment_label": sentiment[0]["label"],
-                "sentiment_score": sentiment[0]["score"],
-            }
-        except Exception:  # pragma: no cover - defensive branch
-            self._logger.debug(
-                "Falling back to heuristic sentiment analysis", exc_info=True
-            )
-            return self._fallback_sentiment(text)
+        return self.analyze_sentiment_batch([text])[0]
 
     def classify_style(self, text: str) -> Dict[str, Any]:
         """Classify ``text`` into coarse style categories."""
-        if not text:
-            return {"predicted_style": "unknown", "style_confidence": 0.0}
-
-        self._ensure_style_pipeline()
-        if self._style_pipeline == "fallback":
-            return self._fallback_style(text)
-
-        try:
-            style_result = self._style_pipeline(text[:512], self._ART_STYLES)
-            return {
-                "predicted_style": style_result["labels"][0],
-                "style_confidence": style_result["scores"][0],
-            }
-        except Exception:  # pragma: no cover - defensive branch
-            self._logger.debug(
-                "Falling back to heuristic style classification", exc_info=True
-            )
-            return self._fallback_style(text)
-
-    def _ensure_sentiment_pipeline(self) -> None:
-        if self._sentiment_pipeline is not None:
-            return
-
-        try:
-            from transformers import pipeline
-
-            self._sentiment_pipeline = pipeline(
-                "sentiment-analysis",
-                model="cardiffnlp/twitter-roberta-base-sentiment-latest",
-                device=0 if self._device == "cuda" else -1,
-            )
-            self._logger.info("Sentiment analysis pipeline loaded")
-        except ImportError:
-            self._logger.debug(
-                "Transformers unavailable, using sentiment fallback heuristics"
-            )
-            self._sentiment_pipeline = "fallback"
+        return self.classify_style_batch([text])[0]
+
+    def analyze_sentiment_batch(self, texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """Analyse each of ``texts``, sending them to the pipeline in chunks.
+
+        Results match :meth:`analyze_sentiment` called once per text.
+        """
+        sentiment_pipeline = self._pipeline("sentiment-analysis", self._SENTIMENT_MODEL)
+
+        def run(chunk: List[str]) -> List[Dict[str, Any]]:
+            results = sentiment_pipeline(chunk, batch_size=len(chunk))
+            return [
+                {"sentiment_label": result["label"], "sentiment_score": result["score"]}
+                for result in results
+            ]
+
+        return self._analyze(
+            texts,
+            run if sentiment_pipeline is not None else None,
+            self._fallback_sentiment,
+            self._NEUTRAL_SENTIMENT,
+            "sentiment analysis",
+        )
 
-    def _ensure_style_pipeline(self) -> None:
-        if self._style_pipeline is not None:
-            return
+    def classify_style_batch(self, texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """Classify each of ``texts``, sending them to the pipeline in chunks.
+
+        Results match :meth:`classify_style` called once per text.
+        """
+        style_pipeline = self._pipeline("zero-shot-classification", self._STYLE_MODEL)
+
+        def run(chunk: List[str]) -> List[Dict[str, Any]]:
+            results = style_pipeline(chunk, self._ART_STYLES, batch_size=len(chunk))
+            return [
+                {
+                    "predicted_style": result["labels"][0],
+                    "style_confidence": result["scores"][0],
+                }
+                for result in results
+            ]
+
+        return self._analyze(
+            texts,
+            run if style_pipeline is not None else None,
+            self._fallback_style,
+            self._UNKNOWN_STYLE,
+            "style classification",
+        )
 
+    def _analyze(
+        self,
+        texts: Sequence[str],
+        run: Callable[[List[str]], List[Dict[str, Any]]] | None,
+        fallback: Callable[[str], Dict[str, Any]],
+        empty: Dict[str, Any],
+        description: str,
+    ) -> List[Dict[str, Any]]:
+        """Run non-empty ``texts`` through ``run`` in chunks.
+
+        Empty texts get a copy of ``empty``. Without a pipeline, or when a
+        chunk fails, the affected texts go through ``fallback`` instead.
+        """
+        results: List[Dict[str, Any]] = [dict(empty) for _ in texts]
+        pending = [position for position, text in enumerate(texts) if text]
+        for start in range(0, len(pending), self._batch_size):
+            positions = pending[start : start + self._batch_size]
+            if run is not None:
+                try:
+                    chunk = run([texts[i][: self._MAX_CHARS] for i in positions])
+                except Exception:  # pragma: no cover - defensive branch
+                    self._logger.debug(
+                        "Falling back to heuristic %s", description, exc_info=True
+                    )
+                else:
+                    for position, result in zip(positions, chunk, strict=True):
+                        results[position] = result
+                    continue
+            for position in positions:
+                results[position] = fallback(texts[position])
+        return results
+
+    def _pipeline(self, task: str, model: str) -> Any | None:
+        """Return the resident ``task`` pipeline, or ``None`` without transformers."""
+        if self._transformers_available is False:
+            return None
         try:
             from transformers import pipeline
-
-            self._style_pipeline = pipeline(
-                "zero-shot-classification",
-                model="facebook/bart-large-mnli",
-                device=0 if self._device == "cuda" else -1,
-            )
-            self._logger.info("Style classification pipeline loaded")
         except ImportError:
             self._logger.debug(
-                "Transformers unavailable, using style fallback heuristics"
+                "Transformers unavailable, using sentiment and style fallback "
+                "heuristics"
             )
-            self._style_pipeline = "fallback"
+            self._transformers_available = False
+            return None
+        self._transformers_available = True
+
+        return self._residency.acquire(
+            f"{model}@{self._device}",
+            lambda: pipeline(
+                task, model=model, device=0 if self._device == "cuda" else -1
+            ),
+        )
 
     def _fallback_sentiment(self, text: str) -> Dict[str, Any]:
-        positive_words = [
-            "good",
-            "great",
-            "excellent",
-            "amazing",
-            "beautiful",
-            "perfect",
-        ]
-        negative_words = [
-            "bad",
-            "terrible",
-            "awful",
-            "horrible",
-            "ugly",
-            "poor",
-        ]
-
         text_lower = text.lower()
-        pos_count = sum(1 for word in positive_words if word in text_lower)
-        neg_count = sum(1 for word in negative_words if word in text_lower)
+        pos_count = sum(1 for word in self._POSITIVE_WORDS if word in text_lower)
+        neg_count = sum(1 for word in self._NEGATIVE_WORDS if word in text_lower)
 
         if pos_count > neg_count:
             return {"sentiment_label": "POSITIVE", "sentiment_score": 0.7}
         if neg_count > pos_count:
             return {"sentiment_label": "NEGATIVE", "sentiment_score": 0.7}
-        return {"sentiment_label": "NEUTRAL", "sentiment_score": 0.5}
+        return dict(self._NEUTRAL_SENTIMENT)
 
     def _fallback_style(self, text: str) -> Dict[str, Any]:
-        style_keywords = {
-            "anime": ["anime", "manga", "japanese", "kawaii"],
-            "realistic": ["realistic", "photorealistic", "photo", "real"],
-            "cartoon": ["cartoon", "comic", "toon"],
-            "digital art": ["digital", "cg", "computer"],
-            "painting": ["painting", "paint", "oil", "watercolor"],
-        }
-
         text_lower = text.lower()
         style_scores: Dict[str, int] = {}
 
-        for style, keywords in style_keywords.items():
+        for style, keywords in self._STYLE_KEYWORDS.items():
             score = sum(1 for keyword in keywords if keyword in text_lower)
             if score > 0:
                 style_scores[style] = score
@@ -186,7 +224,7 @@ class SentimentStyleAnalyzer(SentimentStyleAnalyzerProtocol):
                 "predicted_style": best_style,
                 "style_confidence": min(confidence, 1.0),
             }
-        return {"predicted_style": "unknown", "style_confidence": 0.0}
+        return dict(self._UNKNOWN_STYLE)
 
 
 __all__ = ["SentimentStyleAnalyzer", "SentimentStyleAnalyzerProtocol"]
@@ -7,6 +7,7 @@ from typing import Optional, Sequence
 
 import numpy as np
 
+from .model_residency import ModelResidencyManager
 from .sentence_transformer_provider import SentenceTransformerProvider
 
 
@@ -21,6 +22,7 @@ class TriggerEmbedder:
         device: str = "cpu",
         logger: Optional[logging.Logger] = None,
         provider: Optional[SentenceTransformerProvider] = None,
+        residency: Optional[ModelResidencyManager] = None,
     ) -> None:
         """Initialise the embedder with the desired device and provider overrides."""
         self._logger = logger or logging.getLogger(__name__)
@@ -35,6 +37,7 @@ class TriggerEmbedder:
             logger=self._logger,
             force_fallback=False,
             model_configs=configs,
+            residency=residency,
         )
         self.device = self._provider.device
 
@@ -43,6 +46,10 @@ class TriggerEmbedder:
         """Return the embedding dimension for the trigger encoder."""
         return int(self._provider.get_dimension(self.MODEL_KEY))
 
+    def model_version(self) -> str:
+        """Return the identifier of the model producing trigger vectors."""
+        return self._provider.model_version(self.MODEL_KEY)
+
     def encode(self, phrases: Sequence[str]) -> np.ndarray:
         """Encode ``phrases`` into a 2D numpy array of embeddings."""
         if not phrases:
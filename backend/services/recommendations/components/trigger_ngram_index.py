@@ -0,0 +1,145 @@
+"""Character n-gram and prefix index for fuzzy trigger lookup."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+
+class TriggerNgramIndex:
+    """Inverted index from character trigrams and word prefixes to triggers.
+
+    Each trigger is padded with a boundary marker and split into trigrams.
+    A query is scored against every trigger sharing at least one trigram
+    using the Dice coefficient ``2 * shared / (|query| + |trigger|)``, which
+    tolerates typos and partial words. Triggers with a word starting with
+    the query are found by bisecting a sorted word table, so prefixes such
+    as ``"wat"`` reach ``"watercolor style"`` immediately. New words wait in
+    a pending set that is merged into the table on the next search, and
+    removals bisect to a trigger's own entries instead of scanning the table.
+    """
+
+    BOUNDARY = "\x00"
+
+    def __init__(
+        self,
+        triggers: Iterable[str] = (),
+        *,
+        n: int = 3,
+        min_similarity: float = 0.3,
+        prefix_score: float = 0.75,
+        max_prefix_matches: int = 64,
+    ) -> None:
+        """Index ``triggers``.
+
+        Args:
+            triggers: Canonical trigger phrases.
+            n: Character n-gram length.
+            min_similarity: Dice score below which fuzzy matches are dropped.
+            prefix_score: Minimum score given to word-prefix matches.
+            max_prefix_matches: Cap on prefix matches collected per query.
+
+        """
+        self._n = n
+        self._min_similarity = min_similarity
+        self._prefix_score = prefix_score
+        self._max_prefix_matches = max_prefix_matches
+        self._postings: Dict[str, Set[str]] = {}
+        self._grams: Dict[str, FrozenSet[str]] = {}
+        self._words: List[Tuple[str, str]] = []
+        self._pending_words: Set[Tuple[str, str]] = set()
+        for trigger in triggers:
+            self.add(trigger)
+
+    def __len__(self) -> int:
+        """Return the number of indexed triggers."""
+        return len(self._grams)
+
+    def __contains__(self, trigger: object) -> bool:
+        """Return whether ``trigger`` is indexed."""
+        return trigger in self._grams
+
+    def ngrams(self, text: str) -> FrozenSet[str]:
+        """Return the padded character n-grams of ``text``."""
+        padded = f"{self.BOUNDARY}{text}{self.BOUNDARY}"
+        if len(padded) <= self._n:
+            return frozenset((padded,))
+        return frozenset(
+            padded[start : start + self._n]
+            for start in range(len(padded) - self._n + 1)
+        )
+
+    def add(self, trigger: str) -> None:
+        """Index ``trigger`` (no-op if already present)."""
+        if not trigger or trigger in self._grams:
+            return
+        grams = self.ngrams(trigger)
+        self._grams[trigger] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(trigger)
+        self._pending_words.update((word, trigger) for word in trigger.split())
+
+    def remove(self, trigger: str) -> None:
+        """Drop ``trigger`` from the index."""
+        grams = self._grams.pop(trigger, None)
+        if grams is None:
+            return
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(trigger)
+                if not posting:
+                    del self._postings[gram]
+        for word in set(trigger.split()):
+            entry = (word, trigger)
+            if entry in self._pending_words:
+                self._pending_words.discard(entry)
+                continue
+            position = bisect_left(self._words, entry)
+            if position < len(self._words) and self._words[position] == entry:
+                del self._words[position]
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[str, float]]:
+        """Return up to ``limit`` ``(trigger, score)`` pairs, best first.
+
+        Scores lie in ``(0, 1]``; an exact trigger scores ``1.0``.
+        """
+        if not query or limit <= 0 or not self._grams:
+            return []
+
+        query_grams = self.ngrams(query)
+        shared: Counter[str] = Counter()
+        for gram in query_grams:
+            shared.update(self._postings.get(gram, ()))
+
+        scores: Dict[str, float] = {}
+        for trigger, overlap in shared.items():
+            score = 2.0 * overlap / (len(query_grams) + len(self._grams[trigger]))
+            if score >= self._min_similarity:
+                scores[trigger] = score
+
+        for trigger in self._prefix_matches(query):
+            scores[trigger] = max(scores.get(trigger, 0.0), self._prefix_score)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def _prefix_matches(self, query: str) -> Set[str]:
+        if self._pending_words:
+            # The table is sorted already, so this sort is a single merge.
+            self._words.extend(sorted(self._pending_words))
+            self._words.sort()
+            self._pending_words.clear()
+        matches: Set[str] = set()
+        position = bisect_left(self._words, (query, ""))
+        while position < len(self._words) and len(matches) < self._max_prefix_matches:
+            word, trigger = self._words[position]
+            if not word.startswith(query):
+                break
+            matches.add(trigger)
+            position += 1
+        return matches
+
+
+__all__ = ["TriggerNgramIndex"]
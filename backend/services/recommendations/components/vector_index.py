@@ -0,0 +1,545 @@
+"""Pluggable vector indexes backing the recommendation similarity search."""
+
+from __future__ import annotations
+
+import logging
+import math
+from typing import Any, Optional, Protocol, Tuple, Union, runtime_checkable
+
+import numpy as np
+
+from .quantization import QuantizedMatrix
+from .row_buffer import RowBuffer
+
+INDEX_BACKENDS: tuple[str, ...] = ("exact", "ivf", "faiss_ivf", "faiss_hnsw")
+
+# Float32 rows, or fused rows kept in a compact dtype by the engine.
+IndexVectors = Union[np.ndarray, QuantizedMatrix]
+
+# FAISS scalar quantizer used to store each compact precision.
+_FAISS_QTYPES = {"float16": "QT_fp16", "int8": "QT_8bit"}
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return indices of the ``k`` highest ``scores`` in descending order.
+
+    Uses ``np.argpartition`` so only the selected slice is sorted.
+    """
+    size = scores.shape[0]
+    if k <= 0 or size == 0:
+        return np.zeros(0, dtype=np.int64)
+    if k >= size:
+        return np.argsort(scores)[::-1]
+    partition = np.argpartition(scores, size - k)[size - k :]
+    return partition[np.argsort(scores[partition])[::-1]]
+
+
+@runtime_checkable
+class VectorIndexProtocol(Protocol):
+    """Inner-product search index over L2-normalised row vectors."""
+
+    name: str
+
+    @property
+    def size(self) -> int:
+        """Return the number of indexed vectors."""
+
+    def build(self, vectors: np.ndarray) -> None:
+        """Replace the index contents with ``vectors``."""
+
+    def add(self, vectors: np.ndarray) -> None:
+        """Append ``vectors`` to the index without retraining."""
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(scores, indices)`` of shape ``(len(queries), k)``.
+
+        Slots without a match hold index ``-1`` and score ``-inf``.
+        """
+
+
+def _empty_result(n_queries: int, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    return (
+        np.full((n_queries, k), -np.inf, dtype=np.float32),
+        np.full((n_queries, k), -1, dtype=np.int64),
+    )
+
+
+def _as_matrix(vectors: np.ndarray) -> np.ndarray:
+    matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    return matrix
+
+
+def _row_count(vectors: IndexVectors) -> int:
+    if isinstance(vectors, QuantizedMatrix):
+        return vectors.rows
+    return int(vectors.shape[0])
+
+
+def _float_rows(vectors: IndexVectors, rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """Return float32 fused ``rows`` (all rows if ``None``) of ``vectors``."""
+    if isinstance(vectors, QuantizedMatrix):
+        return np.hstack(vectors.dequantize(rows))
+    return _as_matrix(vectors if rows is None else vectors[rows])
+
+
+def _scores(vectors: IndexVectors, queries: np.ndarray) -> np.ndarray:
+    """Return the ``(N, Q)`` inner products of every row with ``queries``.
+
+    Compact rows are scored block by block in their storage dtype, so no
+    float32 copy of the whole matrix is made.
+    """
+    if isinstance(vectors, QuantizedMatrix):
+        return vectors.scores([queries[:, lo:hi] for lo, hi in vectors.segments])
+    return vectors @ queries.T
+
+
+def _dimension(vectors: IndexVectors) -> int:
+    if isinstance(vectors, QuantizedMatrix):
+        return vectors.segments[-1][1] if vectors.segments else 0
+    return int(vectors.shape[1]) if vectors.ndim == 2 else int(vectors.shape[0])
+
+
+def _iter_blocks(vectors: IndexVectors, block_rows: int = 4096):
+    """Yield float32 fused blocks of at most ``block_rows`` rows."""
+    count = _row_count(vectors)
+    for start in range(0, count, block_rows):
+        yield _float_rows(vectors, np.arange(start, min(start + block_rows, count)))
+
+
+class ExactVectorIndex:
+    """Brute-force inner-product search used as the accuracy reference."""
+
+    name = "exact"
+
+    def __init__(self) -> None:
+        """Create an empty exact index."""
+        self._vectors = RowBuffer(np.zeros((0, 0), dtype=np.float32))
+
+    @property
+    def size(self) -> int:
+        """Return the number of indexed vectors."""
+        return self._vectors.size
+
+    def build(self, vectors: np.ndarray) -> None:
+        """Store ``vectors`` for brute-force scoring."""
+        self._vectors = RowBuffer(_as_matrix(vectors))
+
+    def add(self, vectors: np.ndarray) -> None:
+        """Append ``vectors`` to the stored matrix (amortised O(1) per row)."""
+        if self.size == 0:
+            self.build(vectors)
+            return
+        self._vectors.append(_as_matrix(vectors))
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Score every vector and return the top ``k`` per query."""
+        queries = _as_matrix(queries)
+        scores_out, indices_out = _empty_result(queries.shape[0], k)
+        if self.size == 0 or k <= 0:
+            return scores_out, indices_out
+
+        similarities = queries @ self._vectors.view.T
+        for row, row_scores in enumerate(similarities):
+            top = top_k_indices(row_scores, k)
+            scores_out[row, : len(top)] = row_scores[top]
+            indices_out[row, : len(top)] = top
+        return scores_out, indices_out
+
+
+class NumpyIVFIndex:
+    """Inverted-file index with spherical k-means, implemented in numpy.
+
+    Vectors are bucketed by their nearest centroid; queries only score the
+    ``nprobe`` closest buckets. Used when FAISS is not installed.
+
+    Vectors and inverted lists live in capacity-doubling buffers, so
+    :meth:`add` only assigns the new rows. A :class:`QuantizedMatrix` passed
+    to :meth:`build` is kept in its compact dtype, sharing the caller's
+    arrays until the index first grows; only probed candidates are
+    dequantized. :meth:`add` grows that storage in place and :meth:`take`
+    keeps only the given rows, renumbering them; neither retrains the
+    centroids. :attr:`needs_retrain` reports when the rows added
+    or removed since training exceed ``retrain_ratio`` of the rows the
+    centroids were trained on.
+    """
+
+    name = "ivf"
+
+    def __init__(
+        self,
+        *,
+        nlist: int = 0,
+        nprobe: int = 8,
+        n_iter: int = 10,
+        training_sample: int = 256,
+        seed: int = 0,
+        retrain_ratio: float = 0.5,
+    ) -> None:
+        """Configure list count (``0`` picks ``sqrt(N)``) and probe width."""
+        self._requested_nlist = nlist
+        self.nprobe = nprobe
+        self._n_iter = n_iter
+        self._training_sample = training_sample
+        self._seed = seed
+        self._retrain_ratio = retrain_ratio
+        self._vectors: Union[RowBuffer, QuantizedMatrix] = RowBuffer(
+            np.zeros((0, 0), dtype=np.float32)
+        )
+        self._centroids = np.zeros((0, 0), dtype=np.float32)
+        self._lists: list[RowBuffer] = []
+        self._trained_rows = 0
+        self._changed_rows = 0
+
+    @property
+    def size(self) -> int:
+        """Return the number of indexed vectors."""
+        return _row_count(self._stored())
+
+    @property
+    def nlist(self) -> int:
+        """Return the number of trained inverted lists."""
+        return int(self._centroids.shape[0])
+
+    @property
+    def needs_retrain(self) -> bool:
+        """Return whether the data drifted enough to warrant retraining."""
+        return bool(self._trained_rows) and (
+            self._changed_rows > self._retrain_ratio * self._trained_rows
+        )
+
+    def build(self, vectors: IndexVectors) -> None:
+        """Train centroids on ``vectors`` and populate the inverted lists."""
+        if isinstance(vectors, QuantizedMatrix):
+            self._vectors = QuantizedMatrix(
+                vectors.values,
+                vectors.scales,
+                vectors.segments,
+                block_rows=vectors.block_rows,
+            )
+        else:
+            self._vectors = RowBuffer(_as_matrix(vectors))
+        stored = self._stored()
+        self._changed_rows = 0
+        count = self.size
+        self._trained_rows = count
+        if count == 0:
+            self._centroids = np.zeros((0, _dimension(stored)), dtype=np.float32)
+            self._lists = []
+            return
+
+        nlist = self._requested_nlist or int(math.sqrt(count))
+        nlist = max(1, min(nlist, count))
+        self._centroids = self._train(stored, nlist)
+        assignments = self._assign(stored)
+        self._lists = [
+            RowBuffer(np.flatnonzero(assignments == list_id))
+            for list_id in range(nlist)
+        ]
+
+    def add(self, vectors: IndexVectors) -> None:
+        """Assign ``vectors`` to existing lists, training first if empty."""
+        if self.nlist == 0:
+            self.build(vectors)
+            return
+        offset = self.size
+        stored = self._vectors
+        if isinstance(stored, QuantizedMatrix):
+            if (
+                not isinstance(vectors, QuantizedMatrix)
+                or vectors.precision != stored.precision
+            ):
+                matrix = _float_rows(vectors)
+                vectors = QuantizedMatrix.quantize(
+                    [matrix[:, lo:hi] for lo, hi in stored.segments],
+                    stored.precision,
+                )
+            stored.append(vectors)
+        else:
+            vectors = _float_rows(vectors)
+            stored.append(vectors)
+        assignments = self._assign(vectors)
+        self._changed_rows += len(assignments)
+        for list_id in np.unique(assignments):
+            rows = np.flatnonzero(assignments == list_id) + offset
+            self._lists[list_id].append(rows)
+
+    def take(self, indices: np.ndarray) -> None:
+        """Keep only the rows at ``indices`` (renumbered in that order)."""
+        indices = np.asarray(indices, dtype=np.int64)
+        renumbered = np.full(self.size, -1, dtype=np.int64)
+        renumbered[indices] = np.arange(len(indices))
+        self._changed_rows += self.size - len(indices)
+        self._vectors.take(indices)
+        for position, rows in enumerate(self._lists):
+            mapped = renumbered[rows.view]
+            self._lists[position] = RowBuffer(mapped[mapped >= 0])
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Score vectors in the ``nprobe`` nearest lists for each query."""
+        queries = _as_matrix(queries)
+        scores_out, indices_out = _empty_result(queries.shape[0], k)
+        if self.size == 0 or k <= 0:
+            return scores_out, indices_out
+
+        stored = self._stored()
+        centroid_scores = queries @ self._centroids.T
+        for row, query in enumerate(queries):
+            probes = top_k_indices(centroid_scores[row], self.nprobe)
+            candidates = np.concatenate([self._lists[probe].view for probe in probes])
+            if candidates.size == 0:
+                continue
+            candidate_scores = _float_rows(stored, candidates) @ query
+            top = top_k_indices(candidate_scores, k)
+            scores_out[row, : len(top)] = candidate_scores[top]
+            indices_out[row, : len(top)] = candidates[top]
+        return scores_out, indices_out
+
+    def _stored(self) -> IndexVectors:
+        if isinstance(self._vectors, RowBuffer):
+            return self._vectors.view
+        return self._vectors
+
+    def _train(self, vectors: IndexVectors, nlist: int) -> np.ndarray:
+        rng = np.random.default_rng(self._seed)
+        count = _row_count(vectors)
+        sample_size = min(count, nlist * self._training_sample)
+        sample = _float_rows(vectors, rng.choice(count, sample_size, replace=False))
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+        for _ in range(self._n_iter):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            counts = np.bincount(assignments, minlength=nlist)
+            empty = counts == 0
+            # Re-seed empty lists so every centroid keeps a share of the data.
+            if empty.any():
+                sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1
+            centroids = (sums / norms).astype(np.float32)
+        return centroids
+
+    def _assign(self, vectors: IndexVectors) -> np.ndarray:
+        return np.argmax(_scores(vectors, self._centroids), axis=1)
+
+
+class FaissVectorIndex:
+    """FAISS IVF or HNSW index using inner-product metric.
+
+    Float32 input is stored flat. A :class:`QuantizedMatrix` is stored with
+    the matching FAISS scalar quantizer (fp16 or 8-bit) and added block by
+    block, so no float32 copy of the whole matrix is made.
+
+    :meth:`take` re-adds the kept vectors without retraining the IVF
+    quantizer; :attr:`needs_retrain` turns true once the rows added or
+    removed since an IVF index was trained exceed ``retrain_ratio`` of them.
+    """
+
+    def __init__(
+        self,
+        faiss_module: Any,
+        *,
+        kind: str = "ivf",
+        nlist: int = 0,
+        nprobe: int = 8,
+        hnsw_m: int = 32,
+        ef_search: int = 64,
+        retrain_ratio: float = 0.5,
+    ) -> None:
+        """Store FAISS configuration; the index is created on ``build``."""
+        if kind not in {"ivf", "hnsw"}:
+            raise ValueError(f"Unsupported FAISS index kind: {kind}")
+        self._faiss = faiss_module
+        self._kind = kind
+        self._requested_nlist = nlist
+        self.nprobe = nprobe
+        self._hnsw_m = hnsw_m
+        self._ef_search = ef_search
+        self._retrain_ratio = retrain_ratio
+        self._trained_rows = 0
+        self._changed_rows = 0
+        self._index: Any | None = None
+        self.name = f"faiss_{kind}"
+
+    @property
+    def size(self) -> int:
+        """Return the number of indexed vectors."""
+        return int(self._index.ntotal) if self._index is not None else 0
+
+    @property
+    def needs_retrain(self) -> bool:
+        """Return whether the IVF lists were trained on too few rows."""
+        if self._kind == "hnsw" or not self._trained_rows:
+            return False
+        return self._changed_rows > self._retrain_ratio * self._trained_rows
+
+    def build(self, vectors: IndexVectors) -> None:
+        """Create, train and populate the FAISS index."""
+        if not isinstance(vectors, QuantizedMatrix):
+            vectors = _as_matrix(vectors)
+        faiss = self._faiss
+        count = _row_count(vectors)
+        dim = _dimension(vectors)
+        metric = faiss.METRIC_INNER_PRODUCT
+        qtype = None
+        if isinstance(vectors, QuantizedMatrix):
+            qtype = getattr(faiss.ScalarQuantizer, _FAISS_QTYPES[vectors.precision])
+
+        nlist = 1
+        if self._kind == "hnsw":
+            if qtype is None:
+                index = faiss.IndexHNSWFlat(dim, self._hnsw_m, metric)
+            else:
+                index = faiss.IndexHNSWSQ(dim, qtype, self._hnsw_m, metric)
+            index.hnsw.efSearch = self._ef_search
+        else:
+            nlist = self._requested_nlist or int(math.sqrt(max(count, 1)))
+            nlist = max(1, min(nlist, count))
+            quantizer = faiss.IndexFlatIP(dim)
+            if qtype is None:
+                index = faiss.IndexIVFFlat(quantizer, dim, nlist, metric)
+            else:
+                index = faiss.IndexIVFScalarQuantizer(
+                    quantizer, dim, nlist, qtype, metric
+                )
+            index.nprobe = min(self.nprobe, nlist)
+            # Lets take() reconstruct stored vectors by row id.
+            index.make_direct_map()
+            # Keep a reference so the quantizer outlives the Python wrapper.
+            index._quantizer_ref = quantizer
+
+        if count and not index.is_trained:
+            rng = np.random.default_rng(0)
+            sample = rng.choice(count, min(count, nlist * 256), replace=False)
+            index.train(_float_rows(vectors, np.sort(sample)))
+        for block in _iter_blocks(vectors):
+            index.add(block)
+        self._index = index
+        self._trained_rows = count
+        self._changed_rows = 0
+
+    def add(self, vectors: IndexVectors) -> None:
+        """Append ``vectors`` to the trained index."""
+        if self._index is None or not getattr(self._index, "is_trained", True):
+            self.build(vectors)
+            return
+        for block in _iter_blocks(vectors):
+            self._index.add(block)
+        self._changed_rows += _row_count(vectors)
+
+    def take(self, indices: np.ndarray) -> None:
+        """Keep only the rows at ``indices`` without retraining.
+
+        FAISS numbers rows by insertion order, so the kept vectors are
+        reconstructed and re-added to the emptied (still trained) index.
+        """
+        if self._index is None:
+            return
+        kept = self._index.reconstruct_n(0, self.size)[np.asarray(indices)]
+        self._changed_rows += self.size - len(kept)
+        self._index.reset()
+        if len(kept):
+            self._index.add(np.ascontiguousarray(kept, dtype=np.float32))
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Delegate the search to FAISS."""
+        queries = _as_matrix(queries)
+        if self._index is None or self.size == 0 or k <= 0:
+            return _empty_result(queries.shape[0], k)
+        scores, indices = self._index.search(queries, k)
+        scores = np.where(indices < 0, -np.inf, scores).astype(np.float32)
+        return scores, indices.astype(np.int64)
+
+
+def create_vector_index(
+    backend: str,
+    *,
+    nlist: int = 0,
+    nprobe: int = 8,
+    hnsw_m: int = 32,
+    logger: Optional[logging.Logger] = None,
+) -> VectorIndexProtocol:
+    """Return a vector index for ``backend``, degrading gracefully.
+
+    FAISS backends fall back to :class:`NumpyIVFIndex` when ``faiss`` is not
+    installed so the configured trade-off is still approximately honoured.
+    """
+    logger = logger or logging.getLogger(__name__)
+    if backend not in INDEX_BACKENDS:
+        raise ValueError(
+            f"Unknown index backend '{backend}'; expected one of "
+            f"{', '.join(INDEX_BACKENDS)}",
+        )
+
+    if backend == "exact":
+        return ExactVectorIndex()
+    if backend == "ivf":
+        return NumpyIVFIndex(nlist=nlist, nprobe=nprobe)
+
+    try:
+        import faiss  # type: ignore
+    except ImportError:
+        logger.warning(
+            "FAISS not available for '%s'; falling back to numpy IVF index",
+            backend,
+        )
+        return NumpyIVFIndex(nlist=nlist, nprobe=nprobe)
+
+    kind = backend.split("_", 1)[1]
+    return FaissVectorIndex(
+        faiss,
+        kind=kind,
+        nlist=nlist,
+        nprobe=nprobe,
+        hnsw_m=hnsw_m,
+    )
+
+
+def measure_recall_at_k(
+    index: VectorIndexProtocol,
+    vectors: IndexVectors,
+    *,
+    k: int = 10,
+    sample_size: int = 64,
+    seed: int = 0,
+) -> float:
+    """Return the mean recall@k of ``index`` against exact search.
+
+    Queries are drawn from ``vectors`` themselves, which are the rows the
+    index was built from. The exact reference is scored in the storage
+    dtype of ``vectors`` without copying them.
+    """
+    if not isinstance(vectors, QuantizedMatrix):
+        vectors = _as_matrix(vectors)
+    count = _row_count(vectors)
+    if count == 0 or k <= 0:
+        return 1.0
+
+    k = min(k, count)
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(count, min(sample_size, count), replace=False)
+    queries = _float_rows(vectors, rows)
+
+    expected = _scores(vectors, queries)
+    _, actual = index.search(queries, k)
+
+    hits = 0
+    for column, actual_row in enumerate(actual):
+        expected_row = top_k_indices(expected[:, column], k)
+        hits += len(set(expected_row.tolist()) & set(actual_row.tolist()))
+    return hits / float(len(rows) * k)
+
+
+__all__ = [
+    "ExactVectorIndex",
+    "FaissVectorIndex",
+    "INDEX_BACKENDS",
+    "NumpyIVFIndex",
+    "VectorIndexProtocol",
+    "create_vector_index",
+    "measure_recall_at_k",
+    "top_k_indices",
+]
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import logging
 import time
 from datetime import datetime, timezone
-from typing import Any, Dict, Sequence
+from typing import Any, Dict, Optional, Sequence
 
 from .embedding_computer import EmbeddingComputer
 from .embedding_repository import LoRAEmbeddingRepository
@@ -17,10 +18,13 @@ class EmbeddingBatchRunner:
         self,
         repository: LoRAEmbeddingRepository,
         computer: EmbeddingComputer,
+        *,
+        logger: Optional[logging.Logger] = None,
     ) -> None:
         """Initialise the batch runner with persistence and compute helpers."""
         self._repository = repository
         self._computer = computer
+        self._logger = logger or logging.getLogger(__name__)
 
     async def run(
         self,
@@ -28,8 +32,19 @@ class EmbeddingBatchRunner:
         *,
         force_recompute: bool = False,
         batch_size: int = 32,
+        skip_unchanged: bool = False,
     ) -> Dict[str, Any]:
-        """Compute embeddings for ``adapter_ids`` (or all active adapters)."""
+        """Compute embeddings for ``adapter_ids`` (or all active adapters).
+
+        Each chunk of ``batch_size`` adapters is encoded with one model call
+        per modality and persisted in one transaction. A failing chunk is
+        retried adapter by adapter so errors are reported per adapter.
+
+        With ``skip_unchanged``, forced recomputes skip adapters whose stored
+        content hash matches their current payloads and models; those only
+        get their scores rewritten and count towards ``skipped_count`` and
+        ``unchanged_count``.
+        """
         start_time = time.time()
 
         adapters = self._repository.list_adapters(adapter_ids)
@@ -47,12 +62,32 @@ class EmbeddingBatchRunner:
             ]
             skipped_due_to_existing = pre_filter_count - len(adapters)
 
+        unchanged_count = 0
+        if force_recompute and skip_unchanged:
+            unchanged = self._computer.unchanged_ids(adapters)
+            self._computer.refresh_scores(
+                [adapter for adapter in adapters if adapter.id in unchanged],
+            )
+            adapters = [adapter for adapter in adapters if adapter.id not in unchanged]
+            unchanged_count = len(unchanged)
+
         processed_count = 0
         error_count = 0
         errors: list[Dict[str, str]] = []
 
         for start in range(0, len(adapters), batch_size):
             batch = adapters[start : start + batch_size]
+            try:
+                processed_count += await self._computer.compute_batch(batch)
+                continue
+            except Exception as exc:
+                self._logger.warning(
+                    "Batch of %s adapters failed (%s); retrying one by one",
+                    len(batch),
+                    exc,
+                )
+
+            # Retry individually so one bad adapter does not fail the chunk.
             for adapter in batch:
                 try:
                     await self._computer.compute(
@@ -73,7 +108,8 @@ class EmbeddingBatchRunner:
 
         return {
             "processed_count": processed_count,
-            "skipped_count": skipped_due_to_existing,
+            "skipped_count": skipped_due_to_existing + unchanged_count,
+            "unchanged_count": unchanged_count,
             "error_count": error_count,
             "processing_time_seconds": processing_time,
             "errors": errors,
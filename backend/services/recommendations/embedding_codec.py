@@ -0,0 +1,141 @@
+"""Compact binary encoding for stored embedding vectors.
+
+A blob is a fixed header followed by the raw little-endian array bytes::
+
+    magic "LEMB" | version u8 | dtype u8 | ndim u8 | model id length u8
+    | shape (ndim x u32) | model id (utf-8) | data
+
+Decoding returns a read-only view over the blob via ``np.frombuffer``, so
+readers never copy or unpickle anything.
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"LEMB"
+VERSION = 1
+
+_PREFIX = struct.Struct("<4sBBBB")
+_DTYPES = {1: np.dtype("<f2"), 2: np.dtype("<f4")}
+_DTYPE_CODES = {dtype: code for code, dtype in _DTYPES.items()}
+
+STORAGE_DTYPES = ("float32", "float16")
+
+
+@dataclass(frozen=True)
+class EmbeddingHeader:
+    """Metadata stored in front of an encoded embedding."""
+
+    dtype: np.dtype
+    shape: Tuple[int, ...]
+    model_id: str
+    data_offset: int
+
+
+def encode_embedding(
+    vector: Any,
+    *,
+    dtype: str = "float32",
+    model_id: str = "",
+) -> bytes:
+    """Return ``vector`` encoded as a header plus raw little-endian bytes.
+
+    Args:
+        vector: Array-like of any shape with at most 255 dimensions.
+        dtype: Storage precision, ``"float32"`` or ``"float16"``.
+        model_id: Identifier of the model that produced the vector.
+
+    """
+    if dtype not in STORAGE_DTYPES:
+        raise ValueError(f"Unsupported embedding dtype: {dtype}")
+    storage = np.dtype(dtype).newbyteorder("<")
+    array = np.ascontiguousarray(vector, dtype=storage)
+    model_bytes = model_id.encode("utf-8")
+    if len(model_bytes) > 255:
+        raise ValueError("model_id must encode to at most 255 bytes")
+    header = _PREFIX.pack(
+        MAGIC, VERSION, _DTYPE_CODES[storage], array.ndim, len(model_bytes)
+    ) + struct.pack(f"<{array.ndim}I", *array.shape)
+    return header + model_bytes + array.tobytes()
+
+
+def read_header(blob: bytes | bytearray | memoryview) -> EmbeddingHeader:
+    """Parse the header of an encoded embedding.
+
+    Raises:
+        ValueError: If ``blob`` is not an encoded embedding.
+
+    """
+    if len(blob) < _PREFIX.size:
+        raise ValueError("Embedding blob is truncated")
+    magic, version, dtype_code, ndim, model_length = _PREFIX.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("Not an encoded embedding")
+    if version != VERSION or dtype_code not in _DTYPES:
+        raise ValueError(f"Unsupported embedding encoding {version}/{dtype_code}")
+    shape = struct.unpack_from(f"<{ndim}I", blob, _PREFIX.size)
+    model_start = _PREFIX.size + 4 * ndim
+    model_end = model_start + model_length
+    return EmbeddingHeader(
+        dtype=_DTYPES[dtype_code],
+        shape=tuple(shape),
+        model_id=bytes(blob[model_start:model_end]).decode("utf-8"),
+        data_offset=model_end,
+    )
+
+
+def decode_embedding(blob: bytes | bytearray | memoryview) -> np.ndarray:
+    """Return the array stored in ``blob`` as a zero-copy view.
+
+    The view has the stored dtype (``float16`` or ``float32``) and is
+    read-only when ``blob`` is immutable; callers that need ``float32``
+    should convert explicitly.
+    """
+    header = read_header(blob)
+    count = int(np.prod(header.shape, dtype=np.int64))
+    array = np.frombuffer(
+        blob, dtype=header.dtype, count=count, offset=header.data_offset
+    )
+    return array.reshape(header.shape)
+
+
+def decode_current_embeddings(
+    blobs: Mapping[str, Optional[bytes]],
+    model_versions: Optional[Mapping[str, str]] = None,
+) -> Optional[Dict[str, np.ndarray]]:
+    """Decode a row's modality ``blobs`` if they are complete and current.
+
+    Returns ``None`` when any blob is missing or, for each modality listed in
+    ``model_versions``, when its header names another model. Blobs written
+    without a model id never match, so they are re-encoded like missing rows.
+    """
+    if not all(blobs.values()):
+        return None
+    if model_versions:
+        for key, blob in blobs.items():
+            if key in model_versions and (
+                read_header(blob).model_id != model_versions[key]
+            ):
+                return None
+    return {key: decode_embedding(blob) for key, blob in blobs.items()}
+
+
+def is_encoded_embedding(blob: Optional[bytes]) -> bool:
+    """Return whether ``blob`` starts with the codec's magic bytes."""
+    return bool(blob) and bytes(blob[: len(MAGIC)]) == MAGIC
+
+
+__all__ = [
+    "EmbeddingHeader",
+    "STORAGE_DTYPES",
+    "decode_current_embeddings",
+    "decode_embedding",
+    "encode_embedding",
+    "is_encoded_embedding",
+    "read_header",
+]
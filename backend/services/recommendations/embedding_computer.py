@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Callable
+from typing import Any, Callable, Sequence, Set
 
 from .components.interfaces import FeatureExtractorProtocol
 from .embedding_repository import LoRAEmbeddingRepository
@@ -28,14 +28,69 @@ class EmbeddingComputer:
             extractor.extract_prompt_features, prompt, device=device
         )
 
-    async def compute(self, adapter_id: str, *, force_recompute: bool = False) -> bool:
-        """Compute embeddings for ``adapter_id`` and persist them."""
+    def unchanged_ids(self, adapters: Sequence[Any]) -> Set[str]:
+        """Return ids of ``adapters`` whose stored content hash is still current.
+
+        Recomputing those would reproduce the stored vectors. Hashes are
+        derived from metadata and model ids only, so no model runs here.
+        """
+        if not adapters:
+            return set()
+        extractor = self._feature_extractor_getter()
+        content_hash = getattr(extractor, "content_hash", None)
+        if not callable(content_hash):
+            return set()
+        stored = self._repository.get_content_hashes(
+            [adapter.id for adapter in adapters],
+        )
+        if not stored:
+            return set()
+        return {
+            adapter.id
+            for adapter in adapters
+            if adapter.id in stored and stored[adapter.id] == content_hash(adapter)
+        }
+
+    def refresh_scores(self, adapters: Sequence[Any]) -> int:
+        """Rewrite the stored scores of ``adapters`` without running models.
+
+        Scores depend on usage stats the content hash does not cover, so
+        adapters skipped as unchanged still get them refreshed. Returns the
+        number of rows updated.
+        """
+        if not adapters:
+            return 0
+        extractor = self._feature_extractor_getter()
+        calculator = getattr(extractor, "score_calculator", None)
+        compute_many = getattr(calculator, "compute_many", None)
+        if not callable(compute_many):
+            return 0
+        return self._repository.update_scores(
+            [adapter.id for adapter in adapters],
+            compute_many(adapters),
+        )
+
+    async def compute(
+        self,
+        adapter_id: str,
+        *,
+        force_recompute: bool = False,
+        skip_unchanged: bool = False,
+    ) -> bool:
+        """Compute embeddings for ``adapter_id`` and persist them.
+
+        With ``skip_unchanged`` a forced recompute only rescores the adapter
+        when the stored content hash matches its current inputs.
+        """
         adapter = self._repository.get_adapter(adapter_id)
         if adapter is None:
             raise ValueError(f"Adapter {adapter_id} not found")
 
         if not force_recompute and self._repository.embedding_exists(adapter_id):
             return True
+        if force_recompute and skip_unchanged and self.unchanged_ids([adapter]):
+            self.refresh_scores([adapter])
+            return True
 
         extractor = self._feature_extractor_getter()
 
@@ -57,3 +112,43 @@ class EmbeddingComputer:
             ) from exc
 
         return True
+
+    async def compute_batch(self, adapters: Sequence[Any]) -> int:
+        """Compute and persist embeddings for ``adapters`` as one unit.
+
+        Every model is invoked once for the whole batch and all rows are
+        written in a single transaction. Returns the number of adapters.
+        """
+        if not adapters:
+            return 0
+
+        extractor = self._feature_extractor_getter()
+        batch_extract = getattr(extractor, "extract_advanced_features_batch", None)
+        try:
+            if callable(batch_extract):
+                features = await asyncio.to_thread(batch_extract, list(adapters))
+            else:
+                features = await asyncio.to_thread(
+                    lambda: [
+                        extractor.extract_advanced_features(adapter)
+                        for adapter in adapters
+                    ],
+                )
+        except Exception as exc:
+            raise RuntimeError(
+                f"Failed to extract features for {len(adapters)} adapters: {exc}",
+            ) from exc
+
+        try:
+            self._repository.save_features_batch(
+                {
+                    adapter.id: item
+                    for adapter, item in zip(adapters, features, strict=True)
+                },
+            )
+        except Exception as exc:
+            raise RuntimeError(
+                f"Failed to persist embeddings for {len(adapters)} adapters: {exc}",
+            ) from exc
+
+        return len(adapters)
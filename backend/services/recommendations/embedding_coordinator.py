@@ -74,12 +74,18 @@ class EmbeddingCoordinator:
         *,
         force_recompute: bool = False,
         batch_size: int = 32,
+        skip_unchanged: bool = False,
     ) -> Dict[str, Any]:
-        """Compute embeddings for multiple adapters."""
+        """Compute embeddings for multiple adapters.
+
+        With ``skip_unchanged``, forced runs only rescore adapters whose
+        content hash is unchanged.
+        """
         return await self._embedding_workflow.batch_compute_embeddings(
             adapter_ids,
             force_recompute=force_recompute,
             batch_size=batch_size,
+            skip_unchanged=skip_unchanged,
         )
 
     async def refresh_similarity_index(
@@ -90,6 +96,10 @@ class EmbeddingCoordinator:
         """Rebuild and persist the similarity index cache."""
         return await self._persistence_service.rebuild_similarity_index(force=force)
 
+    async def warm_start_similarity_index(self) -> bool:
+        """Serve from the persisted index snapshot without running inference."""
+        return await self._persistence_service.load_similarity_index()
+
     # ------------------------------------------------------------------
     # Bootstrap helpers
     # ------------------------------------------------------------------
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, Sequence
+import asyncio
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import numpy as np
 
 from backend.models import Adapter
 
@@ -13,8 +16,9 @@ from .components.interfaces import (
 from .embedding_batch_runner import EmbeddingBatchRunner
 from .embedding_computer import EmbeddingComputer
 from .embedding_repository import LoRAEmbeddingRepository
+from .index_snapshot import IndexSnapshot
 from .model_registry import RecommendationModelRegistry
-from .similarity_index_builder import SimilarityIndexBuilder
+from .similarity_index_builder import SimilarityIndexBuilder, engine_model_versions
 
 
 class EmbeddingManager:
@@ -89,16 +93,22 @@ class EmbeddingManager:
         adapter_ids: Sequence[str] | None = None,
         force_recompute: bool = False,
         batch_size: int = 32,
+        skip_unchanged: bool = False,
     ) -> Dict[str, Any]:
         """Compute embeddings for multiple adapters efficiently."""
         return await self._batch_runner.run(
             adapter_ids,
             force_recompute=force_recompute,
             batch_size=batch_size,
+            skip_unchanged=skip_unchanged,
         )
 
     async def ensure_embeddings_exist(self, adapters: Sequence[Adapter]) -> None:
-        """Ensure embeddings exist for the provided adapters."""
+        """Ensure current embeddings exist for the provided adapters.
+
+        Adapters whose stored vectors were encoded by other models than the
+        engine's are recomputed like adapters without a stored embedding.
+        """
         adapter_ids = [adapter.id for adapter in adapters]
         existing_ids = self._repository.list_existing_embedding_ids(adapter_ids)
         missing_ids = [
@@ -108,6 +118,30 @@ class EmbeddingManager:
         if missing_ids:
             await self.batch_compute_embeddings(missing_ids)
 
+        model_versions = engine_model_versions(self._get_recommendation_engine())
+        existing = [
+            adapter_id for adapter_id in adapter_ids if adapter_id in existing_ids
+        ]
+        if model_versions and existing:
+            current = self._repository.get_embedding_vectors(existing, model_versions)
+            stale_ids = [
+                adapter_id for adapter_id in existing if adapter_id not in current
+            ]
+            if stale_ids:
+                await self.batch_compute_embeddings(stale_ids, force_recompute=True)
+
     async def build_similarity_index(self) -> None:
         """Build the in-memory similarity index for active adapters."""
         await self._index_builder.build()
+
+    async def stored_index_matrices(
+        self, lora_ids: Sequence[str]
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """Return the stored float32 vectors of ``lora_ids`` as row matrices."""
+        return await asyncio.to_thread(
+            self._index_builder.stored_matrices_for, lora_ids
+        )
+
+    async def load_similarity_index(self, snapshot: IndexSnapshot) -> bool:
+        """Populate the similarity index from a persisted snapshot."""
+        return await self._index_builder.load_snapshot(snapshot)
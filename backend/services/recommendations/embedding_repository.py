@@ -2,26 +2,46 @@
 
 from __future__ import annotations
 
-import pickle
 from datetime import datetime, timezone
-from typing import Any, Mapping, Sequence, Set
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence, Set, Tuple
 
-from sqlmodel import Session, select
+import numpy as np
+from sqlalchemy import bindparam
+from sqlmodel import Session, func, select
 
 from backend.models import Adapter, LoRAEmbedding
 
+from .embedding_codec import (
+    STORAGE_DTYPES,
+    decode_current_embeddings,
+    encode_embedding,
+)
+
+# Stored score column -> key in the feature dict and score columns.
+_SCORE_COLUMNS = {
+    "quality_score": "quality_score",
+    "popularity_score": "popularity_score",
+    "recency_score": "recency_score",
+    "compatibility_score": "sd_compatibility_score",
+}
+
 
 class LoRAEmbeddingRepository:
     """Encapsulate database access for LoRA embedding records."""
 
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, *, embedding_dtype: str = "float32") -> None:
         """Create a repository bound to the provided database session.
 
         Args:
             session: Active SQLModel session used for queries and persistence.
+            embedding_dtype: Precision vectors are stored in, ``"float32"`` or
+                ``"float16"``.
 
         """
+        if embedding_dtype not in STORAGE_DTYPES:
+            raise ValueError(f"Unsupported embedding dtype: {embedding_dtype}")
         self._session = session
+        self._embedding_dtype = embedding_dtype
 
     # ------------------------------------------------------------------
     # Lookup helpers
@@ -47,6 +67,23 @@ class LoRAEmbeddingRepository:
 
         return list(self._session.exec(stmt))
 
+    def count_adapters(self) -> int:
+        """Return the total number of adapters."""
+        return self._session.exec(select(func.count()).select_from(Adapter)).one()
+
+    def list_adapter_ids_page(
+        self, *, after: str | None = None, limit: int = 1000
+    ) -> list[str]:
+        """Return up to ``limit`` adapter ids greater than ``after``, in order.
+
+        Keyset pagination keeps every page a cheap index range scan, so a
+        full walk never materialises the whole adapter table.
+        """
+        stmt = select(Adapter.id).order_by(Adapter.id).limit(limit)
+        if after is not None:
+            stmt = stmt.where(Adapter.id > after)
+        return list(self._session.exec(stmt).all())
+
     def list_existing_embedding_ids(self, adapter_ids: Sequence[str]) -> Set[str]:
         """Return the subset of ``adapter_ids`` that already have embeddings."""
         if not adapter_ids:
@@ -57,6 +94,17 @@ class LoRAEmbeddingRepository:
         )
         return set(self._session.exec(stmt).all())
 
+    def get_content_hashes(self, adapter_ids: Sequence[str]) -> dict[str, str]:
+        """Return the stored content hash of each of ``adapter_ids`` that has one."""
+        if not adapter_ids:
+            return {}
+
+        stmt = select(LoRAEmbedding.adapter_id, LoRAEmbedding.content_hash).where(
+            LoRAEmbedding.adapter_id.in_(adapter_ids),
+            LoRAEmbedding.content_hash.is_not(None),
+        )
+        return dict(self._session.exec(stmt).all())
+
     def list_active_adapters_with_embeddings(self) -> list[Adapter]:
         """Return active adapters that have stored embeddings."""
         stmt = (
@@ -66,6 +114,78 @@ class LoRAEmbeddingRepository:
         )
         return list(self._session.exec(stmt))
 
+    def iter_active_embedding_vectors(
+        self,
+        model_versions: Optional[Mapping[str, str]] = None,
+    ) -> Iterator[Tuple[str, Optional[Dict[str, np.ndarray]]]]:
+        """Yield ``(adapter_id, vectors)`` for active adapters with embeddings.
+
+        ``vectors`` maps each modality to a read-only view over its stored
+        blob, or is ``None`` when any modality is missing or, given
+        ``model_versions``, was encoded by a different model.
+        """
+        stmt = (
+            select(
+                LoRAEmbedding.adapter_id,
+                LoRAEmbedding.semantic_embedding,
+                LoRAEmbedding.artistic_embedding,
+                LoRAEmbedding.technical_embedding,
+            )
+            .join(Adapter, Adapter.id == LoRAEmbedding.adapter_id)
+            .where(Adapter.active)
+        )
+        for adapter_id, semantic, artistic, technical in self._session.exec(stmt):
+            blobs = {"semantic": semantic, "artistic": artistic, "technical": technical}
+            yield adapter_id, decode_current_embeddings(blobs, model_versions)
+
+    def get_embedding_vectors(
+        self,
+        adapter_ids: Sequence[str],
+        model_versions: Optional[Mapping[str, str]] = None,
+    ) -> dict[str, Dict[str, np.ndarray]]:
+        """Return stored multi-modal vectors for ``adapter_ids``.
+
+        Adapters without an embedding row, with any modality missing or,
+        given ``model_versions``, encoded by a different model are left out
+        of the result.
+        """
+        if not adapter_ids:
+            return {}
+        stmt = select(
+            LoRAEmbedding.adapter_id,
+            LoRAEmbedding.semantic_embedding,
+            LoRAEmbedding.artistic_embedding,
+            LoRAEmbedding.technical_embedding,
+        ).where(LoRAEmbedding.adapter_id.in_(adapter_ids))
+        vectors: dict[str, Dict[str, np.ndarray]] = {}
+        for adapter_id, semantic, artistic, technical in self._session.exec(stmt):
+            blobs = {"semantic": semantic, "artistic": artistic, "technical": technical}
+            decoded = decode_current_embeddings(blobs, model_versions)
+            if decoded is not None:
+                vectors[adapter_id] = decoded
+        return vectors
+
+    def get_predicted_styles(
+        self, adapter_ids: Sequence[str] | None = None
+    ) -> dict[str, str]:
+        """Return ``adapter_id -> predicted_style`` for embeddings that have one.
+
+        Limited to ``adapter_ids`` when given.
+        """
+        stmt = select(LoRAEmbedding.adapter_id, LoRAEmbedding.predicted_style).where(
+            LoRAEmbedding.predicted_style.is_not(None),
+        )
+        if adapter_ids is not None:
+            if not adapter_ids:
+                return {}
+            stmt = stmt.where(LoRAEmbedding.adapter_id.in_(adapter_ids))
+        return dict(self._session.exec(stmt).all())
+
+    def get_last_embedding_update(self) -> datetime | None:
+        """Return the most recent ``last_computed`` across stored embeddings."""
+        stmt = select(func.max(LoRAEmbedding.last_computed))
+        return self._session.exec(stmt).one()
+
     # ------------------------------------------------------------------
     # Persistence helpers
     # ------------------------------------------------------------------
@@ -78,12 +198,122 @@ class LoRAEmbeddingRepository:
             self._session.rollback()
             raise
 
+    def save_features_batch(
+        self, features_by_id: Mapping[str, Mapping[str, Any]]
+    ) -> None:
+        """Persist features for several adapters in a single transaction.
+
+        Existing rows are loaded with one query; nothing is written if any
+        row fails.
+        """
+        if not features_by_id:
+            return
+        try:
+            stmt = select(LoRAEmbedding).where(
+                LoRAEmbedding.adapter_id.in_(list(features_by_id)),
+            )
+            existing = {
+                record.adapter_id: record for record in self._session.exec(stmt)
+            }
+            for adapter_id, features in features_by_id.items():
+                self._upsert_features(
+                    adapter_id, features, existing=existing.get(adapter_id)
+                )
+            self._session.commit()
+        except Exception:  # pragma: no cover - defensive rollback
+            self._session.rollback()
+            raise
+
+    def update_scores(
+        self, adapter_ids: Sequence[str], scores: Mapping[str, Sequence[float]]
+    ) -> int:
+        """Write rescored columns for ``adapter_ids`` back in bulk.
+
+        Stored scores are read with one query and only rows whose values
+        differ are written, with a single executemany ``UPDATE``.
+
+        Args:
+            adapter_ids: Adapters whose embedding rows are updated.
+            scores: Columns keyed like :meth:`ScoreCalculator.compute_many`,
+                with one value per adapter in ``adapter_ids``.
+
+        Returns:
+            The number of embedding rows updated. Adapters without a stored
+            embedding are skipped.
+
+        """
+        if not adapter_ids:
+            return 0
+        table = LoRAEmbedding.__table__
+        columns = list(_SCORE_COLUMNS)
+        new_values = np.column_stack([
+            np.asarray(scores[_SCORE_COLUMNS[column]], dtype=np.float64)
+            for column in columns
+        ])
+        stored_rows = {
+            row[0]: row[1:]
+            for row in self._session.execute(
+                select(
+                    table.c.adapter_id, *(table.c[column] for column in columns)
+                ).where(table.c.adapter_id.in_(adapter_ids))
+            )
+        }
+        present = np.fromiter(
+            (adapter_id in stored_rows for adapter_id in adapter_ids),
+            dtype=bool,
+            count=len(adapter_ids),
+        )
+        stored = np.full(new_values.shape, np.nan)
+        if stored_rows:
+            stored[present] = np.array(
+                [
+                    stored_rows[adapter_id]
+                    for adapter_id in adapter_ids
+                    if adapter_id in stored_rows
+                ],
+                dtype=np.float64,
+            )
+        changed = np.flatnonzero(present & (stored != new_values).any(axis=1))
+        if not len(changed):
+            return 0
+
+        stmt = (
+            table
+            .update()
+            .where(table.c.adapter_id == bindparam("row_id"))
+            .values({
+                **{column: bindparam(f"new_{column}") for column in columns},
+                "updated_at": datetime.now(timezone.utc),
+            })
+        )
+        names = [f"new_{column}" for column in columns]
+        params = [
+            {"row_id": adapter_ids[row], **dict(zip(names, values, strict=True))}
+            for row, values in zip(
+                changed.tolist(), new_values[changed].tolist(), strict=True
+            )
+        ]
+        try:
+            self._session.execute(stmt, params)
+            self._session.commit()
+        except Exception:  # pragma: no cover - defensive rollback
+            self._session.rollback()
+            raise
+        return len(params)
+
     # Internal utilities -------------------------------------------------
-    def _upsert_features(self, adapter_id: str, features: Mapping[str, Any]) -> None:
+    def _upsert_features(
+        self,
+        adapter_id: str,
+        features: Mapping[str, Any],
+        *,
+        existing: LoRAEmbedding | None = None,
+    ) -> None:
         now = datetime.now(timezone.utc)
         payload = self._serialize_features(features)
 
-        existing = self._session.get(LoRAEmbedding, adapter_id)
+        if existing is None:
+            existing = self._session.get(LoRAEmbedding, adapter_id)
 
         if existing:
             for field, value in payload.items():
@@ -100,22 +330,35 @@ class LoRAEmbeddingRepository:
         )
         self._session.add(record)
 
-    @staticmethod
-    def _serialize_features(features: Mapping[str, Any]) -> dict[str, Any]:
-        def serialize_embedding(value: Any) -> bytes | None:
+    def _serialize_features(self, features: Mapping[str, Any]) -> dict[str, Any]:
+        models = features.get("model_versions") or {}
+
+        def serialize_embedding(value: Any, model_key: str) -> bytes | None:
             if value is None:
                 return None
-            return pickle.dumps(value)
+            return encode_embedding(
+                value,
+                dtype=self._embedding_dtype,
+                model_id=str(models.get(model_key, "")),
+            )
+
+        trigger_vectors = features.get("trigger_embeddings")
+        if trigger_vectors is not None and len(trigger_vectors):
+            trigger_blob = serialize_embedding(
+                np.asarray(trigger_vectors, dtype=np.float32), "trigger"
+            )
+        else:
+            trigger_blob = None
 
         return {
             "semantic_embedding": serialize_embedding(
-                features.get("semantic_embedding")
+                features.get("semantic_embedding"), "semantic"
             ),
             "artistic_embedding": serialize_embedding(
-                features.get("artistic_embedding")
+                features.get("artistic_embedding"), "artistic"
             ),
             "technical_embedding": serialize_embedding(
-                features.get("technical_embedding")
+                features.get("technical_embedding"), "technical"
             ),
             "extracted_keywords": list(features.get("extracted_keywords", [])),
             "keyword_scores": list(features.get("keyword_scores", [])),
@@ -123,15 +366,10 @@ class LoRAEmbeddingRepository:
             "style_confidence": features.get("style_confidence"),
             "sentiment_label": features.get("sentiment_label"),
             "sentiment_score": features.get("sentiment_score"),
-            "quality_score": features.get("quality_score"),
-            "popularity_score": features.get("popularity_score"),
-            "recency_score": features.get("recency_score"),
-            "compatibility_score": features.get("sd_compatibility_score"),
+            **{column: features.get(key) for column, key in _SCORE_COLUMNS.items()},
             "normalized_triggers": list(features.get("normalized_triggers", [])),
             "trigger_aliases": dict(features.get("trigger_aliases", {})),
-            "trigger_embeddings": [
-                list(map(float, embedding))
-                for embedding in features.get("trigger_embeddings", [])
-            ],
+            "trigger_embeddings": trigger_blob,
             "trigger_metadata": dict(features.get("trigger_metadata", {})),
+            "content_hash": features.get("content_hash"),
         }
@@ -0,0 +1,231 @@
+"""Versioned, memory-mappable on-disk snapshot of the similarity index.
+
+A snapshot is a directory holding one ``.npy`` file per embedding modality,
+an id table and ``header.json``. The header records the format version, the
+shape, byte size and modification time of every array file, the embedding
+model versions, the precision the vectors were last stored at (``float32``
+for lossless originals) and a checksum over the array contents. Arrays are opened
+with ``np.load(mmap_mode="r")`` so a new process can serve queries from the
+page cache without running inference or copying the matrices into private
+memory. Derived matrices such as the pre-weighted profiles are rebuilt by
+the engine rather than persisted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+INDEX_SNAPSHOT_VERSION = 3
+
+_HEADER_FILE = "header.json"
+_IDS_FILE = "lora_ids.npy"
+_MODALITIES: Tuple[str, ...] = ("semantic", "artistic", "technical")
+
+
+class IndexSnapshotError(RuntimeError):
+    """Raised when a snapshot is missing, corrupt or incompatible."""
+
+
+@dataclass(frozen=True)
+class IndexSnapshot:
+    """Arrays and metadata loaded from a similarity index snapshot."""
+
+    lora_ids: List[str]
+    embeddings: Dict[str, np.ndarray]
+    model_versions: Dict[str, str] = field(default_factory=dict)
+    created_at: Optional[datetime] = None
+    precision: str = "float32"
+
+
+def write_index_snapshot(
+    directory: str | Path,
+    *,
+    lora_ids: Sequence[str],
+    embeddings: Mapping[str, np.ndarray],
+    model_versions: Optional[Mapping[str, str]] = None,
+    precision: str = "float32",
+) -> int:
+    """Persist the index arrays to ``directory`` and return the bytes written.
+
+    ``precision`` names the storage precision the vectors passed through:
+    ``float32`` for originals, or the compact dtype they were dequantized
+    from.
+
+    Files are written to a sibling staging directory which then replaces the
+    previous snapshot, so readers that already memory-mapped the old arrays
+    keep a consistent view.
+    """
+    target = Path(directory)
+    staging = target.with_name(f".{target.name}.tmp-{os.getpid()}")
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir(parents=True)
+
+    arrays: Dict[str, np.ndarray] = {
+        _IDS_FILE: np.asarray(list(lora_ids), dtype=np.str_),
+    }
+    for key in _MODALITIES:
+        arrays[f"{key}.npy"] = np.ascontiguousarray(embeddings[key], dtype=np.float32)
+
+    count = len(arrays[_IDS_FILE])
+    for file_name, array in arrays.items():
+        if array.shape[0] != count:
+            raise IndexSnapshotError(
+                f"{file_name} has {array.shape[0]} rows, expected {count}",
+            )
+        np.save(staging / file_name, array, allow_pickle=False)
+
+    specs: Dict[str, Dict[str, Any]] = {}
+    for file_name, array in arrays.items():
+        stat = (staging / file_name).stat()
+        specs[file_name] = {
+            "dtype": str(array.dtype),
+            "shape": list(array.shape),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    header = {
+        "format_version": INDEX_SNAPSHOT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "count": count,
+        "model_versions": dict(model_versions or {}),
+        "precision": precision,
+        "arrays": specs,
+        "checksum": _checksum(arrays),
+    }
+    (staging / _HEADER_FILE).write_text(json.dumps(header, indent=2))
+
+    if target.is_dir():
+        backup = target.with_name(f".{target.name}.old-{os.getpid()}")
+        os.replace(target, backup)
+        os.replace(staging, target)
+        shutil.rmtree(backup, ignore_errors=True)
+    else:
+        if target.exists():
+            # Legacy pickle snapshot written by earlier releases.
+            target.unlink()
+        os.replace(staging, target)
+
+    return sum(path.stat().st_size for path in target.iterdir())
+
+
+def read_index_snapshot(
+    directory: str | Path,
+    *,
+    model_versions: Optional[Mapping[str, str]] = None,
+    precision: Optional[str] = None,
+    mmap: bool = True,
+    verify_checksum: bool = False,
+) -> IndexSnapshot:
+    """Open a snapshot written by :func:`write_index_snapshot`.
+
+    Args:
+        directory: Snapshot directory.
+        model_versions: Versions of the models currently configured; a
+            mismatch with the recorded versions rejects the snapshot.
+        precision: Index precision currently configured; snapshots of
+            dequantized vectors are rejected unless they were stored at the
+            same precision, so lossy vectors never seed a finer index.
+        mmap: Memory-map the arrays read-only instead of loading them.
+        verify_checksum: Also hash the array contents and compare with the
+            header. This reads every page of the snapshot, so it is opt-in;
+            by default only the file sizes and modification times recorded
+            in the header are checked.
+
+    Raises:
+        IndexSnapshotError: If the snapshot is missing, corrupt or was built
+            with different models, another lossy precision or a different
+            format version.
+
+    """
+    root = Path(directory)
+    header_path = root / _HEADER_FILE
+    if not header_path.is_file():
+        raise IndexSnapshotError(f"No index snapshot at {root}")
+
+    try:
+        header = json.loads(header_path.read_text())
+    except (OSError, ValueError) as exc:
+        raise IndexSnapshotError(f"Unreadable snapshot header: {exc}") from exc
+
+    if header.get("format_version") != INDEX_SNAPSHOT_VERSION:
+        raise IndexSnapshotError(
+            f"Unsupported snapshot format {header.get('format_version')!r}",
+        )
+
+    recorded_versions = dict(header.get("model_versions") or {})
+    if model_versions is not None and recorded_versions != dict(model_versions):
+        raise IndexSnapshotError(
+            f"Snapshot models {recorded_versions} do not match {dict(model_versions)}",
+        )
+
+    recorded_precision = header.get("precision", "float32")
+    if precision is not None and recorded_precision not in ("float32", precision):
+        raise IndexSnapshotError(
+            f"Snapshot vectors were stored at {recorded_precision}, "
+            f"not {precision}",
+        )
+
+    arrays: Dict[str, np.ndarray] = {}
+    for file_name, spec in header.get("arrays", {}).items():
+        try:
+            stat = (root / file_name).stat()
+        except OSError as exc:
+            raise IndexSnapshotError(f"Cannot load {file_name}: {exc}") from exc
+        if (stat.st_size, stat.st_mtime_ns) != (spec["size"], spec["mtime_ns"]):
+            raise IndexSnapshotError(f"{file_name} changed after it was written")
+        try:
+            array = np.load(
+                root / file_name,
+                mmap_mode="r" if mmap else None,
+                allow_pickle=False,
+            )
+        except (OSError, ValueError) as exc:
+            raise IndexSnapshotError(f"Cannot load {file_name}: {exc}") from exc
+        if str(array.dtype) != spec["dtype"] or list(array.shape) != spec["shape"]:
+            raise IndexSnapshotError(f"{file_name} does not match the header")
+        arrays[file_name] = array
+
+    missing = {_IDS_FILE, *(f"{key}.npy" for key in _MODALITIES)} - set(arrays)
+    if missing:
+        raise IndexSnapshotError(f"Snapshot is missing {', '.join(sorted(missing))}")
+
+    if verify_checksum and _checksum(arrays) != header.get("checksum"):
+        raise IndexSnapshotError("Snapshot checksum mismatch")
+
+    created_at = header.get("created_at")
+    return IndexSnapshot(
+        lora_ids=arrays[_IDS_FILE].tolist(),
+        embeddings={key: arrays[f"{key}.npy"] for key in _MODALITIES},
+        model_versions=recorded_versions,
+        created_at=datetime.fromisoformat(created_at) if created_at else None,
+        precision=recorded_precision,
+    )
+
+
+def _checksum(arrays: Mapping[str, np.ndarray]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for file_name in sorted(arrays):
+        digest.update(file_name.encode("utf-8"))
+        raw = np.ascontiguousarray(arrays[file_name]).reshape(-1).view(np.uint8)
+        digest.update(raw.data)
+    return digest.hexdigest()
+
+
+__all__ = [
+    "INDEX_SNAPSHOT_VERSION",
+    "IndexSnapshot",
+    "IndexSnapshotError",
+    "read_index_snapshot",
+    "write_index_snapshot",
+]
@@ -0,0 +1,129 @@
+"""Keep the in-memory similarity index in step with adapter writes."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, FrozenSet, Optional, Sequence, Set
+
+import numpy as np
+
+from .components.engine import MODALITIES
+from .components.interfaces import RecommendationEngineProtocol
+from .embedding_repository import LoRAEmbeddingRepository
+from .model_registry import RecommendationModelRegistry
+from .similarity_index_builder import engine_model_versions
+
+# Adapter fields that feed the multi-modal text payloads.
+EMBEDDING_FIELDS: FrozenSet[str] = frozenset({
+    "trained_words",
+    "triggers",
+    "activation_text",
+    "tags",
+    "archetype",
+    "sd_version",
+    "supports_generation",
+    "nsfw_level",
+    "primary_file_size_kb",
+})
+
+
+class SimilarityIndexSync:
+    """Apply committed adapter changes to the similarity index incrementally.
+
+    Only an engine that already holds an index is touched; an empty engine
+    is left for the next full build so its "existing index" check stays
+    meaningful. No model runs on the write path: activated adapters are
+    upserted from their stored vectors and predicted styles, like a full
+    build would index them, and are left out when they have none.
+    Deactivated and deleted adapters are tombstoned. Any other edit,
+    payload edits included, keeps the adapter's row and refreshes the
+    adapter object used for filtering, boosts and keyword search. A payload
+    edit leaves the stored content hash behind the adapter's inputs, so the
+    next recompute re-encodes it even when unchanged adapters are skipped.
+    """
+
+    def __init__(
+        self,
+        engine_getter: Optional[
+            Callable[[], Optional[RecommendationEngineProtocol]]
+        ] = None,
+        *,
+        repository: Optional[LoRAEmbeddingRepository] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Store the engine lookup and the source of stored embeddings.
+
+        The engine defaults to the shared registry engine. Without a
+        ``repository`` newly activated adapters are not indexed.
+        """
+        self._engine_getter = (
+            engine_getter or RecommendationModelRegistry.loaded_recommendation_engine
+        )
+        self._repository = repository
+        self._logger = logger or logging.getLogger(__name__)
+
+    def _indexed_engine(self) -> Optional[RecommendationEngineProtocol]:
+        engine = self._engine_getter()
+        if engine is None or not getattr(engine, "lora_ids", None):
+            return None
+        return engine
+
+    def adapters_updated(
+        self, adapters: Sequence[Any], changed_fields: Set[str]
+    ) -> None:
+        """Index, refresh or remove ``adapters`` according to their state."""
+        engine = self._indexed_engine()
+        if engine is None:
+            return
+
+        removed = [adapter.id for adapter in adapters if not adapter.active]
+        if removed:
+            engine.remove(removed)
+
+        active = [adapter for adapter in adapters if adapter.active]
+        missing = [adapter for adapter in active if not engine.contains(adapter.id)]
+        if missing:
+            self._index_stored(engine, missing)
+        missing_ids = {adapter.id for adapter in missing}
+        refreshed = engine.refresh_metadata([
+            adapter for adapter in active if adapter.id not in missing_ids
+        ])
+        if refreshed and changed_fields & EMBEDDING_FIELDS:
+            self._logger.debug(
+                "%s adapters keep their stored vectors until the next recompute",
+                refreshed,
+            )
+
+    def _index_stored(
+        self, engine: RecommendationEngineProtocol, adapters: Sequence[Any]
+    ) -> None:
+        if self._repository is None:
+            return
+        stored = self._repository.get_embedding_vectors(
+            [adapter.id for adapter in adapters], engine_model_versions(engine)
+        )
+        indexable = [adapter for adapter in adapters if adapter.id in stored]
+        if not indexable:
+            return
+        engine.upsert(
+            indexable,
+            {
+                key: np.stack([stored[adapter.id][key] for adapter in indexable])
+                for key in MODALITIES
+            },
+        )
+        engine.set_predicted_styles(
+            self._repository.get_predicted_styles(
+                [adapter.id for adapter in indexable]
+            )
+        )
+        self._logger.debug("Indexed %s adapters from stored vectors", len(indexable))
+
+    def adapters_removed(self, adapter_ids: Sequence[str]) -> None:
+        """Tombstone deleted adapters."""
+        engine = self._indexed_engine()
+        if engine is not None:
+            engine.remove(adapter_ids)
+
+
+__all__ = ["EMBEDDING_FIELDS", "SimilarityIndexSync"]
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Protocol, Sequence
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Set, Tuple
 
 from backend.schemas.recommendations import (
     IndexRebuildResponse,
@@ -44,13 +44,26 @@ class RecommendationRepository(Protocol):
     def get_adapter(self, adapter_id: str):  # pragma: no cover
         """Return the adapter for ``adapter_id`` if present."""
 
+    def get_adapters(
+        self, adapter_ids: Sequence[str]
+    ) -> Dict[str, Any]:  # pragma: no cover - Protocol
+        """Return column summaries for ``adapter_ids`` keyed by adapter id."""
+
     def get_active_loras_with_embeddings(
         self,
         *,
         exclude_ids: Optional[Sequence[str]] = None,
+        adapters_updated_after: Optional[datetime] = None,
+        embeddings_updated_after: Optional[datetime] = None,
     ) -> List[Any]:  # pragma: no cover - Protocol
         """Return active LoRAs with persisted embeddings."""
 
+    def list_active_embedding_ids(self) -> Set[str]:  # pragma: no cover
+        """Return ids of active LoRAs with persisted embeddings."""
+
+    def get_embedding_change_stamp(self) -> Tuple[Any, ...]:  # pragma: no cover
+        """Return a value that changes whenever indexed LoRAs may have."""
+
     def count_active_adapters(self) -> int:  # pragma: no cover - Protocol
         """Return the number of active LoRA adapters."""
 
@@ -94,6 +107,7 @@ class EmbeddingWorkflow(Protocol):
         *,
         force_recompute: bool = False,
         batch_size: int = 32,
+        skip_unchanged: bool = False,
     ) -> Dict[str, Any]:  # pragma: no cover - Protocol
         """Compute embeddings for a set of adapters."""
 
@@ -114,6 +128,9 @@ class RecommendationPersistenceService(Protocol):
     ) -> IndexRebuildResponse:
         """Rebuild the persisted similarity index."""
 
+    async def load_similarity_index(self) -> bool:
+        """Load the persisted similarity index snapshot if it is current."""
+
     @property
     def index_cache_path(self) -> str:
         """Return the similarity index cache path."""
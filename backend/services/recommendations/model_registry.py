@@ -6,10 +6,15 @@ import logging
 from threading import Lock
 from typing import Optional
 
+from backend.core.config import settings
+
 from .components import (
     GPULoRAFeatureExtractor,
+    KeywordIndex,
     LoRARecommendationEngine,
     LoRASemanticEmbedder,
+    ModelResidencyManager,
+    PromptEmbeddingCache,
     TriggerEmbedder,
     TriggerResolver,
 )
@@ -18,9 +23,91 @@ from .components.interfaces import (
     RecommendationEngineProtocol,
     SemanticEmbedderProtocol,
 )
+from .components.sentiment_style import SentimentStyleAnalyzer
+from .metrics import RecommendationMetrics
+from .result_cache import RecommendationResultCache
 from .trigger_engine import TriggerRecommendationEngine, TriggerSearchIndex
 
 
+def _model_residency(logger: logging.Logger) -> ModelResidencyManager:
+    return ModelResidencyManager(
+        settings.RECOMMENDATION_MODEL_MEMORY_BUDGET_MB * 2**20,
+        logger=logger,
+    )
+
+
+def _semantic_embedder(
+    device: str,
+    gpu_enabled: bool,
+    logger: logging.Logger,
+    *,
+    prompt_cache: Optional[PromptEmbeddingCache],
+    residency: ModelResidencyManager,
+) -> LoRASemanticEmbedder:
+    return LoRASemanticEmbedder(
+        device=device,
+        batch_size=32 if gpu_enabled else 16,
+        logger=logger,
+        prompt_cache=prompt_cache,
+        residency=residency,
+    )
+
+
+def _trigger_embedder(
+    logger: logging.Logger, residency: ModelResidencyManager
+) -> TriggerEmbedder:
+    return TriggerEmbedder(device="cpu", logger=logger, residency=residency)
+
+
+def build_feature_extractor(
+    *,
+    device: str,
+    gpu_enabled: bool = False,
+    keyword_index: Optional[KeywordIndex] = None,
+    semantic_embedder: Optional[SemanticEmbedderProtocol] = None,
+    trigger_resolver: Optional[TriggerResolver] = None,
+    trigger_embedder: Optional[TriggerEmbedder] = None,
+    residency: Optional[ModelResidencyManager] = None,
+    sentiment_style: Optional[bool] = None,
+    logger: Optional[logging.Logger] = None,
+) -> GPULoRAFeatureExtractor:
+    """Build a feature extractor configured like the registry's shared one.
+
+    The registry passes its shared components; sharded recompute workers
+    call this with only a device and keyword corpus, and any missing
+    component is created from the same settings. Both paths therefore
+    store identical content hashes, keywords and sentiment/style features
+    for an adapter. The batched sentiment and style analyzer is attached
+    only when ``sentiment_style`` (default
+    ``RECOMMENDATION_SENTIMENT_STYLE_ENABLED``) is set, and loads its
+    pipelines through ``residency`` on first use.
+    """
+    logger = logger or logging.getLogger(__name__)
+    residency = residency or _model_residency(logger)
+    semantic_embedder = semantic_embedder or _semantic_embedder(
+        device, gpu_enabled, logger, prompt_cache=None, residency=residency
+    )
+    if sentiment_style is None:
+        sentiment_style = settings.RECOMMENDATION_SENTIMENT_STYLE_ENABLED
+    analyzer = None
+    if sentiment_style:
+        analyzer = SentimentStyleAnalyzer(
+            device=device,
+            logger=logger,
+            residency=residency,
+            batch_size=32 if gpu_enabled else 16,
+        )
+    return GPULoRAFeatureExtractor(
+        device=device,
+        semantic_embedder=semantic_embedder,
+        logger=logger,
+        trigger_resolver=trigger_resolver or TriggerResolver(),
+        trigger_embedder=trigger_embedder or _trigger_embedder(logger, residency),
+        sentiment_style_analyzer=analyzer,
+        keyword_extractor=keyword_index,
+    )
+
+
 class RecommendationModelRegistry:
     """Manage shared recommendation model instances within the process."""
 
@@ -32,7 +119,12 @@ class RecommendationModelRegistry:
     _shared_trigger_embedder: Optional[TriggerEmbedder] = None
     _shared_trigger_resolver: Optional[TriggerResolver] = None
     _shared_trigger_index: Optional[TriggerSearchIndex] = None
+    _shared_keyword_index: Optional[KeywordIndex] = None
     _shared_trigger_engine: Optional[TriggerRecommendationEngine] = None
+    _shared_result_cache: Optional[RecommendationResultCache] = None
+    _shared_prompt_cache: Optional[PromptEmbeddingCache] = None
+    _shared_model_residency: Optional[ModelResidencyManager] = None
+    _shared_metrics: Optional[RecommendationMetrics] = None
     _shared_logger: logging.Logger = logging.getLogger(__name__)
 
     def __init__(
@@ -67,34 +159,47 @@ class RecommendationModelRegistry:
                 cls._shared_trigger_resolver = TriggerResolver()
 
             if cls._shared_trigger_embedder is None:
-                cls._shared_trigger_embedder = TriggerEmbedder(
-                    device="cpu", logger=logger
+                cls._shared_trigger_embedder = _trigger_embedder(
+                    logger, cls._model_residency_locked()
                 )
 
             if cls._shared_trigger_index is None:
-                cls._shared_trigger_index = TriggerSearchIndex(logger=logger)
+                cls._shared_trigger_index = TriggerSearchIndex(
+                    logger=logger,
+                    refresh_interval=settings.RECOMMENDATION_TRIGGER_REFRESH_SECONDS,
+                )
 
             if cls._shared_semantic_embedder is None:
-                batch_size = 32 if gpu_enabled else 16
-                cls._shared_semantic_embedder = LoRASemanticEmbedder(
-                    device=device,
-                    batch_size=batch_size,
-                    logger=logger,
+                cls._shared_semantic_embedder = _semantic_embedder(
+                    device,
+                    gpu_enabled,
+                    logger,
+                    prompt_cache=cls._prompt_cache_locked(),
+                    residency=cls._model_residency_locked(),
                 )
 
             if cls._shared_feature_extractor is None:
-                cls._shared_feature_extractor = GPULoRAFeatureExtractor(
+                cls._shared_feature_extractor = build_feature_extractor(
                     device=device,
+                    gpu_enabled=gpu_enabled,
+                    keyword_index=cls._keyword_index_locked(),
                     semantic_embedder=cls._shared_semantic_embedder,
-                    logger=logger,
                     trigger_resolver=cls._shared_trigger_resolver,
                     trigger_embedder=cls._shared_trigger_embedder,
+                    residency=cls._model_residency_locked(),
+                    logger=logger,
                 )
 
             if cls._shared_recommendation_engine is None:
                 cls._shared_recommendation_engine = LoRARecommendationEngine(
                     cls._shared_feature_extractor,
                     device=device,
+                    index_backend=settings.RECOMMENDATION_INDEX_BACKEND,
+                    index_nlist=settings.RECOMMENDATION_INDEX_NLIST,
+                    index_nprobe=settings.RECOMMENDATION_INDEX_NPROBE,
+                    index_hnsw_m=settings.RECOMMENDATION_INDEX_HNSW_M,
+                    index_precision=settings.RECOMMENDATION_INDEX_PRECISION,
+                    rerank_factor=settings.RECOMMENDATION_INDEX_RERANK_FACTOR,
                     logger=logger,
                 )
 
@@ -157,3 +262,74 @@ class RecommendationModelRegistry:
             and cls._shared_feature_extractor is not None
             and cls._shared_recommendation_engine is not None
         )
+
+    @classmethod
+    def loaded_recommendation_engine(cls) -> Optional[RecommendationEngineProtocol]:
+        """Return the shared engine if it exists, without loading any models."""
+        return cls._shared_recommendation_engine
+
+    @classmethod
+    def get_result_cache(cls) -> Optional[RecommendationResultCache]:
+        """Return the process-wide result cache (``None`` when disabled)."""
+        if settings.RECOMMENDATION_RESULT_CACHE_SIZE <= 0:
+            return None
+        with cls._shared_lock:
+            if cls._shared_result_cache is None:
+                cls._shared_result_cache = RecommendationResultCache(
+                    settings.RECOMMENDATION_RESULT_CACHE_SIZE,
+                )
+            return cls._shared_result_cache
+
+    @classmethod
+    def get_prompt_cache(cls) -> Optional[PromptEmbeddingCache]:
+        """Return the process-wide prompt embedding cache (``None`` if disabled)."""
+        with cls._shared_lock:
+            return cls._prompt_cache_locked()
+
+    @classmethod
+    def _prompt_cache_locked(cls) -> Optional[PromptEmbeddingCache]:
+        if settings.RECOMMENDATION_PROMPT_CACHE_SIZE <= 0:
+            return None
+        if cls._shared_prompt_cache is None:
+            cls._shared_prompt_cache = PromptEmbeddingCache(
+                settings.RECOMMENDATION_PROMPT_CACHE_SIZE,
+                logger=cls._shared_logger,
+            )
+        return cls._shared_prompt_cache
+
+    @classmethod
+    def get_keyword_index(cls) -> KeywordIndex:
+        """Return the corpus keyword index used by the feature extractor.
+
+        Recomputes fill it before encoding so keywords are ranked against
+        the whole catalog. The engine keeps a separate corpus of the indexed
+        adapters, so index rebuilds leave this one untouched.
+        """
+        with cls._shared_lock:
+            return cls._keyword_index_locked()
+
+    @classmethod
+    def _keyword_index_locked(cls) -> KeywordIndex:
+        if cls._shared_keyword_index is None:
+            cls._shared_keyword_index = KeywordIndex()
+        return cls._shared_keyword_index
+
+    @classmethod
+    def get_model_residency(cls) -> ModelResidencyManager:
+        """Return the process-wide manager holding loaded models."""
+        with cls._shared_lock:
+            return cls._model_residency_locked()
+
+    @classmethod
+    def _model_residency_locked(cls) -> ModelResidencyManager:
+        if cls._shared_model_residency is None:
+            cls._shared_model_residency = _model_residency(cls._shared_logger)
+        return cls._shared_model_residency
+
+    @classmethod
+    def get_shared_metrics(cls) -> RecommendationMetrics:
+        """Return metrics shared by every request-scoped service."""
+        with cls._shared_lock:
+            if cls._shared_metrics is None:
+                cls._shared_metrics = RecommendationMetrics()
+            return cls._shared_metrics
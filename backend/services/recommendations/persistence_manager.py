@@ -2,18 +2,27 @@
 
 from __future__ import annotations
 
-import pickle
+import asyncio
+import logging
+import shutil
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Dict, Optional, Tuple
 
 import numpy as np
 
+from backend.core.config import settings
 from backend.schemas.recommendations import IndexRebuildResponse
 
 from .components.interfaces import RecommendationEngineProtocol
+from .components.prompt_cache import PromptEmbeddingCache
 from .embedding_manager import EmbeddingManager
+from .index_snapshot import (
+    IndexSnapshotError,
+    read_index_snapshot,
+    write_index_snapshot,
+)
 
 
 class RecommendationPersistenceManager:
@@ -25,18 +34,31 @@ class RecommendationPersistenceManager:
         engine_getter: Callable[[], RecommendationEngineProtocol],
         *,
         embedding_cache_dir: str | Path = "cache/embeddings",
-        index_cache_path: str | Path = "cache/similarity_index.pkl",
+        index_cache_path: str | Path | None = None,
         clock: Callable[[], float] = time.time,
+        prompt_cache: Optional[PromptEmbeddingCache] = None,
+        logger: Optional[logging.Logger] = None,
     ) -> None:
-        """Initialise cache paths and collaborators for persistence."""
+        """Initialise cache paths and collaborators for persistence.
+
+        ``prompt_cache`` is persisted under ``embedding_cache_dir/prompts``
+        when ``RECOMMENDATION_PROMPT_CACHE_PERSIST`` is enabled.
+        """
+        if index_cache_path is None:
+            index_cache_path = settings.RECOMMENDATION_INDEX_SNAPSHOT_PATH
+        self._logger = logger or logging.getLogger(__name__)
         self._embedding_manager = embedding_manager
         self._engine_getter = engine_getter
         self._embedding_cache_dir = Path(embedding_cache_dir)
         self._index_cache_path = Path(index_cache_path)
         self._clock = clock
+        self._prompt_cache = (
+            prompt_cache if settings.RECOMMENDATION_PROMPT_CACHE_PERSIST else None
+        )
 
         self._embedding_cache_dir.mkdir(parents=True, exist_ok=True)
         self._index_cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self._attach_prompt_cache()
 
     @property
     def embedding_cache_dir(self) -> Path:
@@ -48,6 +70,11 @@ class RecommendationPersistenceManager:
         path = Path(value)
         path.mkdir(parents=True, exist_ok=True)
         self._embedding_cache_dir = path
+        self._attach_prompt_cache()
+
+    def _attach_prompt_cache(self) -> None:
+        if self._prompt_cache is not None:
+            self._prompt_cache.directory = self._embedding_cache_dir / "prompts"
 
     @property
     def index_cache_path(self) -> Path:
@@ -60,24 +87,63 @@ class RecommendationPersistenceManager:
         path.parent.mkdir(parents=True, exist_ok=True)
         self._index_cache_path = path
 
+    async def load_similarity_index(self) -> bool:
+        """Warm-start the engine from the persisted snapshot.
+
+        Returns ``True`` when the memory-mapped snapshot was adopted. Missing,
+        corrupt, stale or model-mismatched snapshots are ignored so callers
+        can fall back to a full rebuild.
+        """
+        engine = self._engine_getter()
+        start_time = self._clock()
+        try:
+            snapshot = await asyncio.to_thread(
+                read_index_snapshot,
+                self._index_cache_path,
+                model_versions=engine.model_versions(),
+                precision=getattr(engine, "index_precision", None),
+                verify_checksum=settings.RECOMMENDATION_INDEX_SNAPSHOT_VERIFY,
+            )
+        except IndexSnapshotError as exc:
+            self._logger.info("Similarity index snapshot not used: %s", exc)
+            return False
+
+        loaded = await self._embedding_manager.load_similarity_index(snapshot)
+        if loaded:
+            self._logger.info(
+                "Loaded similarity index snapshot with %s LoRAs in %.1f ms",
+                len(snapshot.lora_ids),
+                (self._clock() - start_time) * 1000,
+            )
+        return loaded
+
     async def rebuild_similarity_index(
         self, *, force: bool = False
     ) -> IndexRebuildResponse:
-        """Rebuild the similarity index and persist it to disk."""
+        """Rebuild the similarity index and persist it to disk.
+
+        Without ``force`` an empty engine is first warm-started from the
+        snapshot, in which case nothing is re-encoded or rewritten.
+        """
         engine = self._engine_getter()
         index_file = self._index_cache_path
 
+        skipped_reason = None
         if not force and getattr(engine, "lora_ids", None):
-            index_size = index_file.stat().st_size if index_file.exists() else 0
+            skipped_reason = "existing_index"
+        elif not force and await self.load_similarity_index():
+            skipped_reason = "snapshot_loaded"
+
+        if skipped_reason is not None:
             return IndexRebuildResponse(
                 status="skipped",
                 indexed_items=len(engine.lora_ids),
                 index_path=str(index_file),
-                index_size_bytes=index_size,
+                index_size_bytes=self._snapshot_size(),
                 processing_time_seconds=0.0,
                 rebuilt_at=datetime.now(timezone.utc),
                 skipped=True,
-                skipped_reason="existing_index",
+                skipped_reason=skipped_reason,
             )
 
         start_time = self._clock()
@@ -87,22 +153,23 @@ class RecommendationPersistenceManager:
         indexed_items = len(getattr(engine, "lora_ids", []) or [])
         index_size = 0
         status = "empty"
-        skipped_reason = None
 
         if indexed_items:
-            payload = {
-                "lora_ids": engine.lora_ids,
-                "semantic_embeddings": np.asarray(engine.semantic_embeddings),
-                "artistic_embeddings": np.asarray(engine.artistic_embeddings),
-                "technical_embeddings": np.asarray(engine.technical_embeddings),
-            }
-            with index_file.open("wb") as handle:
-                pickle.dump(payload, handle)
-            index_size = index_file.stat().st_size
+            lora_ids = list(engine.lora_ids)
+            embeddings, precision = await self._snapshot_matrices(engine, lora_ids)
+            index_size = await asyncio.to_thread(
+                write_index_snapshot,
+                index_file,
+                lora_ids=lora_ids,
+                embeddings=embeddings,
+                model_versions=engine.model_versions(),
+                precision=precision,
+            )
             status = "rebuilt"
-        else:
-            if index_file.exists():
-                index_file.unlink()
+        elif index_file.is_dir():
+            shutil.rmtree(index_file)
+        elif index_file.exists():
+            index_file.unlink()
 
         processing_time = self._clock() - start_time
 
@@ -114,5 +181,39 @@ class RecommendationPersistenceManager:
             processing_time_seconds=processing_time,
             rebuilt_at=datetime.now(timezone.utc),
             skipped=False,
-            skipped_reason=skipped_reason,
         )
+
+    async def _snapshot_matrices(
+        self, engine: RecommendationEngineProtocol, lora_ids: list[str]
+    ) -> Tuple[Dict[str, np.ndarray], str]:
+        """Return the vectors to persist and the precision they were stored at.
+
+        A compact engine only holds dequantized vectors, so the stored
+        float32 embeddings are persisted instead when every row has them.
+        """
+        precision = getattr(engine, "index_precision", "float32")
+        if precision != "float32":
+            originals = await self._embedding_manager.stored_index_matrices(
+                lora_ids
+            )
+            if originals is not None:
+                return (
+                    {key: _normalize_rows(rows) for key, rows in originals.items()},
+                    "float32",
+                )
+            self._logger.info(
+                "Persisting %s index vectors; stored embeddings are incomplete",
+                precision,
+            )
+        return engine.embedding_matrices(), precision
+
+    def _snapshot_size(self) -> int:
+        index_file = self._index_cache_path
+        if index_file.is_dir():
+            return sum(path.stat().st_size for path in index_file.iterdir())
+        return index_file.stat().st_size if index_file.exists() else 0
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0.0, 1.0, norms)
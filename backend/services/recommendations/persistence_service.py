@@ -23,6 +23,10 @@ class RecommendationPersistenceService(PersistenceServiceProtocol):
         """Delegate to the underlying persistence manager."""
         return await self._manager.rebuild_similarity_index(force=force)
 
+    async def load_similarity_index(self) -> bool:
+        """Warm-start the engine from the persisted index snapshot."""
+        return await self._manager.load_similarity_index()
+
     @property
     def index_cache_path(self) -> str:
         """Expose the configured similarity index path as a string."""
@@ -1,9 +1,9 @@
 """Persistence helpers for the recommendation service."""
 
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
-from sqlalchemy import func
+from sqlalchemy import func, or_
 from sqlmodel import Session, select
 
 from backend.models import (
@@ -18,6 +18,19 @@ from backend.schemas.recommendations import (
     UserPreferenceRequest,
 )
 
+# Adapter columns read when hydrating recommendation responses.
+ADAPTER_SUMMARY_COLUMNS = (
+    Adapter.id,
+    Adapter.name,
+    Adapter.description,
+    Adapter.author_username,
+    Adapter.tags,
+    Adapter.sd_version,
+    Adapter.nsfw_level,
+    Adapter.stats,
+    Adapter.triggers,
+)
+
 
 class RecommendationRepository:
     """Encapsulate persistence concerns for recommendations."""
@@ -117,12 +130,45 @@ class RecommendationRepository:
         """Return an adapter by identifier."""
         return self._session.get(Adapter, adapter_id)
 
+    def get_adapters(self, adapter_ids: Sequence[str]) -> Dict[str, Any]:
+        """Return response summaries for ``adapter_ids`` in a single query.
+
+        Only :data:`ADAPTER_SUMMARY_COLUMNS` are selected; the returned rows
+        expose them as attributes and are keyed by adapter id. Unknown ids
+        are omitted.
+        """
+        unique_ids = list(dict.fromkeys(adapter_ids))
+        if not unique_ids:
+            return {}
+        stmt = select(*ADAPTER_SUMMARY_COLUMNS).where(Adapter.id.in_(unique_ids))
+        return {row.id: row for row in self._session.exec(stmt).all()}
+
+    def get_full_adapters(self, adapter_ids: Sequence[str]) -> Dict[str, Adapter]:
+        """Return complete adapter records for ``adapter_ids`` in one query.
+
+        Unlike :meth:`get_adapters` every column is loaded, so the records
+        can be encoded. Unknown ids are omitted.
+        """
+        unique_ids = list(dict.fromkeys(adapter_ids))
+        if not unique_ids:
+            return {}
+        stmt = select(Adapter).where(Adapter.id.in_(unique_ids))
+        return {adapter.id: adapter for adapter in self._session.exec(stmt).all()}
+
     def get_active_loras_with_embeddings(
         self,
         *,
         exclude_ids: Optional[Sequence[str]] = None,
+        adapters_updated_after: Optional[datetime] = None,
+        embeddings_updated_after: Optional[datetime] = None,
     ) -> List[Tuple[Adapter, LoRAEmbedding]]:
-        """Return active adapters that have stored embeddings."""
+        """Return active adapters that have stored embeddings.
+
+        The ``*_updated_after`` filters keep only pairs whose adapter or
+        embedding was updated at or after the given time. The bound is
+        inclusive so writes sharing a change stamp's timestamp are not lost;
+        callers skip rows they have already indexed.
+        """
         stmt = (
             select(Adapter, LoRAEmbedding)
             .join(LoRAEmbedding, Adapter.id == LoRAEmbedding.adapter_id)
@@ -131,13 +177,59 @@ class RecommendationRepository:
 
         if exclude_ids:
             stmt = stmt.where(~Adapter.id.in_(exclude_ids))
+        changed = []
+        if adapters_updated_after is not None:
+            changed.append(Adapter.updated_at >= adapters_updated_after)
+        if embeddings_updated_after is not None:
+            changed.append(LoRAEmbedding.updated_at >= embeddings_updated_after)
+        if changed:
+            stmt = stmt.where(or_(*changed))
 
         return list(self._session.exec(stmt).all())
 
+    def list_active_embedding_ids(self) -> Set[str]:
+        """Return ids of active adapters that have stored embeddings."""
+        stmt = (
+            select(Adapter.id)
+            .join(LoRAEmbedding, Adapter.id == LoRAEmbedding.adapter_id)
+            .where(Adapter.active)
+        )
+        return set(self._session.exec(stmt).all())
+
+    def get_embedding_change_stamp(
+        self,
+    ) -> Tuple[int, int, Optional[datetime], Optional[datetime]]:
+        """Return a cheap stamp that changes when indexed adapters may have.
+
+        The stamp holds the adapter and embedding row counts and the latest
+        ``updated_at`` of each table, read in one query over primary keys and
+        the ``updated_at`` indexes. No join or ``active`` filter is needed:
+        adapter writes, activations included, bump ``updated_at``, and the
+        counts catch deletions and inserts sharing the latest timestamp.
+        """
+        stmt = select(
+            select(func.count(Adapter.id)).scalar_subquery(),
+            select(func.count(LoRAEmbedding.adapter_id)).scalar_subquery(),
+            select(func.max(Adapter.updated_at)).scalar_subquery(),
+            select(func.max(LoRAEmbedding.updated_at)).scalar_subquery(),
+        )
+        adapters, embeddings, adapters_updated, embeddings_updated = (
+            self._session.exec(stmt).one()
+        )
+        return int(adapters), int(embeddings), adapters_updated, embeddings_updated
+
     def get_embedding(self, adapter_id: str) -> Optional[LoRAEmbedding]:
         """Return the embedding entry for ``adapter_id`` if present."""
         return self._session.get(LoRAEmbedding, adapter_id)
 
+    def get_embeddings(self, adapter_ids: Sequence[str]) -> Dict[str, LoRAEmbedding]:
+        """Return stored embedding entries for ``adapter_ids`` in one query."""
+        unique_ids = list(dict.fromkeys(adapter_ids))
+        if not unique_ids:
+            return {}
+        stmt = select(LoRAEmbedding).where(LoRAEmbedding.adapter_id.in_(unique_ids))
+        return {row.adapter_id: row for row in self._session.exec(stmt).all()}
+
     def get_recent_active_adapters(self, limit: int) -> List[Adapter]:
         """Return a deterministic list of recently active adapters."""
         stmt = (
@@ -0,0 +1,80 @@
+"""Bounded LRU cache for recommendation results."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Mapping, Optional, Tuple
+
+
+class RecommendationResultCache:
+    """Thread-safe LRU of query results tagged with an index generation.
+
+    Every entry remembers the generation of the index that produced it and
+    the cache epoch it was stored in. A lookup only hits when both still
+    match, so invalidating after an index rebuild or update is O(1): the
+    index bumps its generation (or :meth:`invalidate` bumps the epoch) and
+    stale entries age out of the LRU.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        """Create an empty cache holding at most ``max_entries`` results."""
+        self._max_entries = max(1, max_entries)
+        self._entries: OrderedDict[Hashable, Tuple[Tuple[int, Any], Any]] = (
+            OrderedDict()
+        )
+        self._epoch = 0
+        self._lock = Lock()
+
+    @property
+    def max_entries(self) -> int:
+        """Return the configured capacity."""
+        return self._max_entries
+
+    def __len__(self) -> int:
+        """Return the number of stored (possibly stale) entries."""
+        return len(self._entries)
+
+    def get(self, key: Hashable, generation: Any) -> Optional[Any]:
+        """Return the cached value for ``key`` at ``generation`` or ``None``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            tag, value = entry
+            if tag != (self._epoch, generation):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, generation: Any, value: Any) -> None:
+        """Store ``value`` for ``key``, evicting the least recently used."""
+        with self._lock:
+            self._entries[key] = ((self._epoch, generation), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Mark every entry stale without walking the cache."""
+        with self._lock:
+            self._epoch += 1
+
+    @staticmethod
+    def weights_key(
+        weights: Optional[Mapping[str, float]],
+    ) -> Optional[Tuple[Tuple[str, float], ...]]:
+        """Return a hashable, order-independent form of ``weights``."""
+        if weights is None:
+            return None
+        return tuple(
+            sorted((key, round(float(value), 6)) for key, value in weights.items())
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Return size and capacity for diagnostics."""
+        return {"entries": len(self._entries), "max_entries": self._max_entries}
+
+
+__all__ = ["RecommendationResultCache"]
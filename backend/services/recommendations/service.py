@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Optional, Sequence
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from backend.schemas.recommendations import (
     EmbeddingStatus,
@@ -88,6 +88,26 @@ class RecommendationService:
             weights=weights,
         )
 
+    async def similar_loras_batch(
+        self,
+        *,
+        target_lora_ids: Sequence[str],
+        limit: int = 10,
+        similarity_threshold: float = 0.1,
+        diversify_results: bool = True,
+        weights: Optional[Dict[str, float]] = None,
+        include_merged: bool = False,
+    ) -> Tuple[Dict[str, List[RecommendationItem]], Optional[List[RecommendationItem]]]:
+        """Return LoRAs similar to each target and an optional merged ranking."""
+        return await self._similar_lora_use_case.execute_batch(
+            target_lora_ids=list(target_lora_ids),
+            limit=limit,
+            similarity_threshold=similarity_threshold,
+            diversify_results=diversify_results,
+            weights=weights,
+            include_merged=include_merged,
+        )
+
     async def recommend_for_prompt(
         self,
         *,
@@ -126,6 +146,10 @@ class RecommendationService:
         """Refresh the persisted similarity index."""
         return await self._embedding_coordinator.refresh_similarity_index(force=force)
 
+    async def warm_start_index(self) -> bool:
+        """Load the memory-mapped index snapshot if it matches the database."""
+        return await self._embedding_coordinator.warm_start_similarity_index()
+
     # ------------------------------------------------------------------
     # Reporting helpers
     # ------------------------------------------------------------------
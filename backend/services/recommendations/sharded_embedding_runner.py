@@ -0,0 +1,255 @@
+"""Multi-process embedding computation for CPU-only hosts."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from backend.core.config import settings
+
+from .components.interfaces import FeatureExtractorProtocol
+from .components.keyword_index import KeywordIndex
+from .embedding_repository import LoRAEmbeddingRepository
+from .model_registry import build_feature_extractor
+
+ExtractorFactory = Callable[[], FeatureExtractorProtocol]
+
+# ``(adapter_id, features, error)`` per adapter, as returned by a worker.
+ChunkResult = List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]
+
+_worker_extractor: Optional[FeatureExtractorProtocol] = None
+
+
+def _init_worker(factory: ExtractorFactory, torch_threads: int) -> None:
+    """Build the extractor once per worker and pin its intra-op threads."""
+    global _worker_extractor
+    try:
+        import torch
+
+        torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+    _worker_extractor = factory()
+
+
+def _encode_chunk(adapters: Sequence[Any]) -> ChunkResult:
+    """Extract features for one chunk inside a worker process.
+
+    The chunk goes through the batched extractor path; if that fails each
+    adapter is retried on its own so one bad record only fails itself.
+    """
+    extractor = _worker_extractor
+    assert extractor is not None, "worker not initialised"
+    try:
+        features = extractor.extract_advanced_features_batch(adapters)
+        return [
+            (adapter.id, item, None)
+            for adapter, item in zip(adapters, features, strict=True)
+        ]
+    except Exception:
+        pass
+
+    results: ChunkResult = []
+    for adapter in adapters:
+        try:
+            results.append((
+                adapter.id,
+                extractor.extract_advanced_features(adapter),
+                None,
+            ))
+        except Exception as exc:
+            results.append((adapter.id, None, str(exc)))
+    return results
+
+
+def _snapshot(adapter: Any) -> SimpleNamespace:
+    """Return a detached, picklable copy of the adapter's column values."""
+    return SimpleNamespace(**adapter.model_dump())
+
+
+class ShardedEmbeddingRunner:
+    """Compute embeddings across a pool of worker processes.
+
+    Adapters are split into ``batch_size`` chunks that are spread over
+    ``workers`` processes. Each worker builds its feature extractor once,
+    so models load once per process, and encodes whole chunks with the
+    batched extractor path. The parent process is the only database writer:
+    it collects finished chunks as they arrive and persists them in bulk
+    transactions of at least ``commit_size`` rows.
+
+    Used as a context manager the pool stays up across :meth:`run` calls,
+    so paged recomputes load the models once per worker for the whole run.
+    """
+
+    def __init__(
+        self,
+        repository: LoRAEmbeddingRepository,
+        *,
+        workers: int,
+        extractor_factory: ExtractorFactory | None = None,
+        keyword_index: KeywordIndex | None = None,
+        commit_size: int = 256,
+        mp_context: Optional[multiprocessing.context.BaseContext] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Configure the pool.
+
+        Args:
+            repository: Persistence layer used by the single writer.
+            workers: Number of worker processes.
+            extractor_factory: Picklable callable building the extractor in
+                each worker; defaults to a CPU extractor configured like the
+                model registry's (see :func:`build_feature_extractor`), with
+                the parent's sentiment/style setting.
+            keyword_index: Corpus for the default extractor's keywords. It is
+                pickled into each worker once, so fill it before the pool
+                starts.
+            commit_size: Rows buffered before a bulk commit.
+            mp_context: Optional multiprocessing context for the pool.
+            logger: Optional logger for progress and diagnostics.
+
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self._repository = repository
+        self._workers = workers
+        self._extractor_factory = extractor_factory or functools.partial(
+            build_feature_extractor,
+            device="cpu",
+            keyword_index=keyword_index,
+            sentiment_style=settings.RECOMMENDATION_SENTIMENT_STYLE_ENABLED,
+        )
+        self._commit_size = max(1, commit_size)
+        self._mp_context = mp_context
+        self._logger = logger or logging.getLogger(__name__)
+        self._hasher: Optional[FeatureExtractorProtocol] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ShardedEmbeddingRunner":
+        """Start the worker pool for reuse across runs."""
+        self._pool = self._create_pool(self._workers)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Shut the worker pool down."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _create_pool(self, workers: int) -> ProcessPoolExecutor:
+        torch_threads = max(1, (os.cpu_count() or workers) // workers)
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=self._mp_context,
+            initializer=_init_worker,
+            initargs=(self._extractor_factory, torch_threads),
+        )
+
+    def _local_extractor(self) -> FeatureExtractorProtocol:
+        if self._hasher is None:
+            self._hasher = self._extractor_factory()
+        return self._hasher
+
+    def _unchanged_ids(self, adapters: Sequence[Any]) -> set[str]:
+        content_hash = getattr(self._local_extractor(), "content_hash", None)
+        stored = self._repository.get_content_hashes([a.id for a in adapters])
+        if not callable(content_hash) or not stored:
+            return set()
+        return {
+            adapter.id
+            for adapter in adapters
+            if adapter.id in stored and stored[adapter.id] == content_hash(adapter)
+        }
+
+    def _refresh_scores(self, adapters: Sequence[Any]) -> None:
+        calculator = getattr(self._local_extractor(), "score_calculator", None)
+        compute_many = getattr(calculator, "compute_many", None)
+        if adapters and callable(compute_many):
+            self._repository.update_scores(
+                [adapter.id for adapter in adapters], compute_many(adapters)
+            )
+
+    async def run(
+        self,
+        adapter_ids: Sequence[str] | None = None,
+        *,
+        force_recompute: bool = False,
+        batch_size: int = 32,
+        skip_unchanged: bool = False,
+    ) -> Dict[str, Any]:
+        """Compute embeddings like :meth:`EmbeddingBatchRunner.run`, in parallel."""
+        start_time = time.time()
+        adapters = self._repository.list_adapters(adapter_ids)
+
+        skipped_count = 0
+        unchanged_count = 0
+        if not force_recompute:
+            existing = self._repository.list_existing_embedding_ids(
+                [adapter.id for adapter in adapters],
+            )
+            skipped_count = sum(adapter.id in existing for adapter in adapters)
+            adapters = [adapter for adapter in adapters if adapter.id not in existing]
+        elif skip_unchanged:
+            unchanged = self._unchanged_ids(adapters)
+            unchanged_count = len(unchanged)
+            self._refresh_scores([a for a in adapters if a.id in unchanged])
+            adapters = [adapter for adapter in adapters if adapter.id not in unchanged]
+
+        chunks = [
+            [_snapshot(adapter) for adapter in adapters[start : start + batch_size]]
+            for start in range(0, len(adapters), batch_size)
+        ]
+        processed_count = 0
+        errors: list[Dict[str, str]] = []
+
+        if chunks:
+            self._logger.info(
+                "Encoding %s adapters in %s chunks across %s workers",
+                len(adapters),
+                len(chunks),
+                min(self._workers, len(chunks)),
+            )
+            loop = asyncio.get_running_loop()
+            pending: Dict[str, Dict[str, Any]] = {}
+            pool = self._pool or self._create_pool(min(self._workers, len(chunks)))
+            try:
+                futures = [
+                    loop.run_in_executor(pool, _encode_chunk, chunk) for chunk in chunks
+                ]
+                for future in asyncio.as_completed(futures):
+                    for adapter_id, features, error in await future:
+                        if error is not None:
+                            errors.append({"adapter_id": adapter_id, "error": error})
+                        else:
+                            pending[adapter_id] = features
+                    if len(pending) >= self._commit_size:
+                        self._repository.save_features_batch(pending)
+                        processed_count += len(pending)
+                        pending = {}
+            finally:
+                if pool is not self._pool:
+                    pool.shutdown()
+            if pending:
+                self._repository.save_features_batch(pending)
+                processed_count += len(pending)
+
+        return {
+            "processed_count": processed_count,
+            "skipped_count": skipped_count + unchanged_count,
+            "unchanged_count": unchanged_count,
+            "error_count": len(errors),
+            "processing_time_seconds": time.time() - start_time,
+            "errors": errors,
+            "completed_at": datetime.now(timezone.utc),
+        }
+
+
+__all__ = ["ShardedEmbeddingRunner"]
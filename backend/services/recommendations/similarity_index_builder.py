@@ -3,10 +3,15 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Callable
+import logging
+from datetime import timezone
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+
+import numpy as np
 
 from .components.interfaces import RecommendationEngineProtocol
 from .embedding_repository import LoRAEmbeddingRepository
+from .index_snapshot import IndexSnapshot
 
 
 class SimilarityIndexBuilder:
@@ -16,16 +21,123 @@ class SimilarityIndexBuilder:
         self,
         repository: LoRAEmbeddingRepository,
         engine_getter: Callable[[], RecommendationEngineProtocol],
+        *,
+        logger: Optional[logging.Logger] = None,
     ) -> None:
         """Store repository and callback used to obtain the engine."""
         self._repository = repository
         self._engine_getter = engine_getter
+        self._logger = logger or logging.getLogger(__name__)
 
     async def build(self) -> None:
-        """Fetch eligible adapters and rebuild the similarity index."""
+        """Fetch eligible adapters and rebuild the similarity index.
+
+        The stored embeddings are reused when every adapter has a complete
+        set encoded by the engine's current models, so a rebuild after a
+        recompute does not encode anything again. Otherwise the engine
+        re-encodes the collection.
+        """
         adapters = self._repository.list_active_adapters_with_embeddings()
         if not adapters:
             return
 
         engine = self._engine_getter()
-        await asyncio.to_thread(engine.build_similarity_index, adapters)
+        matrices = await asyncio.to_thread(
+            self._stored_matrices, adapters, engine_model_versions(engine)
+        )
+        if matrices is None:
+            await asyncio.to_thread(engine.build_similarity_index, adapters)
+        else:
+            self._logger.info(
+                "Building similarity index from %s stored embeddings", len(adapters)
+            )
+            await asyncio.to_thread(engine.build_from_embeddings, adapters, matrices)
+        self._load_predicted_styles(engine)
+
+    def _stored_matrices(
+        self, adapters: Sequence[Any], model_versions: Mapping[str, str]
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """Stack stored vectors in ``adapters`` order, or ``None`` if incomplete.
+
+        Rows encoded by models other than ``model_versions`` count as missing.
+        """
+        iterate = getattr(self._repository, "iter_active_embedding_vectors", None)
+        if not callable(iterate):
+            return None
+        try:
+            stored = dict(iterate(model_versions))
+            rows = [stored.get(adapter.id) for adapter in adapters]
+            if any(row is None for row in rows):
+                return None
+            return {
+                key: np.vstack([row[key] for row in rows], dtype=np.float32)
+                for key in ("semantic", "artistic", "technical")
+            }
+        except ValueError as exc:
+            self._logger.warning("Stored embeddings are inconsistent: %s", exc)
+            return None
+
+    def stored_matrices_for(
+        self, lora_ids: Sequence[str]
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """Stack the stored vectors of ``lora_ids`` in order.
+
+        Returns ``None`` when any of them has no complete stored embedding
+        encoded by the engine's current models.
+        """
+        stored = self._repository.get_embedding_vectors(
+            lora_ids, engine_model_versions(self._engine_getter())
+        )
+        if not lora_ids or any(lora_id not in stored for lora_id in lora_ids):
+            return None
+        return {
+            key: np.vstack(
+                [stored[lora_id][key] for lora_id in lora_ids], dtype=np.float32
+            )
+            for key in ("semantic", "artistic", "technical")
+        }
+
+    async def load_snapshot(self, snapshot: IndexSnapshot) -> bool:
+        """Populate the engine from ``snapshot`` if it is still current.
+
+        The snapshot is considered stale when the set of active adapters with
+        embeddings changed or any embedding was recomputed after it was
+        written. Adapters are hydrated with a single query; no inference runs.
+        """
+        adapters = self._repository.list_active_adapters_with_embeddings()
+        by_id = {adapter.id: adapter for adapter in adapters}
+        if not adapters or set(by_id) != set(snapshot.lora_ids):
+            self._logger.info("Index snapshot is stale: indexed adapters changed")
+            return False
+
+        latest = self._repository.get_last_embedding_update()
+        if latest is not None and snapshot.created_at is not None:
+            if latest.tzinfo is None:
+                latest = latest.replace(tzinfo=timezone.utc)
+            if latest > snapshot.created_at:
+                self._logger.info("Index snapshot is stale: embeddings recomputed")
+                return False
+
+        engine = self._engine_getter()
+        await asyncio.to_thread(
+            engine.build_from_embeddings,
+            [by_id[lora_id] for lora_id in snapshot.lora_ids],
+            snapshot.embeddings,
+            normalized=True,
+            rerank=snapshot.precision == "float32",
+        )
+        self._load_predicted_styles(engine)
+        return True
+
+    def _load_predicted_styles(self, engine: RecommendationEngineProtocol) -> None:
+        """Copy stored style predictions into the engine for prompt scoring."""
+        setter = getattr(engine, "set_predicted_styles", None)
+        if callable(setter):
+            setter(self._repository.get_predicted_styles())
+
+
+def engine_model_versions(engine: Any) -> Dict[str, str]:
+    """Return the model ids ``engine`` encodes with, or ``{}`` if unknown."""
+    getter = getattr(engine, "model_versions", None)
+    versions = getter() if callable(getter) else None
+    return dict(versions) if isinstance(versions, Mapping) else {}
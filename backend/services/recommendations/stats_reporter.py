@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Any, Callable, Optional
+
 from backend.schemas.recommendations import EmbeddingStatus, RecommendationStats
 
 from .interfaces import RecommendationMetricsTracker, RecommendationRepository
@@ -15,10 +17,16 @@ class StatsReporter:
         *,
         metrics_tracker: RecommendationMetricsTracker,
         repository: RecommendationRepository,
+        engine_provider: Optional[Callable[[], Any]] = None,
+        prompt_cache_provider: Optional[Callable[[], Any]] = None,
+        residency_provider: Optional[Callable[[], Any]] = None,
     ) -> None:
         """Persist metrics and repository collaborators."""
         self._metrics_tracker = metrics_tracker
         self._repository = repository
+        self._engine_provider = engine_provider
+        self._prompt_cache_provider = prompt_cache_provider
+        self._residency_provider = residency_provider
 
     @property
     def metrics_tracker(self) -> RecommendationMetricsTracker:
@@ -27,10 +35,43 @@ class StatsReporter:
 
     def build_stats(self, *, gpu_enabled: bool) -> RecommendationStats:
         """Build a statistics snapshot for the recommendation system."""
-        return self._metrics_tracker.build_stats(
+        stats = self._metrics_tracker.build_stats(
             self._repository,
             gpu_enabled=gpu_enabled,
         )
+        prompt_cache = (
+            self._prompt_cache_provider() if self._prompt_cache_provider else None
+        )
+        if prompt_cache is not None:
+            stats = stats.model_copy(
+                update={"prompt_cache_hit_rate": prompt_cache.stats()["hit_rate"]},
+            )
+        if self._residency_provider is not None:
+            residency = self._residency_provider().stats()
+            stats = stats.model_copy(
+                update={
+                    "model_resident_bytes": residency["resident_bytes"],
+                    "model_loads": residency["loads"],
+                    "model_load_seconds": residency["load_seconds"],
+                    "model_evictions": residency["evictions"],
+                    "model_eviction_seconds": residency["eviction_seconds"],
+                },
+            )
+        if self._engine_provider is None:
+            return stats
+
+        index_stats = getattr(self._engine_provider(), "index_stats", None)
+        if not callable(index_stats):
+            return stats
+        details = index_stats()
+        return stats.model_copy(
+            update={
+                "index_backend": details.get("backend"),
+                "index_recall_at_k": details.get("recall_at_k"),
+                "index_precision": details.get("precision"),
+                "index_memory_bytes": details.get("memory_bytes"),
+            },
+        )
 
     def embedding_status(self, adapter_id: str) -> EmbeddingStatus:
         """Return embedding status information for a LoRA adapter."""
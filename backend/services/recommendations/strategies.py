@@ -3,15 +3,16 @@
 from __future__ import annotations
 
 import asyncio
-import pickle
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
 import numpy as np
 
 from backend.schemas.recommendations import RecommendationItem
 
+from .embedding_codec import decode_current_embeddings
 from .embedding_manager import EmbeddingManager
 from .repository import RecommendationRepository
+from .similarity_index_builder import engine_model_versions
 from .trigger_engine import TriggerRecommendationEngine
 
 
@@ -39,50 +40,108 @@ async def get_similar_loras(
     if not getattr(engine, "lora_ids", None):
         return []
 
+    # Prefer stored vectors over re-encoding when the target is not indexed.
+    query_embeddings = None
+    contains = getattr(engine, "contains", None)
+    if callable(contains) and not contains(target_lora_id):
+        query_embeddings = _decode_stored_embeddings(
+            repository.get_embedding(target_lora_id),
+            engine_model_versions(engine),
+        )
+
     recommendations = await asyncio.to_thread(
         engine.get_recommendations,
         target_lora,
         limit * 2,
         weights,
         diversify_results,
+        query_embeddings=query_embeddings,
     )
 
-    filtered_recommendations: List[RecommendationItem] = []
-    for rec in recommendations:
-        if rec["similarity_score"] < similarity_threshold:
-            continue
+    return _hydrate_similar_items(
+        recommendations,
+        limit=limit,
+        similarity_threshold=similarity_threshold,
+        adapters=_fetch_adapters(repository, [recommendations], similarity_threshold),
+    )
 
-        candidate_lora = repository.get_adapter(rec["lora_id"])
-        if candidate_lora is None:
-            continue
 
-        filtered_recommendations.append(
-            RecommendationItem(
-                lora_id=rec["lora_id"],
-                lora_name=candidate_lora.name,
-                lora_description=candidate_lora.description,
-                similarity_score=rec["similarity_score"],
-                final_score=rec["final_score"],
-                explanation=rec["explanation"],
-                semantic_similarity=rec.get("semantic_similarity"),
-                artistic_similarity=rec.get("artistic_similarity"),
-                technical_similarity=rec.get("technical_similarity"),
-                quality_boost=rec.get("quality_boost"),
-                popularity_boost=rec.get("popularity_boost"),
-                recency_boost=rec.get("recency_boost"),
-                metadata={
-                    "tags": candidate_lora.tags[:5],
-                    "author": candidate_lora.author_username,
-                    "sd_version": candidate_lora.sd_version,
-                    "nsfw_level": candidate_lora.nsfw_level,
-                },
-            ),
-        )
+async def get_similar_loras_batch(
+    *,
+    target_lora_ids: Sequence[str],
+    limit: int,
+    similarity_threshold: float,
+    diversify_results: bool,
+    weights: Optional[Dict[str, float]],
+    include_merged: bool,
+    repository: RecommendationRepository,
+    embedding_manager: EmbeddingManager,
+    engine,
+) -> Tuple[Dict[str, List[RecommendationItem]], Optional[List[RecommendationItem]]]:
+    """Return LoRAs similar to each target plus an optional merged ranking.
 
-        if len(filtered_recommendations) >= limit:
-            break
+    The engine scores every target with a single matrix-matrix product; the
+    merged ranking excludes the targets themselves.
+    """
+    target_ids = list(dict.fromkeys(target_lora_ids))
+    found = repository.get_full_adapters(target_ids)
+    missing = [lora_id for lora_id in target_ids if lora_id not in found]
+    if missing:
+        raise ValueError(f"LoRAs not found: {', '.join(missing)}")
+    target_loras = [found[lora_id] for lora_id in target_ids]
 
-    return filtered_recommendations
+    await embedding_manager.ensure_embeddings_exist(target_loras)
+
+    if not getattr(engine, "lora_ids", None):
+        await embedding_manager.build_similarity_index()
+
+    if not getattr(engine, "lora_ids", None):
+        return {lora_id: [] for lora_id in target_ids}, [] if include_merged else None
+
+    query_embeddings: Dict[str, Dict[str, np.ndarray]] = {}
+    contains = getattr(engine, "contains", None)
+    if callable(contains):
+        unindexed = [lora_id for lora_id in target_ids if not contains(lora_id)]
+        model_versions = engine_model_versions(engine)
+        for lora_id, embedding in repository.get_embeddings(unindexed).items():
+            stored = _decode_stored_embeddings(embedding, model_versions)
+            if stored is not None:
+                query_embeddings[lora_id] = stored
+
+    batch = await asyncio.to_thread(
+        engine.get_batch_recommendations,
+        target_loras,
+        limit * 2,
+        weights,
+        diversify_results,
+        query_embeddings=query_embeddings or None,
+        include_merged=include_merged,
+    )
+
+    # One adapter query covers every target's candidates and the merged list.
+    adapters = _fetch_adapters(
+        repository,
+        [*batch["results"].values(), batch.get("merged") or []],
+        similarity_threshold,
+    )
+    results = {
+        lora_id: _hydrate_similar_items(
+            batch["results"].get(lora_id, []),
+            limit=limit,
+            similarity_threshold=similarity_threshold,
+            adapters=adapters,
+        )
+        for lora_id in target_ids
+    }
+    merged = None
+    if batch.get("merged") is not None:
+        merged = _hydrate_similar_items(
+            batch["merged"],
+            limit=limit,
+            similarity_threshold=similarity_threshold,
+            adapters=adapters,
+        )
+    return results, merged
 
 
 async def get_recommendations_for_prompt(
@@ -95,31 +154,48 @@ async def get_recommendations_for_prompt(
     repository: RecommendationRepository,
     embedder,
     device: str,
+    engine=None,
 ) -> List[RecommendationItem]:
-    """Return LoRAs that enhance the provided prompt."""
+    """Return LoRAs that enhance the provided prompt.
+
+    When ``engine`` holds a similarity index the prompt is scored against
+    its matrices in one pass, fused with a BM25 keyword ranking of the
+    prompt, and only the top ``limit`` adapters are read from the database.
+    Otherwise every stored embedding is loaded and scored one by one.
+    """
     active_loras = active_loras or []
 
     # Get embeddings for the prompt
     prompt_embeddings = await asyncio.to_thread(
         embedder.compute_prompt_embeddings, prompt, device=device
     )
+
+    if getattr(engine, "lora_ids", None):
+        ranked = await asyncio.to_thread(
+            engine.get_prompt_recommendations,
+            prompt_embeddings,
+            limit,
+            weights,
+            exclude_ids=active_loras,
+            style_preference=style_preference,
+            query_text=prompt,
+        )
+        return _hydrate_prompt_items(ranked, repository=repository)
+
     prompt_embedding = prompt_embeddings["semantic"]
 
     results = repository.get_active_loras_with_embeddings(exclude_ids=active_loras)
 
+    model_versions = engine_model_versions(embedder)
     recommendations: List[RecommendationItem] = []
     for adapter, embedding in results:
-        if not all([
-            embedding.semantic_embedding,
-            embedding.artistic_embedding,
-            embedding.technical_embedding,
-        ]):
+        # Unpack embeddings, skipping incomplete or stale rows
+        stored = _decode_stored_embeddings(embedding, model_versions)
+        if stored is None:
             continue
-
-        # Unpack embeddings
-        lora_semantic_embedding = pickle.loads(embedding.semantic_embedding)
-        lora_artistic_embedding = pickle.loads(embedding.artistic_embedding)
-        lora_technical_embedding = pickle.loads(embedding.technical_embedding)
+        lora_semantic_embedding = stored["semantic"]
+        lora_artistic_embedding = stored["artistic"]
+        lora_technical_embedding = stored["technical"]
 
         # Calculate multi-modal similarities
         semantic_similarity = _calculate_similarity(
@@ -210,10 +286,16 @@ async def get_recommendations_for_trigger(
             "normalized_triggers": list(getattr(adapter, "triggers", []) or []),
         }
 
+    adapters = repository.get_adapters([
+        candidate.adapter_id
+        for candidate in candidates
+        if candidate.adapter_id not in metadata_cache
+    ])
+
     for candidate in candidates:
         adapter_meta = metadata_cache.get(candidate.adapter_id)
         if adapter_meta is None:
-            adapter = repository.get_adapter(candidate.adapter_id)
+            adapter = adapters.get(candidate.adapter_id)
             if adapter is None:
                 continue
             adapter_meta = build_metadata(adapter)
@@ -334,6 +416,149 @@ async def get_recommendations_for_trigger(
     return recommendations[:limit]
 
 
+def _fetch_adapters(
+    repository: RecommendationRepository,
+    ranked_lists: Sequence[Sequence[Dict[str, Any]]],
+    similarity_threshold: float,
+) -> Dict[str, Any]:
+    """Load adapter summaries for every result above the threshold at once."""
+    return repository.get_adapters([
+        rec["lora_id"]
+        for ranked in ranked_lists
+        for rec in ranked
+        if rec["similarity_score"] >= similarity_threshold
+    ])
+
+
+def _hydrate_similar_items(
+    recommendations: Sequence[Dict[str, Any]],
+    *,
+    limit: int,
+    similarity_threshold: float,
+    adapters: Mapping[str, Any],
+) -> List[RecommendationItem]:
+    """Convert engine results above the threshold into response items."""
+    filtered_recommendations: List[RecommendationItem] = []
+    for rec in recommendations:
+        if rec["similarity_score"] < similarity_threshold:
+            continue
+
+        candidate_lora = adapters.get(rec["lora_id"])
+        if candidate_lora is None:
+            continue
+
+        filtered_recommendations.append(
+            RecommendationItem(
+                lora_id=rec["lora_id"],
+                lora_name=candidate_lora.name,
+                lora_description=candidate_lora.description,
+                similarity_score=rec["similarity_score"],
+                final_score=rec["final_score"],
+                explanation=rec["explanation"],
+                semantic_similarity=rec.get("semantic_similarity"),
+                artistic_similarity=rec.get("artistic_similarity"),
+                technical_similarity=rec.get("technical_similarity"),
+                quality_boost=rec.get("quality_boost"),
+                popularity_boost=rec.get("popularity_boost"),
+                recency_boost=rec.get("recency_boost"),
+                metadata={
+                    "tags": candidate_lora.tags[:5],
+                    "author": candidate_lora.author_username,
+                    "sd_version": candidate_lora.sd_version,
+                    "nsfw_level": candidate_lora.nsfw_level,
+                },
+            ),
+        )
+
+        if len(filtered_recommendations) >= limit:
+            break
+
+    return filtered_recommendations
+
+
+def _hydrate_prompt_items(
+    recommendations: Sequence[Dict[str, Any]],
+    *,
+    repository: RecommendationRepository,
+) -> List[RecommendationItem]:
+    """Convert engine prompt scores into response items for the top-k only.
+
+    The engine's order is kept as-is. When keyword hits were fused in, that
+    order is the reciprocal-rank-fusion rank, not ``final_score`` (the dense
+    score); the fused score is exposed as ``metadata["fusion_score"]`` so
+    clients can re-sort consistently.
+    """
+    adapters = repository.get_adapters([rec["lora_id"] for rec in recommendations])
+    items: List[RecommendationItem] = []
+    for rec in recommendations:
+        adapter = adapters.get(rec["lora_id"])
+        if adapter is None:
+            continue
+
+        explanation_parts = [
+            f"Semantic: {rec['semantic_similarity']:.2f}",
+            f"Artistic: {rec['artistic_similarity']:.2f}",
+            f"Technical: {rec['technical_similarity']:.2f}",
+        ]
+        if rec["style_boost"] > 0:
+            explanation_parts.append(f"Style Match: {rec['predicted_style']}")
+        if rec.get("lexical_score", 0.0) > 0:
+            explanation_parts.append(f"Keywords: {rec['lexical_score']:.2f}")
+
+        metadata = {
+            "tags": adapter.tags[:5],
+            "author": adapter.author_username,
+            "sd_version": adapter.sd_version,
+            "nsfw_level": adapter.nsfw_level,
+            "predicted_style": rec["predicted_style"],
+        }
+        if rec.get("fusion_score"):
+            metadata["fusion_score"] = rec["fusion_score"]
+
+        items.append(
+            RecommendationItem(
+                lora_id=adapter.id,
+                lora_name=adapter.name,
+                lora_description=adapter.description,
+                similarity_score=rec["semantic_similarity"],
+                final_score=rec["final_score"],
+                explanation=" | ".join(explanation_parts),
+                semantic_similarity=rec["semantic_similarity"],
+                artistic_similarity=rec["artistic_similarity"],
+                technical_similarity=rec["technical_similarity"],
+                metadata=metadata,
+            )
+        )
+    return items
+
+
+def _decode_stored_embeddings(
+    embedding: Any, model_versions: Optional[Mapping[str, str]] = None
+) -> Optional[Dict[str, np.ndarray]]:
+    """Return the persisted multi-modal vectors of ``embedding`` if current.
+
+    Incomplete rows and rows encoded by models other than ``model_versions``
+    yield ``None`` so the engine encodes the target itself.
+    """
+    if embedding is None:
+        return None
+
+    blobs = {
+        "semantic": embedding.semantic_embedding,
+        "artistic": embedding.artistic_embedding,
+        "technical": embedding.technical_embedding,
+    }
+    try:
+        decoded = decode_current_embeddings(blobs, model_versions)
+    except Exception:
+        return None
+    if decoded is None:
+        return None
+    return {
+        key: vector.astype(np.float32, copy=False) for key, vector in decoded.items()
+    }
+
+
 def _calculate_similarity(embedding1: np.ndarray, embedding2: np.ndarray) -> float:
     """Calculate cosine similarity between two numpy embeddings."""
     norm1 = np.linalg.norm(embedding1)
@@ -3,14 +3,18 @@
 from __future__ import annotations
 
 import logging
+import time
 from dataclasses import dataclass
 from threading import RLock
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 
+from .components.row_buffer import RowBuffer
 from .components.trigger_embedder import TriggerEmbedder
+from .components.trigger_ngram_index import TriggerNgramIndex
 from .components.trigger_processing import TriggerResolver
+from .embedding_codec import decode_embedding
 
 
 @dataclass(frozen=True)
@@ -25,6 +29,17 @@ class TriggerCandidateResult:
     signals: Dict[str, float]
 
 
+def _decode_trigger_vectors(blob: Optional[bytes]) -> Optional[np.ndarray]:
+    """Return the stored ``(triggers, dim)`` matrix, or ``None`` if unusable."""
+    if not blob:
+        return None
+    try:
+        vectors = decode_embedding(blob)
+    except ValueError:
+        return None
+    return vectors if vectors.ndim == 2 else None
+
+
 class TriggerSearchIndex:
     """Maintain an inverted index and embedding cache for triggers."""
 
@@ -33,15 +48,48 @@ class TriggerSearchIndex:
         *,
         logger: Optional[logging.Logger] = None,
         max_semantic_candidates: int = 100,
+        max_fuzzy_candidates: int = 50,
+        refresh_interval: float = 5.0,
+        compact_ratio: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
     ) -> None:
-        """Configure cache limits and logging for the search index."""
+        """Configure cache limits and logging for the search index.
+
+        Args:
+            logger: Optional logger for diagnostics.
+            max_semantic_candidates: Vectors considered by the semantic pass.
+            max_fuzzy_candidates: Triggers taken from the n-gram index and
+                re-ranked against the query vector.
+            refresh_interval: Minimum seconds between change-stamp checks;
+                searches in between use the index as-is.
+            compact_ratio: Fraction of vacated vector rows that triggers a
+                compaction of the trigger matrix.
+            clock: Monotonic time source, injectable for tests.
+
+        """
         self._logger = logger or logging.getLogger(__name__)
         self._max_semantic_candidates = max_semantic_candidates
+        self._max_fuzzy_candidates = max_fuzzy_candidates
+        self._refresh_interval = refresh_interval
+        self._compact_ratio = compact_ratio
+        self._clock = clock
         self._trigger_to_loras: Dict[str, set[str]] = {}
-        self._vector_keys: List[Tuple[str, str]] = []
-        self._vectors: Optional[np.ndarray] = None
+        self._fuzzy_index = TriggerNgramIndex()
+        # Rows of ``_vectors`` holding each trigger, one per adapter.
+        self._trigger_rows: Dict[str, List[int]] = {}
+        # ``None`` marks a row vacated by a changed or removed adapter; its
+        # vector is zeroed so it never scores above the semantic cut-off.
+        self._vector_keys: List[Optional[Tuple[str, str]]] = []
+        self._vectors: Optional[RowBuffer] = None
+        self._vacant_rows = 0
         self._adapter_metadata: Dict[str, Dict[str, object]] = {}
-        self._adapter_count: int = 0
+        self._adapter_rows: Dict[str, List[int]] = {}
+        # (adapter, embedding) ``updated_at`` last indexed per adapter, used
+        # to skip rows the inclusive incremental query returns again.
+        self._adapter_stamps: Dict[str, Tuple[Any, Any]] = {}
+        self._change_stamp: Optional[Tuple[Any, ...]] = None
+        self._last_check: Optional[float] = None
+        self._generation: int = 0
         self._lock = RLock()
 
     @property
@@ -49,32 +97,95 @@ class TriggerSearchIndex:
         """Expose the cached adapter metadata."""
         return self._adapter_metadata
 
+    @property
+    def generation(self) -> int:
+        """Counter bumped whenever the indexed triggers change."""
+        return self._generation
+
     def ensure(
         self, repository, embedder: TriggerEmbedder, resolver: TriggerResolver
     ) -> None:
-        """Ensure the index is populated and in sync with active adapters."""
+        """Ensure the index is populated and in sync with active adapters.
+
+        The repository change stamp is read at most once per
+        ``refresh_interval``. When it moved, adapters updated at or after the
+        previous stamp are reloaded, and only those whose timestamps differ
+        from the indexed copy are re-encoded and patched into the lookup
+        structures. Deactivated or deleted adapters are dropped.
+        """
         with self._lock:
-            current_count = repository.count_active_adapters()
-            if self._vectors is not None and current_count == self._adapter_count:
+            now = self._clock()
+            if (
+                self._vectors is not None
+                and self._last_check is not None
+                and now - self._last_check < self._refresh_interval
+            ):
                 return
-            self._logger.info("Rebuilding trigger index for %s adapters", current_count)
-            self._rebuild(repository, embedder, resolver)
-            self._adapter_count = current_count
+            self._last_check = now
 
-    def _rebuild(
-        self, repository, embedder: TriggerEmbedder, resolver: TriggerResolver
-    ) -> None:
-        trigger_to_loras: Dict[str, set[str]] = {}
-        vector_keys: List[Tuple[str, str]] = []
-        vector_payload: List[np.ndarray] = []
-        adapter_metadata: Dict[str, Dict[str, object]] = {}
+            stamp = tuple(repository.get_embedding_change_stamp())
+            if self._vectors is not None and stamp == self._change_stamp:
+                return
+
+            # The stamp ends with the latest adapter and embedding updates.
+            previous = self._change_stamp
+            if (
+                self._vectors is None
+                or previous is None
+                or None in previous[-2:]
+                or None in stamp[-2:]
+            ):
+                self._reset(embedder.dimension)
+                records = repository.get_active_loras_with_embeddings()
+                self._logger.info(
+                    "Building trigger index for %s adapters", len(records)
+                )
+                removed: set[str] = set()
+                rebuilt = True
+            else:
+                # Inclusive bounds: a write sharing the previous stamp's
+                # timestamp must not be missed; unchanged rows are skipped.
+                records = repository.get_active_loras_with_embeddings(
+                    adapters_updated_after=previous[-2],
+                    embeddings_updated_after=previous[-1],
+                )
+                removed = (
+                    set(self._adapter_stamps) - repository.list_active_embedding_ids()
+                )
+                rebuilt = False
+                self._logger.info(
+                    "Refreshing trigger index: %s fetched, %s removed",
+                    len(records),
+                    len(removed),
+                )
 
-        records = repository.get_active_loras_with_embeddings()
+            for adapter_id in removed:
+                self._drop_adapter(adapter_id)
+            changed = self._index_records(records, embedder, resolver)
+            self._maybe_compact()
+            self._change_stamp = stamp
+            if rebuilt or changed or removed:
+                self._generation += 1
+
+    def _index_records(
+        self, records, embedder: TriggerEmbedder, resolver: TriggerResolver
+    ) -> int:
+        """Patch ``records`` into the index and return how many changed."""
+        changed = 0
         for adapter, embedding in records:
+            stamp = (adapter.updated_at, getattr(embedding, "updated_at", None))
+            if self._adapter_stamps.get(adapter.id) == stamp:
+                continue
+            changed += 1
+            self._drop_adapter(adapter.id)
+            self._adapter_stamps[adapter.id] = stamp
+
             triggers = list(getattr(embedding, "normalized_triggers", []) or [])
             aliases = dict(getattr(embedding, "trigger_aliases", {}) or {})
             metadata = dict(getattr(embedding, "trigger_metadata", {}) or {})
-            stored_vectors = list(getattr(embedding, "trigger_embeddings", []) or [])
+            stored_vectors = _decode_trigger_vectors(
+                getattr(embedding, "trigger_embeddings", None)
+            )
 
             if not triggers and (adapter.triggers or adapter.activation_text):
                 candidates = resolver.build_candidates_from_adapter(
@@ -93,24 +204,24 @@ class TriggerSearchIndex:
             if not triggers:
                 continue
 
-            trigger_vectors: List[np.ndarray] = []
-            if stored_vectors and len(stored_vectors) == len(triggers):
-                for vector in stored_vectors:
-                    trigger_vectors.append(np.asarray(vector, dtype=np.float32))
+            if stored_vectors is not None and len(stored_vectors) == len(triggers):
+                trigger_vectors = list(stored_vectors)
             else:
-                computed = embedder.encode(triggers)
-                trigger_vectors = [vector for vector in computed]
+                trigger_vectors = list(embedder.encode(triggers))
 
+            kept: List[str] = []
+            normalized: List[np.ndarray] = []
             for trigger, vector in zip(triggers, trigger_vectors, strict=False):
                 vector = vector.astype(np.float32)
                 norm = np.linalg.norm(vector)
                 if norm:
                     vector = vector / norm
-                trigger_to_loras.setdefault(trigger, set()).add(adapter.id)
-                vector_keys.append((adapter.id, trigger))
-                vector_payload.append(vector)
+                kept.append(trigger)
+                normalized.append(vector)
+            if normalized:
+                self._add_rows(adapter.id, kept, np.vstack(normalized))
 
-            adapter_metadata[adapter.id] = {
+            self._adapter_metadata[adapter.id] = {
                 "id": adapter.id,
                 "name": adapter.name,
                 "description": adapter.description,
@@ -125,16 +236,85 @@ class TriggerSearchIndex:
                 "trigger_confidence": metadata.get("confidence", {}),
                 "normalized_triggers": triggers,
             }
-
-        if vector_payload:
-            matrix = np.vstack(vector_payload)
-        else:
-            matrix = np.zeros((0, embedder.dimension), dtype=np.float32)
-
-        self._trigger_to_loras = trigger_to_loras
-        self._vector_keys = vector_keys
-        self._vectors = matrix
-        self._adapter_metadata = adapter_metadata
+        return changed
+
+    def _reset(self, dimension: int) -> None:
+        """Empty every lookup structure ahead of a full build."""
+        self._trigger_to_loras = {}
+        self._fuzzy_index = TriggerNgramIndex()
+        self._trigger_rows = {}
+        self._vector_keys = []
+        self._vectors = RowBuffer(np.zeros((0, dimension), dtype=np.float32))
+        self._vacant_rows = 0
+        self._adapter_metadata = {}
+        self._adapter_rows = {}
+        self._adapter_stamps = {}
+
+    def _add_rows(
+        self, adapter_id: str, triggers: List[str], vectors: np.ndarray
+    ) -> None:
+        """Append ``adapter_id``'s trigger vectors and register their rows."""
+        assert self._vectors is not None
+        first = self._vectors.size
+        self._vectors.append(vectors)
+        rows = list(range(first, first + len(triggers)))
+        self._adapter_rows[adapter_id] = rows
+        for row, trigger in zip(rows, triggers, strict=True):
+            self._vector_keys.append((adapter_id, trigger))
+            self._trigger_rows.setdefault(trigger, []).append(row)
+            loras = self._trigger_to_loras.setdefault(trigger, set())
+            if not loras:
+                self._fuzzy_index.add(trigger)
+            loras.add(adapter_id)
+
+    def _drop_adapter(self, adapter_id: str) -> None:
+        """Forget ``adapter_id`` and vacate its rows of the trigger matrix."""
+        self._adapter_metadata.pop(adapter_id, None)
+        self._adapter_stamps.pop(adapter_id, None)
+        rows = self._adapter_rows.pop(adapter_id, None)
+        if not rows or self._vectors is None:
+            return
+        for row in rows:
+            key = self._vector_keys[row]
+            if key is None:
+                continue
+            trigger = key[1]
+            self._vector_keys[row] = None
+            trigger_rows = self._trigger_rows[trigger]
+            trigger_rows.remove(row)
+            if not trigger_rows:
+                del self._trigger_rows[trigger]
+            loras = self._trigger_to_loras[trigger]
+            loras.discard(adapter_id)
+            if not loras:
+                del self._trigger_to_loras[trigger]
+                self._fuzzy_index.remove(trigger)
+        indices = np.asarray(rows, dtype=np.intp)
+        self._vectors.assign(
+            indices,
+            np.zeros((len(rows), self._vectors.view.shape[1]), dtype=np.float32),
+        )
+        self._vacant_rows += len(rows)
+
+    def _maybe_compact(self) -> None:
+        """Drop vacated rows once they make up ``compact_ratio`` of the matrix."""
+        if self._vectors is None or not self._vacant_rows:
+            return
+        if self._vacant_rows < self._compact_ratio * self._vectors.size:
+            return
+        keep = [row for row, key in enumerate(self._vector_keys) if key is not None]
+        remap = {old: new for new, old in enumerate(keep)}
+        self._vectors.take(np.asarray(keep, dtype=np.intp))
+        self._vector_keys = [self._vector_keys[row] for row in keep]
+        self._trigger_rows = {
+            trigger: [remap[row] for row in rows]
+            for trigger, rows in self._trigger_rows.items()
+        }
+        self._adapter_rows = {
+            adapter_id: [remap[row] for row in rows]
+            for adapter_id, rows in self._adapter_rows.items()
+        }
+        self._vacant_rows = 0
 
     def search(
         self,
@@ -168,21 +348,31 @@ class TriggerSearchIndex:
                 if existing is None or result.final_score > existing.final_score:
                     scored[adapter_id] = result
 
-        need_semantic = len(scored) < limit
-        if need_semantic and resolution.normalized_query:
-            query_vector = embedder.encode_single(resolution.normalized_query)
-            if self._vectors is not None and len(self._vectors):
-                similarities = np.dot(self._vectors, query_vector)
+        query_vector: Optional[np.ndarray] = None
+        if len(scored) < limit and resolution.normalized_query:
+            fuzzy = self._fuzzy_index.search(
+                resolution.normalized_query, limit=self._max_fuzzy_candidates
+            )
+            if fuzzy:
+                query_vector = embedder.encode_single(resolution.normalized_query)
+                self._score_fuzzy(fuzzy, query_vector, scored)
+
+        # Brute-force dense scan only when lexical lookup came up short.
+        if len(scored) < limit and resolution.normalized_query:
+            if query_vector is None:
+                query_vector = embedder.encode_single(resolution.normalized_query)
+            if self._vectors is not None and self._vectors.size:
+                similarities = np.dot(self._vectors.view, query_vector)
                 top_indices = np.argsort(similarities)[::-1][
                     : self._max_semantic_candidates
                 ]
                 for idx in top_indices:
-                    adapter_id, trigger = self._vector_keys[idx]
-                    if adapter_id in scored and scored[adapter_id].signals.get("exact"):
-                        continue
                     similarity = float(similarities[idx])
                     if similarity <= 0:
                         continue
+                    adapter_id, trigger = self._vector_keys[idx]
+                    if adapter_id in scored and scored[adapter_id].signals.get("exact"):
+                        continue
                     explanation = f"Semantic trigger similarity: {similarity:.2f}"
                     result = TriggerCandidateResult(
                         adapter_id=adapter_id,
@@ -201,6 +391,43 @@ class TriggerSearchIndex:
         )
         return ranked[:limit]
 
+    def _score_fuzzy(
+        self,
+        fuzzy: List[Tuple[str, float]],
+        query_vector: np.ndarray,
+        scored: Dict[str, TriggerCandidateResult],
+    ) -> None:
+        """Re-rank n-gram candidates with their stored trigger vectors.
+
+        The final score averages the lexical and cosine similarities so a
+        close spelling of an unrelated concept does not outrank a slightly
+        weaker spelling of a relevant one.
+        """
+        if self._vectors is None:
+            return
+        rows = [row for trigger, _ in fuzzy for row in self._trigger_rows[trigger]]
+        if not rows:
+            return
+        lexical = dict(fuzzy)
+        similarities = self._vectors.view[rows] @ query_vector
+        for row, similarity in zip(rows, similarities.tolist(), strict=True):
+            adapter_id, trigger = self._vector_keys[row]
+            existing = scored.get(adapter_id)
+            if existing is not None and existing.signals.get("exact"):
+                continue
+            lexical_score = lexical[trigger]
+            final_score = (lexical_score + max(similarity, 0.0)) / 2.0
+            result = TriggerCandidateResult(
+                adapter_id=adapter_id,
+                canonical_trigger=trigger,
+                final_score=final_score,
+                similarity_score=lexical_score,
+                explanation=f"Fuzzy trigger match: '{trigger}' ({lexical_score:.2f})",
+                signals={"fuzzy": lexical_score, "semantic": similarity},
+            )
+            if existing is None or result.final_score > existing.final_score:
+                scored[adapter_id] = result
+
 
 class TriggerRecommendationEngine:
     """High level trigger recommendation helper with cached index."""
@@ -219,6 +446,11 @@ class TriggerRecommendationEngine:
         self._index = index
         self._logger = logger or logging.getLogger(__name__)
 
+    def index_generation(self, repository) -> int:
+        """Bring the trigger index up to date and return its generation."""
+        self._index.ensure(repository, self._embedder, self._resolver)
+        return self._index.generation
+
     def search(
         self, repository, query: str, limit: int
     ) -> List[TriggerCandidateResult]:
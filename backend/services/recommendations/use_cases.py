@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Any, Callable, Dict, List, Optional, Sequence
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from backend.schemas.recommendations import RecommendationItem
 
@@ -14,6 +14,7 @@ from .interfaces import (
     RecommendationMetricsTracker,
     RecommendationRepository,
 )
+from .result_cache import RecommendationResultCache
 from .strategies import (
     get_recommendations_for_prompt as prompt_strategy,
 )
@@ -23,6 +24,9 @@ from .strategies import (
 from .strategies import (
     get_similar_loras as similar_loras_strategy,
 )
+from .strategies import (
+    get_similar_loras_batch as similar_loras_batch_strategy,
+)
 
 
 class SimilarLoraUseCase:
@@ -35,12 +39,14 @@ class SimilarLoraUseCase:
         embedding_workflow: EmbeddingWorkflow,
         engine_provider: Callable[[], Any],
         metrics: RecommendationMetricsTracker,
+        result_cache: Optional[RecommendationResultCache] = None,
     ) -> None:
         """Store collaborators used to resolve similarity queries."""
         self._repository = repository
         self._embedding_workflow = embedding_workflow
         self._engine_provider = engine_provider
         self._metrics = metrics
+        self._result_cache = result_cache
 
     async def execute(
         self,
@@ -51,11 +57,30 @@ class SimilarLoraUseCase:
         diversify_results: bool,
         weights: Optional[Dict[str, float]],
     ) -> List[RecommendationItem]:
-        """Return LoRAs similar to ``target_lora_id`` while capturing metrics."""
+        """Return LoRAs similar to ``target_lora_id`` while capturing metrics.
+
+        Results are served from the result cache while the engine's index
+        generation is unchanged. Fresh results are stored under the
+        generation read after the strategy ran, since resolving the target
+        may itself rebuild or update the index.
+        """
         start = time.perf_counter()
         try:
             engine = self._engine_provider()
-            return await similar_loras_strategy(
+            key = (
+                "similar",
+                target_lora_id,
+                RecommendationResultCache.weights_key(weights),
+                limit,
+                similarity_threshold,
+                diversify_results,
+            )
+            generation = getattr(engine, "generation", None)
+            cached = _cache_lookup(self._result_cache, self._metrics, key, generation)
+            if cached is not None:
+                return cached
+
+            items = await similar_loras_strategy(
                 target_lora_id=target_lora_id,
                 limit=limit,
                 similarity_threshold=similarity_threshold,
@@ -65,6 +90,42 @@ class SimilarLoraUseCase:
                 embedding_manager=self._embedding_workflow,
                 engine=engine,
             )
+            _cache_store(
+                self._result_cache,
+                key,
+                getattr(engine, "generation", None),
+                items,
+            )
+            return items
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._metrics.record_query(elapsed_ms)
+
+    async def execute_batch(
+        self,
+        *,
+        target_lora_ids: Sequence[str],
+        limit: int,
+        similarity_threshold: float,
+        diversify_results: bool,
+        weights: Optional[Dict[str, float]],
+        include_merged: bool = False,
+    ) -> Tuple[Dict[str, List[RecommendationItem]], Optional[List[RecommendationItem]]]:
+        """Return per-target similar LoRAs and an optional merged ranking."""
+        start = time.perf_counter()
+        try:
+            engine = self._engine_provider()
+            return await similar_loras_batch_strategy(
+                target_lora_ids=target_lora_ids,
+                limit=limit,
+                similarity_threshold=similarity_threshold,
+                diversify_results=diversify_results,
+                weights=weights,
+                include_merged=include_merged,
+                repository=self._repository,
+                embedding_manager=self._embedding_workflow,
+                engine=engine,
+            )
         finally:
             elapsed_ms = (time.perf_counter() - start) * 1000
             self._metrics.record_query(elapsed_ms)
@@ -80,12 +141,18 @@ class PromptRecommendationUseCase:
         embedder_provider: Callable[[], SemanticEmbedderProtocol],
         metrics: RecommendationMetricsTracker,
         device: str,
+        engine_provider: Optional[Callable[[], Any]] = None,
     ) -> None:
-        """Persist dependencies required to generate prompt recommendations."""
+        """Persist dependencies required to generate prompt recommendations.
+
+        ``engine_provider`` should return the loaded recommendation engine (or
+        ``None``); prompts are then scored against its in-memory index.
+        """
         self._repository = repository
         self._embedder_provider = embedder_provider
         self._metrics = metrics
         self._device = device
+        self._engine_provider = engine_provider
 
     async def execute(
         self,
@@ -100,6 +167,7 @@ class PromptRecommendationUseCase:
         start = time.perf_counter()
         try:
             embedder = self._embedder_provider()
+            engine = self._engine_provider() if self._engine_provider else None
             return await prompt_strategy(
                 prompt=prompt,
                 active_loras=list(active_loras) if active_loras else None,
@@ -109,6 +177,7 @@ class PromptRecommendationUseCase:
                 repository=self._repository,
                 embedder=embedder,
                 device=self._device,
+                engine=engine,
             )
         finally:
             elapsed_ms = (time.perf_counter() - start) * 1000
@@ -125,12 +194,14 @@ class TriggerRecommendationUseCase:
         trigger_engine_provider: Callable[[], Any],
         metrics: RecommendationMetricsTracker,
         logger: Optional[logging.Logger] = None,
+        result_cache: Optional[RecommendationResultCache] = None,
     ) -> None:
         """Cache dependencies required to execute trigger recommendations."""
         self._repository = repository
         self._trigger_engine_provider = trigger_engine_provider
         self._metrics = metrics
         self._logger = logger or logging.getLogger(__name__)
+        self._result_cache = result_cache
 
     async def execute(
         self,
@@ -142,13 +213,51 @@ class TriggerRecommendationUseCase:
         start = time.perf_counter()
         try:
             engine = self._trigger_engine_provider()
-            return await trigger_strategy(
+            key = ("trigger", trigger_query.strip().lower(), limit)
+            generation = None
+            if self._result_cache is not None:
+                generation = engine.index_generation(self._repository)
+            cached = _cache_lookup(self._result_cache, self._metrics, key, generation)
+            if cached is not None:
+                return cached
+
+            items = await trigger_strategy(
                 trigger_query=trigger_query,
                 limit=limit,
                 repository=self._repository,
                 trigger_engine=engine,
                 logger=self._logger,
             )
+            _cache_store(self._result_cache, key, generation, items)
+            return items
         finally:
             elapsed_ms = (time.perf_counter() - start) * 1000
             self._metrics.record_query(elapsed_ms)
+
+
+def _cache_lookup(
+    cache: Optional[RecommendationResultCache],
+    metrics: RecommendationMetricsTracker,
+    key: Tuple[Any, ...],
+    generation: Any,
+) -> Optional[List[RecommendationItem]]:
+    """Return a copy of a cached result, recording the hit or miss."""
+    if cache is None or generation is None:
+        return None
+    cached = cache.get(key, generation)
+    if cached is None:
+        metrics.record_cache_miss()
+        return None
+    metrics.record_cache_hit()
+    return [item.model_copy(deep=True) for item in cached]
+
+
+def _cache_store(
+    cache: Optional[RecommendationResultCache],
+    key: Tuple[Any, ...],
+    generation: Any,
+    items: List[RecommendationItem],
+) -> None:
+    """Store private copies of ``items`` so callers cannot mutate the entry."""
+    if cache is not None and generation is not None:
+        cache.put(key, generation, tuple(item.model_copy(deep=True) for item in items))
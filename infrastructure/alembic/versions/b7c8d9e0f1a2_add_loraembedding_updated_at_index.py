@@ -0,0 +1,29 @@
+"""Index loraembedding.updated_at for trigger index change stamps.
+
+Revision ID: b7c8d9e0f1a2
+Revises: f0a1b2c3d4e5
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b7c8d9e0f1a2"
+down_revision = "f0a1b2c3d4e5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add the index used by ``max(updated_at)`` change-stamp queries."""
+    op.create_index(
+        "idx_loraembedding_updated_at",
+        "loraembedding",
+        ["updated_at"],
+        unique=False,
+    )
+
+
+def downgrade():
+    """Drop the change-stamp index."""
+    op.drop_index("idx_loraembedding_updated_at", table_name="loraembedding")
@@ -0,0 +1,34 @@
+"""Add loraembedding.content_hash for incremental recomputes.
+
+Revision ID: c8d9e0f1a2b3
+Revises: b7c8d9e0f1a2
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c8d9e0f1a2b3"
+down_revision = "b7c8d9e0f1a2"
+branch_labels = None
+depends_on = None
+
+TABLE_NAME = "loraembedding"
+
+
+def upgrade():
+    """Add the nullable hash column; existing rows recompute once."""
+    existing = {c["name"] for c in sa.inspect(op.get_bind()).get_columns(TABLE_NAME)}
+    if "content_hash" in existing:
+        return
+    with op.batch_alter_table(TABLE_NAME, schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("content_hash", sa.String(length=64), nullable=True)
+        )
+
+
+def downgrade():
+    """Drop the hash column."""
+    with op.batch_alter_table(TABLE_NAME, schema=None) as batch_op:
+        batch_op.drop_column("content_hash")
@@ -1,86 +1,252 @@
 """Recompute LoRA embeddings and rebuild the similarity index.
 
-This migration script iterates over every adapter in the database, recomputes
-its multi-modal embeddings with the current feature extraction pipeline, and
-then rebuilds the similarity index from scratch. The script is intended to be
-executed in staging before running in production so that operators can estimate
-runtime and resource requirements.
+This migration script walks every adapter in the database in id-ordered
+pages, recomputes its multi-modal embeddings with the current feature
+extraction pipeline, and then rebuilds the similarity index from the stored
+vectors. Adapters whose stored content hash (payload texts plus model ids) is
+unchanged are not re-encoded and only get their scores refreshed; keywords
+and sentiment are not covered by the hash, so pass ``--all`` to re-encode
+them anyway after changing those models.
+
+After every page the last completed adapter id and running totals are written
+to a checkpoint file, so an interrupted run continues where it stopped when
+started again with ``--resume``. The keyword corpus filled from the catalog is
+saved next to the checkpoint, so a resumed run restores it instead of reading
+the whole catalog again. Each page logs throughput and an ETA.
+
+``--scores-only`` skips the models entirely. It recomputes the numeric quality,
+popularity, recency and compatibility scores column-wise and writes each page
+back with one bulk update, e.g. after an adapter stats refresh. The
+script is intended to be executed in staging before running in production so
+that operators can estimate runtime and resource requirements.
 """
 
 from __future__ import annotations
 
 import argparse
 import asyncio
+import contextlib
+import json
 import logging
 import os
 import sys
-from typing import TYPE_CHECKING, Any, Dict
-
-from sqlmodel import select
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
 
 # Ensure the project root is on the import path when the script is executed
 # directly (e.g. ``python scripts/recompute_embeddings.py``).
 PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
 
-if TYPE_CHECKING:  # pragma: no cover - typing support only
-    from backend.models import Adapter
-
 LOGGER = logging.getLogger("lora.migrations.recompute_embeddings")
 
+DEFAULT_CHECKPOINT = "recompute_embeddings.checkpoint.json"
+
+_COUNTERS = ("processed_count", "skipped_count", "unchanged_count", "error_count")
+
 
 def _load_backend_dependencies():
     """Import backend modules lazily after patching ``sys.path`` if required."""
     if PROJECT_ROOT not in sys.path:
         sys.path.insert(0, PROJECT_ROOT)
 
+    from backend.core.config import settings
     from backend.core.database import get_session_context, init_db
-    from backend.models import Adapter
     from backend.services import create_service_container
+    from backend.services.recommendations import (
+        LoRAEmbeddingRepository,
+        ShardedEmbeddingRunner,
+    )
+    from backend.services.recommendations.components.keyword_index import (
+        document_text,
+    )
+    from backend.services.recommendations.components.scoring import ScoreCalculator
+    from backend.services.recommendations.model_registry import (
+        RecommendationModelRegistry,
+    )
 
     return {
         "get_session_context": get_session_context,
         "init_db": init_db,
-        "Adapter": Adapter,
+        "settings": settings,
         "create_service_container": create_service_container,
+        "LoRAEmbeddingRepository": LoRAEmbeddingRepository,
+        "RecommendationModelRegistry": RecommendationModelRegistry,
+        "ShardedEmbeddingRunner": ShardedEmbeddingRunner,
+        "ScoreCalculator": ScoreCalculator,
+        "document_text": document_text,
     }
 
 
-async def _recompute_embeddings(*, batch_size: int) -> Dict[str, Any]:
-    """Recompute embeddings for every adapter and rebuild the similarity index."""
+def _read_checkpoint(path: Path) -> Dict[str, Any]:
+    """Return the JSON state saved at ``path``, or ``{}`` if there is none."""
+    if not path.is_file():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _write_checkpoint(path: Path, state: Dict[str, Any]) -> None:
+    """Atomically replace the JSON state saved at ``path`` with ``state``."""
+    staging = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+    staging.write_text(json.dumps(state), encoding="utf-8")
+    os.replace(staging, path)
+
+
+def _corpus_path(checkpoint_path: Path) -> Path:
+    """Return where the keyword corpus of a checkpointed run is saved."""
+    return checkpoint_path.with_name(f"{checkpoint_path.name}.corpus")
+
+
+def _keyword_corpus(repository, document_text, *, page_size: int):
+    """Yield ``(adapter_id, text)`` for every adapter, one page at a time."""
+    last_id: Optional[str] = None
+    while True:
+        page = repository.list_adapter_ids_page(after=last_id, limit=page_size)
+        if not page:
+            return
+        for adapter in repository.list_adapters(page):
+            yield adapter.id, document_text(adapter)
+        last_id = page[-1]
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}"
+
+
+async def _recompute_embeddings(
+    *,
+    batch_size: int,
+    skip_unchanged: bool = True,
+    workers: int = 1,
+    page_size: int = 1000,
+    checkpoint_path: Path = Path(DEFAULT_CHECKPOINT),
+    resume: bool = False,
+) -> Dict[str, Any]:
+    """Recompute embeddings for every adapter and rebuild the similarity index.
+
+    Adapters whose stored content hash still matches their payloads and
+    model ids are skipped unless ``skip_unchanged`` is ``False``. With more
+    than one worker, adapters are sharded across a process pool and this
+    process only writes the results.
+    """
     deps = _load_backend_dependencies()
-    init_db = deps["init_db"]
-    get_session_context = deps["get_session_context"]
-    adapter_model = deps["Adapter"]
-    create_service_container = deps["create_service_container"]
-
-    init_db()
-
-    with get_session_context() as session:
-        adapters: list["Adapter"] = list(session.exec(select(adapter_model)).all())
-        adapter_ids = [adapter.id for adapter in adapters]
-        LOGGER.info("Discovered %s adapters for recompute", len(adapter_ids))
-
-        if not adapter_ids:
-            LOGGER.warning("No adapters found; nothing to recompute")
-            return {
-                "processed_count": 0,
-                "skipped_count": 0,
-                "error_count": 0,
-                "processing_time_seconds": 0.0,
-                "index_rebuild": None,
-            }
-
-        container = create_service_container(session)
+    deps["init_db"]()
+
+    state: Dict[str, Any] = {}
+    if resume:
+        state = _read_checkpoint(checkpoint_path)
+        if state:
+            LOGGER.info(
+                "Resuming after adapter %s (%s done)",
+                state.get("last_id"),
+                state.get("completed", 0),
+            )
+        else:
+            LOGGER.info(
+                "No checkpoint at %s; starting from the beginning", checkpoint_path
+            )
+    totals = {key: int(state.get(key, 0)) for key in _COUNTERS}
+    errors: list[Dict[str, str]] = list(state.get("errors", []))
+    last_id: Optional[str] = state.get("last_id")
+    completed = int(state.get("completed", 0))
+
+    with deps["get_session_context"]() as session:
+        repository = deps["LoRAEmbeddingRepository"](
+            session,
+            embedding_dtype=deps["settings"].RECOMMENDATION_EMBEDDING_STORAGE_DTYPE,
+        )
+        total = repository.count_adapters()
+        LOGGER.info("Discovered %s adapters for recompute", total)
+
+        container = deps["create_service_container"](session)
         recommendation_service = container.domain.recommendations
 
-        LOGGER.info("Starting batch embedding recompute (batch size=%s)", batch_size)
-        batch_result = await recommendation_service.embeddings.compute_batch(
-            adapter_ids,
-            force_recompute=True,
-            batch_size=batch_size,
+        # Keywords are ranked against corpus document frequencies, so fill
+        # the corpus from the whole catalog before the first page is encoded.
+        # A resumed run restores the corpus its first pages were ranked with.
+        keyword_index = deps["RecommendationModelRegistry"].get_keyword_index()
+        corpus_path = _corpus_path(checkpoint_path)
+        saved_corpus = _read_checkpoint(corpus_path) if state else {}
+        if saved_corpus:
+            keyword_index.load_document_terms(saved_corpus)
+            LOGGER.info("Restored the keyword corpus from %s", corpus_path)
+        else:
+            keyword_index.rebuild(
+                _keyword_corpus(repository, deps["document_text"], page_size=page_size)
+            )
+            _write_checkpoint(corpus_path, keyword_index.document_terms())
+        LOGGER.info("Keyword corpus holds %s adapters", len(keyword_index))
+
+        LOGGER.info(
+            "Starting embedding recompute (batch size=%s, page size=%s, workers=%s)",
+            batch_size,
+            page_size,
+            workers,
         )
+        runner = None
+        if workers > 1:
+            runner = deps["ShardedEmbeddingRunner"](
+                repository,
+                workers=workers,
+                keyword_index=keyword_index,
+                logger=LOGGER,
+            )
+
+        start_time = time.monotonic()
+        done_this_run = 0
+        with runner if runner is not None else contextlib.nullcontext():
+            while True:
+                page = repository.list_adapter_ids_page(after=last_id, limit=page_size)
+                if not page:
+                    break
+
+                if runner is not None:
+                    result = await runner.run(
+                        page,
+                        force_recompute=True,
+                        batch_size=batch_size,
+                        skip_unchanged=skip_unchanged,
+                    )
+                else:
+                    result = await recommendation_service.embeddings.compute_batch(
+                        page,
+                        force_recompute=True,
+                        batch_size=batch_size,
+                        skip_unchanged=skip_unchanged,
+                    )
+
+                for key in _COUNTERS:
+                    totals[key] += int(result.get(key, 0))
+                errors.extend(result.get("errors", []))
+                last_id = page[-1]
+                completed += len(page)
+                done_this_run += len(page)
+                _write_checkpoint(
+                    checkpoint_path,
+                    {
+                        "last_id": last_id,
+                        "completed": completed,
+                        "errors": errors,
+                        **totals,
+                    },
+                )
+
+                elapsed = time.monotonic() - start_time
+                rate = done_this_run / elapsed if elapsed > 0 else 0.0
+                remaining = max(total - completed, 0)
+                eta = _format_duration(remaining / rate) if rate else "unknown"
+                LOGGER.info(
+                    "Progress %s/%s adapters (%.1f items/s, ETA %s, %s errors)",
+                    completed,
+                    total,
+                    rate,
+                    eta,
+                    totals["error_count"],
+                )
 
-        LOGGER.info("Rebuilding similarity index with freshly computed embeddings")
+        LOGGER.info("Rebuilding similarity index from the stored embeddings")
         index_response = await recommendation_service.refresh_indexes(force=True)
 
         LOGGER.info(
@@ -89,10 +255,49 @@ async def _recompute_embeddings(*, batch_size: int) -> Dict[str, Any]:
             index_response.indexed_items,
         )
 
-        return {
-            **batch_result,
-            "index_rebuild": index_response.model_dump(),
-        }
+    checkpoint_path.unlink(missing_ok=True)
+    corpus_path.unlink(missing_ok=True)
+    return {
+        **totals,
+        "errors": errors,
+        "processing_time_seconds": time.monotonic() - start_time,
+        "index_rebuild": index_response.model_dump(),
+    }
+
+
+def _rescore_catalog(*, page_size: int = 1000) -> Dict[str, Any]:
+    """Recompute the stored numeric scores of every adapter without models.
+
+    Each page is scored with :meth:`ScoreCalculator.compute_many` and written
+    back with a single bulk update; embeddings are left untouched.
+    """
+    deps = _load_backend_dependencies()
+    deps["init_db"]()
+    calculator = deps["ScoreCalculator"](logger=LOGGER)
+
+    start_time = time.monotonic()
+    scored_count = 0
+    updated_count = 0
+    last_id: Optional[str] = None
+    with deps["get_session_context"]() as session:
+        repository = deps["LoRAEmbeddingRepository"](session)
+        while True:
+            page = repository.list_adapter_ids_page(after=last_id, limit=page_size)
+            if not page:
+                break
+            adapters = repository.list_adapters(page)
+            updated_count += repository.update_scores(
+                [adapter.id for adapter in adapters],
+                calculator.compute_many(adapters),
+            )
+            scored_count += len(adapters)
+            last_id = page[-1]
+
+    return {
+        "scored_count": scored_count,
+        "updated_count": updated_count,
+        "processing_time_seconds": time.monotonic() - start_time,
+    }
 
 
 def _configure_logging(verbose: bool) -> None:
@@ -109,7 +314,43 @@ def _parse_args() -> argparse.Namespace:
         "--batch-size",
         type=int,
         default=32,
-        help="Number of adapters to embed concurrently before yielding",
+        help="Number of adapters encoded together per model call",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=1000,
+        help="Adapters fetched and checkpointed per page",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes to shard the recompute across (CPU hosts)",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Re-encode every adapter, even when its content hash is unchanged",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=Path(DEFAULT_CHECKPOINT),
+        help=(
+            "Checkpoint file recording progress; the keyword corpus is saved "
+            "beside it with a .corpus suffix (both removed on success)"
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue after the last adapter recorded in the checkpoint",
+    )
+    parser.add_argument(
+        "--scores-only",
+        action="store_true",
+        help="Only recompute stored quality, popularity and recency scores",
     )
     parser.add_argument(
         "--verbose",
@@ -124,8 +365,23 @@ def main() -> None:
     args = _parse_args()
     _configure_logging(args.verbose)
 
-    LOGGER.info("Launching full embedding recompute migration")
-    result = asyncio.run(_recompute_embeddings(batch_size=args.batch_size))
+    if args.scores_only:
+        LOGGER.info("Rescoring every adapter")
+        result = _rescore_catalog(page_size=max(1, args.page_size))
+        LOGGER.info("Rescore summary: %s", result)
+        return
+
+    LOGGER.info("Launching embedding recompute migration")
+    result = asyncio.run(
+        _recompute_embeddings(
+            batch_size=args.batch_size,
+            skip_unchanged=not args.all,
+            workers=max(1, args.workers),
+            page_size=max(1, args.page_size),
+            checkpoint_path=args.checkpoint,
+            resume=args.resume,
+        )
+    )
 
     LOGGER.info("Embedding recompute summary: %s", result)
 
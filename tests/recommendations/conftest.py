@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import dataclasses
+from typing import Any, Dict, List, Sequence
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 
 from backend.models import Adapter
@@ -66,3 +69,67 @@ def model_registry(monkeypatch):
     )
 
     return RecommendationModelRegistry
+
+
+@dataclasses.dataclass
+class CatalogLora:
+    """Lightweight LoRA stand-in used by engine tests."""
+
+    id: str
+    sd_version: str | None = None
+    description: str | None = None
+    tags: tuple[str, ...] = ()
+    stats: Dict[str, Any] | None = None
+    published_at: Any = None
+
+
+class TableEmbedder:
+    """Embedder stub returning pre-generated vectors keyed by LoRA id."""
+
+    def __init__(self, vectors: Dict[str, Dict[str, np.ndarray]]) -> None:
+        self.vectors = vectors
+        self.single_calls: List[str] = []
+        self.batch_calls = 0
+
+    def create_multi_modal_embedding(self, lora: Any) -> Dict[str, np.ndarray]:
+        self.single_calls.append(lora.id)
+        return self.vectors[lora.id]
+
+    def batch_encode_collection(self, loras: Sequence[Any]) -> Dict[str, np.ndarray]:
+        self.batch_calls += 1
+        return {
+            key: np.vstack([self.vectors[lora.id][key] for lora in loras])
+            for key in ("semantic", "artistic", "technical")
+        }
+
+    def model_versions(self) -> Dict[str, str]:
+        return {key: "table-v1" for key in ("semantic", "artistic", "technical")}
+
+
+class CatalogExtractor:
+    """Feature extractor stub exposing a :class:`TableEmbedder`."""
+
+    def __init__(self, embedder: TableEmbedder) -> None:
+        self.semantic_embedder = embedder
+
+
+@pytest.fixture
+def lora_catalog():
+    """Return a factory building ``(loras, extractor)`` with random vectors."""
+
+    def build(count: int, **lora_kwargs: Any):
+        rng = np.random.default_rng(count)
+        dims = {"semantic": 16, "artistic": 8, "technical": 4}
+        matrices = {}
+        for key, dim in dims.items():
+            matrix = rng.normal(size=(count, dim)).astype(np.float32)
+            matrices[key] = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+        loras = [CatalogLora(id=f"lora-{idx}", **lora_kwargs) for idx in range(count)]
+        vectors = {
+            lora.id: {key: matrices[key][idx] for key in dims}
+            for idx, lora in enumerate(loras)
+        }
+        return loras, CatalogExtractor(TableEmbedder(vectors))
+
+    return build
@@ -0,0 +1,38 @@
+"""Tests for the in-memory BM25 keyword index."""
+
+from __future__ import annotations
+
+from backend.services.recommendations.components.bm25_index import (
+    BM25Index,
+    tokenize,
+)
+
+
+class TestBM25Index:
+    """Ranking and incremental maintenance of the BM25 postings."""
+
+    def test_tokenize_lowercases_and_splits_punctuation(self):
+        assert tokenize("Pixel-Art, 8bit_style!") == ["pixel", "art", "8bit", "style"]
+
+    def test_rare_terms_and_short_documents_rank_higher(self):
+        index = BM25Index()
+        index.add("a", "anime portrait anime")
+        index.add("b", "anime landscape with many other filler words here")
+        index.add("c", "landscape photo")
+
+        assert [doc for doc, _ in index.search("anime")] == ["a", "b"]
+        ranked = index.search("anime photo")
+        assert {doc for doc, _ in ranked} == {"a", "b", "c"}
+        assert index.search("unknown") == []
+
+    def test_add_replaces_and_remove_drops_postings(self):
+        index = BM25Index()
+        index.add("a", "ink wash")
+        index.add("a", "oil paint")
+        assert index.search("ink") == []
+        assert index.search("oil")[0][0] == "a"
+
+        index.remove("a")
+        assert len(index) == 0
+        assert index.search("oil") == []
+        assert index._postings == {}
@@ -0,0 +1,302 @@
+"""Tests for chunked embedding computation."""
+
+from __future__ import annotations
+
+import functools
+import multiprocessing
+from typing import Any, Dict, List, Sequence
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from sqlalchemy import event
+
+from backend.models import Adapter, LoRAEmbedding
+from backend.services.recommendations.components.keyword_index import (
+    document_text,
+)
+from backend.services.recommendations.embedding_batch_runner import (
+    EmbeddingBatchRunner,
+)
+from backend.services.recommendations.embedding_codec import decode_embedding
+from backend.services.recommendations.embedding_computer import EmbeddingComputer
+from backend.services.recommendations.embedding_repository import (
+    LoRAEmbeddingRepository,
+)
+from backend.services.recommendations.sharded_embedding_runner import (
+    ShardedEmbeddingRunner,
+)
+from backend.services.recommendations.similarity_index_builder import (
+    SimilarityIndexBuilder,
+)
+
+
+class _BatchExtractor:
+    def __init__(self, *, fail_batches: bool = False) -> None:
+        self.batches: List[List[str]] = []
+        self.singles: List[str] = []
+        self.fail_batches = fail_batches
+        self.model = "v1"
+        self.quality = 0.5
+        self.score_calculator = self
+
+    def compute_many(self, adapters: Sequence[Any]) -> Dict[str, np.ndarray]:
+        column = np.full(len(adapters), self.quality)
+        return {
+            "quality_score": column,
+            "popularity_score": column,
+            "recency_score": column,
+            "sd_compatibility_score": column,
+        }
+
+    def content_hash(self, adapter: Any) -> str:
+        return f"{adapter.name}:{adapter.description}:{self.model}"
+
+    def _features(self, adapter: Any) -> Dict[str, Any]:
+        vector = np.full(3, float(len(adapter.id)), dtype=np.float32)
+        return {
+            "semantic_embedding": vector,
+            "artistic_embedding": vector,
+            "technical_embedding": vector,
+            "quality_score": self.quality,
+            "content_hash": self.content_hash(adapter),
+        }
+
+    def extract_advanced_features(self, adapter: Any) -> Dict[str, Any]:
+        self.singles.append(adapter.id)
+        if adapter.id == "broken":
+            raise ValueError("bad metadata")
+        return self._features(adapter)
+
+    def extract_advanced_features_batch(
+        self, adapters: Sequence[Any]
+    ) -> List[Dict[str, Any]]:
+        self.batches.append([adapter.id for adapter in adapters])
+        if self.fail_batches:
+            raise ValueError("bad metadata")
+        return [self._features(adapter) for adapter in adapters]
+
+
+def _runner(db_session, extractor):
+    repository = LoRAEmbeddingRepository(db_session)
+    return EmbeddingBatchRunner(
+        repository, EmbeddingComputer(repository, lambda: extractor)
+    )
+
+
+def _add_adapters(db_session, ids):
+    for adapter_id in ids:
+        db_session.add(
+            Adapter(
+                id=adapter_id,
+                name=adapter_id,
+                file_path=f"/tmp/{adapter_id}.safetensors",
+                active=True,
+            )
+        )
+    db_session.commit()
+
+
+class TestEmbeddingBatchRunner:
+    """Chunks are extracted with one call and committed once."""
+
+    @pytest.mark.anyio("asyncio")
+    async def test_each_chunk_is_one_extraction_and_one_commit(self, db_session):
+        _add_adapters(db_session, [f"lora-{idx}" for idx in range(5)])
+        extractor = _BatchExtractor()
+        commits = []
+        event.listen(db_session, "after_commit", lambda session: commits.append(1))
+
+        result = await _runner(db_session, extractor).run(batch_size=3)
+
+        assert result["processed_count"] == 5
+        assert [len(batch) for batch in extractor.batches] == [3, 2]
+        assert extractor.singles == []
+        assert len(commits) == 2
+        stored = db_session.get(LoRAEmbedding, "lora-4")
+        assert np.array_equal(decode_embedding(stored.semantic_embedding), [6.0] * 3)
+
+    @pytest.mark.anyio("asyncio")
+    async def test_failed_chunk_is_retried_per_adapter(self, db_session):
+        _add_adapters(db_session, ["ok-1", "broken", "ok-2"])
+        extractor = _BatchExtractor(fail_batches=True)
+
+        result = await _runner(db_session, extractor).run(batch_size=8)
+
+        assert len(extractor.batches) == 1
+        assert result["processed_count"] == 2
+        assert result["error_count"] == 1
+        assert result["errors"][0]["adapter_id"] == "broken"
+        assert db_session.get(LoRAEmbedding, "ok-1") is not None
+
+    @pytest.mark.anyio("asyncio")
+    async def test_forced_runs_skip_unchanged_content_on_request(self, db_session):
+        _add_adapters(db_session, ["a", "b", "c"])
+        extractor = _BatchExtractor()
+        runner = _runner(db_session, extractor)
+        await runner.run(force_recompute=True)
+
+        extractor.batches.clear()
+        extractor.quality = 0.9
+        result = await runner.run(force_recompute=True, skip_unchanged=True)
+        assert extractor.batches == []
+        assert result["unchanged_count"] == 3
+        assert result["skipped_count"] == 3
+        db_session.expire_all()
+        assert db_session.get(LoRAEmbedding, "a").quality_score == pytest.approx(0.9)
+
+        adapter = db_session.get(Adapter, "b")
+        adapter.description = "new description"
+        db_session.add(adapter)
+        db_session.commit()
+        result = await runner.run(force_recompute=True, skip_unchanged=True)
+        assert extractor.batches == [["b"]]
+        assert result["processed_count"] == 1
+
+        result = await runner.run(force_recompute=True)
+        assert result["processed_count"] == 3
+        assert result["unchanged_count"] == 0
+
+
+class TestShardedEmbeddingRunner:
+    """Worker processes encode chunks; the parent writes them in bulk."""
+
+    @pytest.mark.anyio("asyncio")
+    async def test_shards_are_encoded_in_workers_and_committed_in_bulk(
+        self, db_session
+    ):
+        _add_adapters(db_session, [f"lora-{idx}" for idx in range(5)] + ["broken"])
+        commits = []
+        event.listen(db_session, "after_commit", lambda session: commits.append(1))
+        runner = ShardedEmbeddingRunner(
+            LoRAEmbeddingRepository(db_session),
+            workers=2,
+            extractor_factory=functools.partial(_BatchExtractor, fail_batches=True),
+            commit_size=3,
+            mp_context=multiprocessing.get_context("fork"),
+        )
+
+        result = await runner.run(force_recompute=True, batch_size=2)
+
+        assert result["processed_count"] == 5
+        assert [error["adapter_id"] for error in result["errors"]] == ["broken"]
+        assert len(commits) == 2
+        stored = db_session.get(LoRAEmbedding, "lora-3")
+        assert np.array_equal(decode_embedding(stored.semantic_embedding), [6.0] * 3)
+        assert stored.content_hash == "lora-3:None:v1"
+
+        result = await runner.run(
+            force_recompute=True, batch_size=2, skip_unchanged=True
+        )
+        assert result["unchanged_count"] == 5
+        assert result["processed_count"] == 0
+
+    @pytest.mark.anyio("asyncio")
+    async def test_default_workers_match_the_registry_extractor(
+        self, db_session, model_registry, monkeypatch
+    ):
+        for name in (
+            "_shared_keyword_index",
+            "_shared_trigger_embedder",
+            "_shared_trigger_resolver",
+        ):
+            monkeypatch.setattr(model_registry, name, None)
+        for adapter_id, tags in (
+            ("ink", ["ink wash", "monochrome"]),
+            ("neon", ["cyberpunk", "neon lights"]),
+            ("oil", ["oil painting", "portrait"]),
+        ):
+            db_session.add(
+                Adapter(
+                    id=adapter_id,
+                    name=adapter_id,
+                    file_path=f"/tmp/{adapter_id}.safetensors",
+                    tags=tags,
+                    trained_words=[f"{adapter_id} style"],
+                    active=True,
+                )
+            )
+        db_session.commit()
+        repository = LoRAEmbeddingRepository(db_session)
+        adapters = repository.list_adapters()
+        keyword_index = model_registry.get_keyword_index()
+        keyword_index.rebuild(
+            (adapter.id, document_text(adapter)) for adapter in adapters
+        )
+        registry_extractor = model_registry(device="cpu").get_feature_extractor()
+        expected = {
+            adapter.id: features
+            for adapter, features in zip(
+                adapters,
+                registry_extractor.extract_advanced_features_batch(adapters),
+                strict=True,
+            )
+        }
+
+        runner = ShardedEmbeddingRunner(
+            repository,
+            workers=2,
+            keyword_index=keyword_index,
+            mp_context=multiprocessing.get_context("fork"),
+        )
+        result = await runner.run(force_recompute=True, batch_size=2)
+
+        assert result["processed_count"] == 3
+        for adapter_id, features in expected.items():
+            stored = db_session.get(LoRAEmbedding, adapter_id)
+            assert stored.content_hash == features["content_hash"]
+            assert stored.extracted_keywords == features["extracted_keywords"]
+            assert stored.extracted_keywords
+            for key in ("sentiment_label", "predicted_style"):
+                assert getattr(stored, key) == features[key]
+
+
+class TestPagedRecompute:
+    """Recomputes walk adapters in pages and rebuild from stored vectors."""
+
+    def test_adapter_ids_are_paged_by_key(self, db_session):
+        _add_adapters(db_session, ["c", "a", "e", "b", "d"])
+        repository = LoRAEmbeddingRepository(db_session)
+
+        pages, last = [], None
+        while page := repository.list_adapter_ids_page(after=last, limit=2):
+            pages.append(page)
+            last = page[-1]
+
+        assert pages == [["a", "b"], ["c", "d"], ["e"]]
+        assert repository.count_adapters() == 5
+
+    @pytest.mark.anyio("asyncio")
+    async def test_index_rebuild_reuses_stored_vectors(self, db_session):
+        _add_adapters(db_session, ["x", "yy"])
+        await _runner(db_session, _BatchExtractor()).run(force_recompute=True)
+        repository = LoRAEmbeddingRepository(db_session)
+
+        stored = dict(repository.iter_active_embedding_vectors())
+        assert np.array_equal(stored["yy"]["artistic"], [2.0] * 3)
+
+        engine = MagicMock()
+        builder = SimilarityIndexBuilder(repository, lambda: engine)
+        await builder.build()
+
+        engine.build_similarity_index.assert_not_called()
+        adapters, matrices = engine.build_from_embeddings.call_args.args
+        order = [adapter.id for adapter in adapters]
+        assert sorted(order) == ["x", "yy"]
+        assert matrices["semantic"].shape == (2, 3)
+        assert matrices["semantic"][order.index("yy"), 0] == 2.0
+
+    @pytest.mark.anyio("asyncio")
+    async def test_index_rebuild_reencodes_vectors_from_other_models(
+        self, db_session
+    ):
+        _add_adapters(db_session, ["x", "yy"])
+        await _runner(db_session, _BatchExtractor()).run(force_recompute=True)
+        repository = LoRAEmbeddingRepository(db_session)
+
+        engine = MagicMock()
+        engine.model_versions.return_value = {"semantic": "mpnet-v2"}
+        await SimilarityIndexBuilder(repository, lambda: engine).build()
+
+        engine.build_from_embeddings.assert_not_called()
+        engine.build_similarity_index.assert_called_once()
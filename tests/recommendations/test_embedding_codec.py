@@ -0,0 +1,129 @@
+"""Tests for the binary embedding codec."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from backend.models import Adapter, LoRAEmbedding
+from backend.services.recommendations.components.embedder import (
+    LoRASemanticEmbedder,
+)
+from backend.services.recommendations.embedding_codec import (
+    decode_current_embeddings,
+    decode_embedding,
+    encode_embedding,
+    read_header,
+)
+from backend.services.recommendations.embedding_repository import (
+    LoRAEmbeddingRepository,
+)
+from backend.services.recommendations.trigger_engine import _decode_trigger_vectors
+
+
+class TestEmbeddingCodec:
+    """Vectors round-trip through a header and raw little-endian bytes."""
+
+    def test_round_trip_is_a_zero_copy_view(self):
+        vector = np.linspace(-1.0, 1.0, 7, dtype=np.float32)
+
+        blob = encode_embedding(vector, model_id="all-mpnet-base-v2")
+        decoded = decode_embedding(blob)
+
+        assert np.array_equal(decoded, vector)
+        assert decoded.dtype == np.float32
+        assert not decoded.flags.owndata
+        assert not decoded.flags.writeable
+        header = read_header(blob)
+        assert header.shape == (7,)
+        assert header.model_id == "all-mpnet-base-v2"
+        assert len(blob) == header.data_offset + vector.nbytes
+
+    def test_float16_matrices_keep_shape(self):
+        matrix = np.arange(6, dtype=np.float32).reshape(2, 3)
+
+        decoded = decode_embedding(encode_embedding(matrix, dtype="float16"))
+
+        assert decoded.dtype == np.float16
+        assert decoded.shape == (2, 3)
+        assert np.array_equal(decoded, matrix)
+
+    def test_rejects_foreign_blobs(self):
+        with pytest.raises(ValueError):
+            decode_embedding(b"\x80\x04legacy pickle")
+        with pytest.raises(ValueError):
+            encode_embedding([1.0], dtype="int8")
+        assert _decode_trigger_vectors(b"not an embedding") is None
+
+    def test_rows_from_other_models_are_not_current(self):
+        vector = np.ones(3, dtype=np.float32)
+        blobs = {
+            "semantic": encode_embedding(vector, model_id="mpnet"),
+            "artistic": encode_embedding(vector),
+        }
+
+        assert decode_current_embeddings(blobs)["semantic"].shape == (3,)
+        assert decode_current_embeddings(blobs, {"semantic": "mpnet"}) is not None
+        assert decode_current_embeddings(blobs, {"semantic": "minilm"}) is None
+        assert decode_current_embeddings(blobs, {"artistic": "clip"}) is None
+        assert decode_current_embeddings({**blobs, "technical": None}) is None
+
+
+class TestRepositoryEncoding:
+    """The repository writes every vector with the codec."""
+
+    def test_features_are_stored_binary_with_model_ids(self, db_session):
+        db_session.add(Adapter(id="a", name="a", file_path="/tmp/a.safetensors"))
+        db_session.commit()
+        repository = LoRAEmbeddingRepository(db_session, embedding_dtype="float16")
+        vector = np.array([0.5, -0.25, 1.0], dtype=np.float32)
+
+        repository.save_features(
+            "a",
+            {
+                "semantic_embedding": vector,
+                "artistic_embedding": vector,
+                "technical_embedding": vector,
+                "trigger_embeddings": np.eye(2, 4, dtype=np.float32),
+                "model_versions": {"semantic": "mpnet", "trigger": "minilm"},
+            },
+        )
+
+        stored = db_session.get(LoRAEmbedding, "a")
+        assert read_header(stored.semantic_embedding).model_id == "mpnet"
+        assert np.array_equal(decode_embedding(stored.semantic_embedding), vector)
+        assert read_header(stored.trigger_embeddings).model_id == "minilm"
+        assert _decode_trigger_vectors(stored.trigger_embeddings).shape == (2, 4)
+
+    def test_fallback_version_bump_invalidates_stored_vectors(self, db_session):
+        for adapter_id in ("a", "b"):
+            db_session.add(
+                Adapter(
+                    id=adapter_id,
+                    name=adapter_id,
+                    file_path=f"/tmp/{adapter_id}.safetensors",
+                    active=True,
+                )
+            )
+        db_session.commit()
+        repository = LoRAEmbeddingRepository(db_session)
+        current = LoRASemanticEmbedder(device="cpu", force_fallback=True)
+        models = current.model_versions()
+        previous = {
+            key: version.replace("hashed-fallback-v2", "hashed-fallback-v1")
+            for key, version in models.items()
+        }
+        vector = np.ones(3, dtype=np.float32)
+        for adapter_id, versions in (("a", previous), ("b", models)):
+            repository.save_features(
+                adapter_id,
+                {
+                    "semantic_embedding": vector,
+                    "artistic_embedding": vector,
+                    "technical_embedding": vector,
+                    "model_versions": versions,
+                },
+            )
+
+        assert set(repository.get_embedding_vectors(["a", "b"], models)) == {"b"}
+        assert dict(repository.iter_active_embedding_vectors(models))["a"] is None
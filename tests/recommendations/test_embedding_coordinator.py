@@ -46,6 +46,7 @@ class TestEmbeddingCoordinator:
             ["adapter-2"],
             force_recompute=False,
             batch_size=16,
+            skip_unchanged=False,
         )
 
         await coordinator.refresh_similarity_index(force=True)
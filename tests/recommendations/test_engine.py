@@ -0,0 +1,592 @@
+"""Tests for the multi-modal recommendation engine scoring paths."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from backend.services.recommendations.components.engine import (
+    RRF_K,
+    LoRARecommendationEngine,
+)
+from backend.services.recommendations.embedding_codec import encode_embedding
+from backend.services.recommendations.strategies import (
+    get_recommendations_for_prompt,
+    get_similar_loras,
+)
+
+
+def _manual_ranking(extractor, loras, target, weights, limit):
+    vectors = extractor.semantic_embedder.vectors
+    scores = {}
+    for lora in loras:
+        if lora.id == target.id:
+            continue
+        scores[lora.id] = sum(
+            weights[key] * float(np.dot(vectors[lora.id][key], vectors[target.id][key]))
+            for key in ("semantic", "artistic", "technical")
+        )
+    return sorted(scores, key=scores.get, reverse=True)[:limit]
+
+
+class TestFusedScoring:
+    """Verify fused weight profiles match the per-modality computation."""
+
+    def test_default_profile_uses_fused_matrix(self, lora_catalog):
+        loras, extractor = lora_catalog(60)
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras)
+        weights = {"semantic": 0.5, "artistic": 0.35, "technical": 0.15}
+
+        results = engine.get_recommendations(loras[3], 5, diversify_results=False)
+
+        assert engine._weight_profiles[(0.5, 0.35, 0.15)] is not None
+        assert [rec["lora_id"] for rec in results] == _manual_ranking(
+            extractor, loras, loras[3], weights, 5
+        )
+
+    def test_custom_weights_fall_back_to_three_matrix_path(self, lora_catalog):
+        loras, extractor = lora_catalog(60)
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras)
+        weights = {"semantic": 0.2, "artistic": 0.2, "technical": 0.6}
+
+        results = engine.get_recommendations(
+            loras[7], 5, weights=weights, diversify_results=False
+        )
+
+        assert (0.2, 0.2, 0.6) not in engine._weight_profiles
+        assert [rec["lora_id"] for rec in results] == _manual_ranking(
+            extractor, loras, loras[7], weights, 5
+        )
+        expected_score = sum(
+            weights[key] * results[0][f"{key}_similarity"]
+            for key in ("semantic", "artistic", "technical")
+        )
+        assert np.isclose(results[0]["similarity_score"], expected_score)
+
+    def test_registered_profile_is_extended_incrementally(self, lora_catalog):
+        loras, extractor = lora_catalog(30)
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras[:20])
+        engine.register_weight_profile({
+            "semantic": 0.2,
+            "artistic": 0.2,
+            "technical": 0.6,
+        })
+
+        engine.update_index_incremental(loras[20:])
+
+        fused = engine.weight_profile_matrices()[(0.2, 0.2, 0.6)]
+        assert fused.shape == (30, 28)
+
+
+class TestQueryEmbeddingReuse:
+    """Ensure similarity queries avoid re-encoding known LoRAs."""
+
+    def test_indexed_target_is_not_reencoded(self, lora_catalog):
+        loras, extractor = lora_catalog(20)
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras)
+
+        engine.get_recommendations(loras[0], 5)
+
+        assert extractor.semantic_embedder.single_calls == []
+
+    def test_unknown_target_uses_supplied_embeddings(self, lora_catalog):
+        loras, extractor = lora_catalog(20)
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras[1:])
+        stored = extractor.semantic_embedder.vectors[loras[0].id]
+
+        results = engine.get_recommendations(
+            loras[0], 5, diversify_results=False, query_embeddings=stored
+        )
+
+        assert extractor.semantic_embedder.single_calls == []
+        assert [rec["lora_id"] for rec in results] == _manual_ranking(
+            extractor,
+            loras[1:] + [loras[0]],
+            loras[0],
+            {"semantic": 0.5, "artistic": 0.35, "technical": 0.15},
+            5,
+        )
+
+    def test_unknown_target_without_embeddings_is_encoded(self, lora_catalog):
+        loras, extractor = lora_catalog(20)
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras[1:])
+
+        engine.get_recommendations(loras[0], 5)
+
+        assert extractor.semantic_embedder.single_calls == [loras[0].id]
+
+
+class TestSimilarStrategyEmbeddingReuse:
+    """Check the strategy forwards persisted vectors to the engine."""
+
+    @pytest.mark.anyio("asyncio")
+    async def test_strategy_passes_stored_embeddings_for_unindexed_target(self):
+        vector = np.asarray([1.0, 0.0], dtype=np.float32)
+        repository = MagicMock()
+        repository.get_adapter.return_value = MagicMock(id="target")
+        repository.get_embedding.return_value = MagicMock(
+            semantic_embedding=encode_embedding(vector),
+            artistic_embedding=encode_embedding(vector),
+            technical_embedding=encode_embedding(vector),
+        )
+        embedding_manager = MagicMock()
+        embedding_manager.ensure_embeddings_exist = AsyncMock()
+        engine = MagicMock()
+        engine.lora_ids = ["other"]
+        engine.contains.return_value = False
+        engine.get_recommendations.return_value = []
+
+        await get_similar_loras(
+            target_lora_id="target",
+            limit=3,
+            similarity_threshold=0.1,
+            diversify_results=True,
+            weights=None,
+            repository=repository,
+            embedding_manager=embedding_manager,
+            engine=engine,
+        )
+
+        query_embeddings = engine.get_recommendations.call_args.kwargs[
+            "query_embeddings"
+        ]
+        assert set(query_embeddings) == {"semantic", "artistic", "technical"}
+        assert np.array_equal(query_embeddings["semantic"], vector)
+
+
+class TestBatchRecommendations:
+    """Verify multi-target scoring matches the single-target path."""
+
+    @pytest.mark.parametrize(
+        ("backend", "weights"),
+        [
+            ("exact", None),
+            ("exact", {"semantic": 0.2, "artistic": 0.5, "technical": 0.3}),
+            ("ivf", None),
+        ],
+    )
+    def test_batch_matches_single_target_results(self, lora_catalog, backend, weights):
+        loras, extractor = lora_catalog(80)
+        engine = LoRARecommendationEngine(
+            extractor,
+            device="cpu",
+            index_backend=backend,
+            index_nlist=4,
+            index_nprobe=4,
+        )
+        engine.build_similarity_index(loras)
+        targets = [loras[1], loras[7], loras[42]]
+
+        batch = engine.get_batch_recommendations(targets, 6, weights)
+
+        for target in targets:
+            expected = engine.get_recommendations(target, 6, weights)
+            assert batch["results"][target.id] == expected
+        assert batch["merged"] is None
+
+    def test_merged_ranking_excludes_targets_and_averages_scores(self, lora_catalog):
+        loras, extractor = lora_catalog(50)
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras)
+        targets = [loras[0], loras[1], loras[2]]
+        weights = {"semantic": 0.5, "artistic": 0.35, "technical": 0.15}
+
+        batch = engine.get_batch_recommendations(
+            targets,
+            5,
+            weights,
+            diversify_results=False,
+            include_merged=True,
+        )
+
+        per_target = [
+            engine._exact_scores(engine._query_vectors(target), weights)
+            for target in targets
+        ]
+        mean_scores = np.mean(per_target, axis=0)
+        expected = [
+            engine.lora_ids[idx]
+            for idx in np.argsort(-mean_scores)
+            if engine.lora_ids[idx] not in {target.id for target in targets}
+        ][:5]
+        merged_ids = [rec["lora_id"] for rec in batch["merged"]]
+        assert merged_ids == expected
+        assert batch["merged"][0]["similarity_score"] == pytest.approx(
+            float(mean_scores[engine._row_by_id[expected[0]]]),
+            rel=1e-5,
+        )
+
+    def test_unindexed_targets_use_supplied_embeddings(self, lora_catalog):
+        loras, extractor = lora_catalog(30)
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras[:25])
+        stored = {
+            lora.id: extractor.semantic_embedder.vectors[lora.id]
+            for lora in loras[25:27]
+        }
+
+        batch = engine.get_batch_recommendations(
+            [loras[3], loras[25], loras[26]],
+            4,
+            query_embeddings=stored,
+        )
+
+        assert set(batch["results"]) == {"lora-3", "lora-25", "lora-26"}
+        assert all(len(items) == 4 for items in batch["results"].values())
+        assert extractor.semantic_embedder.single_calls == []
+
+
+class TestMutableIndex:
+    """Upserts, tombstoned removal and compaction of the in-memory index."""
+
+    def test_appends_grow_capacity_geometrically(self, lora_catalog):
+        loras, extractor = lora_catalog(200)
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras[:10])
+
+        capacities = set()
+        for lora in loras[10:]:
+            engine.update_index_incremental([lora])
+            capacities.add(engine._buffers[0].capacity)
+
+        assert engine.semantic_embeddings.shape[0] == 200
+        assert len(capacities) <= 3
+        assert engine.get_recommendations(loras[150], 3)
+
+    def test_upsert_replaces_vectors_in_place(self, lora_catalog):
+        loras, extractor = lora_catalog(20)
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras)
+        vectors = extractor.semantic_embedder.vectors
+        clone = {key: vectors["lora-1"][key][None, :] for key in vectors["lora-1"]}
+
+        engine.upsert([loras[0]], clone)
+
+        top = engine.get_recommendations(loras[1], 1, diversify_results=False)
+        assert top[0]["lora_id"] == "lora-0"
+        assert top[0]["similarity_score"] == pytest.approx(1.0, abs=1e-5)
+        assert len(engine.lora_ids) == 20
+
+    def test_removed_rows_are_filtered_then_compacted(self, lora_catalog):
+        loras, extractor = lora_catalog(40)
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras)
+        before = engine.get_recommendations(loras[0], 3, diversify_results=False)
+        removed = [rec["lora_id"] for rec in before]
+
+        generation = engine.generation
+        assert engine.remove(removed) == 3
+        assert engine.generation > generation
+
+        after = engine.get_recommendations(loras[0], 3, diversify_results=False)
+        assert not {rec["lora_id"] for rec in after} & set(removed)
+        assert engine.index_stats()["tombstoned_items"] == 3
+        assert not engine.contains(removed[0])
+
+        assert engine.compact() == 3
+        assert len(engine.lora_ids) == 37
+        assert engine.semantic_embeddings.shape[0] == 37
+        assert engine.get_recommendations(loras[0], 3, diversify_results=False) == (
+            after
+        )
+
+    def test_ann_backend_upsert_tombstones_old_row(self, lora_catalog):
+        loras, extractor = lora_catalog(60)
+        engine = LoRARecommendationEngine(
+            extractor,
+            device="cpu",
+            index_backend="ivf",
+            index_nlist=2,
+            index_nprobe=2,
+        )
+        engine.build_similarity_index(loras)
+        engine.set_predicted_styles({loras[5].id: "anime"})
+        style = engine._attributes["style"].view[engine._row_by_id[loras[5].id]]
+
+        engine.upsert([loras[5]])
+
+        assert engine.index_stats()["indexed_items"] == 60
+        assert engine.index_stats()["tombstoned_items"] == 1
+        row = engine._row_by_id[loras[5].id]
+        assert row == 60
+        assert engine._attributes["style"].view[row] == style != 0
+        ids = [rec["lora_id"] for rec in engine.get_recommendations(loras[0], 59)]
+        assert len(ids) == len(set(ids)) == 59
+
+        centroids = engine._vector_index._centroids
+        assert engine.compact() == 1
+        assert engine._vector_index._centroids is centroids
+        assert engine._vector_index.size == 60
+        ids = [rec["lora_id"] for rec in engine.get_recommendations(loras[0], 59)]
+        assert len(ids) == len(set(ids)) == 59
+
+
+class TestPrecomputedRowAttributes:
+    """Boosts and compatibility keys are vectorized per index row."""
+
+    def test_incompatible_versions_are_filtered(self, lora_catalog):
+        loras, extractor = lora_catalog(30)
+        for position, lora in enumerate(loras):
+            lora.sd_version = ("SD1", "SDXL", None)[position % 3]
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras)
+
+        results = engine.get_recommendations(loras[0], 25)
+
+        versions = {engine.loras_dict[rec["lora_id"]].sd_version for rec in results}
+        assert versions <= {"SD1", None}
+        assert len(results) == 19
+
+    def test_boosts_match_lora_metadata(self, lora_catalog):
+        loras, extractor = lora_catalog(12)
+        now = datetime.now(timezone.utc)
+        for lora in loras:
+            lora.stats = {"rating": 4.5, "downloadCount": 2000}
+            lora.published_at = now - timedelta(days=3)
+        loras[1].published_at = now - timedelta(days=90)
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras)
+
+        results = {
+            rec["lora_id"]: rec for rec in engine.get_recommendations(loras[0], 11)
+        }
+
+        assert results["lora-2"]["quality_boost"] == pytest.approx(0.1)
+        assert results["lora-2"]["popularity_boost"] == pytest.approx(0.05)
+        assert results["lora-2"]["recency_boost"] == pytest.approx(0.05)
+        assert results["lora-1"]["recency_boost"] == 0.0
+        assert results["lora-2"]["final_score"] == pytest.approx(
+            results["lora-2"]["similarity_score"] * 1.2
+        )
+        scores = [rec["final_score"] for rec in results.values()]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_metadata_refresh_updates_boosts(self, lora_catalog):
+        loras, extractor = lora_catalog(10)
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras)
+        updated = replace(loras[4], stats={"rating": 5, "downloadCount": 50000})
+
+        engine.refresh_metadata([updated])
+
+        results = {
+            rec["lora_id"]: rec for rec in engine.get_recommendations(loras[0], 9)
+        }
+        assert results["lora-4"]["popularity_boost"] == pytest.approx(0.1)
+
+
+class TestPromptScoring:
+    """Prompt scoring runs over the index matrices instead of a DB loop."""
+
+    @staticmethod
+    def _prompt(seed: int):
+        rng = np.random.default_rng(seed)
+        dims = {"semantic": 16, "artistic": 8, "technical": 4}
+        return {
+            key: rng.normal(size=dim).astype(np.float32) for key, dim in dims.items()
+        }
+
+    @staticmethod
+    def _repository(loras, extractor, styles):
+        adapters = {
+            lora.id: MagicMock(
+                id=lora.id,
+                description=None,
+                tags=["tag"],
+                author_username="author",
+                sd_version=None,
+                nsfw_level=0,
+            )
+            for lora in loras
+        }
+        for adapter in adapters.values():
+            adapter.name = adapter.id
+        vectors = extractor.semantic_embedder.vectors
+
+        def rows(*, exclude_ids=None):
+            return [
+                (
+                    adapters[lora.id],
+                    MagicMock(
+                        semantic_embedding=encode_embedding(
+                            vectors[lora.id]["semantic"]
+                        ),
+                        artistic_embedding=encode_embedding(
+                            vectors[lora.id]["artistic"]
+                        ),
+                        technical_embedding=encode_embedding(
+                            vectors[lora.id]["technical"]
+                        ),
+                        predicted_style=styles.get(lora.id),
+                    ),
+                )
+                for lora in loras
+                if lora.id not in (exclude_ids or [])
+            ]
+
+        repository = MagicMock()
+        repository.get_adapters.side_effect = lambda ids: {
+            lora_id: adapters[lora_id] for lora_id in ids if lora_id in adapters
+        }
+        repository.get_active_loras_with_embeddings.side_effect = rows
+        return repository
+
+    @pytest.mark.anyio("asyncio")
+    async def test_indexed_scores_match_database_loop(self, lora_catalog):
+        loras, extractor = lora_catalog(40)
+        styles = {
+            lora.id: "anime" if idx % 4 == 0 else "realistic"
+            for idx, lora in enumerate(loras)
+        }
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras)
+        engine.set_predicted_styles(styles)
+        embedder = MagicMock()
+        embedder.compute_prompt_embeddings.return_value = self._prompt(7)
+        kwargs = {
+            "prompt": "a prompt",
+            "active_loras": ["lora-3", "lora-8"],
+            "limit": 10,
+            "style_preference": "Anime",
+            "weights": {"semantic": 0.6, "artistic": 0.3},
+            "embedder": embedder,
+            "device": "cpu",
+        }
+
+        legacy_repository = self._repository(loras, extractor, styles)
+        legacy = await get_recommendations_for_prompt(
+            repository=legacy_repository, **kwargs
+        )
+        indexed_repository = self._repository(loras, extractor, styles)
+        indexed = await get_recommendations_for_prompt(
+            repository=indexed_repository, engine=engine, **kwargs
+        )
+
+        assert [item.lora_id for item in indexed] == [item.lora_id for item in legacy]
+        for fast, slow in zip(indexed, legacy, strict=True):
+            assert fast.final_score == pytest.approx(slow.final_score, abs=1e-5)
+            assert fast.explanation == slow.explanation
+            assert fast.metadata == slow.metadata
+        assert not {"lora-3", "lora-8"} & {item.lora_id for item in indexed}
+        assert any("Style Match: anime" in item.explanation for item in indexed)
+        indexed_repository.get_active_loras_with_embeddings.assert_not_called()
+        indexed_repository.get_adapters.assert_called_once()
+        assert len(indexed_repository.get_adapters.call_args.args[0]) == len(indexed)
+
+    def test_removed_rows_and_unmatched_styles_are_ignored(self, lora_catalog):
+        loras, extractor = lora_catalog(20)
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras)
+        engine.set_predicted_styles({"lora-1": "anime", "unknown": "anime"})
+        engine.remove(["lora-2"])
+
+        results = engine.get_prompt_recommendations(
+            self._prompt(3), 20, style_preference="watercolor"
+        )
+
+        assert len(results) == 19
+        assert "lora-2" not in {rec["lora_id"] for rec in results}
+        assert all(rec["style_boost"] == 0.0 for rec in results)
+        by_id = {rec["lora_id"]: rec for rec in results}
+        assert by_id["lora-1"]["predicted_style"] == "anime"
+        assert by_id["lora-0"]["predicted_style"] is None
+
+
+class TestHybridRetrieval:
+    """BM25 keyword hits are fused with the dense prompt ranking."""
+
+    def _engine(self, lora_catalog):
+        loras, extractor = lora_catalog(30)
+        loras = [
+            replace(lora, description="generic style", tags=("misc",)) for lora in loras
+        ]
+        loras[17] = replace(loras[17], tags=("watercolor", "misc"))
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras)
+        return engine, loras
+
+    def test_exact_keyword_hit_is_fused_into_results(self, lora_catalog):
+        engine, _ = self._engine(lora_catalog)
+        prompt = TestPromptScoring._prompt(3)
+        dense = [rec["lora_id"] for rec in engine.get_prompt_recommendations(prompt, 3)]
+        assert "lora-17" not in dense
+
+        fused = engine.get_prompt_recommendations(
+            prompt, 3, query_text="a Watercolor landscape"
+        )
+
+        assert fused[0]["lora_id"] == "lora-17"
+        assert fused[0]["lexical_score"] > 0
+        assert [rec["lora_id"] for rec in fused[1:]] == dense[:2]
+        assert (
+            engine.get_prompt_recommendations(
+                prompt, 3, query_text="watercolor", exclude_ids=["lora-17"]
+            )[0]["lora_id"]
+            != "lora-17"
+        )
+
+    def test_results_follow_the_fused_rank(self, lora_catalog):
+        engine, _ = self._engine(lora_catalog)
+        prompt = TestPromptScoring._prompt(3)
+        dense = engine.get_prompt_recommendations(prompt, 30)
+        dense_rank = {rec["lora_id"]: rank for rank, rec in enumerate(dense)}
+
+        fused = engine.get_prompt_recommendations(prompt, 5, query_text="watercolor")
+
+        for rec in fused:
+            expected = 1.0 / (RRF_K + 1 + dense_rank[rec["lora_id"]])
+            if rec["lexical_score"] > 0:
+                expected += 1.0 / (RRF_K + 1)
+            assert rec["fusion_score"] == pytest.approx(expected)
+        scores = [rec["fusion_score"] for rec in fused]
+        assert scores == sorted(scores, reverse=True)
+        # The keyword hit leads although its dense score is lower.
+        assert fused[0]["final_score"] < fused[1]["final_score"]
+
+    @pytest.mark.anyio("asyncio")
+    async def test_prompt_strategy_keeps_the_fused_order(self, lora_catalog):
+        engine, loras = self._engine(lora_catalog)
+        embedder = MagicMock()
+        embedder.compute_prompt_embeddings.return_value = TestPromptScoring._prompt(3)
+        repository = TestPromptScoring._repository(loras, engine.feature_extractor, {})
+        fused = engine.get_prompt_recommendations(
+            TestPromptScoring._prompt(3), 3, query_text="watercolor"
+        )
+
+        items = await get_recommendations_for_prompt(
+            prompt="watercolor",
+            active_loras=[],
+            limit=3,
+            style_preference=None,
+            weights={},
+            repository=repository,
+            embedder=embedder,
+            device="cpu",
+            engine=engine,
+        )
+
+        assert [item.lora_id for item in items] == [rec["lora_id"] for rec in fused]
+        assert items[0].lora_id == "lora-17"
+        assert items[0].metadata["fusion_score"] == fused[0]["fusion_score"]
+        assert "Keywords:" in items[0].explanation
+
+    def test_keyword_index_follows_incremental_updates(self, lora_catalog):
+        engine, loras = self._engine(lora_catalog)
+        assert engine.lexical_search("watercolor", 5)[0][0] == "lora-17"
+
+        engine.refresh_metadata([replace(loras[17], tags=("misc",))])
+        engine.refresh_metadata([replace(loras[4], description="soft watercolor")])
+        assert [hit[0] for hit in engine.lexical_search("watercolor", 5)] == ["lora-4"]
+
+        engine.remove(["lora-4"])
+        assert engine.lexical_search("watercolor", 5) == []
@@ -4,12 +4,19 @@ from __future__ import annotations
 
 import dataclasses
 from typing import Any, Dict, Iterable, List
+from unittest.mock import patch
 
 import numpy as np
 
 from backend.services.recommendations.components.feature_extractor import (
     GPULoRAFeatureExtractor,
 )
+from backend.services.recommendations.components.keyword_index import (
+    KeywordIndex,
+)
+from backend.services.recommendations.components.sentiment_style import (
+    SentimentStyleAnalyzer,
+)
 from backend.services.recommendations.components.text_payload_builder import (
     MultiModalTextPayloadBuilder,
 )
@@ -17,6 +24,9 @@ from backend.services.recommendations.components.trigger_processing import (
     TriggerCandidate,
     TriggerResolution,
 )
+from backend.services.recommendations.model_registry import (
+    build_feature_extractor,
+)
 
 
 @dataclasses.dataclass
@@ -124,7 +134,7 @@ class TestGPULoRAFeatureExtractor:
         features = self.embedder_logger_extractor.extract_advanced_features(adapter)
 
         assert np.allclose(features["semantic_embedding"], [0.1, 0.2, 0.3])
-        assert features["trigger_embeddings"] == [[0.0], [1.0], [2.0]]
+        assert np.array_equal(features["trigger_embeddings"], [[0.0], [1.0], [2.0]])
 
     def test_description_content_does_not_change_features(self) -> None:
         adapter_without_description = _Adapter(description=None)
@@ -153,9 +163,9 @@ class TestGPULoRAFeatureExtractor:
             features_with_description["technical_embedding"],
             features_without_description["technical_embedding"],
         )
-        assert (
-            features_with_description["trigger_embeddings"]
-            == features_without_description["trigger_embeddings"]
+        assert np.array_equal(
+            features_with_description["trigger_embeddings"],
+            features_without_description["trigger_embeddings"],
         )
         assert (
             features_with_description["normalized_triggers"]
@@ -174,3 +184,241 @@ class TestGPULoRAFeatureExtractor:
             "ornate" not in payload["semantic"] and "ornate" not in payload["artistic"]
             for payload in self.embedder.payloads
         )
+
+
+class _TableEmbedder(_RecordingEmbedder):
+    """Stub embedder deriving vectors from the payload text."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batch_calls = 0
+
+    def _vector(self, text: str) -> np.ndarray:
+        return np.asarray([len(text), text.count("a"), 1.0], dtype=np.float32)
+
+    def create_multi_modal_embedding(self, lora: Any) -> Dict[str, Any]:
+        payload = self.builder.build_payload(lora)
+        return {key: self._vector(text) for key, text in payload.items()}
+
+    def batch_encode_collection(self, loras: Any) -> Dict[str, np.ndarray]:
+        self.batch_calls += 1
+        payloads = [self.builder.build_payload(lora) for lora in loras]
+        return {
+            key: np.vstack([self._vector(payload[key]) for payload in payloads])
+            for key in ("semantic", "artistic", "technical")
+        }
+
+    def build_payload(self, lora: Any) -> Dict[str, str]:
+        return self.builder.build_payload(lora)
+
+    def model_versions(self) -> Dict[str, str]:
+        return {"semantic": "s1", "artistic": "a1", "technical": "t1"}
+
+
+class _PhraseTriggerEmbedder:
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    def encode(self, phrases: Iterable[str]) -> np.ndarray:
+        phrases = list(phrases)
+        self.calls.append(phrases)
+        return np.asarray([[float(len(phrase))] for phrase in phrases])
+
+
+class TestBatchFeatureExtraction:
+    """The batch path matches the single-item path with fewer model calls."""
+
+    def test_batch_matches_single_item_features(self) -> None:
+        embedder = _TableEmbedder()
+        triggers = _PhraseTriggerEmbedder()
+        extractor = GPULoRAFeatureExtractor(
+            semantic_embedder=embedder,
+            score_calculator=_StaticScoreCalculator(),
+            trigger_resolver=_StaticTriggerResolver(),
+            trigger_embedder=triggers,
+        )
+        adapters = [
+            _Adapter(),
+            _Adapter(triggers=(), trained_words=(), activation_text=None),
+            _Adapter(triggers=("dragon scales",), tags=("creature",)),
+        ]
+
+        batch = extractor.extract_advanced_features_batch(adapters)
+
+        assert embedder.batch_calls == 1
+        assert len(triggers.calls) == 1
+        single = [extractor.extract_advanced_features(adapter) for adapter in adapters]
+        assert len(batch) == len(single)
+        for batched, expected in zip(batch, single, strict=True):
+            assert batched.keys() == expected.keys()
+            for key, value in expected.items():
+                if isinstance(value, np.ndarray):
+                    assert np.array_equal(batched[key], value)
+                else:
+                    assert batched[key] == value
+        assert extractor.extract_advanced_features_batch([]) == []
+
+    def test_content_hash_tracks_payload_and_models(self) -> None:
+        embedder = _TableEmbedder()
+        extractor = GPULoRAFeatureExtractor(
+            semantic_embedder=embedder,
+            score_calculator=_StaticScoreCalculator(),
+            trigger_resolver=_StaticTriggerResolver(),
+            trigger_embedder=_PhraseTriggerEmbedder(),
+        )
+        adapter = _Adapter()
+        digest = extractor.content_hash(adapter)
+
+        assert extractor.extract_advanced_features(adapter)["content_hash"] == digest
+        assert extractor.content_hash(_Adapter(description="ignored")) == digest
+        assert extractor.content_hash(_Adapter(triggers=("devil",))) != digest
+        embedder.model_versions = lambda: {"semantic": "s2"}
+        assert extractor.content_hash(adapter) != digest
+
+    def test_keywords_come_from_metadata_and_the_corpus(self) -> None:
+        keywords = KeywordIndex()
+        keywords.rebuild([("x", "fantasy portrait"), ("y", "fantasy landscape")])
+        extractor = GPULoRAFeatureExtractor(
+            semantic_embedder=_TableEmbedder(),
+            score_calculator=_StaticScoreCalculator(),
+            trigger_resolver=_StaticTriggerResolver(),
+            trigger_embedder=_PhraseTriggerEmbedder(),
+            keyword_extractor=keywords,
+        )
+        adapter = _GuardAdapter()
+
+        features = extractor.extract_advanced_features(adapter)
+        batch = extractor.extract_advanced_features_batch([adapter])
+
+        assert features["extracted_keywords"][0] == "angel"
+        assert "fantasy" in features["extracted_keywords"]
+        assert batch[0]["extracted_keywords"] == features["extracted_keywords"]
+        assert batch[0]["keyword_scores"] == features["keyword_scores"]
+        assert extractor.content_hash(_Adapter(tags=("fantasy",))) != (
+            extractor.content_hash(_Adapter(tags=("portrait",)))
+        )
+
+    def test_content_hash_ignores_optional_components(self) -> None:
+        def build(**kwargs: Any) -> GPULoRAFeatureExtractor:
+            return GPULoRAFeatureExtractor(
+                semantic_embedder=_TableEmbedder(),
+                score_calculator=_StaticScoreCalculator(),
+                trigger_resolver=_StaticTriggerResolver(),
+                trigger_embedder=_PhraseTriggerEmbedder(),
+                **kwargs,
+            )
+
+        keywords = KeywordIndex()
+        keywords.rebuild([("x", "fantasy portrait")])
+        adapter = _Adapter()
+        digest = build().content_hash(adapter)
+
+        assert build(keyword_extractor=keywords).content_hash(adapter) == digest
+        analyzed = build(sentiment_style_analyzer=_analyzer())
+        assert analyzed.content_hash(adapter) == digest
+        assert "style" in analyzed.model_versions()
+
+
+class _FakePipelines:
+    """Transformers pipeline stand-ins that record every call."""
+
+    def __init__(self) -> None:
+        self.calls: List[tuple[str, int]] = []
+
+    def __call__(self, task: str, model: str) -> Any:
+        def sentiment(texts: List[str], batch_size: int) -> List[Dict[str, Any]]:
+            self.calls.append((task, len(texts)))
+            return [
+                {"label": f"L{len(text)}", "score": len(text) / 512} for text in texts
+            ]
+
+        def style(
+            texts: List[str], labels: List[str], batch_size: int
+        ) -> List[Dict[str, Any]]:
+            self.calls.append((task, len(texts)))
+            return [
+                {"labels": [labels[len(text) % len(labels)]], "scores": [0.9]}
+                for text in texts
+            ]
+
+        return sentiment if task == "sentiment-analysis" else style
+
+
+def _analyzer(**kwargs: Any) -> SentimentStyleAnalyzer:
+    return SentimentStyleAnalyzer(device="cpu", **kwargs)
+
+
+class TestBatchSentimentStyle:
+    """Sentiment and style analysis run over lists in chunks."""
+
+    TEXTS = ["great anime portrait", "", "ugly oil painting", "x" * 600, "plain"]
+
+    def test_pipelines_receive_chunks_matching_single_calls(self) -> None:
+        analyzer = _analyzer(batch_size=2)
+        pipelines = _FakePipelines()
+
+        with patch.object(analyzer, "_pipeline", pipelines):
+            sentiments = analyzer.analyze_sentiment_batch(self.TEXTS)
+            styles = analyzer.classify_style_batch(self.TEXTS)
+            assert pipelines.calls == [
+                ("sentiment-analysis", 2),
+                ("sentiment-analysis", 2),
+                ("zero-shot-classification", 2),
+                ("zero-shot-classification", 2),
+            ]
+            assert sentiments == [analyzer.analyze_sentiment(t) for t in self.TEXTS]
+            assert styles == [analyzer.classify_style(t) for t in self.TEXTS]
+
+        assert sentiments[1] == {"sentiment_label": "NEUTRAL", "sentiment_score": 0.5}
+        assert sentiments[3]["sentiment_label"] == "L512"
+
+    def test_heuristic_fallbacks_match_single_calls(self) -> None:
+        analyzer = _analyzer(batch_size=2)
+
+        with patch.object(analyzer, "_pipeline", return_value=None):
+            sentiments = analyzer.analyze_sentiment_batch(self.TEXTS)
+            styles = analyzer.classify_style_batch(self.TEXTS)
+
+            assert sentiments == [analyzer.analyze_sentiment(t) for t in self.TEXTS]
+            assert styles == [analyzer.classify_style(t) for t in self.TEXTS]
+        assert sentiments[0]["sentiment_label"] == "POSITIVE"
+        assert styles[2]["predicted_style"] == "painting"
+
+    def test_extractor_batches_analysis_per_model(self) -> None:
+        analyzer = _analyzer()
+        pipelines = _FakePipelines()
+        extractor = GPULoRAFeatureExtractor(
+            semantic_embedder=_TableEmbedder(),
+            score_calculator=_StaticScoreCalculator(),
+            trigger_resolver=_StaticTriggerResolver(),
+            trigger_embedder=_PhraseTriggerEmbedder(),
+            sentiment_style_analyzer=analyzer,
+        )
+        adapters = [_Adapter(), _Adapter(tags=("anime", "watercolor"))]
+
+        with patch.object(analyzer, "_pipeline", pipelines):
+            batch = extractor.extract_advanced_features_batch(adapters)
+            assert [task for task, _ in pipelines.calls] == [
+                "sentiment-analysis",
+                "zero-shot-classification",
+            ]
+            single = [extractor.extract_advanced_features(a) for a in adapters]
+
+        for batched, expected in zip(batch, single, strict=True):
+            for key in ("sentiment_label", "predicted_style", "content_hash"):
+                assert batched[key] == expected[key]
+        assert batch[0]["model_versions"]["style"] == analyzer._STYLE_MODEL
+
+    def test_registry_extractor_attaches_analyzer_only_on_request(self) -> None:
+        def build(**kwargs: Any) -> GPULoRAFeatureExtractor:
+            return build_feature_extractor(
+                device="cpu",
+                semantic_embedder=_TableEmbedder(),
+                trigger_resolver=_StaticTriggerResolver(),
+                trigger_embedder=_PhraseTriggerEmbedder(),
+                **kwargs,
+            )
+
+        assert build().sentiment_style_analyzer is None
+        enabled = build(sentiment_style=True).sentiment_style_analyzer
+        assert isinstance(enabled, SentimentStyleAnalyzer)
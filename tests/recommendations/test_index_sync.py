@@ -0,0 +1,105 @@
+"""Tests for applying adapter writes to the similarity index."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from backend.services.recommendations.index_sync import SimilarityIndexSync
+
+
+def _adapter(adapter_id: str, *, active: bool = True) -> SimpleNamespace:
+    return SimpleNamespace(id=adapter_id, active=active)
+
+
+def _engine(indexed=("a", "b")) -> MagicMock:
+    engine = MagicMock()
+    engine.lora_ids = list(indexed)
+    engine.contains.side_effect = lambda lora_id: lora_id in indexed
+    engine.refresh_metadata.side_effect = lambda loras: len(loras)
+    return engine
+
+
+def _repository(*ids, styles=None) -> MagicMock:
+    repository = MagicMock()
+    repository.get_embedding_vectors.side_effect = lambda adapter_ids, models=None: {
+        adapter_id: {
+            key: np.full(3, float(index), dtype=np.float32)
+            for key in ("semantic", "artistic", "technical")
+        }
+        for index, adapter_id in enumerate(adapter_ids)
+        if adapter_id in ids
+    }
+    repository.get_predicted_styles.side_effect = lambda adapter_ids: {
+        adapter_id: style
+        for adapter_id, style in (styles or {}).items()
+        if adapter_id in adapter_ids
+    }
+    return repository
+
+
+class TestSimilarityIndexSync:
+    """Route adapter changes to upsert, refresh or remove."""
+
+    def test_deactivated_and_deleted_adapters_are_removed(self):
+        engine = _engine()
+        sync = SimilarityIndexSync(lambda: engine)
+
+        sync.adapters_updated([_adapter("a", active=False)], {"active"})
+        sync.adapters_removed(["b"])
+
+        assert engine.remove.call_args_list[0].args == (["a"],)
+        assert engine.remove.call_args_list[1].args == (["b"],)
+        engine.upsert.assert_not_called()
+
+    def test_payload_edits_keep_the_row_and_refresh_metadata(self):
+        engine = _engine()
+        sync = SimilarityIndexSync(lambda: engine, repository=_repository("a"))
+        adapter = _adapter("a")
+
+        sync.adapters_updated([adapter], {"tags", "updated_at"})
+
+        engine.remove.assert_not_called()
+        engine.upsert.assert_not_called()
+        engine.refresh_metadata.assert_called_once_with([adapter])
+
+    def test_other_edits_only_refresh_metadata(self):
+        engine = _engine()
+        sync = SimilarityIndexSync(lambda: engine)
+        adapter = _adapter("a")
+
+        sync.adapters_updated([adapter], {"weight", "updated_at"})
+
+        engine.upsert.assert_not_called()
+        engine.refresh_metadata.assert_called_once_with([adapter])
+
+    def test_activation_indexes_stored_vectors_and_styles(self):
+        engine = _engine()
+        repository = _repository("c", styles={"c": "anime", "d": "painting"})
+        sync = SimilarityIndexSync(lambda: engine, repository=repository)
+        with_vectors = _adapter("c")
+
+        sync.adapters_updated([with_vectors, _adapter("d")], {"active"})
+
+        loras, embeddings = engine.upsert.call_args.args
+        assert loras == [with_vectors]
+        assert embeddings["semantic"].shape == (1, 3)
+        engine.set_predicted_styles.assert_called_once_with({"c": "anime"})
+
+    def test_activation_without_repository_skips_indexing(self):
+        engine = _engine()
+        sync = SimilarityIndexSync(lambda: engine)
+
+        sync.adapters_updated([_adapter("c")], {"active"})
+
+        engine.upsert.assert_not_called()
+
+    def test_empty_engine_is_left_for_full_build(self):
+        engine = _engine(indexed=())
+        sync = SimilarityIndexSync(lambda: engine)
+
+        sync.adapters_updated([_adapter("a")], {"active"})
+
+        engine.upsert.assert_not_called()
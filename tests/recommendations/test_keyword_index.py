@@ -0,0 +1,125 @@
+"""Tests for the corpus TF-IDF keyword index."""
+
+from __future__ import annotations
+
+import json
+import pickle
+from unittest.mock import MagicMock
+
+from backend.services.recommendations.components.engine import (
+    LoRARecommendationEngine,
+)
+from backend.services.recommendations.components.keyword_index import (
+    KeywordIndex,
+)
+
+
+class TestKeywordIndex:
+    """Keywords are ranked against incrementally maintained corpus counts."""
+
+    def test_distinctive_terms_outrank_common_ones(self):
+        index = KeywordIndex()
+        index.rebuild([
+            ("a", "anime portrait style"),
+            ("b", "anime landscape style"),
+            ("c", "anime watercolor style"),
+        ])
+
+        result = index.extract("Anime style with watercolor washes, 2024")
+
+        assert result["extracted_keywords"][:2] == ["washes", "watercolor"]
+        assert set(result["extracted_keywords"]) == {
+            "washes",
+            "watercolor",
+            "anime",
+            "style",
+        }
+        scores = result["keyword_scores"]
+        assert scores == sorted(scores, reverse=True)
+        assert index.keywords_for("c")["extracted_keywords"][0] == "watercolor"
+        assert index.extract("") == {"extracted_keywords": [], "keyword_scores": []}
+
+    def test_add_replaces_and_remove_drops_frequencies(self):
+        index = KeywordIndex()
+        index.add("a", "glowing runes")
+        index.add("b", "glowing eyes")
+        index.add("a", "oil painting")
+
+        assert index._document_frequency == {"glowing": 1, "eyes": 1, "painting": 1}
+        index.remove("a")
+        index.remove("missing")
+        assert len(index) == 1
+        assert "a" not in index
+        assert index._document_frequency == {"glowing": 1, "eyes": 1}
+
+    def test_pickled_copies_keep_the_corpus(self):
+        index = KeywordIndex()
+        index.rebuild([("a", "glowing runes"), ("b", "glowing eyes")])
+
+        copy = pickle.loads(pickle.dumps(index))
+        copy.add("c", "runes")
+
+        assert copy._document_frequency == {"glowing": 2, "runes": 2, "eyes": 1}
+        assert len(index) == 2
+
+    def test_saved_document_terms_restore_the_corpus(self):
+        index = KeywordIndex()
+        index.rebuild([("a", "glowing runes"), ("b", "glowing eyes")])
+
+        restored = KeywordIndex()
+        restored.load_document_terms(json.loads(json.dumps(index.document_terms())))
+
+        assert restored._document_frequency == index._document_frequency
+        assert restored.keywords_for("b") == index.keywords_for("b")
+
+    def test_common_keywords_prefer_rare_shared_terms(self):
+        index = KeywordIndex()
+        index.rebuild([
+            ("a", "fantasy armor knight"),
+            ("b", "fantasy dragon"),
+            ("c", "fantasy forest"),
+        ])
+
+        shared = index.common_keywords(
+            "A fantasy knight in armor", "Fantasy armor for the knight"
+        )
+
+        assert shared == ["armor", "knight", "fantasy"]
+
+
+class TestEngineKeywords:
+    """The engine keeps its keyword corpus in sync with its rows."""
+
+    def test_explanations_use_the_engine_corpus(self):
+        keywords = KeywordIndex()
+        engine = LoRARecommendationEngine(
+            MagicMock(), device="cpu", keyword_index=keywords
+        )
+        loras = [
+            MagicMock(
+                id=f"lora-{i}",
+                description=f"fantasy {word} character",
+                tags=[],
+                trained_words=[],
+                sd_version=None,
+                stats=None,
+                published_at=None,
+            )
+            for i, word in enumerate(("dragon", "dragon", "elf"))
+        ]
+        for lora in loras:
+            lora.name = lora.id
+        engine.build_from_embeddings(
+            loras,
+            {
+                key: [[1.0, float(i)] for i in range(3)]
+                for key in ("semantic", "artistic", "technical")
+            },
+        )
+
+        assert len(keywords) == 3
+        assert engine._find_common_keywords(
+            loras[0].description, loras[1].description
+        ) == ["dragon", "character", "fantasy"]
+        engine.remove(["lora-2"])
+        assert "lora-2" not in keywords
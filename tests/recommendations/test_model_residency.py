@@ -0,0 +1,98 @@
+"""Tests for memory-budgeted model residency."""
+
+from __future__ import annotations
+
+from backend.services.recommendations.components import (
+    ModelResidencyManager,
+    SentenceTransformerProvider,
+)
+
+
+class _Loader:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def __call__(self, key: str):
+        def load():
+            self.calls.append(key)
+            return object()
+
+        return load
+
+
+class TestModelResidencyManager:
+    """Models load lazily and the least recently used go first."""
+
+    def test_evicts_least_recently_used_over_budget(self):
+        residency = ModelResidencyManager(250)
+        loader = _Loader()
+
+        first = residency.acquire("a", loader("a"), size_bytes=100)
+        residency.acquire("b", loader("b"), size_bytes=100)
+        assert residency.acquire("a", loader("a"), size_bytes=100) is first
+        residency.acquire("c", loader("c"), size_bytes=100)
+
+        assert "b" not in residency
+        assert "a" in residency and "c" in residency
+        residency.acquire("b", loader("b"), size_bytes=100)
+        assert loader.calls == ["a", "b", "c", "b"]
+
+        stats = residency.stats()
+        assert stats["loads"] == 4
+        assert stats["evictions"] == 2
+        assert stats["resident_bytes"] == 200
+        assert stats["resident_models"] == ["c", "b"]
+        assert stats["load_seconds"] >= 0.0
+
+    def test_oversized_model_still_loads_alone(self):
+        residency = ModelResidencyManager(50)
+        loader = _Loader()
+
+        residency.acquire("small", loader("small"), size_bytes=10)
+        residency.acquire("large", loader("large"), size_bytes=500)
+
+        assert residency.stats()["resident_models"] == ["large"]
+
+    def test_unlimited_budget_keeps_every_model(self):
+        residency = ModelResidencyManager()
+        loader = _Loader()
+        for key in "abc":
+            residency.acquire(key, loader(key), size_bytes=10**9)
+
+        assert residency.stats()["evictions"] == 0
+        assert residency.evict("b") is True
+        assert residency.evict("b") is False
+        assert residency.stats()["resident_models"] == ["a", "c"]
+
+
+class TestProviderResidency:
+    """Providers load per modality through a shared manager."""
+
+    def test_modalities_load_lazily_and_share_weights(self):
+        residency = ModelResidencyManager()
+        configs = {
+            "semantic": {"model_name": "m-semantic", "default_dim": 8},
+            "artistic": {"model_name": "m-artistic", "default_dim": 4},
+        }
+        provider = SentenceTransformerProvider(
+            device="cpu",
+            force_fallback=True,
+            model_configs=configs,
+            residency=residency,
+        )
+        other = SentenceTransformerProvider(
+            device="cpu",
+            force_fallback=True,
+            model_configs={"trigger": {"model_name": "t", "default_dim": 8}},
+            residency=residency,
+        )
+
+        assert not provider.is_loaded("semantic")
+        assert provider.encode("semantic", "watercolor").shape == (8,)
+        assert provider.is_loaded("semantic")
+        assert not provider.is_loaded("artistic")
+        assert other.get_model("trigger") is provider.get_model("semantic")
+
+        assert provider.unload("semantic") is True
+        assert provider.encode("semantic", "watercolor").shape == (8,)
+        assert residency.stats()["loads"] == 2
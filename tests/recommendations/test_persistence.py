@@ -1,5 +1,7 @@
 """Tests covering recommendation persistence helpers."""
 
+import os
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock
 
 import numpy as np
@@ -8,9 +10,16 @@ import pytest
 from backend.models import Adapter, LoRAEmbedding
 from backend.services.recommendations import (
     EmbeddingBatchRunner,
+    IndexSnapshotError,
     LoRAEmbeddingRepository,
     RecommendationPersistenceManager,
     RecommendationPersistenceService,
+    SimilarityIndexBuilder,
+    read_index_snapshot,
+    write_index_snapshot,
+)
+from backend.services.recommendations.components.engine import (
+    LoRARecommendationEngine,
 )
 
 
@@ -25,28 +34,22 @@ class TestRecommendationPersistenceService:
         manager = RecommendationPersistenceManager(
             MagicMock(),
             lambda: engine,
-            index_cache_path=tmp_path / "index.pkl",
+            index_cache_path=tmp_path / "index",
         )
         service = RecommendationPersistenceService(manager)
 
         result = await service.rebuild_similarity_index()
 
         assert result.skipped is True
-        assert service.index_cache_path.endswith("index.pkl")
+        assert service.index_cache_path.endswith("index")
 
     @pytest.mark.anyio("asyncio")
-    async def test_rebuild_persists_payload_to_disk(self, tmp_path):
-        engine = MagicMock()
-        engine.lora_ids = []
-        engine.semantic_embeddings = []
-        engine.artistic_embeddings = []
-        engine.technical_embeddings = []
+    async def test_rebuild_persists_snapshot_to_disk(self, tmp_path, lora_catalog):
+        loras, extractor = lora_catalog(12)
+        engine = LoRARecommendationEngine(extractor, device="cpu")
 
         async def populate_index():
-            engine.lora_ids = ["a", "b"]
-            engine.semantic_embeddings = np.array([[1.0], [0.5]], dtype=np.float32)
-            engine.artistic_embeddings = np.array([[0.2], [0.3]], dtype=np.float32)
-            engine.technical_embeddings = np.array([[0.9], [0.1]], dtype=np.float32)
+            engine.build_similarity_index(loras)
 
         embedding_manager = MagicMock()
         embedding_manager.build_similarity_index = AsyncMock(side_effect=populate_index)
@@ -54,16 +57,179 @@ class TestRecommendationPersistenceService:
         manager = RecommendationPersistenceManager(
             embedding_manager,
             lambda: engine,
-            index_cache_path=tmp_path / "rebuilt.pkl",
+            index_cache_path=tmp_path / "rebuilt",
         )
         service = RecommendationPersistenceService(manager)
 
         result = await service.rebuild_similarity_index(force=True)
 
         assert result.status == "rebuilt"
-        assert (tmp_path / "rebuilt.pkl").exists()
+        assert (tmp_path / "rebuilt" / "header.json").exists()
+        assert result.index_size_bytes > 0
         embedding_manager.build_similarity_index.assert_awaited_once()
 
+        snapshot = read_index_snapshot(
+            tmp_path / "rebuilt",
+            model_versions=engine.model_versions(),
+        )
+        assert snapshot.lora_ids == engine.lora_ids
+        assert isinstance(snapshot.embeddings["semantic"], np.memmap)
+        np.testing.assert_array_equal(
+            snapshot.embeddings["semantic"],
+            engine.semantic_embeddings,
+        )
+
+
+    @pytest.mark.anyio("asyncio")
+    async def test_compact_rebuild_persists_stored_originals(
+        self, tmp_path, lora_catalog
+    ):
+        loras, extractor = lora_catalog(12)
+        originals = extractor.semantic_embedder.batch_encode_collection(loras)
+        engine = LoRARecommendationEngine(
+            extractor, device="cpu", index_precision="int8"
+        )
+
+        async def populate_index():
+            engine.build_from_embeddings(loras, originals)
+
+        embedding_manager = MagicMock()
+        embedding_manager.build_similarity_index = AsyncMock(side_effect=populate_index)
+        embedding_manager.stored_index_matrices = AsyncMock(return_value=originals)
+        manager = RecommendationPersistenceManager(
+            embedding_manager,
+            lambda: engine,
+            index_cache_path=tmp_path / "compact",
+        )
+
+        await manager.rebuild_similarity_index(force=True)
+
+        snapshot = read_index_snapshot(tmp_path / "compact", precision="float32")
+        assert snapshot.precision == "float32"
+        semantic = np.asarray(originals["semantic"], dtype=np.float32)
+        np.testing.assert_allclose(
+            snapshot.embeddings["semantic"],
+            semantic / np.linalg.norm(semantic, axis=1, keepdims=True),
+            rtol=1e-6,
+        )
+
+
+class _SnapshotRepository:
+    def __init__(self, adapters, last_update=None):
+        self.adapters = adapters
+        self.last_update = last_update
+
+    def list_active_adapters_with_embeddings(self):
+        return list(self.adapters)
+
+    def get_last_embedding_update(self):
+        return self.last_update
+
+    def get_predicted_styles(self):
+        return {}
+
+
+class TestIndexSnapshot:
+    """Round-trip and warm-start behaviour of the binary index snapshot."""
+
+    def _write(self, path, loras, extractor):
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras)
+        write_index_snapshot(
+            path,
+            lora_ids=engine.lora_ids,
+            embeddings={
+                "semantic": engine.semantic_embeddings,
+                "artistic": engine.artistic_embeddings,
+                "technical": engine.technical_embeddings,
+            },
+            model_versions=engine.model_versions(),
+        )
+        return engine
+
+    def test_rejects_mismatched_models_and_corruption(self, tmp_path, lora_catalog):
+        loras, extractor = lora_catalog(8)
+        self._write(tmp_path / "snap", loras, extractor)
+
+        with pytest.raises(IndexSnapshotError):
+            read_index_snapshot(tmp_path / "snap", model_versions={"semantic": "x"})
+
+        path = tmp_path / "snap" / "artistic.npy"
+        written = path.stat()
+        artistic = np.load(path)
+        artistic[0, 0] += 1.0
+        np.save(path, artistic)
+        os.utime(path, ns=(written.st_atime_ns, written.st_mtime_ns + 1))
+        with pytest.raises(IndexSnapshotError):
+            read_index_snapshot(tmp_path / "snap")
+
+        # Same size and mtime: only the opt-in content hash notices.
+        os.utime(path, ns=(written.st_atime_ns, written.st_mtime_ns))
+        assert read_index_snapshot(tmp_path / "snap").lora_ids
+        with pytest.raises(IndexSnapshotError):
+            read_index_snapshot(tmp_path / "snap", verify_checksum=True)
+
+    def test_lossy_snapshots_only_load_at_their_precision(
+        self, tmp_path, lora_catalog
+    ):
+        loras, extractor = lora_catalog(6)
+        engine = LoRARecommendationEngine(
+            extractor, device="cpu", index_precision="float16"
+        )
+        engine.build_similarity_index(loras)
+        write_index_snapshot(
+            tmp_path / "snap",
+            lora_ids=engine.lora_ids,
+            embeddings=engine.embedding_matrices(),
+            precision="float16",
+        )
+
+        with pytest.raises(IndexSnapshotError):
+            read_index_snapshot(tmp_path / "snap", precision="float32")
+        snapshot = read_index_snapshot(tmp_path / "snap", precision="float16")
+        assert snapshot.precision == "float16"
+
+    @pytest.mark.anyio("asyncio")
+    async def test_warm_start_serves_without_inference(self, tmp_path, lora_catalog):
+        loras, extractor = lora_catalog(40)
+        built = self._write(tmp_path / "snap", loras, extractor)
+        embedder = extractor.semantic_embedder
+        embedder.batch_calls = 0
+
+        warm = LoRARecommendationEngine(extractor, device="cpu")
+        builder = SimilarityIndexBuilder(_SnapshotRepository(loras), lambda: warm)
+        snapshot = read_index_snapshot(tmp_path / "snap")
+
+        assert await builder.load_snapshot(snapshot) is True
+        assert embedder.batch_calls == 0
+        assert isinstance(warm.semantic_embeddings, np.memmap)
+        assert not list(tmp_path.glob("snap/profile-*.npy"))
+        assert warm.get_recommendations(loras[5], 5) == built.get_recommendations(
+            loras[5], 5
+        )
+
+    @pytest.mark.anyio("asyncio")
+    async def test_stale_snapshot_is_ignored(self, tmp_path, lora_catalog):
+        loras, extractor = lora_catalog(10)
+        self._write(tmp_path / "snap", loras, extractor)
+        snapshot = read_index_snapshot(tmp_path / "snap")
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+
+        changed = SimilarityIndexBuilder(
+            _SnapshotRepository(loras[:-1]), lambda: engine
+        )
+        recomputed = SimilarityIndexBuilder(
+            _SnapshotRepository(
+                loras,
+                last_update=datetime.now(timezone.utc) + timedelta(minutes=1),
+            ),
+            lambda: engine,
+        )
+
+        assert await changed.load_snapshot(snapshot) is False
+        assert await recomputed.load_snapshot(snapshot) is False
+        assert engine.lora_ids == []
+
 
 class TestEmbeddingBatchRunner:
     """Targeted tests for the embedding batch runner."""
@@ -1,6 +1,13 @@
 """Tests for the recommendation repository."""
 
+from contextlib import contextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import event
+
 from backend.models import (
+    Adapter,
     RecommendationFeedback,
     RecommendationSession,
     UserPreference,
@@ -9,6 +16,39 @@ from backend.schemas.recommendations import (
     UserFeedbackRequest,
     UserPreferenceRequest,
 )
+from backend.services.recommendations.strategies import (
+    get_similar_loras,
+    get_similar_loras_batch,
+)
+
+
+@contextmanager
+def _count_queries(db_session):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def _add_adapters(db_session, count):
+    for idx in range(count):
+        db_session.add(
+            Adapter(
+                id=f"adapter-{idx}",
+                name=f"Adapter {idx}",
+                file_path=f"/tmp/adapter-{idx}.safetensors",
+                tags=["style", "portrait"],
+                active=True,
+            )
+        )
+    db_session.commit()
 
 
 class TestRecommendationRepository:
@@ -73,3 +113,121 @@ class TestRecommendationRepository:
         stored = db_session.get(UserPreference, first.id)
         assert stored.evidence_count == 2
         assert stored.learned_from == "feedback"
+
+
+class TestBulkAdapterHydration:
+    """Recommendation responses hydrate adapters without N+1 queries."""
+
+    def test_get_adapters_returns_summaries_by_id(self, repository, db_session):
+        _add_adapters(db_session, 3)
+
+        with _count_queries(db_session) as statements:
+            adapters = repository.get_adapters(["adapter-2", "adapter-0", "missing"])
+
+        assert len(statements) == 1
+        assert "file_path" not in statements[0]
+        assert set(adapters) == {"adapter-0", "adapter-2"}
+        assert adapters["adapter-2"].name == "Adapter 2"
+        assert adapters["adapter-2"].tags == ["style", "portrait"]
+        assert repository.get_adapters([]) == {}
+
+    @pytest.mark.anyio("asyncio")
+    @pytest.mark.parametrize("result_count", [2, 30])
+    async def test_similar_strategy_query_count_is_constant(
+        self, repository, db_session, result_count
+    ):
+        _add_adapters(db_session, 31)
+        db_session.expunge_all()
+        engine = MagicMock()
+        engine.lora_ids = ["adapter-0"]
+        engine.contains.return_value = True
+        engine.get_recommendations.return_value = [
+            {
+                "lora_id": f"adapter-{idx}",
+                "similarity_score": 0.9,
+                "final_score": 0.9,
+                "explanation": "General similarity",
+            }
+            for idx in range(1, result_count + 1)
+        ]
+        embedding_manager = MagicMock()
+        embedding_manager.ensure_embeddings_exist = AsyncMock()
+
+        with _count_queries(db_session) as statements:
+            items = await get_similar_loras(
+                target_lora_id="adapter-0",
+                limit=result_count,
+                similarity_threshold=0.1,
+                diversify_results=True,
+                weights=None,
+                repository=repository,
+                embedding_manager=embedding_manager,
+                engine=engine,
+            )
+
+        assert len(items) == result_count
+        # One query for the target adapter and one for every candidate.
+        assert len(statements) == 2
+
+    @pytest.mark.anyio("asyncio")
+    @pytest.mark.parametrize("target_count", [1, 10])
+    async def test_batch_strategy_query_count_is_constant(
+        self, repository, db_session, target_count
+    ):
+        _add_adapters(db_session, 12)
+        db_session.expunge_all()
+        target_ids = [f"adapter-{idx}" for idx in range(target_count)]
+        engine = MagicMock()
+        engine.lora_ids = ["adapter-11"]
+        engine.contains.return_value = False
+        engine.get_batch_recommendations.return_value = {
+            "results": {
+                lora_id: [
+                    {
+                        "lora_id": "adapter-11",
+                        "similarity_score": 0.9,
+                        "final_score": 0.9,
+                        "explanation": "General similarity",
+                    }
+                ]
+                for lora_id in target_ids
+            },
+            "merged": None,
+        }
+        embedding_manager = MagicMock()
+        embedding_manager.ensure_embeddings_exist = AsyncMock()
+
+        with _count_queries(db_session) as statements:
+            results, merged = await get_similar_loras_batch(
+                target_lora_ids=target_ids,
+                limit=5,
+                similarity_threshold=0.1,
+                diversify_results=True,
+                weights=None,
+                include_merged=False,
+                repository=repository,
+                embedding_manager=embedding_manager,
+                engine=engine,
+            )
+
+        assert set(results) == set(target_ids)
+        assert merged is None
+        # Targets, their stored embeddings and the candidates: one query each.
+        assert len(statements) == 3
+
+    @pytest.mark.anyio("asyncio")
+    async def test_batch_strategy_reports_missing_targets(self, repository, db_session):
+        _add_adapters(db_session, 1)
+
+        with pytest.raises(ValueError, match="missing-a, missing-b"):
+            await get_similar_loras_batch(
+                target_lora_ids=["adapter-0", "missing-a", "missing-b"],
+                limit=5,
+                similarity_threshold=0.1,
+                diversify_results=True,
+                weights=None,
+                include_merged=False,
+                repository=repository,
+                embedding_manager=MagicMock(),
+                engine=MagicMock(),
+            )
@@ -0,0 +1,109 @@
+"""Tests for numeric LoRA scoring."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from backend.models import Adapter, LoRAEmbedding
+from backend.services.recommendations.components.scoring import (
+    ScoreCalculator,
+    score_rows,
+)
+from backend.services.recommendations.embedding_repository import (
+    LoRAEmbeddingRepository,
+)
+
+
+def _adapters() -> list[Adapter]:
+    now = datetime.now(timezone.utc)
+    return [
+        Adapter(
+            id="full",
+            name="full",
+            file_path="/tmp/full.safetensors",
+            stats={
+                "rating": 4.5,
+                "downloadCount": 12000,
+                "favoriteCount": 300,
+                "commentCount": 40,
+            },
+            tags=["Anime Style", "character", "anime portrait"],
+            sd_version="SDXL 1.0",
+            author_username="an_author_with_a_long_name",
+            primary_file_size_kb=150_000,
+            published_at=(now - timedelta(days=40, hours=3)).replace(tzinfo=None),
+            created_at=now - timedelta(days=400),
+            nsfw_level=3,
+            supports_generation=True,
+        ),
+        Adapter(
+            id="sparse",
+            name="sparse",
+            file_path="/tmp/sparse.safetensors",
+            stats={"downloadCount": 0},
+            tags=[],
+            sd_version="SD 2.1",
+            created_at=now - timedelta(days=10, hours=12),
+        ),
+        Adapter(
+            id="bare",
+            name="bare",
+            file_path="/tmp/bare.safetensors",
+            sd_version=None,
+            created_at=now - timedelta(days=2, hours=12),
+        ),
+    ]
+
+
+class TestComputeMany:
+    """Column-wise scoring matches per-adapter scoring exactly."""
+
+    def test_columns_match_compute(self):
+        calculator = ScoreCalculator()
+        adapters = _adapters()
+
+        columns = calculator.compute_many(adapters)
+
+        assert columns["tags_vector"].shape == (3, 10)
+        assert columns["sd_version_vector"].shape == (3, 3)
+        assert all(len(values) == 3 for values in columns.values())
+        assert score_rows(columns) == [calculator.compute(a) for a in adapters]
+        assert all(len(values) == 0 for values in calculator.compute_many([]).values())
+
+    def test_reference_time_drives_recency(self):
+        published = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        adapter = Adapter(id="a", name="a", file_path="/tmp/a", published_at=published)
+
+        columns = ScoreCalculator().compute_many(
+            [adapter], now=published + timedelta(days=73, hours=23)
+        )
+
+        assert columns["recency_score"][0] == 1.0 - 73 / 365.0
+
+
+class TestBulkScoreUpdate:
+    """Rescored columns are written back in one statement."""
+
+    def test_update_scores_overwrites_existing_rows(self, db_session):
+        adapters = _adapters()
+        for adapter in adapters:
+            db_session.add(adapter)
+        db_session.add(LoRAEmbedding(adapter_id="full", quality_score=0.0))
+        db_session.add(LoRAEmbedding(adapter_id="bare", quality_score=0.0))
+        db_session.commit()
+        repository = LoRAEmbeddingRepository(db_session)
+        columns = ScoreCalculator().compute_many(adapters)
+
+        updated = repository.update_scores([a.id for a in adapters], columns)
+
+        assert updated == 2
+        db_session.expire_all()
+        full = db_session.get(LoRAEmbedding, "full")
+        assert full.quality_score == columns["quality_score"][0]
+        assert full.compatibility_score == 1.0
+        assert db_session.get(LoRAEmbedding, "bare").quality_score == 0.5
+        assert db_session.get(LoRAEmbedding, "sparse") is None
+        assert np.isclose(full.recency_score, columns["recency_score"][0])
+        assert repository.update_scores([a.id for a in adapters], columns) == 0
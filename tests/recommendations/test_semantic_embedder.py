@@ -2,11 +2,23 @@
 
 from __future__ import annotations
 
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
 import numpy as np
 
+from backend.services.recommendations.components import (
+    sentence_transformer_provider,
+)
 from backend.services.recommendations.components.embedder import (
     LoRASemanticEmbedder,
 )
+from backend.services.recommendations.components.prompt_cache import (
+    PromptEmbeddingCache,
+)
 
 
 class TestLoRASemanticEmbedder:
@@ -38,3 +50,124 @@ class TestLoRASemanticEmbedder:
             embedding = result[key]
             assert embedding.shape == (expected_dim,)
             assert np.allclose(embedding, 0.0)
+
+
+class TestPromptEmbeddingCache:
+    """Repeated prompts are served from the cache without inference."""
+
+    def _embedder(self, cache: PromptEmbeddingCache) -> LoRASemanticEmbedder:
+        return LoRASemanticEmbedder(
+            device="cpu", force_fallback=True, prompt_cache=cache
+        )
+
+    def test_normalised_repeat_skips_inference(self) -> None:
+        cache = PromptEmbeddingCache(max_entries=4)
+        embedder = self._embedder(cache)
+        first = embedder.compute_prompt_embeddings("dreamy  watercolor\tlandscape")
+
+        with patch.object(embedder, "_encode_single") as encode:
+            second = embedder.compute_prompt_embeddings(" dreamy watercolor landscape ")
+
+        encode.assert_not_called()
+        for key, vector in first.items():
+            assert np.array_equal(second[key], vector)
+            assert not second[key].flags.writeable
+        assert cache.stats() == {
+            "entries": 1,
+            "max_entries": 4,
+            "hits": 1,
+            "disk_hits": 0,
+            "misses": 1,
+            "hit_rate": 0.5,
+        }
+
+    def test_model_versions_and_capacity_bound_entries(self) -> None:
+        cache = PromptEmbeddingCache(max_entries=2)
+        vectors = {"semantic": np.ones(3, dtype=np.float32)}
+        for prompt in ("a", "b", "c"):
+            cache.put(cache.make_key(prompt, {"semantic": "v1"}), vectors)
+
+        assert len(cache) == 2
+        assert cache.get(cache.make_key("a", {"semantic": "v1"})) is None
+        assert cache.get(cache.make_key("c", {"semantic": "v2"})) is None
+        assert cache.get(cache.make_key("c", {"semantic": "v1"})) is not None
+
+    def test_persisted_entries_survive_a_new_cache(self, tmp_path) -> None:
+        first = self._embedder(PromptEmbeddingCache(directory=tmp_path))
+        expected = first.compute_prompt_embeddings("ink sketch")
+
+        cache = PromptEmbeddingCache(directory=tmp_path)
+        embedder = self._embedder(cache)
+        with patch.object(embedder, "_encode_single") as encode:
+            result = embedder.compute_prompt_embeddings("ink sketch")
+
+        encode.assert_not_called()
+        assert cache.stats()["disk_hits"] == 1
+        for key, vector in expected.items():
+            assert np.array_equal(result[key], vector)
+
+
+_FallbackSentenceEncoder = sentence_transformer_provider._FallbackSentenceEncoder
+
+
+class TestFallbackSentenceEncoder:
+    """The hashed fallback encoder is batched, normalised and deterministic."""
+
+    def test_batch_matches_single_encodes(self) -> None:
+        encoder = _FallbackSentenceEncoder(64)
+        texts = ["Soft watercolor, pastel", "", None, "ink\x00wash sketch"]
+
+        batch = encoder.encode(texts)
+
+        assert batch.shape == (4, 64)
+        assert batch.dtype == np.float32
+        for row, text in zip(batch, texts, strict=True):
+            assert np.array_equal(row, encoder.encode(text or ""))
+        assert np.allclose(np.linalg.norm(batch[[0, 3]], axis=1), 1.0)
+        assert not batch[1].any() and not batch[2].any()
+
+    def test_bigrams_make_vectors_order_sensitive(self) -> None:
+        encoder = _FallbackSentenceEncoder(256)
+
+        forward, backward = encoder.encode(["red dragon", "dragon red"])
+
+        assert not np.array_equal(forward, backward)
+        assert np.array_equal(
+            encoder.encode("Red, dragon!"), encoder.encode("red dragon")
+        )
+
+    def test_memo_reset_keeps_hashes_of_running_batches(self) -> None:
+        encoder = _FallbackSentenceEncoder(32)
+        encoder._MAX_CACHED_TOKENS = 4
+        expected = _FallbackSentenceEncoder(32).encode(["ink wash", "neon city glow"])
+
+        running = encoder._cache_hashes(["ink", "wash"])
+        encoder._cache_hashes(["neon", "city", "glow"])
+
+        assert {"ink", "wash"} <= running.keys()
+        assert "ink" not in encoder._token_hashes
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            batches = list(
+                pool.map(encoder.encode, [["ink wash", "neon city glow"]] * 32)
+            )
+        assert all(np.array_equal(batch, expected) for batch in batches)
+
+    def test_vectors_are_stable_across_processes(self) -> None:
+        script = (
+            "from backend.services.recommendations.components."
+            "sentence_transformer_provider import _FallbackSentenceEncoder;"
+            "print(_FallbackSentenceEncoder(32).encode('neon city').tobytes().hex())"
+        )
+        outputs = {
+            subprocess.run(
+                [sys.executable, "-c", script],
+                capture_output=True,
+                check=True,
+                env={**os.environ, "PYTHONHASHSEED": seed},
+                text=True,
+            ).stdout.strip()
+            for seed in ("1", "2")
+        }
+
+        expected = _FallbackSentenceEncoder(32).encode("neon city")
+        assert outputs == {expected.tobytes().hex()}
@@ -124,6 +124,7 @@ class TestRecommendationService:
             ["adapter-1"],
             force_recompute=False,
             batch_size=8,
+            skip_unchanged=False,
         )
 
         await service.refresh_indexes(force=True)
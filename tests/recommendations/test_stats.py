@@ -15,6 +15,7 @@ from backend.services.recommendations import (
     RecommendationMetricsTracker,
     StatsReporter,
 )
+from backend.services.recommendations.components import ModelResidencyManager
 
 
 class TestStatsReporter:
@@ -31,6 +32,49 @@ class TestStatsReporter:
             gpu_enabled=True,
         )
 
+    def test_build_stats_reports_model_residency(self):
+        metrics_tracker = MagicMock()
+        metrics_tracker.build_stats.return_value = RecommendationStats(
+            total_loras=0,
+            loras_with_embeddings=0,
+            embedding_coverage=0.0,
+            avg_recommendation_time_ms=0.0,
+            cache_hit_rate=0.0,
+            total_sessions=0,
+            user_preferences_count=0,
+            feedback_count=0,
+            model_memory_usage_gb=0.0,
+            last_index_update=datetime.now(timezone.utc),
+        )
+        residency = ModelResidencyManager(100)
+        residency.acquire("a", object, size_bytes=80)
+        residency.acquire("b", object, size_bytes=80)
+        reporter = StatsReporter(
+            metrics_tracker=metrics_tracker,
+            repository=MagicMock(),
+            residency_provider=lambda: residency,
+        )
+
+        stats = reporter.build_stats(gpu_enabled=False)
+
+        assert stats.model_resident_bytes == 80
+        assert stats.model_loads == 2
+        assert stats.model_evictions == 1
+
+    def test_build_stats_skips_index_details_before_models_load(self):
+        metrics_tracker = MagicMock()
+        metrics_tracker.build_stats.return_value = MagicMock()
+        reporter = StatsReporter(
+            metrics_tracker=metrics_tracker,
+            repository=MagicMock(),
+            engine_provider=lambda: None,
+        )
+
+        stats = reporter.build_stats(gpu_enabled=False)
+
+        assert stats is metrics_tracker.build_stats.return_value
+        stats.model_copy.assert_not_called()
+
     def test_embedding_status_handles_missing(self, repository):
         reporter = StatsReporter(
             metrics_tracker=MagicMock(),
@@ -0,0 +1,265 @@
+"""Tests for change-stamp driven trigger index refreshes."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Sequence
+
+import numpy as np
+
+from backend.models import Adapter, LoRAEmbedding
+from backend.services.recommendations.components.trigger_ngram_index import (
+    TriggerNgramIndex,
+)
+from backend.services.recommendations.components.trigger_processing import (
+    TriggerResolver,
+)
+from backend.services.recommendations.trigger_engine import TriggerSearchIndex
+
+
+class _CountingEmbedder:
+    dimension = 4
+
+    def __init__(self) -> None:
+        self.encoded: List[str] = []
+
+    def encode(self, phrases: Sequence[str]) -> np.ndarray:
+        self.encoded.extend(phrases)
+        return np.ones((len(phrases), self.dimension), dtype=np.float32)
+
+    def encode_single(self, phrase: str) -> np.ndarray:
+        return np.ones(self.dimension, dtype=np.float32)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _add_adapter(db_session, adapter_id: str, trigger: str, updated_at: datetime):
+    db_session.add(
+        Adapter(
+            id=adapter_id,
+            name=adapter_id,
+            file_path=f"/tmp/{adapter_id}.safetensors",
+            triggers=[trigger],
+            active=True,
+            updated_at=updated_at,
+        )
+    )
+    db_session.add(LoRAEmbedding(adapter_id=adapter_id, updated_at=updated_at))
+    db_session.commit()
+
+
+class TestTriggerIndexRefresh:
+    """The trigger index polls a change stamp and refreshes incrementally."""
+
+    def _setup(self, db_session):
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        _add_adapter(db_session, "a", "sunset glow", start)
+        _add_adapter(db_session, "b", "ink wash", start)
+        clock = _Clock()
+        index = TriggerSearchIndex(refresh_interval=5.0, clock=clock)
+        embedder = _CountingEmbedder()
+        resolver = TriggerResolver()
+        return start, clock, index, embedder, resolver
+
+    def test_stamp_is_checked_at_most_once_per_interval(
+        self, repository, db_session, monkeypatch
+    ):
+        _, clock, index, embedder, resolver = self._setup(db_session)
+        index.ensure(repository, embedder, resolver)
+        calls = []
+        original = repository.get_embedding_change_stamp
+        monkeypatch.setattr(
+            repository,
+            "get_embedding_change_stamp",
+            lambda: calls.append(1) or original(),
+        )
+
+        clock.now = 1.0
+        index.ensure(repository, embedder, resolver)
+        assert calls == []
+
+        clock.now = 6.0
+        generation = index.generation
+        index.ensure(repository, embedder, resolver)
+        assert calls == [1]
+        assert index.generation == generation
+
+    def test_only_changed_adapters_are_reencoded(self, repository, db_session):
+        start, clock, index, embedder, resolver = self._setup(db_session)
+        index.ensure(repository, embedder, resolver)
+        assert sorted(embedder.encoded) == ["ink wash", "sunset glow"]
+        embedder.encoded.clear()
+
+        # Same adapter count, edited triggers: a count check would miss this.
+        adapter = db_session.get(Adapter, "b")
+        adapter.triggers = ["ink splash"]
+        adapter.updated_at = start + timedelta(minutes=5)
+        db_session.add(adapter)
+        db_session.commit()
+        clock.now = 10.0
+        index.ensure(repository, embedder, resolver)
+
+        assert embedder.encoded == ["ink splash"]
+        results = index.search(
+            query="ink splash", resolver=resolver, embedder=embedder, limit=5
+        )
+        by_id = {result.adapter_id: result for result in results}
+        assert by_id["b"].signals.get("exact")
+        assert index.adapter_metadata["b"]["normalized_triggers"] == ["ink splash"]
+
+    def test_deactivated_adapters_are_dropped(self, repository, db_session):
+        start, clock, index, embedder, resolver = self._setup(db_session)
+        index.ensure(repository, embedder, resolver)
+        generation = index.generation
+
+        adapter = db_session.get(Adapter, "a")
+        adapter.active = False
+        adapter.updated_at = start + timedelta(minutes=1)
+        db_session.add(adapter)
+        db_session.commit()
+        clock.now = 10.0
+        index.ensure(repository, embedder, resolver)
+
+        assert index.generation == generation + 1
+        assert set(index.adapter_metadata) == {"b"}
+        results = index.search(
+            query="sunset glow", resolver=resolver, embedder=embedder, limit=5
+        )
+        assert all(result.adapter_id != "a" for result in results)
+
+    def test_deleted_adapters_are_dropped(self, repository, db_session):
+        _, clock, index, embedder, resolver = self._setup(db_session)
+        index.ensure(repository, embedder, resolver)
+        stamp = repository.get_embedding_change_stamp()
+
+        # Deleting rows leaves both latest ``updated_at`` values unchanged.
+        db_session.delete(db_session.get(LoRAEmbedding, "a"))
+        db_session.delete(db_session.get(Adapter, "a"))
+        db_session.commit()
+        clock.now = 10.0
+        index.ensure(repository, embedder, resolver)
+
+        assert repository.get_embedding_change_stamp()[-2:] == stamp[-2:]
+        assert set(index.adapter_metadata) == {"b"}
+
+    def test_writes_sharing_the_stamp_time_are_indexed(self, repository, db_session):
+        start, clock, index, embedder, resolver = self._setup(db_session)
+        index.ensure(repository, embedder, resolver)
+        embedder.encoded.clear()
+
+        # Committed after the first refresh but stamped with the same time.
+        _add_adapter(db_session, "c", "neon rain", start)
+        clock.now = 10.0
+        index.ensure(repository, embedder, resolver)
+
+        assert embedder.encoded == ["neon rain"]
+        assert set(index.adapter_metadata) == {"a", "b", "c"}
+
+    def test_refresh_patches_rows_in_place(self, repository, db_session):
+        start, clock, index, embedder, resolver = self._setup(db_session)
+        index = TriggerSearchIndex(refresh_interval=5.0, compact_ratio=0.9, clock=clock)
+        index.ensure(repository, embedder, resolver)
+        vectors = index._vectors
+
+        adapter = db_session.get(Adapter, "b")
+        adapter.triggers = ["ink splash"]
+        adapter.updated_at = start + timedelta(minutes=5)
+        db_session.add(adapter)
+        db_session.commit()
+        clock.now = 10.0
+        index.ensure(repository, embedder, resolver)
+
+        assert index._vectors is vectors
+        assert vectors.size == 3
+        vacated = [row for row, key in enumerate(index._vector_keys) if key is None]
+        assert len(vacated) == 1
+        assert not vectors.view[vacated].any()
+        assert "ink wash" not in index._fuzzy_index
+        assert "ink splash" in index._fuzzy_index
+        results = index.search(
+            query="ink wash", resolver=resolver, embedder=embedder, limit=5
+        )
+        assert all(result.canonical_trigger != "ink wash" for result in results)
+
+    def test_vacated_rows_are_compacted(self, repository, db_session):
+        start, clock, index, embedder, resolver = self._setup(db_session)
+        index.ensure(repository, embedder, resolver)
+
+        adapter = db_session.get(Adapter, "a")
+        adapter.active = False
+        adapter.updated_at = start + timedelta(minutes=1)
+        db_session.add(adapter)
+        db_session.commit()
+        clock.now = 10.0
+        index.ensure(repository, embedder, resolver)
+
+        assert index._vectors.size == 1
+        assert index._vector_keys == [("b", "ink wash")]
+        assert index._trigger_rows == {"ink wash": [0]}
+        results = index.search(
+            query="ink wash", resolver=resolver, embedder=embedder, limit=5
+        )
+        assert [result.adapter_id for result in results] == ["b"]
+
+
+class TestFuzzyTriggerLookup:
+    """Misspelled and partial triggers resolve through the n-gram index."""
+
+    def test_ngram_index_ranks_typos_and_prefixes(self):
+        index = TriggerNgramIndex(["sunset glow", "ink wash", "watercolor style"])
+
+        assert index.search("sunset glow")[0] == ("sunset glow", 1.0)
+        assert index.search("sunst glow")[0][0] == "sunset glow"
+        assert index.search("wat")[0][0] == "watercolor style"
+        assert index.search("zzzz") == []
+
+        index.remove("ink wash")
+        assert "ink wash" not in index
+        assert all(trigger != "ink wash" for trigger, _ in index.search("ink"))
+
+    def test_prefix_table_tracks_adds_and_removes(self):
+        index = TriggerNgramIndex(["sunset glow", "watercolor style"])
+        index.search("sun")
+        index.add("water lilies")
+        index.remove("watercolor style")
+        index.add("wash style")
+        index.remove("wash style")
+
+        assert index._words == [("glow", "sunset glow"), ("sunset", "sunset glow")]
+        assert index.search("wat") == [("water lilies", 0.75)]
+        assert index._words == sorted(
+            [("glow", "sunset glow"), ("sunset", "sunset glow")]
+            + [("lilies", "water lilies"), ("water", "water lilies")]
+        )
+
+    def test_fuzzy_candidates_skip_the_dense_scan(
+        self, repository, db_session, monkeypatch
+    ):
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        _add_adapter(db_session, "a", "sunset glow", start)
+        _add_adapter(db_session, "b", "ink wash", start)
+        index = TriggerSearchIndex()
+        embedder = _CountingEmbedder()
+        resolver = TriggerResolver()
+        index.ensure(repository, embedder, resolver)
+
+        dense_calls = []
+        original_dot = np.dot
+        monkeypatch.setattr(
+            np, "dot", lambda *args: dense_calls.append(1) or original_dot(*args)
+        )
+
+        results = index.search(
+            query="sunst glow", resolver=resolver, embedder=embedder, limit=1
+        )
+
+        assert [result.adapter_id for result in results] == ["a"]
+        assert results[0].signals["fuzzy"] > 0.5
+        assert results[0].canonical_trigger == "sunset glow"
+        assert dense_calls == []
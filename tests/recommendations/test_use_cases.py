@@ -1,6 +1,5 @@
 """Tests for recommendation use cases."""
 
-import pickle
 from dataclasses import dataclass
 from typing import List, Optional
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -8,10 +7,15 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import numpy as np
 import pytest
 
+from backend.schemas.recommendations import RecommendationItem
 from backend.services.recommendations import (
     PromptRecommendationUseCase,
+    RecommendationMetricsTracker,
+    RecommendationResultCache,
     SimilarLoraUseCase,
+    TriggerRecommendationUseCase,
 )
+from backend.services.recommendations.embedding_codec import encode_embedding
 
 
 class TestRecommendationUseCases:
@@ -59,6 +63,49 @@ class TestRecommendationUseCases:
         engine_provider.assert_called_once()
         metrics.record_query.assert_called_once()
 
+    @pytest.mark.anyio("asyncio")
+    async def test_similar_batch_use_case_delegates_to_batch_strategy(self):
+        repository = MagicMock()
+        workflow = MagicMock()
+        engine_provider = MagicMock(return_value=MagicMock())
+        metrics = MagicMock()
+        use_case = SimilarLoraUseCase(
+            repository=repository,
+            embedding_workflow=workflow,
+            engine_provider=engine_provider,
+            metrics=metrics,
+        )
+
+        payload = ({"a": [], "b": []}, [])
+        strategy = AsyncMock(return_value=payload)
+
+        with patch(
+            "backend.services.recommendations.use_cases.similar_loras_batch_strategy",
+            strategy,
+        ):
+            result = await use_case.execute_batch(
+                target_lora_ids=["a", "b"],
+                limit=4,
+                similarity_threshold=0.2,
+                diversify_results=False,
+                weights=None,
+                include_merged=True,
+            )
+
+        assert result == payload
+        strategy.assert_awaited_once_with(
+            target_lora_ids=["a", "b"],
+            limit=4,
+            similarity_threshold=0.2,
+            diversify_results=False,
+            weights=None,
+            include_merged=True,
+            repository=repository,
+            embedding_manager=workflow,
+            engine=engine_provider.return_value,
+        )
+        metrics.record_query.assert_called_once()
+
     @pytest.mark.anyio("asyncio")
     async def test_prompt_use_case_records_metrics(self):
         repository = MagicMock()
@@ -143,9 +190,9 @@ class TestRecommendationUseCases:
         )
         embedding_vector = np.asarray([1.0, 0.0, 0.0], dtype=np.float32)
         embedding = _Embedding(
-            semantic_embedding=pickle.dumps(embedding_vector),
-            artistic_embedding=pickle.dumps(embedding_vector),
-            technical_embedding=pickle.dumps(embedding_vector),
+            semantic_embedding=encode_embedding(embedding_vector),
+            artistic_embedding=encode_embedding(embedding_vector),
+            technical_embedding=encode_embedding(embedding_vector),
             predicted_style="dreamy",
         )
         repository = _Repository(adapter, embedding)
@@ -169,3 +216,135 @@ class TestRecommendationUseCases:
         assert len(results) == 1
         assert embedder.calls == [("glowing forest", "cpu")]
         metrics.record_query.assert_called_once()
+
+
+def _item(lora_id: str = "lora") -> RecommendationItem:
+    return RecommendationItem(
+        lora_id=lora_id,
+        lora_name=lora_id,
+        similarity_score=0.9,
+        final_score=0.9,
+        explanation="General similarity",
+    )
+
+
+class TestResultCache:
+    """Repeated queries are served from the generation-tagged cache."""
+
+    @staticmethod
+    def _similar(engine, cache, metrics):
+        return SimilarLoraUseCase(
+            repository=MagicMock(),
+            embedding_workflow=MagicMock(),
+            engine_provider=lambda: engine,
+            metrics=metrics,
+            result_cache=cache,
+        )
+
+    @staticmethod
+    async def _run(use_case, **overrides):
+        arguments = {
+            "target_lora_id": "adapter-id",
+            "limit": 5,
+            "similarity_threshold": 0.3,
+            "diversify_results": True,
+            "weights": {"semantic": 0.6, "artistic": 0.3, "technical": 0.1},
+        }
+        arguments.update(overrides)
+        return await use_case.execute(**arguments)
+
+    @pytest.mark.anyio("asyncio")
+    async def test_repeated_similar_query_hits_cache(self):
+        engine = MagicMock(generation=1)
+        metrics = RecommendationMetricsTracker()
+        use_case = self._similar(engine, RecommendationResultCache(8), metrics)
+        strategy = AsyncMock(return_value=[_item()])
+
+        with patch(
+            "backend.services.recommendations.use_cases.similar_loras_strategy",
+            strategy,
+        ):
+            first = await self._run(use_case)
+            second = await self._run(use_case)
+            await self._run(use_case, limit=6)
+
+        assert first == second
+        assert strategy.await_count == 2
+        assert metrics.metrics.cache_hits == 1
+        assert metrics.metrics.cache_misses == 2
+
+    @pytest.mark.anyio("asyncio")
+    async def test_results_are_stored_as_private_copies_after_rebuilds(self):
+        engine = MagicMock(generation=1)
+        use_case = self._similar(
+            engine, RecommendationResultCache(8), RecommendationMetricsTracker()
+        )
+
+        async def rebuild_then_rank(**kwargs):
+            engine.generation = 2
+            return [_item()]
+
+        strategy = AsyncMock(side_effect=rebuild_then_rank)
+        with patch(
+            "backend.services.recommendations.use_cases.similar_loras_strategy",
+            strategy,
+        ):
+            first = await self._run(use_case)
+            first[0].explanation = "changed by the caller"
+            second = await self._run(use_case)
+
+        strategy.assert_awaited_once()
+        assert second[0].explanation == "General similarity"
+
+    @pytest.mark.anyio("asyncio")
+    async def test_index_generation_change_invalidates(self):
+        engine = MagicMock(generation=1)
+        cache = RecommendationResultCache(8)
+        use_case = self._similar(engine, cache, RecommendationMetricsTracker())
+        strategy = AsyncMock(return_value=[])
+
+        with patch(
+            "backend.services.recommendations.use_cases.similar_loras_strategy",
+            strategy,
+        ):
+            await self._run(use_case)
+            engine.generation = 2
+            await self._run(use_case)
+            cache.invalidate()
+            await self._run(use_case)
+
+        assert strategy.await_count == 3
+
+    @pytest.mark.anyio("asyncio")
+    async def test_trigger_queries_are_cached_per_index_generation(self):
+        engine = MagicMock()
+        engine.index_generation.return_value = 4
+        metrics = RecommendationMetricsTracker()
+        use_case = TriggerRecommendationUseCase(
+            repository=MagicMock(),
+            trigger_engine_provider=lambda: engine,
+            metrics=metrics,
+            result_cache=RecommendationResultCache(8),
+        )
+        strategy = AsyncMock(return_value=[_item()])
+
+        with patch(
+            "backend.services.recommendations.use_cases.trigger_strategy",
+            strategy,
+        ):
+            await use_case.execute(trigger_query="Neon City", limit=3)
+            await use_case.execute(trigger_query="neon city ", limit=3)
+
+        strategy.assert_awaited_once()
+        assert metrics.cache_hit_rate == pytest.approx(0.5)
+
+    def test_lru_evicts_oldest_entry(self):
+        cache = RecommendationResultCache(2)
+        cache.put("a", 1, ["a"])
+        cache.put("b", 1, ["b"])
+        cache.get("a", 1)
+        cache.put("c", 1, ["c"])
+
+        assert cache.get("b", 1) is None
+        assert cache.get("a", 1) == ["a"]
+        assert cache.get("c", 1) == ["c"]
@@ -0,0 +1,272 @@
+"""Tests for the pluggable vector index layer and engine integration."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from backend.services.recommendations.components.engine import (
+    LoRARecommendationEngine,
+)
+from backend.services.recommendations.components.quantization import (
+    QuantizedMatrix,
+)
+from backend.services.recommendations.components.vector_index import (
+    ExactVectorIndex,
+    NumpyIVFIndex,
+    create_vector_index,
+    measure_recall_at_k,
+    top_k_indices,
+)
+
+
+def _random_unit_vectors(count: int, dim: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestVectorIndexes:
+    """Unit tests for individual index implementations."""
+
+    def test_top_k_indices_orders_descending(self):
+        scores = np.asarray([0.1, 0.9, 0.5, 0.7], dtype=np.float32)
+
+        assert top_k_indices(scores, 2).tolist() == [1, 3]
+        assert top_k_indices(scores, 10).tolist() == [1, 3, 2, 0]
+
+    def test_exact_index_returns_self_as_best_match(self):
+        vectors = _random_unit_vectors(50, 12)
+        index = ExactVectorIndex()
+        index.build(vectors)
+
+        _, indices = index.search(vectors[:5], 3)
+
+        assert indices[:, 0].tolist() == [0, 1, 2, 3, 4]
+
+    def test_exact_index_appends_into_spare_capacity(self):
+        vectors = _random_unit_vectors(40, 12)
+        index = ExactVectorIndex()
+        index.add(vectors[:30])
+        index.add(vectors[30:35])
+        capacity = index._vectors.capacity
+        index.add(vectors[35:])
+
+        _, indices = index.search(vectors[35], 1)
+
+        assert index.size == 40
+        assert index._vectors.capacity == capacity
+        assert indices[0, 0] == 35
+
+    def test_ivf_index_reports_high_recall_with_full_probe(self):
+        vectors = _random_unit_vectors(400, 12)
+        index = NumpyIVFIndex(nlist=8, nprobe=8)
+        index.build(vectors)
+
+        assert measure_recall_at_k(index, vectors, k=5) == pytest.approx(1.0)
+
+    def test_ivf_index_add_keeps_new_rows_searchable(self):
+        vectors = _random_unit_vectors(120, 12)
+        index = NumpyIVFIndex(nlist=4, nprobe=4)
+        index.build(vectors[:100])
+        index.add(vectors[100:])
+
+        _, indices = index.search(vectors[110], 1)
+
+        assert index.size == 120
+        assert indices[0, 0] == 110
+
+    def test_ivf_index_remaps_rows_and_retrains_only_on_drift(self):
+        vectors = _random_unit_vectors(200, 12)
+        index = NumpyIVFIndex(nlist=4, nprobe=4)
+        index.build(vectors[:100])
+        centroids = index._centroids
+        index.add(vectors[100:110])
+        capacity = index._vectors.capacity
+        index.add(vectors[110:120])
+        assert index._vectors.capacity == capacity
+
+        index.take(np.arange(10, 120))
+        _, indices = index.search(vectors[118], 1)
+
+        assert index._centroids is centroids
+        assert index.size == 110
+        assert indices[0, 0] == 108
+        assert not index.needs_retrain
+        index.add(vectors[120:141])
+        assert index.needs_retrain
+
+    def test_faiss_backend_falls_back_without_faiss(self, monkeypatch):
+        import builtins
+
+        real_import = builtins.__import__
+
+        def fake_import(name, *args, **kwargs):
+            if name == "faiss":
+                raise ImportError("faiss missing")
+            return real_import(name, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "__import__", fake_import)
+
+        index = create_vector_index("faiss_hnsw")
+
+        assert isinstance(index, NumpyIVFIndex)
+
+    def test_unknown_backend_is_rejected(self):
+        with pytest.raises(ValueError):
+            create_vector_index("annoy")
+
+
+class TestEngineIndexBackends:
+    """Ensure the engine uses the configured index backend."""
+
+    def test_ivf_backend_matches_exact_results_with_full_probe(self, lora_catalog):
+        loras, extractor = lora_catalog(200)
+        exact = LoRARecommendationEngine(extractor, device="cpu")
+        approx = LoRARecommendationEngine(
+            extractor,
+            device="cpu",
+            index_backend="ivf",
+            index_nlist=4,
+            index_nprobe=4,
+        )
+        exact.build_similarity_index(loras)
+        approx.build_similarity_index(loras)
+
+        expected = exact.get_recommendations(loras[0], 5, diversify_results=False)
+        actual = approx.get_recommendations(loras[0], 5, diversify_results=False)
+
+        assert [rec["lora_id"] for rec in actual] == [
+            rec["lora_id"] for rec in expected
+        ]
+        assert approx.index_stats()["recall_at_k"] == pytest.approx(1.0)
+        assert approx.index_stats()["backend"] == "ivf"
+
+    def test_exact_backend_reports_perfect_recall(self, lora_catalog):
+        loras, extractor = lora_catalog(10)
+        engine = LoRARecommendationEngine(extractor, device="cpu")
+        engine.build_similarity_index(loras)
+
+        assert engine.index_stats()["recall_at_k"] == 1.0
+
+
+class TestCompactPrecision:
+    """Compact float16/int8 storage with float32 re-ranking."""
+
+    def test_int8_round_trip_error_is_small(self):
+        matrices = [_random_unit_vectors(64, 16, seed) for seed in (1, 2, 3)]
+
+        compact = QuantizedMatrix.quantize(matrices, "int8")
+
+        for original, restored in zip(matrices, compact.dequantize(), strict=True):
+            assert np.abs(original - restored).max() < 0.01
+        assert compact.nbytes * 3 < sum(matrix.nbytes for matrix in matrices)
+
+    def test_compact_scores_match_float32_products(self):
+        matrices = [_random_unit_vectors(40, 8, seed) for seed in (4, 5, 6)]
+        queries = [matrix[:3] for matrix in matrices]
+        expected = sum(
+            matrix @ query.T for matrix, query in zip(matrices, queries, strict=True)
+        )
+
+        compact = QuantizedMatrix.quantize(matrices, "float16")
+        compact.block_rows = 16
+
+        assert compact.scores(queries) == pytest.approx(expected, abs=1e-2)
+        assert compact.scores([query[0] for query in queries]) == pytest.approx(
+            expected[:, 0], abs=1e-2
+        )
+
+    @pytest.mark.parametrize("precision", ["float16", "int8"])
+    def test_compact_engine_matches_float32_results(self, lora_catalog, precision):
+        loras, extractor = lora_catalog(120)
+        exact = LoRARecommendationEngine(extractor, device="cpu")
+        compact = LoRARecommendationEngine(
+            extractor,
+            device="cpu",
+            index_precision=precision,
+        )
+        exact.build_similarity_index(loras)
+        compact.build_similarity_index(loras)
+
+        expected = exact.get_recommendations(loras[0], 5, diversify_results=False)
+        actual = compact.get_recommendations(loras[0], 5, diversify_results=False)
+
+        assert [rec["lora_id"] for rec in actual] == [
+            rec["lora_id"] for rec in expected
+        ]
+        assert actual[0]["similarity_score"] == pytest.approx(
+            expected[0]["similarity_score"], abs=1e-2
+        )
+        assert compact.semantic_embeddings is None
+        stats = compact.index_stats()
+        assert stats["precision"] == precision
+        assert stats["memory_bytes"] * 2 <= exact.index_stats()["memory_bytes"]
+
+    def test_compact_engine_appends_incrementally(self, lora_catalog):
+        loras, extractor = lora_catalog(30)
+        engine = LoRARecommendationEngine(
+            extractor,
+            device="cpu",
+            index_precision="int8",
+        )
+        engine.build_similarity_index(loras[:25])
+        engine.update_index_incremental(loras[25:])
+
+        matrices = engine.embedding_matrices()
+
+        assert matrices["semantic"].shape[0] == 30
+        assert engine.contains(loras[29].id)
+        assert engine.get_recommendations(loras[29], 3)
+
+    def test_rerank_runs_only_against_mapped_float32_rows(self, lora_catalog, tmp_path):
+        loras, extractor = lora_catalog(60)
+        engine = LoRARecommendationEngine(
+            extractor, device="cpu", index_precision="int8"
+        )
+        engine.build_similarity_index(loras)
+        reranked = []
+        score = engine._exact_scores
+
+        def spy(queries, weights, *, rows=None):
+            reranked.append(rows is not None)
+            return score(queries, weights, rows=rows)
+
+        engine._exact_scores = spy
+        engine.get_recommendations(loras[0], 5, diversify_results=False)
+        assert reranked == [False]
+
+        mapped = {}
+        for key, matrix in engine.embedding_matrices().items():
+            np.save(tmp_path / f"{key}.npy", matrix)
+            mapped[key] = np.load(tmp_path / f"{key}.npy", mmap_mode="r")
+        engine.build_from_embeddings(loras, mapped, normalized=True)
+        engine.get_recommendations(loras[0], 5, diversify_results=False)
+        assert reranked == [False, False, True]
+
+    def test_ann_backend_keeps_compact_vectors(self, lora_catalog):
+        loras, extractor = lora_catalog(80)
+        engine = LoRARecommendationEngine(
+            extractor,
+            device="cpu",
+            index_backend="ivf",
+            index_nlist=4,
+            index_nprobe=4,
+            index_precision="int8",
+        )
+        engine.build_similarity_index(loras[:70])
+        engine.update_index_incremental(loras[70:])
+
+        stored = engine._vector_index._vectors
+        assert isinstance(stored, QuantizedMatrix)
+        assert stored.values.dtype == np.int8
+        assert stored.rows == 80
+        assert engine.index_stats()["recall_at_k"] == pytest.approx(1.0)
+        query = np.hstack(stored.dequantize(np.asarray([75])))
+        assert engine._vector_index.search(query, 1)[1][0, 0] == 75
+
+    def test_unknown_precision_is_rejected(self, lora_catalog):
+        _, extractor = lora_catalog(1)
+
+        with pytest.raises(ValueError):
+            LoRARecommendationEngine(extractor, index_precision="int4")
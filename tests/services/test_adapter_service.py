@@ -1,6 +1,7 @@
 """Tests for the AdapterService."""
 
 from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -303,3 +304,22 @@ class TestAdapterService:
 
         with pytest.raises(ValueError):
             adapter_service.patch_adapter(adapter.id, {"weight": "heavy"})
+
+    def test_writes_notify_change_listener(self, adapter_service, db_session):
+        """Patch, deactivate and delete report committed changes."""
+        listener = MagicMock()
+        adapter_service.change_listener = listener
+        adapter = Adapter(name="hooked", active=True, file_path="/tmp/h")
+        db_session.add(adapter)
+        db_session.commit()
+
+        adapter_service.patch_adapter(adapter.id, {"tags": ["style"]})
+        adapters, fields = listener.adapters_updated.call_args.args
+        assert [item.id for item in adapters] == [adapter.id]
+        assert "tags" in fields
+
+        adapter_service.deactivate_adapter(adapter.id)
+        assert "active" in listener.adapters_updated.call_args.args[1]
+
+        adapter_service.delete_adapter(adapter.id)
+        listener.adapters_removed.assert_called_once_with([adapter.id])